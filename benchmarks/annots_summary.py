@@ -0,0 +1,97 @@
+"""
+Compare annotations summary with NumPy against the former pandas implementation.
+
+Run with ``nox -s benchmarks -- [N_ANNOTS ...]``; prints the best of several
+runs for each implementation and number of annotations and the time pandas
+takes to import, which the NumPy implementation doesn't pay.
+
+"""
+import argparse
+import subprocess  # noqa: S404 (runs the same interpreter)
+import sys
+import timeit
+from typing import Callable, Final
+
+import numpy as np
+import numpy.typing as npt  # noqa: WPS301
+
+from quickfif.describe import describe_table
+
+DEFAULT_SIZES: Final = (10**3, 10**5, 10**6)
+DESCRIPTIONS: Final = ("BAD_ACQ_SKIP", "EDGE boundary", "sleep N1", "sleep N2", "sleep N3")
+MAX_DURATION_SEC: Final = 30
+REPEAT: Final = 5
+MS_IN_SEC: Final = 1000
+
+HEADER: Final = "  n_annots  numpy, ms pandas, ms  speedup"
+ROW_FORMAT: Final = "{0:>10} {1:>10.1f} {2:>10.1f} {3:>8.1f}"
+IMPORT_FORMAT: Final = "pandas import, not included above: {0:.0f} ms"
+IMPORT_PANDAS: Final = "; ".join([
+    "import time",
+    "start = time.perf_counter()",
+    "import pandas",
+    "print(time.perf_counter() - start)",
+])
+
+Labels = npt.NDArray[np.str_]
+Floats = npt.NDArray[np.float64]
+Implementation = Callable[[Labels, Floats], str]
+
+
+def pandas_describe_table(labels: Labels, durations: Floats) -> str:
+    """Build the table with pandas as `get_annots_summary` did."""
+    import pandas as pd  # noqa: WPS433 (only needed for the comparison)
+
+    df = pd.DataFrame({"description": labels, "duration": durations})
+    df_groups = df.groupby("description").duration.describe()
+    total_series = df.duration.describe()
+    total_series.name = "Total"
+    joint_df = pd.concat([df_groups, total_series.to_frame().T])
+    joint_df["count"] = joint_df["count"].astype(int)
+    return str(joint_df.to_string(float_format=lambda x: "{0:.2f}".format(x)))
+
+
+def make_annotations(n_annots: int, seed: int = 0) -> tuple[Labels, Floats]:
+    """Generate random descriptions and durations."""
+    rng = np.random.default_rng(seed)
+    labels = rng.choice(DESCRIPTIONS, n_annots).astype(str)
+    return labels, rng.random(n_annots) * MAX_DURATION_SEC
+
+
+def time_best(func: Implementation, labels: Labels, durations: Floats) -> float:
+    """Get the best time of several runs in milliseconds."""
+    timer = timeit.Timer(lambda: func(labels, durations))
+    return min(timer.repeat(repeat=REPEAT, number=1)) * MS_IN_SEC
+
+
+def time_pandas_import() -> float:
+    """Get time of importing pandas in a fresh interpreter in milliseconds."""
+    cmd = [sys.executable, "-c", IMPORT_PANDAS]
+    import_sec = subprocess.run(cmd, capture_output=True, check=True, text=True).stdout
+    return float(import_sec) * MS_IN_SEC
+
+
+def compare(n_annots: int) -> str:
+    """Check both implementations give the same table and get their timings row."""
+    labels, durations = make_annotations(n_annots)
+    if describe_table(labels, durations) != pandas_describe_table(labels, durations):
+        raise RuntimeError(f"Tables differ for {n_annots} annotations")
+    numpy_ms = time_best(describe_table, labels, durations)
+    pandas_ms = time_best(pandas_describe_table, labels, durations)
+    return ROW_FORMAT.format(n_annots, numpy_ms, pandas_ms, pandas_ms / numpy_ms)
+
+
+def main() -> None:
+    """Print timings table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("sizes", nargs="*", type=int, default=DEFAULT_SIZES)
+    sizes = parser.parse_args().sizes
+
+    print(HEADER)
+    for n_annots in sizes:
+        print(compare(n_annots))
+    print(IMPORT_FORMAT.format(time_pandas_import()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Synthetic FIFF files of every supported type for the benchmark suite.
+
+Raw and epochs are scaled by the size of their data. Random data are
+generated for a block of a minute and the block file is repeated with
+`mne.concatenate_raws` without loading it, so even multi-GB split sets are
+written in bounded memory. Annotations are scaled by their number and ICA by
+the number of channels it was fitted on.
+
+Run by `suite.py` as ``python benchmarks/generators.py DATA_DIR SCALE FTYPE``,
+which prints the paths to the file and its splits. Generating in a separate
+process keeps the memory it takes out of the peak RSS of the measurements.
+
+"""
+import math
+import sys
+from pathlib import Path
+from types import MappingProxyType
+from typing import Final
+
+import mne
+import numpy as np
+from scales import SCALES, Scale
+
+from quickfif.config import Ftype
+
+N_CHANNELS: Final = 64
+SFREQ: Final = 1000.0
+BLOCK_SEC: Final = 60
+SAMPLE_BYTES: Final = 4  # mne saves data in single precision by default
+BYTES_IN_MB: Final = 1024 * 1024
+SIGNAL_SCALE: Final = 1e-5
+ANNOT_EVERY_SEC: Final = 10
+EPOCH_SEC: Final = 1.0
+EVENT_ID: Final = MappingProxyType({"left": 1, "right": 2, "rest": 3})
+ICA_COMPONENTS: Final = 20
+ICA_SFREQ: Final = 250.0
+ICA_SEC: Final = 60
+MAX_ANNOT_SEC: Final = 5.0
+ANNOT_DESCRIPTIONS: Final = ("BAD_ACQ_SKIP", "blink", "sleep N1", "sleep N2", "sleep N3")
+DONE_MARK: Final = ".done-{ftype}"
+FNAMES: Final = MappingProxyType({
+    Ftype.raw: "bench_raw.fif",
+    Ftype.epochs: "bench-epo.fif",
+    Ftype.ica: "bench-ica.fif",
+    Ftype.annots: "bench-annot.fif",
+})
+EPOCHS_SOURCE_FNAME: Final = "epochs_source_raw.fif"
+
+
+def get_file(data_dir: Path, scale_name: str, ftype: Ftype) -> Path:
+    """Get the first file of the generated file set, generating it on first use."""
+    scale_dir = data_dir / scale_name
+    fpath = scale_dir / FNAMES[ftype]
+    done_mark = scale_dir / DONE_MARK.format(ftype=ftype)
+    if not done_mark.exists():
+        scale_dir.mkdir(parents=True, exist_ok=True)
+        GENERATORS[ftype](fpath, SCALES[scale_name])
+        done_mark.touch()
+    return fpath
+
+
+def get_fileset(fpath: Path) -> list[Path]:
+    """Get the file with its splits, named the way mne names them."""
+    stem = fpath.name.removesuffix(".fif")
+    return [fpath] + list(fpath.parent.glob(f"{stem}-[0-9]*.fif"))
+
+
+def make_raw(fpath: Path, scale: Scale) -> None:
+    """Write raw with `scale.data_mb` of EEG data and annotations every 10 seconds."""
+    n_times = scale.data_mb * BYTES_IN_MB // (N_CHANNELS * SAMPLE_BYTES)
+    block_fpath = fpath.with_name(f"block_{fpath.name}")
+    _make_block(block_fpath, min(n_times, int(BLOCK_SEC * SFREQ)))
+    n_blocks = math.ceil(n_times / (BLOCK_SEC * SFREQ))
+    blocks = [mne.io.read_raw_fif(block_fpath, verbose="ERROR") for _ in range(n_blocks)]
+    raw = mne.concatenate_raws(blocks, verbose="ERROR")
+    raw.crop(tmax=(n_times - 1) / SFREQ)
+    raw.save(fpath, split_size=scale.split_size, overwrite=True, verbose="ERROR")
+    block_fpath.unlink()
+
+
+def make_epochs(fpath: Path, scale: Scale) -> None:
+    """Write one-second epochs of three event types cut from raw of the same size."""
+    raw_fpath = fpath.with_name(EPOCHS_SOURCE_FNAME)
+    make_raw(raw_fpath, scale)
+    raw = mne.io.read_raw_fif(raw_fpath, verbose="ERROR")
+    tmax = EPOCH_SEC - 1 / SFREQ
+    epochs = mne.Epochs(
+        raw, _make_events(raw), dict(EVENT_ID), 0, tmax, baseline=None, verbose="ERROR"
+    )
+    epochs.save(fpath, split_size=scale.split_size, overwrite=True, verbose="ERROR")
+    for split in get_fileset(raw_fpath):
+        split.unlink()
+
+
+def make_ica(fpath: Path, scale: Scale) -> None:
+    """Write ICA fitted on a minute of random data from `scale.n_ica_channels` channels."""
+    n_times = int(ICA_SEC * ICA_SFREQ)
+    raw = _make_raw_array(scale.n_ica_channels, n_times, ICA_SFREQ)
+    ica = mne.preprocessing.ICA(n_components=ICA_COMPONENTS, random_state=0, verbose="ERROR")
+    ica.fit(raw, verbose="ERROR")
+    ica.save(fpath, overwrite=True, verbose="ERROR")
+
+
+def make_annots(fpath: Path, scale: Scale) -> None:
+    """Write `scale.n_annots` annotations with random descriptions and durations."""
+    rng = np.random.default_rng(0)
+    onsets = np.sort(rng.random(scale.n_annots)) * scale.n_annots
+    durations = rng.random(scale.n_annots) * MAX_ANNOT_SEC
+    descriptions = rng.choice(ANNOT_DESCRIPTIONS, scale.n_annots)
+    mne.Annotations(onsets, durations, descriptions).save(fpath, overwrite=True, verbose="ERROR")
+
+
+def _make_block(fpath: Path, n_times: int) -> None:
+    raw = _make_raw_array(N_CHANNELS, n_times, SFREQ)
+    onsets = np.arange(0, n_times / SFREQ, ANNOT_EVERY_SEC)
+    raw.annotations.append(onsets, 1, "stimulus")
+    raw.save(fpath, overwrite=True, verbose="ERROR")
+
+
+def _make_events(raw: mne.io.BaseRaw) -> np.ndarray:
+    epoch_samples = int(EPOCH_SEC * SFREQ)
+    onsets = np.arange(raw.first_samp, raw.last_samp - epoch_samples, epoch_samples)
+    event_codes = np.resize(list(EVENT_ID.values()), len(onsets))
+    return np.column_stack([onsets, np.zeros_like(onsets), event_codes])
+
+
+def _make_raw_array(n_channels: int, n_times: int, sfreq: float) -> mne.io.BaseRaw:
+    ch_names = [f"EEG{idx:03}" for idx in range(n_channels)]
+    meas_info = mne.create_info(ch_names, sfreq, "eeg")
+    signals = np.random.default_rng(0).normal(size=(n_channels, n_times)) * SIGNAL_SCALE
+    return mne.io.RawArray(signals, meas_info, verbose="ERROR")
+
+
+def main() -> None:
+    """Print paths to the generated file and its splits, one per line."""
+    data_dir, scale_name, ftype_name = sys.argv[1:]
+    fpath = get_file(Path(data_dir), scale_name, Ftype(ftype_name))
+    print("\n".join(str(split) for split in get_fileset(fpath)))
+
+
+GENERATORS: Final = MappingProxyType({
+    Ftype.raw: make_raw,
+    Ftype.epochs: make_epochs,
+    Ftype.ica: make_ica,
+    Ftype.annots: make_annots,
+})
+
+
+if __name__ == "__main__":
+    main()
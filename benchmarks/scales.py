@@ -0,0 +1,22 @@
+"""Sizes of the synthetic files, shared by the suite and the generators."""
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Final
+
+
+@dataclass(frozen=True)
+class Scale(object):
+    """Size of the generated files."""
+
+    data_mb: int  # raw and epochs data
+    split_size: str  # mne split size; smaller than data makes split sets
+    n_annots: int
+    n_ica_channels: int
+
+
+SCALES: Final = MappingProxyType({
+    # data_mb, split_size, n_annots, n_ica_channels
+    "small": Scale(16, "2GB", 1000, 32),  # noqa: WPS432
+    "medium": Scale(512, "200MB", 100000, 64),  # noqa: WPS432
+    "large": Scale(4096, "2GB", 1000000, 128),  # noqa: WPS432
+})
@@ -0,0 +1,246 @@
+"""
+Benchmark read, summary and save of every file type at several scales.
+
+Run with ``nox -s benchmark_suite -- [--scale small medium] [--ftype raw epochs]``.
+Synthetic files are generated into the data directory on first use and reused
+by later runs, see `generators.py`. Each measurement runs in a fresh process:
+`worker.py` times `parse_ftype`, `qf_read`, `summary`, `to_dict` and `qf_save`
+inside the process, and the CLI is timed end to end as the user runs it. Peak
+RSS of every process comes from `os.wait4`.
+
+Results are printed as a table and stored as JSON named after the commit, so
+runs on different commits can be compared: pass ``--compare OLD.json`` to see
+the ratio of the best times to the old ones.
+
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess  # noqa: S404 (runs the same interpreter and the CLI)
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from types import MappingProxyType
+from typing import Final
+
+from scales import SCALES
+
+from quickfif.config import Ftype
+
+DEFAULT_DATA_DIR: Final = Path(tempfile.gettempdir()) / "quickfif-benchmarks"
+WORKER_FPATH: Final = Path(__file__).with_name("worker.py")
+GENERATORS_FPATH: Final = Path(__file__).with_name("generators.py")
+RESULTS_DIR: Final = Path(__file__).with_name("results")
+FTYPE_NAMES: Final = tuple(str(ftype) for ftype in Ftype)
+DEFAULT_REPEAT: Final = 3
+KB_IN_MB: Final = 1024
+BYTES_IN_MB: Final = 1024 * 1024
+SLOWER_RATIO: Final = 1.1  # mark phases slower than the baseline by more than 10%
+CLI_ARGS: Final = MappingProxyType({
+    "cli_preview": ("--no-cache", "--no-daemon", "{fpath}"),
+    "cli_saveas": ("{fpath}", "saveas", "--overwrite", "{dst}"),
+})
+
+HEADER: Final = "{0:<7} {1:<7} {2:<12} {3:>9} {4:>10} {5:>10} {6:>8}".format(
+    "scale", "ftype", "phase", "size, MB", "best, ms", "median, ms", "RSS, MB"
+)
+ROW_FORMAT: Final = "{0:<7} {1:<7} {2:<12} {3:>9.1f} {4:>10.3f} {5:>10.3f} {6:>8.0f}"
+COMPARE_FORMAT: Final = "  {0:>10.3f} ms before, x{1:.2f}{2}"
+SEC_TO_MS: Final = 1000
+FAILED_FORMAT: Final = "{0} failed:\n{1}"
+
+PhaseRuns = dict[str, list[tuple[float, float]]]  # seconds and peak RSS by phase
+Baseline = dict[tuple[str, str, str], float]
+
+
+@dataclass(frozen=True)
+class Measurement(object):
+    """Timings of a phase over the repeated runs."""
+
+    scale: str
+    ftype: str
+    phase: str
+    size_mb: float
+    sec: float  # best of the runs
+    sec_median: float
+    peak_rss_mb: float
+
+    @property
+    def key(self) -> tuple[str, str, str]:
+        """Identify the measurement across runs."""
+        return self.scale, self.ftype, self.phase
+
+
+@dataclass(frozen=True)
+class ProcessRun(object):
+    """Output, wall time and peak memory of a finished process."""
+
+    stdout: str
+    sec: float
+    peak_rss_mb: float
+
+
+def run_process(cmd: list[str]) -> ProcessRun:
+    """
+    Run command and wait for it with `os.wait4`, which reports its peak RSS.
+
+    Raises
+    ------
+    RuntimeError
+        If the command fails
+
+    """
+    with tempfile.TemporaryFile("w+") as stdout:
+        with tempfile.TemporaryFile("w+") as stderr:
+            start = time.perf_counter()
+            proc = subprocess.Popen(cmd, stdout=stdout, stderr=stderr)
+            _, status, rusage = os.wait4(proc.pid, 0)
+            elapsed_sec = time.perf_counter() - start
+            stderr.seek(0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            if proc.returncode:
+                raise RuntimeError(FAILED_FORMAT.format(" ".join(cmd), stderr.read()))
+        stdout.seek(0)
+        return ProcessRun(stdout.read(), elapsed_sec, rusage.ru_maxrss / KB_IN_MB)
+
+
+def generate(data_dir: Path, scale: str, ftype: Ftype) -> list[Path]:
+    """Get the generated file and its splits, generating them on first use."""
+    cmd = [sys.executable, str(GENERATORS_FPATH), str(data_dir), scale, ftype]
+    return [Path(split) for split in run_process(cmd).stdout.split()]
+
+
+def bench_file(data_dir: Path, scale: str, ftype: Ftype, repeat: int) -> list[Measurement]:
+    """Measure the phases in the worker and the CLI commands on a generated file."""
+    fileset = generate(data_dir, scale, ftype)
+    fpath = fileset[0]
+    size_mb = sum(split.stat().st_size for split in fileset) / BYTES_IN_MB
+    runs: PhaseRuns = {}
+    with tempfile.TemporaryDirectory(dir=data_dir) as out_dir:
+        for _ in range(repeat):
+            _run_worker(ftype, fpath, Path(out_dir), runs)
+            _run_cli(fpath, Path(out_dir), runs)
+    return [
+        _summarize(scale, ftype, phase, size_mb, phase_runs)
+        for phase, phase_runs in runs.items()
+    ]
+
+
+def bench_all(args: argparse.Namespace, baseline: Baseline) -> list[Measurement]:
+    """Measure files of the requested scales and types, printing a row per phase."""
+    print(HEADER)
+    measurements = []
+    for scale in args.scale:
+        for ftype in args.ftype:
+            for measurement in bench_file(args.data_dir, scale, Ftype(ftype), args.repeat):
+                print(format_row(measurement, baseline))
+                measurements.append(measurement)
+    return measurements
+
+
+def get_commit() -> str:
+    """Get the commit of the working tree, marked as dirty if it has changes."""
+    cmd = ["git", "describe", "--always", "--dirty"]
+    try:
+        return run_process(cmd).stdout.strip()
+    except (RuntimeError, OSError):
+        return "unknown"
+
+
+def save_results(measurements: list[Measurement], commit: str, output: Path) -> None:
+    """Store measurements with the environment they were taken in as JSON."""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "commit": commit,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "measurements": [asdict(measurement) for measurement in measurements],
+    }
+    output.write_text(json.dumps(report, indent=2))
+
+
+def load_baseline(fpath: Path) -> Baseline:
+    """Get best times of an earlier run by measurement key."""
+    report = json.loads(fpath.read_text())
+    return {
+        (stored["scale"], stored["ftype"], stored["phase"]): stored["sec"]
+        for stored in report["measurements"]
+    }
+
+
+def format_row(measurement: Measurement, baseline: Baseline) -> str:
+    """Format measurement as a table row, compared to the baseline if it has one."""
+    row = ROW_FORMAT.format(
+        measurement.scale,
+        measurement.ftype,
+        measurement.phase,
+        measurement.size_mb,
+        measurement.sec * SEC_TO_MS,
+        measurement.sec_median * SEC_TO_MS,
+        measurement.peak_rss_mb,
+    )
+    old_sec = baseline.get(measurement.key)
+    if not old_sec:
+        return row
+    ratio = measurement.sec / old_sec
+    mark = " slower" if ratio > SLOWER_RATIO else ""
+    return row + COMPARE_FORMAT.format(old_sec * SEC_TO_MS, ratio, mark)
+
+
+def main() -> None:
+    """Run the benchmarks, print the table and store the results."""
+    args = _parse_args()
+    commit = get_commit()
+    baseline = load_baseline(args.compare) if args.compare else {}
+    print(f"Commit {commit}, data in {args.data_dir}")
+    measurements = bench_all(args, baseline)
+    output = args.output or RESULTS_DIR / f"{commit}.json"
+    save_results(measurements, commit, output)
+    print(f"Results saved to {output}")
+
+
+def _run_worker(ftype: Ftype, fpath: Path, out_dir: Path, runs: PhaseRuns) -> None:
+    cmd = [sys.executable, str(WORKER_FPATH), ftype, str(fpath), str(out_dir)]
+    for phase_result in json.loads(run_process(cmd).stdout):
+        phase_runs = runs.setdefault(phase_result["phase"], [])
+        phase_runs.append((phase_result["sec"], phase_result["peak_rss_mb"]))
+
+
+def _run_cli(fpath: Path, out_dir: Path, runs: PhaseRuns) -> None:
+    dst = out_dir / fpath.name
+    for phase, cli_args in CLI_ARGS.items():
+        cmd = ["qfif", *(arg.format(fpath=fpath, dst=dst) for arg in cli_args)]
+        cli_run = run_process(cmd)
+        runs.setdefault(phase, []).append((cli_run.sec, cli_run.peak_rss_mb))
+
+
+def _summarize(
+    scale: str, ftype: Ftype, phase: str, size_mb: float, runs: list[tuple[float, float]]
+) -> Measurement:
+    secs = [sec for sec, _ in runs]
+    peak_rss_mb = max(rss_mb for _, rss_mb in runs)
+    return Measurement(
+        scale, ftype, phase, size_mb, min(secs), statistics.median(secs), peak_rss_mb
+    )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", nargs="+", choices=list(SCALES), default=["small"])
+    parser.add_argument("--ftype", nargs="+", choices=FTYPE_NAMES, default=list(FTYPE_NAMES))
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    parser.add_argument("--output", type=Path, help="Results JSON [default: results/COMMIT.json]")
+    parser.add_argument("--compare", type=Path, help="Results JSON of an earlier run")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
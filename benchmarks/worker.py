@@ -0,0 +1,86 @@
+"""
+Time quickfif operations on one file in a fresh interpreter and print them as JSON.
+
+Run by `suite.py` as ``python benchmarks/worker.py FTYPE FPATH OUT_DIR``. Each
+file is measured in its own process, so import costs and peak memory of one
+measurement don't leak into another. Peak RSS is reported after each phase;
+it never decreases, so a jump shows the phase that allocated the memory.
+
+"""
+import json
+import resource
+import sys
+import time
+import timeit
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Final, TypeVar
+
+T = TypeVar("T")
+
+PARSE_REPEAT: Final = 10000
+KB_IN_MB: Final = 1024
+
+
+@dataclass(frozen=True)
+class PhaseResult(object):
+    """Timing of a phase and the peak memory of the process after it."""
+
+    phase: str
+    sec: float
+    peak_rss_mb: float
+
+
+@dataclass
+class PhaseTimer(object):
+    """Collect timings of the phases run one after another."""
+
+    phase_results: list[PhaseResult] = field(default_factory=list)
+
+    def measure(self, phase: str, func: Callable[[], T]) -> T:
+        """Run function once and record its time."""
+        start = time.perf_counter()
+        func_result = func()
+        self._record(phase, time.perf_counter() - start)
+        return func_result
+
+    def measure_repeated(self, phase: str, func: Callable[[], object], number: int) -> None:
+        """Record the mean time of a function too fast to time once."""
+        self._record(phase, timeit.timeit(func, number=number) / number)
+
+    def _record(self, phase: str, sec: float) -> None:
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KB on Linux
+        self.phase_results.append(PhaseResult(phase, sec, peak_kb / KB_IN_MB))
+
+
+def import_quickfif() -> None:
+    """Import quickfif and mne; mne loads its submodules lazily, on the first read."""
+    import mne  # noqa: F401, WPS433 (import time is measured)
+
+    import quickfif.config  # noqa: F401, WPS301, WPS433
+
+
+def run_phases(ftype_name: str, fpath: Path, out_dir: Path) -> list[PhaseResult]:
+    """Parse type, read, summarize, convert to namespace and save the file."""
+    timer = PhaseTimer()
+    timer.measure("import", import_quickfif)
+    from quickfif import config, parsers  # noqa: WPS433 (imported above)
+
+    timer.measure_repeated("parse_ftype", lambda: parsers.parse_ftype(fpath), PARSE_REPEAT)
+    qf_obj = timer.measure("qf_read", lambda: config.qf_read(fpath, config.Ftype(ftype_name)))
+    timer.measure("summary", lambda: qf_obj.summary)
+    timer.measure("to_dict", qf_obj.to_dict)
+    dst = out_dir / fpath.name
+    timer.measure("qf_save", lambda: config.qf_save(qf_obj, dst, overwrite=True))
+    return timer.phase_results
+
+
+def main() -> None:
+    """Print phase results of the file as JSON."""
+    ftype_name, fpath, out_dir = sys.argv[1:]
+    phase_results = run_phases(ftype_name, Path(fpath), Path(out_dir))
+    print(json.dumps([asdict(phase_result) for phase_result in phase_results]))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ import nox
 from nox.sessions import Session
 
 nox.options.sessions = ["tests", "lint", "mypy"]
-locations = ("src", "tests", "noxfile.py")
+locations = ("src", "tests", "benchmarks", "noxfile.py")
 
 
 @nox.session(python=["3.11"])
@@ -30,6 +30,20 @@ def mypy(session: Session) -> None:
     session.run("mypy", *args)
 
 
+@nox.session(python="3.11")
+def benchmarks(session: Session) -> None:
+    """Compare annotations summary implementations."""
+    session.run("poetry", "install", external=True)
+    session.run("python", "benchmarks/annots_summary.py", *session.posargs)
+
+
+@nox.session(python="3.11")
+def benchmark_suite(session: Session) -> None:
+    """Time read, summary and save of every file type and store the results."""
+    session.run("poetry", "install", external=True)
+    session.run("python", "benchmarks/suite.py", *session.posargs)
+
+
 @nox.session(python="3.11")
 def coverage(session: Session) -> None:
     """Upload coverage data."""
@@ -0,0 +1,189 @@
+"""
+Persistent cache for rendered file summaries.
+
+File managers call `qfif FILE` every time the cursor passes over a file, so we
+keep rendered summaries on disk. Each entry is a separate file named by the
+hash of the file identity: resolved path, inode, size, modification time,
+sizes and modification times of the later splits, package version, file type
+and summary format. Any change to the files or upgrade of the package gives a
+new key, so entries never need invalidation; stale entries are pushed out by
+size-bounded LRU eviction.
+
+Entries are written to a temporary file and atomically renamed, so parallel
+readers see either a complete entry or no entry at all. Access time is tracked
+via file modification time, which is updated on each hit.
+
+"""
+import hashlib
+import os
+from contextlib import suppress
+from dataclasses import dataclass
+from functools import cache
+from importlib import metadata
+from pathlib import Path
+from typing import Final
+
+CACHE_DIR_NAME: Final = "quickfif"
+SUMMARIES_DIR_NAME: Final = "summaries"
+DEFAULT_MAX_BYTES: Final = 8 * 1024 * 1024  # thousands of summaries
+ENTRY_SUFFIX: Final = ".txt"
+BIDS_FIRST_SPLIT: Final = "_split-01_"
+UNKNOWN_VERSION: Final = "0+unknown"  # running from a source checkout that isn't installed
+
+
+def get_cache_dir() -> Path:
+    """Get package cache directory respecting XDG base directory specification."""
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME", "")
+    # XDG spec: relative paths are invalid and should be ignored
+    cache_home = Path(xdg_cache_home) if os.path.isabs(xdg_cache_home) else None
+    return (cache_home or Path.home() / ".cache") / CACHE_DIR_NAME
+
+
+@cache
+def get_version() -> str:
+    """Get installed package version or `UNKNOWN_VERSION` if the package isn't installed."""
+    try:
+        return metadata.version(CACHE_DIR_NAME)
+    except metadata.PackageNotFoundError:
+        return UNKNOWN_VERSION
+
+
+@dataclass(frozen=True)
+class SummaryCache(object):
+    """
+    Store of rendered summaries, bounded by the total size of entries.
+
+    All the methods swallow filesystem errors: the cache is an optimization and
+    must never break the preview.
+
+    """
+
+    root: Path
+    max_bytes: int = DEFAULT_MAX_BYTES
+
+    def get(self, fpath: Path, ftype: str, fmt: str = "text") -> str | None:
+        """Get cached summary for the current state of the file or None on miss."""
+        with suppress(OSError, UnicodeDecodeError):
+            entry = self._entry_path(fpath, ftype, fmt)
+            summary = entry.read_text(encoding="utf-8")
+            os.utime(entry)  # mark as recently used
+            return summary
+        return None
+
+    def put(self, fpath: Path, ftype: str, summary: str, fmt: str = "text") -> None:
+        """Store summary for the current state of the file and evict old entries."""
+        with suppress(OSError):
+            entry = self._entry_path(fpath, ftype, fmt)
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry.with_name(f".{entry.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(summary, encoding="utf-8")
+            os.replace(tmp_path, entry)
+            self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until they fit into `max_bytes`."""
+        evict_entries(self.root / SUMMARIES_DIR_NAME, ENTRY_SUFFIX, self.max_bytes)
+
+    def clear(self) -> int:
+        """Remove all the entries. Return the number of removed entries."""
+        return clear_entries(self.root / SUMMARIES_DIR_NAME, ENTRY_SUFFIX)
+
+    def _entry_path(self, fpath: Path, ftype: str, fmt: str) -> Path:
+        digest = get_split_set_digest(fpath, ftype, fmt)
+        return self.root / SUMMARIES_DIR_NAME / f"{digest}{ENTRY_SUFFIX}"
+
+
+def get_split_set_digest(fpath: Path, *key_parts: str) -> str:
+    """
+    Hash identity of file together with the continuation splits named after it.
+
+    Summaries and pictures of a split set depend on all its files, and the
+    later splits change while the first one stays, e.g. when the recording
+    is still being written. See `find_continuations`.
+
+    """
+    split_parts: list[str] = []
+    for split_fpath in find_continuations(fpath):
+        st = os.stat(split_fpath)
+        split_parts.extend((split_fpath.name, str(st.st_size), str(st.st_mtime_ns)))
+    return get_file_digest(fpath, *key_parts, *split_parts)
+
+
+def find_continuations(fpath: Path) -> list[Path]:
+    """
+    Get existing files named as the continuation splits of `fpath` the way mne names them.
+
+    Following the references between the splits needs parsing FIFF, which is
+    slower than the cache lookup itself, so the names are guessed. An
+    unrelated file with such a name only makes the entries change more often.
+
+    Examples
+    --------
+    >>> _get_split_name("rec_raw.fif", 2), _get_split_name("sub-01_split-01_meg.fif", 1)
+    ('rec_raw-2.fif', 'sub-01_split-02_meg.fif')
+
+    """
+    continuations = []
+    split_fpath = fpath.with_name(_get_split_name(fpath.name, 1))
+    while split_fpath.is_file():
+        continuations.append(split_fpath)
+        split_fpath = fpath.with_name(_get_split_name(fpath.name, len(continuations) + 1))
+    return continuations
+
+
+def _get_split_name(fname: str, idx: int) -> str:
+    if BIDS_FIRST_SPLIT in fname:
+        return fname.replace(BIDS_FIRST_SPLIT, "_split-{0:02}_".format(idx + 1), 1)
+    stem, ext = os.path.splitext(fname)
+    return f"{stem}-{idx}{ext}"
+
+
+def get_file_digest(fpath: Path, *key_parts: str) -> str:
+    """Hash file identity: resolved path, inode, size, mtime, package version and key parts."""
+    st = os.stat(fpath)
+    key = "\0".join(
+        map(
+            str,
+            (fpath.resolve(), st.st_ino, st.st_size, st.st_mtime_ns, get_version(), *key_parts),
+        )
+    )
+    return hashlib.sha256(key.encode("utf-8", "surrogateescape")).hexdigest()
+
+
+def evict_entries(entries_dir: Path, suffix: str, max_bytes: int) -> None:
+    """Remove least recently modified entries until they fit into `max_bytes`."""
+    entries = sorted(stat_entries(entries_dir, suffix), key=lambda ent: ent[1].st_mtime_ns)
+    total_bytes = sum(st.st_size for _, st in entries)
+    for entry, st in entries:
+        if total_bytes <= max_bytes:
+            break
+        with suppress(FileNotFoundError):  # concurrent eviction got it first
+            entry.unlink()
+        total_bytes -= st.st_size
+
+
+def clear_entries(entries_dir: Path, suffix: str) -> int:
+    """Remove all the entries. Return the number of removed entries."""
+    removed = 0
+    for entry, _ in stat_entries(entries_dir, suffix):
+        with suppress(FileNotFoundError):
+            entry.unlink()
+            removed += 1
+    return removed
+
+
+def stat_entries(entries_dir: Path, suffix: str) -> list[tuple[Path, os.stat_result]]:
+    """Get paths and stats of entries in directory; temporary files are skipped."""
+    stats = []
+    with suppress(FileNotFoundError):
+        for dir_entry in os.scandir(entries_dir):
+            if not dir_entry.name.endswith(suffix):
+                continue
+            with suppress(FileNotFoundError):
+                stats.append((Path(dir_entry.path), dir_entry.stat()))
+    return stats
+
+
+def get_summary_cache() -> SummaryCache:
+    """Get summary cache in the default location."""
+    return SummaryCache(get_cache_dir())
@@ -0,0 +1,401 @@
+"""
+SQLite catalog of recordings for searching an archive by their metadata.
+
+`index_files` records the summary of each file: file type, measurement info,
+channel counts by type, annotation descriptions and the files of its split
+set. Re-indexing reads only the files whose split set changed in size or
+modification time since the last run and removes the records of the files
+which are gone. Files are read in worker processes, in the same way as the
+previews; their records are written in transactions of `BATCH_SIZE` files,
+so an interrupted run keeps what it has read.
+
+Continuation files of a split set are recorded as splits of the first file
+only. Files that failed to read are recorded with the error, so they are not
+read again until they change.
+
+`query` selects rows of the `recordings` view with an SQL condition, e.g.
+``sfreq = 1000 AND n_eeg > 300``. The view has a column with the number of
+channels of each type, ``n_<type>``, besides the columns of `files`.
+
+"""
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, Iterable, Iterator
+
+from quickfif.cache import get_cache_dir
+from quickfif.config import Ftype, qf_preview
+from quickfif.fiff.channels import CH_TYPES_ORDER
+from quickfif.parsers import parse_ftype
+from quickfif.qf_types.raw_type import QfRawHeader
+from quickfif.summary import SummaryFormat, render_summary
+
+if TYPE_CHECKING:
+    from quickfif.describe import GroupedStats, Stats  # pragma: no cover
+
+CATALOG_NAME: Final = "catalog.sqlite"
+SCHEMA_VERSION: Final = 1  # bump on changes of the tables, the view or the summaries
+BATCH_SIZE: Final = 500
+DEFAULT_JOBS: Final = os.cpu_count() or 1
+READ_CHUNKSIZE: Final = 16  # files sent to a worker at once
+# Summary fields stored in the columns of the same name; other fields stay in `summary`
+FIELD_COLUMNS: Final = (
+    "sfreq",
+    "duration_sec",
+    "n_channels",
+    "highpass",
+    "lowpass",
+    "meas_date",
+    "experimenter",
+    "n_epochs",
+    "n_annotations",
+    "n_components",
+)
+TABLES: Final = ("files", "splits", "channels", "annotations")
+SCHEMA: Final = """
+CREATE TABLE files (
+    fpath TEXT PRIMARY KEY,
+    ftype TEXT NOT NULL,
+    error TEXT,
+    sfreq REAL,
+    duration_sec REAL,
+    n_channels INTEGER,
+    highpass REAL,
+    lowpass REAL,
+    meas_date TEXT,
+    experimenter TEXT,
+    n_epochs INTEGER,
+    n_annotations INTEGER,
+    n_components INTEGER,
+    summary TEXT
+);
+CREATE TABLE splits (
+    fpath TEXT NOT NULL REFERENCES files ON DELETE CASCADE,
+    split_idx INTEGER NOT NULL,
+    split_fpath TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    PRIMARY KEY (fpath, split_idx)
+);
+CREATE TABLE channels (
+    fpath TEXT NOT NULL REFERENCES files ON DELETE CASCADE,
+    ch_type TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (fpath, ch_type)
+);
+CREATE TABLE annotations (
+    fpath TEXT NOT NULL REFERENCES files ON DELETE CASCADE,
+    description TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    total_sec REAL NOT NULL,
+    PRIMARY KEY (fpath, description)
+);
+"""
+VIEW_SCHEMA: Final = """
+CREATE VIEW recordings AS
+SELECT
+    files.fpath, ftype, error, {field_columns},
+    (SELECT COUNT(*) FROM splits WHERE splits.fpath = files.fpath) AS n_splits,
+    (SELECT SUM(size) FROM splits WHERE splits.fpath = files.fpath) AS size,
+    {ch_columns}
+FROM files LEFT JOIN channels ON channels.fpath = files.fpath
+GROUP BY files.fpath
+"""
+CH_COLUMN: Final = "COALESCE(SUM(count) FILTER (WHERE ch_type = '{0}'), 0) AS n_{0}"
+INSERT_FILE: Final = "INSERT INTO files VALUES ({0})".format(  # noqa: S608 (placeholders)
+    ", ".join("?" * (len(FIELD_COLUMNS) + 4))  # fpath, ftype, error and summary
+)
+INSERT_SPLIT: Final = "INSERT INTO splits VALUES (?, ?, ?, ?, ?)"
+INSERT_CHANNELS: Final = "INSERT INTO channels VALUES (?, ?, ?)"
+INSERT_ANNOTATIONS: Final = "INSERT INTO annotations VALUES (?, ?, ?, ?)"
+DELETE_FILE: Final = "DELETE FROM files WHERE fpath = ?"
+# Continuation splits of a set read as files of their own before the first file
+DELETE_CONTINUATIONS: Final = """
+DELETE FROM files WHERE fpath IN (SELECT split_fpath FROM splits WHERE split_idx > 0)
+"""
+SELECT_SPLITS: Final = (
+    "SELECT fpath, split_fpath, size, mtime_ns FROM splits ORDER BY fpath, split_idx"
+)
+QUERY: Final = "SELECT * FROM recordings WHERE {0} ORDER BY fpath"
+
+
+class CatalogError(Exception):
+    """Catalog can't be opened, written or queried."""
+
+
+@dataclass(frozen=True)
+class SplitStat(object):
+    """Size and modification time of a file of the split set."""
+
+    fpath: str
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def of(cls, fpath: Path) -> "SplitStat":
+        """Stat the file now."""
+        st = fpath.stat()
+        return cls(str(fpath), st.st_size, st.st_mtime_ns)
+
+
+@dataclass(frozen=True)
+class FileRecord(object):
+    """Summary of a file with its split set, or the error reading it."""
+
+    fpath: Path
+    ftype: Ftype
+    splits: tuple[SplitStat, ...]
+    summary: str = ""  # JSON of `summary_fields`
+    error: str = ""
+
+
+@dataclass(frozen=True)
+class IndexStats(object):
+    """Outcome of indexing."""
+
+    n_read: int
+    n_failed: int
+    n_unchanged: int
+    n_removed: int
+    elapsed_sec: float
+
+    def __str__(self) -> str:
+        """Report the numbers of files."""
+        return "Read {0} files ({1} failed), {2} unchanged, {3} removed in {4:.1f} sec".format(
+            self.n_read, self.n_failed, self.n_unchanged, self.n_removed, self.elapsed_sec
+        )
+
+
+def get_catalog_path() -> Path:
+    """Get catalog path in the package cache directory."""
+    return get_cache_dir() / CATALOG_NAME
+
+
+@contextmanager
+def open_catalog(catalog_fpath: Path) -> Iterator[sqlite3.Connection]:
+    """
+    Open catalog for indexing, creating it or recreating it for a new schema.
+
+    Raises
+    ------
+    CatalogError
+        If SQLite fails, in the block as well
+
+    """
+    with _reraise_sqlite_errors():
+        catalog_fpath.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(catalog_fpath)) as conn:
+            _prepare(conn)
+            yield conn
+
+
+def index_files(
+    conn: sqlite3.Connection, root: Path, fpaths: list[Path], jobs: int
+) -> IndexStats:
+    """
+    Update the records of the files under `root` to the supported files found there.
+
+    `fpaths` must be absolute paths under `root`, as found by scanning it.
+
+    """
+    start = time.perf_counter()
+    to_read, gone, n_unchanged = _plan_update(conn, root, fpaths)
+    with conn:
+        conn.executemany(DELETE_FILE, [(fpath,) for fpath in gone])
+    n_failed = write_records(conn, read_records(to_read, jobs))
+    with conn:
+        conn.execute(DELETE_CONTINUATIONS)
+    elapsed_sec = time.perf_counter() - start
+    return IndexStats(len(to_read), n_failed, n_unchanged, len(gone), elapsed_sec)
+
+
+def read_records(fpaths: list[Path], jobs: int) -> Iterator[FileRecord]:
+    """Read records of supported files in `jobs` processes, in the order of `fpaths`."""
+    ftypes = [parse_ftype(fpath) for fpath in fpaths]
+    if jobs == 1:
+        yield from map(read_record, fpaths, ftypes)
+        return
+    from concurrent.futures import ProcessPoolExecutor  # noqa: WPS433 (imports multiprocessing)
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(read_record, fpaths, ftypes, chunksize=READ_CHUNKSIZE)
+
+
+def read_record(fpath: Path, ftype: Ftype) -> FileRecord:
+    """Read summary and split set of a file; errors are recorded, not raised."""
+    try:
+        return _read_record(fpath, ftype)
+    except Exception as exc:
+        splits = (SplitStat.of(fpath),) if fpath.exists() else ()
+        return FileRecord(fpath, ftype, splits, error=str(exc) or type(exc).__name__)
+
+
+def write_records(conn: sqlite3.Connection, records: Iterable[FileRecord]) -> int:
+    """Replace records of the files in transactions of `BATCH_SIZE` files; count failed ones."""
+    n_failed = 0
+    records = iter(records)
+    batch = list(islice(records, BATCH_SIZE))
+    while batch:
+        with conn:
+            n_failed += sum(_write_record(conn, record) for record in batch)
+        batch = list(islice(records, BATCH_SIZE))
+    return n_failed
+
+
+def query(catalog_fpath: Path, condition: str) -> Iterator[dict[str, object]]:
+    """
+    Get rows of `recordings` view matching SQL condition, sorted by path.
+
+    The catalog is opened read-only, so the condition can't change it.
+
+    Raises
+    ------
+    CatalogError
+        If there's no catalog, it can't be read or the condition is not valid SQL
+
+    """
+    if not catalog_fpath.exists():
+        raise CatalogError(f"No catalog at {catalog_fpath}; create it with 'qfif index DIR'")
+    uri = "{0}?mode=ro".format(catalog_fpath.resolve().as_uri())
+    with _reraise_sqlite_errors():
+        with closing(sqlite3.connect(uri, uri=True)) as conn:
+            conn.row_factory = sqlite3.Row
+            yield from (dict(row) for row in conn.execute(QUERY.format(condition)))
+
+
+@contextmanager
+def _reraise_sqlite_errors() -> Iterator[None]:
+    try:
+        yield
+    except sqlite3.Error as exc:
+        raise CatalogError(str(exc))
+
+
+def _prepare(conn: sqlite3.Connection) -> None:
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")  # queries don't wait for indexing to finish
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        _create_schema(conn)
+
+
+def _read_record(fpath: Path, ftype: Ftype) -> FileRecord:
+    qf_obj = qf_preview(fpath, ftype)
+    if isinstance(qf_obj, QfRawHeader):
+        split_fpaths = qf_obj.header.fnames
+    elif ftype == Ftype.epochs and not fpath.name.endswith(".gz"):
+        split_fpaths = _read_split_fpaths(fpath)
+    else:
+        split_fpaths = [fpath]
+    splits = tuple(SplitStat.of(split_fpath) for split_fpath in split_fpaths)
+    return FileRecord(fpath, ftype, splits, render_summary(qf_obj, SummaryFormat.json))
+
+
+def _read_split_fpaths(fpath: Path) -> list[Path]:
+    from quickfif.fiff.move import read_chain  # noqa: WPS433 (imports numpy)
+
+    return [split.fpath for split in read_chain(fpath)]
+
+
+def _write_record(conn: sqlite3.Connection, record: FileRecord) -> bool:
+    """Replace record of the file; return whether reading the file failed."""
+    fpath = str(record.fpath)
+    fields = json.loads(record.summary) if record.summary else {}
+    columns = [fields.get(column) for column in FIELD_COLUMNS]
+    conn.execute(DELETE_FILE, (fpath,))
+    conn.execute(
+        INSERT_FILE, (fpath, record.ftype, record.error or None, *columns, record.summary or None)
+    )
+    conn.executemany(
+        INSERT_SPLIT,
+        [(fpath, idx, *_astuple(split)) for idx, split in enumerate(record.splits)],
+    )
+    # annotations of raw files or of annotation files
+    annot_stats = fields.get("annotation_stats") or fields.get("duration_stats")
+    _write_composition(conn, fpath, fields.get("channel_counts") or {}, annot_stats)
+    return bool(record.error)
+
+
+def _write_composition(
+    conn: sqlite3.Connection,
+    fpath: str,
+    channel_counts: dict[str, int],
+    annot_stats: "GroupedStats | None",
+) -> None:
+    """Write channel counts by type and annotations by description of the file."""
+    conn.executemany(INSERT_CHANNELS, [
+        (fpath, ch_type, count) for ch_type, count in channel_counts.items()
+    ])
+    by_label = annot_stats["by_label"] if annot_stats else {}
+    conn.executemany(INSERT_ANNOTATIONS, [
+        (fpath, description, stats["count"], _get_total(stats))
+        for description, stats in by_label.items()
+    ])
+
+
+def _get_total(stats: "Stats") -> float:
+    """Get the sum of samples from their count and mean; labels have samples."""
+    return (stats["count"] or 0) * (stats["mean"] or 0)
+
+
+def _astuple(split: SplitStat) -> tuple[str, int, int]:
+    return split.fpath, split.size, split.mtime_ns
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    """Drop the tables of the old schema and create the new ones; the records are read again."""
+    field_columns = ", ".join(FIELD_COLUMNS)
+    ch_columns = ",\n    ".join(CH_COLUMN.format(ch_type) for ch_type in CH_TYPES_ORDER)
+    drop_tables = "".join(f"DROP TABLE IF EXISTS {table};\n" for table in reversed(TABLES))
+    with conn:
+        conn.executescript("".join((
+            "DROP VIEW IF EXISTS recordings;\n",
+            drop_tables,
+            SCHEMA,
+            VIEW_SCHEMA.format(field_columns=field_columns, ch_columns=ch_columns),
+            f"; PRAGMA user_version = {SCHEMA_VERSION};",
+        )))
+
+
+def _plan_update(
+    conn: sqlite3.Connection, root: Path, fpaths: list[Path]
+) -> tuple[list[Path], set[str], int]:
+    """Get files to read, records of the files gone and the number of unchanged files."""
+    stored = _load_split_sets(conn, root)
+    found = {str(fpath) for fpath in fpaths}
+    fresh = {fpath for fpath, splits in stored.items() if _is_fresh(splits)}
+    # continuations come with their first file, even if the set changed
+    skipped = fresh.union(_get_continuations(stored, found))
+    to_read = [fpath for fpath in fpaths if str(fpath) not in skipped]
+    return to_read, stored.keys() - found, len(fresh & found)
+
+
+def _load_split_sets(conn: sqlite3.Connection, root: Path) -> dict[str, list[SplitStat]]:
+    """Get stored split sets of the files under `root` by the path of the first file."""
+    split_sets: dict[str, list[SplitStat]] = {}
+    for fpath, split_fpath, size, mtime_ns in conn.execute(SELECT_SPLITS):
+        if Path(fpath).is_relative_to(root):
+            split_sets.setdefault(fpath, []).append(SplitStat(split_fpath, size, mtime_ns))
+    return split_sets
+
+
+def _is_fresh(splits: list[SplitStat]) -> bool:
+    """Check none of the files of the split set changed since it was indexed."""
+    try:
+        return all(SplitStat.of(Path(split.fpath)) == split for split in splits)
+    except OSError:
+        return False
+
+
+def _get_continuations(split_sets: dict[str, list[SplitStat]], fpaths: set[str]) -> set[str]:
+    """Get continuation splits of the sets starting with `fpaths`."""
+    return {
+        split.fpath
+        for fpath, splits in split_sets.items()
+        if fpath in fpaths
+        for split in splits[1:]
+    }
@@ -0,0 +1,70 @@
+"""Previews of many files in parallel; errors are reported per file, not raised."""
+from concurrent.futures import BrokenExecutor, Future, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Final, Iterator
+
+import click
+
+from quickfif.cli.docs import FORMAT_HELP
+from quickfif.cli.errors import BrokenFileClickError, ExitCode
+from quickfif.cli.preview import PreviewOptions, get_summary
+from quickfif.summary import SummaryFormat
+
+# Single file gets a JSON record too; with many files the records make NDJSON
+format_option: Final = click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(list(SummaryFormat)),
+    default=SummaryFormat.text,
+    help=FORMAT_HELP,
+)
+
+
+@dataclass(frozen=True)
+class PreviewResult(object):
+    """Summary of a file or error message with exit code when preview failed."""
+
+    fpath: Path
+    summary: str = ""
+    error: str = ""
+    exit_code: ExitCode = ExitCode.ok
+
+
+def preview_file(fpath: Path, options: PreviewOptions) -> PreviewResult:
+    """Get summary of a single file in a batch; errors are returned, not raised."""
+    if not fpath.is_file():
+        error = f"Path '{fpath}' does not exist or is not a file."
+        return PreviewResult(fpath, error=error, exit_code=ExitCode.bad_click_path)
+    try:
+        return PreviewResult(fpath, summary=get_summary(fpath, options))
+    except click.ClickException as exc:
+        return PreviewResult(fpath, error=exc.format_message(), exit_code=ExitCode(exc.exit_code))
+
+
+def preview_many(
+    fpaths: list[Path], options: PreviewOptions, jobs: int, in_order: bool = True
+) -> Iterator[PreviewResult]:
+    """
+    Preview files in `jobs` processes; yield results in input or completion order.
+
+    With a single job, files are previewed in this process one by one.
+
+    """
+    if jobs == 1:
+        yield from (preview_file(fpath, options) for fpath in fpaths)
+        return
+    from concurrent.futures import ProcessPoolExecutor  # noqa: WPS433 (imports multiprocessing)
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(preview_file, fpath, options): fpath for fpath in fpaths}
+        ordered = futures if in_order else as_completed(futures)
+        yield from (_get_result(future, futures[future]) for future in ordered)
+
+
+def _get_result(future: "Future[PreviewResult]", fpath: Path) -> PreviewResult:
+    try:
+        return future.result()
+    except BrokenExecutor as exc:  # worker crashed, e.g. killed by OOM killer
+        error = BrokenFileClickError(fpath, exc).format_message()
+        return PreviewResult(fpath, error=error, exit_code=ExitCode.broken_file)
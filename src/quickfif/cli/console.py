@@ -0,0 +1,36 @@
+"""Namespace of `inspect` console, read in the background while the console starts."""
+from functools import partial
+from pathlib import Path
+
+from quickfif.cli.preview import read_or_raise
+from quickfif.config import Ftype, qf_fields, qf_read
+from quickfif.lazy import BackgroundLoader, lazy_field
+from quickfif.qf_types import epochs_type, raw_type
+from quickfif.qf_types.base import QfType
+
+
+def read_in_background(fpath: Path, ftype: Ftype, preload: bool = False) -> dict[str, object]:
+    """
+    Start reading the file in a background thread and get the console namespace.
+
+    The namespace has the same keys as `QfType.to_dict`; the path is known
+    right away and the other values are proxies which wait for the reading to
+    finish on first use. With `preload`, raw data are mapped from the preload
+    cache, see `quickfif.preload`, and epochs data are loaded into memory.
+
+    """
+    read_func = read_preloaded if preload else qf_read
+    loader = BackgroundLoader(partial(read_or_raise, read_func, fpath, ftype)).start()
+    ns: dict[str, object] = {"fpath": fpath}
+    for name in qf_fields(ftype):
+        ns.setdefault(name, lazy_field(loader, name))
+    return ns
+
+
+def read_preloaded(fpath: Path, ftype: Ftype) -> QfType:
+    """Read raw with its data mapped from the preload cache or epochs with their data loaded."""
+    if ftype == Ftype.epochs:
+        return epochs_type.read(fpath, preload=True)
+    from quickfif.preload import get_preload_cache  # noqa: WPS433 (imports numpy)
+
+    return raw_type.QfRaw(fpath, get_preload_cache().read_raw(fpath))
@@ -4,6 +4,24 @@ from typing import Final
 from quickfif.config import Ftype
 
 FTYPE_HELP: Final = "Manually specify file type instead of guessing it from extension"
+NO_CACHE_HELP: Final = "Don't use cached preview and don't store a new one"
+NO_DAEMON_HELP: Final = "Read the file in this process even if the preview daemon is running"
+RECURSIVE_HELP: Final = "Search subdirectories too; '**' in patterns matches them"
+JOBS_HELP: Final = "Number of processes previewing the files in parallel"
+ORDER_HELP: Final = "Print previews in the order of arguments or as soon as they're ready"
+TMIN_HELP: Final = "Start of the saved raw segment, sec from the first sample"
+TMAX_HELP: Final = "End of the saved raw segment, sec from the first sample"
+PICKS_HELP: Final = "Comma-separated channel names or types to save from raw, e.g. 'eeg,stim'"
+BUFFER_SEC_HELP: Final = "Seconds of raw data read and written at once; bounds memory use"
+FORMAT_HELP: Final = "Print summary as text or as JSON records, one line per file"
+SIGNAL_HELP: Final = "Append sparklines of raw data read from a few evenly spaced buffers"
+BUDGET_HELP: Final = "Stop a single file preview after this many ms, marking the rest omitted"
+PRELOAD_HELP: Final = (
+    "Map raw data from a cache decoded once and shared between sessions; load epochs data"
+)
+PROFILE_HELP: Final = "Print time and memory taken by each phase of the command to stderr"
+PROFILE_JSON_HELP: Final = "Write time and memory taken by each phase as JSON to this file"
+PROFILE_PSTATS_HELP: Final = "Run cProfile along and save its statistics to this file"
 UNSUPPORTED_FTYPE_ERROR_MSG: Final = (
     "Can`t determine file type by extension."
     + "Try specifying the type manually via --ftype option."
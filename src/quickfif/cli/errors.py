@@ -1,6 +1,7 @@
 """Exceptions for communication with click API."""
 from enum import IntEnum, unique
 from pathlib import Path
+from typing import Iterable
 
 import click
 
@@ -18,6 +19,8 @@ class ExitCode(IntEnum):
     unsupported_file = 4
     save_failed = 5
     embed_failed = 6
+    daemon_failed = 7
+    mixed_failures = 8  # files in a batch failed for different reasons
 
 
 class UnsupportedFtypeClickError(click.FileError):
@@ -51,3 +54,32 @@ class ConsoleEmbedClickError(click.ClickException):
     def __init__(self, exc: Exception):
         super().__init__(message=str(exc))
         self.exit_code = ExitCode.embed_failed
+
+
+class DaemonClickError(click.ClickException):
+    """Error when preview daemon failed to start."""
+
+    exit_code = ExitCode.daemon_failed
+
+    def __init__(self, exc: Exception):
+        super().__init__(message=str(exc))
+
+
+def aggregate_exit_code(exit_codes: Iterable[ExitCode]) -> ExitCode:
+    """
+    Get exit code of a batch: the one shared by all the failed files, if it's the same.
+
+    Examples
+    --------
+    >>> aggregate_exit_code([ExitCode.ok, ExitCode.broken_file, ExitCode.broken_file])
+    <ExitCode.broken_file: 3>
+    >>> aggregate_exit_code([ExitCode.broken_file, ExitCode.unsupported_file])
+    <ExitCode.mixed_failures: 8>
+    >>> aggregate_exit_code([])
+    <ExitCode.ok: 0>
+
+    """
+    failures = set(exit_codes) - {ExitCode.ok}
+    if len(failures) > 1:
+        return ExitCode.mixed_failures
+    return failures.pop() if failures else ExitCode.ok
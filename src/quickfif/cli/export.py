@@ -0,0 +1,55 @@
+"""Options of `saveas` selecting the part of raw to save."""
+from pathlib import Path
+from typing import Callable, TypeVar
+
+import click
+
+from quickfif.cli.docs import BUFFER_SEC_HELP, PICKS_HELP, TMAX_HELP, TMIN_HELP
+from quickfif.config import UnsupportedOperationError
+from quickfif.fastcopy import SaveMethod
+from quickfif.qf_types import raw_type
+from quickfif.qf_types.base import QfType
+
+T = TypeVar("T")
+
+
+def raw_export_options(wrapped: Callable[..., T]) -> Callable[..., T]:  # type: ignore[misc]
+    """Add options selecting the part of raw to save."""  # noqa: D202
+    options = (
+        click.option("--tmin", type=float, help=TMIN_HELP),
+        click.option("--tmax", type=float, help=TMAX_HELP),
+        click.option("--picks", help=PICKS_HELP),
+        click.option(
+            "--buffer-sec", type=click.FloatRange(min=0, min_open=True), help=BUFFER_SEC_HELP
+        ),
+    )
+    for option in reversed(options):
+        wrapped = option(wrapped)
+    return wrapped
+
+
+def get_raw_export(
+    tmin: float | None, tmax: float | None, picks: str | None, buffer_sec: float | None
+) -> raw_type.RawExport | None:
+    """Get raw export settings from the options; None if none of them is set."""
+    if (tmin, tmax, picks, buffer_sec) == (None, None, None, None):
+        return None
+    ch_picks = tuple(picks.split(",")) if picks else None
+    return raw_type.RawExport(tmin or 0, tmax, ch_picks, buffer_sec)
+
+
+def save_raw_export(
+    qf_obj: QfType, dst: Path, overwrite: bool, export: raw_type.RawExport
+) -> SaveMethod:
+    """
+    Save the part of raw.
+
+    Raises
+    ------
+    UnsupportedOperationError
+        If the object is not raw
+
+    """
+    if not isinstance(qf_obj, raw_type.QfRaw):
+        raise UnsupportedOperationError("--tmin, --tmax, --picks and --buffer-sec are for raw")
+    return raw_type.save(qf_obj, dst, overwrite, export=export)
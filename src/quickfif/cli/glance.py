@@ -0,0 +1,40 @@
+"""Signal section of raw file previews: sparklines of a few data buffers."""
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+import click
+
+from quickfif.cli.docs import SIGNAL_HELP
+from quickfif.cli.errors import BrokenFileClickError
+from quickfif.profiling import phase
+
+if TYPE_CHECKING:  # pragma: no cover
+    from quickfif.sparklines import SignalFields
+
+signal_option: Final = click.option("--signal", is_flag=True, default=False, help=SIGNAL_HELP)
+
+
+def read_signal(fpath: Path) -> "SignalFields":
+    """
+    Summarize signal of raw file from a few evenly spaced data buffers.
+
+    Raises
+    ------
+    BrokenFileClickError
+        If the data buffers can't be read
+
+    """
+    from quickfif.sparklines import read_signal as read_sparklines  # noqa: WPS433 (numpy)
+
+    try:
+        with phase("signal"):
+            return read_sparklines(fpath)
+    except (ValueError, OSError) as exc:
+        raise BrokenFileClickError(fpath, exc)
+
+
+def render_signal(signal: "SignalFields") -> str:
+    """Render signal section of the text preview."""
+    from quickfif.sparklines import render_signal as render_sparklines  # noqa: WPS433 (numpy)
+
+    return render_sparklines(signal)
@@ -0,0 +1,66 @@
+"""Click group taking a file argument before subcommands, with file-independent tools."""
+from typing import Any
+
+import click
+
+
+class FileGroup(click.Group):
+    """
+    Group for `qfif FPATH... [COMMAND]` usage which also runs `qfif TOOL [ARGS]`.
+
+    Subcommands of the group work on the files passed before them; the group's
+    variadic argument takes everything up to the first subcommand name. Tools,
+    like `qfif cache clear`, don't need a file and are registered in the
+    `tools` group. When the first argument names a tool, the rest of the command
+    line is handed over to the tools group. Use `./NAME` to pass a file named as
+    a subcommand or a tool.
+
+    """
+
+    # options may follow the files since subcommand arguments are split off in `parse_args`
+    allow_interspersed_args = True
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # type: ignore[misc]
+        super().__init__(*args, **kwargs)
+        self.tools = click.Group(name=self.name)
+
+    def make_context(  # type: ignore[misc]
+        self,
+        info_name: str | None,
+        args: list[str],
+        parent: click.Context | None = None,
+        **extra: Any,
+    ) -> click.Context:
+        """Create context for tools group when the first argument names a tool."""
+        if args and args[0] in self.tools.commands:
+            return self.tools.make_context(info_name, args, parent=parent, **extra)
+        return super().make_context(info_name, args, parent=parent, **extra)
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        """Parse group arguments up to the first subcommand name; keep the rest for it."""
+        is_cmd = [arg in self.commands for arg in args]
+        cmd_idx = is_cmd.index(True) if any(is_cmd) else len(args)
+        super().parse_args(ctx, args[:cmd_idx])
+        cmd_args = args[cmd_idx:]
+        if cmd_args:
+            # the same as `click.Group.parse_args` does with the unparsed rest
+            ctx._protected_args = cmd_args[:1]  # noqa: WPS437
+            ctx.args = cmd_args[1:]
+        return ctx.args
+
+    def invoke(self, ctx: click.Context) -> Any:  # type: ignore[misc]
+        """Invoke tools group if the context was created for it."""
+        if ctx.command is self.tools:
+            return self.tools.invoke(ctx)
+        return super().invoke(ctx)
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        """List tools after the file subcommands."""
+        super().format_commands(ctx, formatter)
+        tools = [
+            (name, cmd.get_short_help_str(formatter.width))
+            for name, cmd in sorted(self.tools.commands.items())
+        ]
+        if tools:
+            with formatter.section("Tools (used without FPATH)"):
+                formatter.write_dl(tools)
@@ -1,25 +1,70 @@
 """CLI entry point."""
+import json
 from functools import wraps
 from pathlib import Path
-from typing import Callable, Concatenate, ParamSpec, Protocol, TypeVar
+from typing import Callable, Concatenate, Final, Iterable, NoReturn, ParamSpec, Protocol, TypeVar
 
 import click
+from click.decorators import pass_meta_key
 
-from quickfif.cli.docs import FTYPE_HELP, get_ftype_choices
+from quickfif.cache import get_summary_cache
+from quickfif.cli.batch import PreviewResult, format_option, preview_many
+from quickfif.cli.console import read_in_background
+from quickfif.cli.docs import (
+    FTYPE_HELP,
+    JOBS_HELP,
+    NO_CACHE_HELP,
+    NO_DAEMON_HELP,
+    ORDER_HELP,
+    PRELOAD_HELP,
+    RECURSIVE_HELP,
+    get_ftype_choices,
+)
 from quickfif.cli.errors import (
     BrokenFileClickError,
     ConsoleEmbedClickError,
+    DaemonClickError,
+    ExitCode,
     SaveFailedClickError,
-    UnsupportedFtypeClickError,
+    aggregate_exit_code,
+)
+from quickfif.cli.export import get_raw_export, raw_export_options, save_raw_export
+from quickfif.cli.glance import signal_option
+from quickfif.cli.group import FileGroup
+from quickfif.cli.paths import expand_paths, is_single_file
+from quickfif.cli.preview import PreviewOptions, iter_summary, read_or_raise, resolve_ftype
+from quickfif.cli.profile import profile_options, start_profiling
+from quickfif.cli.stream import budget_option, echo_sections
+from quickfif.config import BIDS_SPLIT_EXT, Ftype, qf_read, qf_save
+from quickfif.daemon.protocol import (
+    DEFAULT_IDLE_TIMEOUT_SEC,
+    DEFAULT_REQUEST_TIMEOUT_SEC,
+    DEFAULT_WORKERS,
+    get_socket_path,
 )
-from quickfif.config import Ftype, qf_read, qf_save
 from quickfif.ipython import embed_ipython
-from quickfif.parsers import parse_ftype
+from quickfif.profiling import phase
 from quickfif.qf_types.base import QfType
+from quickfif.summary import SummaryFormat, format_record
 
 P = ParamSpec("P")
 T = TypeVar("T")
 
+EXISTING_FILE: Final = click.Path(exists=True, dir_okay=False)
+BATCH_HEADER: Final = "==> {fpath} <=="
+FPATH_KEY: Final = "quickfif.fpath"
+FTYPE_KEY: Final = "quickfif.ftype"
+# Subcommands working on the file itself or reading it on their own; they get path and `--ftype`
+FPATH_COMMANDS: Final = frozenset(
+    ("move", "inspect", "recompress", "verify", "pyramid", "stats")
+)
+catalog_option: Final = click.option(
+    "--catalog",
+    "catalog_fpath",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Catalog file  [default: catalog.sqlite in the cache directory]",
+)
+
 
 def pass_obj(wrapped: Callable[Concatenate[QfType, P], T]) -> Callable[P, T]:  # noqa: WPS221
     """Decorator to pass `click.Context.obj` instead of `click.Context`."""  # noqa: D401, D202
@@ -38,35 +83,148 @@ class ClickContext(Protocol):
     invoked_subcommand: str | None
     obj: QfType  # noqa: WPS110 (wrong variable name)
 
+    def exit(self, code: int = 0) -> NoReturn:  # noqa: WPS125 (click API)
+        """Exit the application with a given exit code."""
+
+    def call_on_close(self, callback: Callable[[], T]) -> Callable[[], T]:
+        """Register function to call when the command finishes."""
 
-@click.group(invoke_without_command=True)
-@click.argument("fpath", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+
+@click.group(cls=FileGroup, invoke_without_command=True)
+@click.argument("fpaths", nargs=-1, required=True, metavar="FPATH...")
 @click.option("-t", "--ftype", type=click.Choice(get_ftype_choices()), help=FTYPE_HELP)
+@click.option("--no-cache", is_flag=True, default=False, help=NO_CACHE_HELP)
+@click.option("--no-daemon", is_flag=True, default=False, help=NO_DAEMON_HELP)
+@click.option("-r", "--recursive", is_flag=True, default=False, help=RECURSIVE_HELP)
+@click.option("-j", "--jobs", type=click.IntRange(min=1), default=1, help=JOBS_HELP)
+@click.option(
+    "--order", type=click.Choice(["input", "completion"]), default="input", help=ORDER_HELP
+)
+@format_option
+@signal_option
+@budget_option
+@profile_options
 @click.pass_context
-def main(ctx: ClickContext, fpath: Path, ftype: str | None) -> None:
-    """When invoked without subcommands: show file preview."""
-    try:
-        ftype = Ftype(ftype) if ftype else parse_ftype(fpath)
-    except ValueError:
-        raise UnsupportedFtypeClickError(fpath)
+def main(  # noqa: WPS211, WPS216 (click options)
+    ctx: ClickContext,
+    fpaths: tuple[str, ...],
+    ftype: str | None,
+    no_cache: bool,
+    no_daemon: bool,
+    recursive: bool,
+    jobs: int,
+    order: str,
+    fmt: str,
+    signal: bool,
+    budget_ms: int | None,
+    profile: bool,
+    profile_json: Path | None,
+    profile_pstats: Path | None,
+) -> None:
+    """When invoked without subcommands: show preview of the files.
 
-    try:
-        qf_obj = qf_read(fpath, ftype)
-    except Exception as exc:
-        raise BrokenFileClickError(fpath, exc)
+    Directories and glob patterns are expanded to the supported files in them.
+    Subcommands work on a single file. Text preview of a single file is printed
+    section by section as they're ready, so it can be cut by --budget-ms.
+    With --signal, previews of raw files end with sparklines of the data.
+
+    """
+    start_profiling(ctx, profile, profile_json, profile_pstats)
+    options = PreviewOptions(
+        Ftype(ftype) if ftype else None, not no_cache, not no_daemon, SummaryFormat(fmt), signal
+    )
+    _check_preview_options(ctx, fpaths, options, budget_ms)
+    if is_single_file(fpaths):
+        EXISTING_FILE.convert(fpaths[0], None, None)  # raises click.BadParameter
+        fpath = Path(fpaths[0])
+        if ctx.invoked_subcommand in FPATH_COMMANDS:
+            meta = click.get_current_context().meta
+            meta[FPATH_KEY] = fpath
+            meta[FTYPE_KEY] = options.ftype
+        elif ctx.invoked_subcommand:  # pass the object to subcommands via context
+            ctx.obj = _read_for_subcommand(fpath, options.ftype)
+        else:
+            echo_sections(iter_summary(fpath, options), budget_ms)
+        return
 
     if ctx.invoked_subcommand:
-        ctx.obj = qf_obj  # pass the object to subcommands via context
+        raise click.UsageError(f"'{ctx.invoked_subcommand}' works on a single file")
+    previews = preview_many(expand_paths(fpaths, recursive), options, jobs, order == "input")
+    with phase("preview_many"):
+        exit_code = _echo_batch(previews, options.fmt)
+    ctx.exit(exit_code)
+
+
+def _check_preview_options(
+    ctx: ClickContext, fpaths: tuple[str, ...], options: PreviewOptions, budget_ms: int | None
+) -> None:
+    """Check preview options are used where they work; time budget needs a single text preview."""
+    if options.signal and ctx.invoked_subcommand:
+        raise click.UsageError("--signal works only with previews")
+    if budget_ms is None:
+        return
+    if ctx.invoked_subcommand or not is_single_file(fpaths) or options.fmt != SummaryFormat.text:
+        raise click.UsageError("--budget-ms works only with text preview of a single file")
+
+
+def _read_for_subcommand(fpath: Path, ftype: Ftype | None) -> QfType:
+    with phase("parse_ftype"):
+        resolved_ftype = resolve_ftype(fpath, ftype)
+    with phase("qf_read"):
+        return read_or_raise(qf_read, fpath, resolved_ftype)
+
+
+def _echo_batch(previews: Iterable[PreviewResult], fmt: SummaryFormat) -> ExitCode:
+    """Print summaries to stdout and errors to stderr as they come; get total exit code."""
+    exit_codes = []
+    for res in previews:
+        if fmt == SummaryFormat.json:
+            _echo_record(res)
+        elif res.exit_code == ExitCode.ok:
+            click.echo(BATCH_HEADER.format(fpath=res.fpath))
+            click.echo(f"{res.summary}\n")
+        else:
+            click.echo(f"Error: {res.error}", err=True)
+        exit_codes.append(res.exit_code)
+
+    n_total = len(exit_codes)
+    n_failed = sum(code != ExitCode.ok for code in exit_codes)
+    if not n_total:
+        click.echo("No supported files found", err=True)
+    elif n_failed:
+        click.echo(f"{n_failed} of {n_total} files failed", err=True)
+    return aggregate_exit_code(exit_codes)
+
+
+def _echo_record(res: PreviewResult) -> None:
+    """Print JSON record of the file; failed files get a record with the error too."""
+    if res.exit_code == ExitCode.ok:
+        click.echo(res.summary)
     else:
-        click.echo(qf_obj.summary)
+        click.echo(format_record(res.fpath, error=res.error, exit_code=res.exit_code))
 
 
 @main.command()
-@pass_obj
-def inspect(qf_obj: QfType) -> None:
-    """Inspect file in IPython interactive console."""
+@click.option("--preload", is_flag=True, default=False, help=PRELOAD_HELP)
+@pass_meta_key(FTYPE_KEY)
+@pass_meta_key(FPATH_KEY)
+def inspect(fpath: Path, ftype: Ftype | None, preload: bool) -> None:
+    """Inspect file in IPython interactive console.
+
+    The console opens right away while the file is read in the background; the
+    variables wait for the reading to finish on first use.
+
+    With --preload, raw data are decoded once into a memory-mapped cache file;
+    later and concurrent consoles on the same file map it without decoding.
+    Epochs data are loaded into memory instead of being read on each access.
+
+    """
+    resolved_ftype = resolve_ftype(fpath, ftype)
+    if preload and resolved_ftype not in {Ftype.raw, Ftype.epochs}:
+        raise click.UsageError("--preload works only with raw files and epochs")
+    ns = read_in_background(fpath, resolved_ftype, preload)
     try:
-        embed_ipython(qf_obj.to_dict())
+        embed_ipython(ns)
     except Exception as exc:
         raise ConsoleEmbedClickError(exc)
 
@@ -74,14 +232,362 @@ def inspect(qf_obj: QfType) -> None:
 @main.command()
 @click.argument("dst", type=click.Path(path_type=Path, dir_okay=True, writable=True))
 @click.option("-o", "--overwrite", is_flag=True, default=False, help="Overwrite destination file.")
+@raw_export_options
 @pass_obj
-def saveas(qf_obj: QfType, dst: Path, overwrite: bool) -> None:
+def saveas(  # noqa: WPS211 (click options)
+    qf_obj: QfType,
+    dst: Path,
+    overwrite: bool,
+    tmin: float | None,
+    tmax: float | None,
+    picks: str | None,
+    buffer_sec: float | None,
+) -> None:
     """Save mne file under different name. Existing destination is overwritten.
 
-    Works correctly with large fif file splits.
+    Works correctly with large fif file splits. Raw files can be cropped and
+    reduced to a subset of channels on the way, without loading them in memory.
 
     """
+    export = get_raw_export(tmin, tmax, picks, buffer_sec)
     try:
-        qf_save(qf_obj, dst, overwrite)
+        with phase("saveas"):
+            if export is None:
+                save_method = qf_save(qf_obj, dst, overwrite)
+            else:
+                save_method = save_raw_export(qf_obj, dst, overwrite, export)
     except Exception as exc:
         raise SaveFailedClickError(dst, exc)
+    click.echo(f"Saved {dst} with {save_method}", err=True)
+
+
+@main.command()
+@click.argument("dst", type=click.Path(path_type=Path, dir_okay=True, writable=True))
+@click.option("-o", "--overwrite", is_flag=True, default=False, help="Overwrite destinations.")
+@pass_meta_key(FPATH_KEY)
+def move(fpath: Path, dst: Path, overwrite: bool) -> None:
+    """Move file with its splits without rewriting the data.
+
+    Only the references between the split files are patched, so large
+    recordings are moved in no time. The files must stay on the same file
+    system; use `saveas` otherwise.
+
+    """
+    from quickfif.fiff.move import move_splits  # noqa: WPS433 (imports numpy)
+
+    try:
+        with phase("move"):
+            move_splits(fpath, dst, str(dst).endswith(BIDS_SPLIT_EXT), overwrite)
+    except (ValueError, OSError) as exc:
+        raise SaveFailedClickError(dst, exc)
+
+
+@main.command()
+@click.argument("dst", type=click.Path(path_type=Path, dir_okay=False, writable=True))
+@click.option("-o", "--overwrite", is_flag=True, default=False, help="Overwrite destinations.")
+@click.option(
+    "-j", "--jobs", type=click.IntRange(min=1), default=None,
+    help="Number of threads compressing the data  [default: number of CPUs]",
+)
+@click.option(
+    "-l", "--level", type=click.IntRange(1, 9), default=6, show_default=True,
+    help="Compression level from 1 (fastest) to 9 (smallest files).",
+)
+@pass_meta_key(FPATH_KEY)
+def recompress(  # noqa: WPS216 (click options)
+    fpath: Path, dst: Path, overwrite: bool, jobs: int | None, level: int
+) -> None:
+    """Compress file with its splits to .fif.gz or decompress it to .fif.
+
+    The data are copied as is, without reading them with mne; only the
+    references between the split files are updated for the new names.
+    Compression runs on all cores.
+
+    """
+    from quickfif import recompress as rc  # noqa: WPS433 (imports numpy)
+
+    bids = str(dst).endswith(BIDS_SPLIT_EXT)
+    try:
+        with phase("recompress"):
+            stats = rc.recompress(fpath, dst, bids, overwrite, jobs or rc.DEFAULT_JOBS, level)
+    except (ValueError, OSError) as exc:
+        raise SaveFailedClickError(dst, exc)
+    click.echo(str(stats), err=True)
+
+
+@main.command()
+@click.option(
+    "--checksum", is_flag=True, default=False,
+    help="Print SHA-256 of each split to stdout in the format of `sha256sum`.",
+)
+@click.option(
+    "-j", "--jobs", type=click.IntRange(min=1), default=None,
+    help="Number of threads hashing the splits  [default: number of CPUs]",
+)
+@pass_meta_key(FPATH_KEY)
+def verify(fpath: Path, checksum: bool, jobs: int | None) -> None:
+    """Check integrity of file with its splits without reading the data.
+
+    The tags of each split are walked to check they fit in the file and match
+    the tag directory, and the references between the splits are followed to
+    find missing or extra parts. Exits with the broken file status if there
+    are problems.
+
+    """
+    from quickfif import verify as vf  # noqa: WPS433 (imports numpy)
+
+    with phase("verify"):
+        report = vf.verify_splits(fpath, checksum, jobs or vf.DEFAULT_JOBS)
+    for split in report.splits:
+        if split.checksum is not None:
+            click.echo(f"{split.checksum}  {split.fpath}")
+    click.echo(str(report), err=True)
+    if report.n_problems:
+        click.get_current_context().exit(ExitCode.broken_file)
+
+
+@main.command()
+@click.option(
+    "-o", "--output", type=click.Path(path_type=Path, dir_okay=False, writable=True),
+    default=None, help="Pyramid file  [default: file name with .pyr appended]",
+)
+@click.option(
+    "--bin-size", type=click.IntRange(min=1), default=None,
+    help="Number of samples in a bin of the finest level  [default: 256]",
+)
+@click.option(
+    "-j", "--jobs", type=click.IntRange(min=1), default=None,
+    help="Number of processes reading the data  [default: number of CPUs]",
+)
+@pass_meta_key(FTYPE_KEY)
+@pass_meta_key(FPATH_KEY)
+def pyramid(  # noqa: WPS216 (click options)
+    fpath: Path,
+    ftype: Ftype | None,
+    output: Path | None,
+    bin_size: int | None,
+    jobs: int | None,
+) -> None:
+    """Write min/max/RMS envelope of raw data at several resolutions.
+
+    The data are read once, by several processes, and summarized in bins of
+    growing size. The envelope of any time window at any plot width is then
+    read from the memory-mapped pyramid file without reading the recording.
+
+    """
+    if resolve_ftype(fpath, ftype) != Ftype.raw:
+        raise click.UsageError("pyramid works only with raw files")
+    from quickfif import pyramid as pyr  # noqa: WPS433 (imports numpy)
+
+    dst = output or pyr.get_sidecar_path(fpath)
+    bin_size = bin_size or pyr.DEFAULT_BIN_SIZE
+    try:
+        with phase("pyramid"):
+            stats = pyr.build_pyramid(fpath, dst, bin_size, jobs=jobs or pyr.DEFAULT_JOBS)
+    except (ValueError, OSError) as exc:
+        raise SaveFailedClickError(dst, exc)
+    click.echo(str(stats), err=True)
+
+
+@main.command()
+@click.option(
+    "--format", "fmt", type=click.Choice(["text", "json"]), default="text",
+    help="Print a table of the channels or a JSON record of the file.",
+)
+@click.option(
+    "-j", "--jobs", type=click.IntRange(min=1), default=None,
+    help="Number of processes reading groups of channels  [default: number of CPUs]",
+)
+@pass_meta_key(FTYPE_KEY)
+@pass_meta_key(FPATH_KEY)
+def stats(fpath: Path, ftype: Ftype | None, fmt: str, jobs: int | None) -> None:
+    """Print statistics of raw signal channels and suggest bad ones.
+
+    The data are streamed in chunks, so memory use doesn't depend on the
+    recording length. Channels constant in over 10% of 1 s windows are
+    suggested as flat, ones at their extreme value in 1% of samples as
+    clipped, and ones with std or kurtosis standing out among channels of the
+    same type as noisy.
+
+    """
+    if resolve_ftype(fpath, ftype) != Ftype.raw:
+        raise click.UsageError("stats works only with raw files")
+    from quickfif import screening  # noqa: WPS433 (imports numpy)
+
+    try:
+        with phase("stats"):
+            raw_stats = screening.read_stats(fpath, jobs or screening.DEFAULT_JOBS)
+    except (ValueError, OSError) as exc:
+        raise BrokenFileClickError(fpath, exc)
+    if fmt == "json":
+        click.echo(format_record(fpath, ftype=str(Ftype.raw), stats=raw_stats))
+    else:
+        click.echo(screening.render_stats(raw_stats))
+
+
+@main.tools.command()
+@click.argument("fpaths", nargs=-1, required=True, metavar="FPATH...")
+@click.option("-r", "--recursive", is_flag=True, default=False, help=RECURSIVE_HELP)
+@click.option(
+    "-o", "--output", type=click.Path(path_type=Path, writable=True), default=None,
+    help="PNG file for a single FPATH or directory for <name>.png of each file",
+)
+@click.option("--width", type=click.IntRange(min=1), default=None, help="[default: 640]")
+@click.option("--height", type=click.IntRange(min=1), default=None, help="[default: 360]")
+@click.option(
+    "--style", type=click.Choice(["butterfly", "stacked"]), default="butterfly",
+    show_default=True, help="Raw channels of a type overlaid or a few channels one under another",
+)
+@click.option(
+    "-j", "--jobs", type=click.IntRange(min=1), default=None,
+    help="Number of processes rendering the files  [default: number of CPUs]",
+)
+def thumbnail(  # noqa: WPS211, WPS216 (click options)
+    fpaths: tuple[str, ...],
+    recursive: bool,
+    output: Path | None,
+    width: int | None,
+    height: int | None,
+    style: str,
+    jobs: int | None,
+) -> None:
+    """Render PNG pictures of the files and print their paths.
+
+    Raw traces, epochs images and ICA topographies are drawn headless from
+    decimated data and cached by file identity, so rendering an unchanged
+    file again takes no time. Without --output the cached PNGs are printed.
+
+    """
+    from quickfif import thumbnail as thumb  # noqa: WPS433 (imports matplotlib)
+
+    files = expand_paths(fpaths, recursive)
+    options = thumb.ThumbnailOptions(
+        width or thumb.DEFAULT_WIDTH, height or thumb.DEFAULT_HEIGHT, thumb.TraceStyle(style)
+    )
+    dsts = _get_thumbnail_dsts(files, output, single=is_single_file(fpaths))
+    n_failed = 0
+    with phase("thumbnail"):
+        for res in thumb.make_thumbnails(files, dsts, options, jobs or thumb.DEFAULT_JOBS):
+            if res.png is None:
+                click.echo(f"Error: {res.error}", err=True)
+                n_failed += 1
+            else:
+                click.echo(res.png)
+    if n_failed:
+        click.echo("{0} of {1} files failed".format(n_failed, len(files)), err=True)
+        click.get_current_context().exit(ExitCode.broken_file)
+
+
+def _get_thumbnail_dsts(files: list[Path], output: Path | None, single: bool) -> list[Path | None]:
+    """Get destination of each thumbnail; `output` is a directory unless there's a single file."""
+    if output is None:
+        return [None for _ in files]
+    if single and not output.is_dir():
+        return [output]
+    output.mkdir(parents=True, exist_ok=True)
+    return [output / "{0}.png".format(fpath.name) for fpath in files]
+
+
+@main.tools.group()
+def cache() -> None:
+    """Manage cache of file previews."""
+
+
+@cache.command()
+def clear() -> None:
+    """Remove all cached previews, thumbnails and preloaded data."""
+    from quickfif.preload import get_preload_cache  # noqa: WPS433 (imports numpy)
+    from quickfif.thumbnail import get_thumbnail_cache  # noqa: WPS433 (imports matplotlib)
+
+    removed = get_summary_cache().clear()
+    removed_thumbnails = get_thumbnail_cache().clear()
+    removed_preloads = get_preload_cache().clear()
+    click.echo(
+        "Removed {0} cached previews, {1} thumbnails and {2} preloaded recordings".format(
+            removed, removed_thumbnails, removed_preloads
+        )
+    )
+
+
+@main.tools.command()
+@click.option(
+    "-j", "--workers", type=click.IntRange(min=1), default=DEFAULT_WORKERS, show_default=True,
+    help="Number of files read in parallel.",
+)
+@click.option(
+    "--timeout", type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_REQUEST_TIMEOUT_SEC, show_default=True,
+    help="Seconds to wait for a preview before the client reads the file itself.",
+)
+@click.option(
+    "--idle-timeout", type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_IDLE_TIMEOUT_SEC, show_default=True,
+    help="Shut down after this many seconds without requests.",
+)
+def serve(workers: int, timeout: float, idle_timeout: float) -> None:
+    """Run preview daemon; `qfif FPATH` forwards previews to it while it's running."""
+    from quickfif.daemon import server  # noqa: WPS433 (imports mne, keep it off startup path)
+
+    socket_path = get_socket_path()
+    click.echo(f"Starting preview daemon on {socket_path}")
+    try:
+        server.serve(socket_path, workers, timeout, idle_timeout)
+    except (server.DaemonRunningError, OSError) as exc:
+        raise DaemonClickError(exc)
+
+
+@main.tools.command()
+@click.argument(
+    "dpath", metavar="DIR", type=click.Path(exists=True, file_okay=False, path_type=Path)
+)
+@catalog_option
+@click.option(
+    "-j", "--jobs", type=click.IntRange(min=1), default=None,
+    help="Number of processes reading the files  [default: number of CPUs]",
+)
+def index(dpath: Path, catalog_fpath: Path | None, jobs: int | None) -> None:
+    """Record metadata of the files under DIR in a catalog searched by `qfif query`.
+
+    Running it again reads only the files which changed since the last run
+    and drops the files which are gone.
+
+    """
+    from quickfif import catalog  # noqa: WPS433 (imports sqlite3)
+
+    root = dpath.resolve()
+    fpaths = expand_paths([str(root)], recursive=True)
+    try:
+        with catalog.open_catalog(catalog_fpath or catalog.get_catalog_path()) as conn:
+            with phase("index"):
+                index_stats = catalog.index_files(conn, root, fpaths, jobs or catalog.DEFAULT_JOBS)
+    except catalog.CatalogError as exc:
+        raise click.ClickException(str(exc))
+    click.echo(str(index_stats), err=True)
+
+
+@main.tools.command()
+@click.argument("condition", default="1")
+@catalog_option
+@click.option(
+    "--format", "fmt", type=click.Choice(["paths", "json"]), default="paths",
+    help="Print paths of the files or their records as JSON lines.",
+)
+def query(condition: str, catalog_fpath: Path | None, fmt: str) -> None:
+    """Print files in the catalog matching SQL CONDITION; all of them by default.
+
+    For example, 'sfreq = 1000 AND n_eeg > 300'. The columns are: fpath,
+    ftype, error, sfreq, duration_sec, n_channels, highpass, lowpass,
+    meas_date, experimenter, n_epochs, n_annotations, n_components, n_splits,
+    size and the number of channels of each type, e.g. n_eeg or n_grad. Files
+    which failed to read have the error set. Annotations are in the
+    `annotations` table: fpath IN (SELECT fpath FROM annotations WHERE
+    description = 'BAD_blink').
+
+    """
+    from quickfif import catalog  # noqa: WPS433 (imports sqlite3)
+
+    try:
+        for row in catalog.query(catalog_fpath or catalog.get_catalog_path(), condition):
+            click.echo(json.dumps(row) if fmt == "json" else row["fpath"])
+    except catalog.CatalogError as exc:
+        raise click.ClickException(str(exc))
@@ -0,0 +1,57 @@
+"""Expansion of command line paths, directories and glob patterns to files."""
+import glob
+from pathlib import Path
+from typing import Iterable
+
+from quickfif.config import EXT_TO_FTYPE
+
+
+def is_single_file(patterns: tuple[str, ...]) -> bool:
+    """Check the arguments are a single path, not a directory or a glob to expand."""
+    if len(patterns) != 1:
+        return False
+    path = Path(patterns[0])
+    is_pattern = not path.exists() and glob.has_magic(patterns[0])
+    return not path.is_dir() and not is_pattern
+
+
+def expand_paths(patterns: Iterable[str], recursive: bool) -> list[Path]:
+    """
+    Get files to preview from paths, directories and glob patterns.
+
+    Directories and patterns are expanded to the files with supported
+    extensions, in sorted order. Patterns are matched recursively, i.e. `**`
+    matches subdirectories, if `recursive` is set. Files are taken as they are,
+    as well as patterns matching nothing; previewing those reports the error.
+
+    """
+    fpaths = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            fpaths.extend(_find_supported(path, recursive))
+        elif path.exists() or not glob.has_magic(pattern):
+            fpaths.append(path)
+        else:
+            fpaths.extend(_expand_glob(pattern, recursive) or [path])
+    return list(dict.fromkeys(fpaths))  # drop duplicates keeping the order
+
+
+def _find_supported(dpath: Path, recursive: bool) -> list[Path]:
+    found = dpath.rglob("*") if recursive else dpath.iterdir()
+    return sorted(path for path in found if _is_supported_file(path))
+
+
+def _expand_glob(pattern: str, recursive: bool) -> list[Path]:
+    fpaths = []
+    for match in sorted(glob.glob(pattern, recursive=recursive)):
+        path = Path(match)
+        if path.is_dir():
+            fpaths.extend(_find_supported(path, recursive))
+        elif _is_supported_file(path):
+            fpaths.append(path)
+    return fpaths
+
+
+def _is_supported_file(path: Path) -> bool:
+    return path.name.endswith(tuple(EXT_TO_FTYPE)) and path.is_file()
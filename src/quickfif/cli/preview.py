@@ -0,0 +1,126 @@
+"""Preview of a single file: from cache, daemon or reading the file in this process."""
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Generator, Iterator
+
+from quickfif.cache import get_summary_cache
+from quickfif.cli.errors import BrokenFileClickError, UnsupportedFtypeClickError
+from quickfif.cli.glance import read_signal, render_signal
+from quickfif.config import Ftype, qf_preview
+from quickfif.daemon.client import request_summary
+from quickfif.parsers import parse_ftype
+from quickfif.profiling import phase
+from quickfif.qf_types.base import QfType
+from quickfif.summary import SummaryFormat, format_record, render_sections
+
+
+@dataclass(frozen=True)
+class PreviewOptions(object):
+    """Preview settings shared by all the files; passed to worker processes."""
+
+    ftype: Ftype | None = None  # guess from extension when not set
+    use_cache: bool = True
+    use_daemon: bool = True
+    fmt: SummaryFormat = SummaryFormat.text
+    signal: bool = False  # glance at the data of raw files; not cached
+
+
+def read_or_raise(read_func: Callable[[Path, Ftype], QfType], fpath: Path, ftype: Ftype) -> QfType:
+    """Read QfType object converting reader errors to click error."""
+    try:
+        return read_func(fpath, ftype)
+    except Exception as exc:
+        raise BrokenFileClickError(fpath, exc)
+
+
+def resolve_ftype(fpath: Path, ftype: Ftype | None) -> Ftype:
+    """Get file type, guessing it from the extension if it's not set."""
+    try:
+        return ftype or parse_ftype(fpath)
+    except ValueError:
+        raise UnsupportedFtypeClickError(fpath)
+
+
+def get_summary(fpath: Path, options: PreviewOptions) -> str:
+    """
+    Get file summary, from cache when possible; cache hits don't import mne.
+
+    JSON summary comes as the record of the file, with its path and type.
+
+    Raises
+    ------
+    click.ClickException
+        If the file type is unsupported or reading failed
+
+    """
+    return "\n".join(iter_summary(fpath, options))
+
+
+def iter_summary(fpath: Path, options: PreviewOptions) -> Iterator[str]:
+    """
+    Generate sections of file summary as they're ready; see `get_summary`.
+
+    Summaries from the cache or the daemon and JSON records come whole. A new
+    summary is cached once all its sections are generated. The signal section
+    of raw files comes last and is never cached: the file can be rewritten
+    with the same header.
+
+    Raises
+    ------
+    click.ClickException
+        If the file type is unsupported or reading failed
+
+    """
+    with phase("parse_ftype"):
+        ftype = resolve_ftype(fpath, options.ftype)
+    summary = yield from _iter_text(fpath, ftype, options)
+    signal = read_signal(fpath) if options.signal and ftype == Ftype.raw else None
+    if options.fmt == SummaryFormat.json:
+        signal_fields = {} if signal is None else {"signal": signal}
+        yield format_record(fpath, ftype=ftype, summary=json.loads(summary), **signal_fields)
+    elif signal is not None:
+        yield render_signal(signal)
+
+
+def _iter_text(fpath: Path, ftype: Ftype, options: PreviewOptions) -> Generator[str, None, str]:
+    """Generate text summary sections from the cache or computed; get the whole summary."""
+    summary_cache = get_summary_cache() if options.use_cache else None
+    fmt = options.fmt
+    with phase("cache"):
+        summary = summary_cache.get(fpath, ftype, fmt) if summary_cache else None
+    if summary is not None:
+        return (yield from _pass_text(iter([summary]), fmt))
+    sections = _compute_sections(fpath, ftype, fmt, options.use_daemon)
+    summary = yield from _pass_text(sections, fmt)
+    if summary_cache:
+        summary_cache.put(fpath, ftype, summary, fmt)
+    return summary
+
+
+def _compute_sections(
+    fpath: Path, ftype: Ftype, fmt: SummaryFormat, use_daemon: bool
+) -> Iterator[str]:
+    """Get summary from the daemon, falling back to reading the file in this process."""
+    try:
+        with phase("daemon"):
+            summary = request_summary(fpath, ftype, fmt) if use_daemon else None
+    except ValueError as exc:
+        raise BrokenFileClickError(fpath, exc)
+    if summary is not None:
+        yield summary
+        return
+    with phase("qf_preview"):
+        qf_obj = read_or_raise(qf_preview, fpath, ftype)
+    with phase("summary"):
+        yield from render_sections(qf_obj, fmt)
+
+
+def _pass_text(sections: Iterator[str], fmt: SummaryFormat) -> Generator[str, None, str]:
+    """Pass text sections on as they come; get the whole summary."""
+    collected = []
+    for section in sections:
+        collected.append(section)
+        if fmt == SummaryFormat.text:
+            yield section
+    return "\n".join(collected)
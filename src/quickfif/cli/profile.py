@@ -0,0 +1,55 @@
+"""Options of the main group profiling the command."""
+from functools import partial
+from pathlib import Path
+from typing import Callable, Final, Protocol, TypeVar
+
+import click
+
+from quickfif.cli.docs import PROFILE_HELP, PROFILE_JSON_HELP, PROFILE_PSTATS_HELP
+from quickfif.profiling import Profiler
+
+T = TypeVar("T")
+
+OUTPUT_FILE: Final = click.Path(dir_okay=False, writable=True, path_type=Path)
+
+
+class ClosingContext(Protocol):
+    """Part of `click.Context` running callbacks when the command finishes."""
+
+    def call_on_close(self, callback: Callable[[], T]) -> Callable[[], T]:
+        """Register function to call when the command finishes."""
+
+
+def profile_options(wrapped: Callable[..., T]) -> Callable[..., T]:  # type: ignore[misc]
+    """Add options reporting the phases of the command."""  # noqa: D202
+    options = (
+        click.option("--profile", is_flag=True, default=False, help=PROFILE_HELP),
+        click.option("--profile-json", type=OUTPUT_FILE, help=PROFILE_JSON_HELP),
+        click.option("--profile-pstats", type=OUTPUT_FILE, help=PROFILE_PSTATS_HELP),
+    )
+    for option in reversed(options):
+        wrapped = option(wrapped)
+    return wrapped
+
+
+def start_profiling(
+    ctx: ClosingContext, to_stderr: bool, json_fpath: Path | None, pstats_fpath: Path | None
+) -> None:
+    """Profile the command if any of the options is set; report when the context closes."""
+    if not (to_stderr or json_fpath or pstats_fpath):
+        return
+    profiler = Profiler(with_cprofile=pstats_fpath is not None)
+    profiler.start()
+    ctx.call_on_close(partial(_report, profiler, to_stderr, json_fpath, pstats_fpath))
+
+
+def _report(
+    profiler: Profiler, to_stderr: bool, json_fpath: Path | None, pstats_fpath: Path | None
+) -> None:
+    report = profiler.stop()
+    if to_stderr:
+        click.echo(str(report), err=True)
+    if json_fpath:
+        json_fpath.write_text(report.to_json())
+    if pstats_fpath:
+        profiler.dump_stats(pstats_fpath)
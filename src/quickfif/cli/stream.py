@@ -0,0 +1,72 @@
+"""Printing preview sections as soon as they're ready, within a time budget."""
+import queue
+import threading
+import time
+from functools import partial
+from typing import Final, Iterator, TypeAlias
+
+import click
+
+from quickfif.cli.docs import BUDGET_HELP
+
+MS_IN_SEC: Final = 1000
+OMITTED_MARK: Final = "[... the rest is omitted: over the time budget of {budget_ms} ms]"
+
+# ranger kills previewers that take too long; a partial preview in time is better
+budget_option: Final = click.option(
+    "--budget-ms", type=click.IntRange(min=1), default=None, help=BUDGET_HELP
+)
+
+# Sections, None after the last one or the error of generating them
+_Ready: TypeAlias = "queue.Queue[str | Exception | None]"
+
+
+def echo_sections(sections: Iterator[str], budget_ms: int | None = None) -> None:
+    """
+    Print sections, flushing each one as soon as it's ready.
+
+    With `budget_ms`, the sections are generated in a background thread and
+    printing stops when the budget runs out, even in the middle of a slow
+    section; a mark tells the rest is omitted. The thread is left behind and
+    doesn't hold the process exit.
+
+    Raises
+    ------
+    click.ClickException
+        If generating the sections failed within the budget
+
+    """
+    if budget_ms is None:
+        for section in sections:
+            click.echo(section)
+        return
+    deadline = time.monotonic() + budget_ms / MS_IN_SEC
+    ready: _Ready = queue.Queue()
+    threading.Thread(target=_generate, args=(sections, ready), daemon=True).start()
+    try:
+        _echo_ready(ready, deadline)
+    except queue.Empty:
+        click.echo(OMITTED_MARK.format(budget_ms=budget_ms))
+
+
+def _generate(sections: Iterator[str], ready: _Ready) -> None:
+    try:
+        for section in sections:
+            ready.put(section)
+    except Exception as exc:
+        ready.put(exc)
+    else:
+        ready.put(None)
+
+
+def _echo_ready(ready: _Ready, deadline: float) -> None:
+    """Print sections until the last one; raise `queue.Empty` at the deadline."""
+    for section in iter(partial(_get_before, ready, deadline), None):
+        click.echo(section)
+
+
+def _get_before(ready: _Ready, deadline: float) -> str | None:
+    section = ready.get(timeout=max(deadline - time.monotonic(), 0))
+    if isinstance(section, Exception):
+        raise section
+    return section
@@ -1,10 +1,14 @@
 """Configure dispatch on QfType objects for supported file types."""
+from dataclasses import fields
 from enum import StrEnum
 from functools import singledispatch
 from pathlib import Path
 from types import MappingProxyType
 from typing import Callable, Final, TypeAlias
 
+# Plugins import mne and numpy only inside the functions that need them,
+# so that importing the registry stays cheap and `qfif --help` starts fast
+from quickfif.fastcopy import SaveMethod
 from quickfif.qf_types import annots_type, epochs_type, ica_type, raw_type
 from quickfif.qf_types.base import QfType
 
@@ -32,6 +36,17 @@ _ftype_to_read_func: dict[Ftype, Callable[[Path], QfType]] = {
     Ftype.ica: ica_type.read,
     Ftype.raw: raw_type.read,
 }
+_ftype_to_preview_func: dict[Ftype, Callable[[Path], QfType]] = {
+    **_ftype_to_read_func,
+    Ftype.raw: raw_type.read_header,
+}
+# Classes returned by the read functions; their fields make the `inspect` namespace
+_ftype_to_class: dict[Ftype, type] = {
+    Ftype.epochs: epochs_type.QfEpochs,
+    Ftype.annots: annots_type.QfAnnots,
+    Ftype.ica: ica_type.QfIca,
+    Ftype.raw: raw_type.QfRaw,
+}
 _ftype_to_ext: dict[Ftype, tuple[Ext, ...]] = {
     Ftype.epochs: epochs_type.EXTENSIONS,
     Ftype.annots: annots_type.EXTENSIONS,
@@ -44,6 +59,8 @@ for ft, exts in _ftype_to_ext.items():
 
 FTYPE_TO_EXT: Final = MappingProxyType(_ftype_to_ext)
 EXT_TO_FTYPE: Final = MappingProxyType(_ext_to_ftype)
+# Destination names for which mne uses BIDS split naming on save
+BIDS_SPLIT_EXT: Final = raw_type.BIDS_EXT + epochs_type.BIDS_EXT
 
 
 def qf_read(fpath: Path, ftype: Ftype) -> QfType:
@@ -51,13 +68,31 @@ def qf_read(fpath: Path, ftype: Ftype) -> QfType:
     return _ftype_to_read_func[ftype](fpath)
 
 
+def qf_preview(fpath: Path, ftype: Ftype) -> QfType:
+    """Read QfType object sufficient for `summary`; may skip reading the data."""
+    return _ftype_to_preview_func[ftype](fpath)
+
+
+def qf_fields(ftype: Ftype) -> tuple[str, ...]:
+    """
+    Get names of the fields of QfType object, i.e. the keys of its `to_dict`.
+
+    Examples
+    --------
+    >>> qf_fields(Ftype.raw)
+    ('fpath', 'raw')
+
+    """
+    return tuple(field.name for field in fields(_ftype_to_class[ftype]))
+
+
 class UnsupportedOperationError(Exception):
     """Operation not supported for this file type."""
 
 
 @singledispatch
-def qf_save(qf_obj: QfType, dst: Path, overwrite: bool) -> None:  # pyright: ignore
-    """Save mne object."""
+def qf_save(qf_obj: QfType, dst: Path, overwrite: bool) -> SaveMethod:  # pyright: ignore
+    """Save mne object; files that don't change are copied without decoding."""
     raise UnsupportedOperationError(f"'Save as' is not supported for {qf_obj}")
 
 
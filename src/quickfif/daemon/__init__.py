@@ -0,0 +1 @@
+"""Long-lived preview server answering over a Unix domain socket and its thin client."""
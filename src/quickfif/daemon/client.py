@@ -0,0 +1,61 @@
+"""
+Thin client forwarding previews to the daemon.
+
+Keep the imports light: the whole point of the daemon is that the client
+process doesn't import mne.
+
+"""
+import socket
+from pathlib import Path
+from typing import Final
+
+from quickfif.cache import get_version
+from quickfif.daemon.protocol import (
+    MAX_MESSAGE_BYTES,
+    Request,
+    Status,
+    decode_response,
+    encode,
+    get_socket_path,
+)
+
+CLIENT_TIMEOUT_SEC: Final = 30.0
+
+
+def request_summary(
+    fpath: Path,
+    ftype: str,
+    fmt: str = "text",
+    socket_path: Path | None = None,
+    timeout: float = CLIENT_TIMEOUT_SEC,
+) -> str | None:
+    """
+    Get file summary from the daemon.
+
+    Returns
+    -------
+    str | None
+        Summary or None if there's no daemon running or it couldn't serve the
+        request in time. In the latter case the caller should read the file itself.
+
+    Raises
+    ------
+    ValueError
+        If the daemon failed to read the file
+
+    """
+    fpath = fpath.resolve()
+    request = Request(str(fpath), str(ftype), get_version(), str(fmt))
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(socket_path or get_socket_path()))
+            sock.sendall(encode(request))
+            with sock.makefile("rb") as sock_file:
+                response = decode_response(sock_file.readline(MAX_MESSAGE_BYTES))
+    except (OSError, ValueError):  # no daemon, stale socket, timeout or garbled response
+        return None
+
+    if response.status == Status.broken:
+        raise ValueError(response.error)
+    return response.summary if response.status == Status.ok else None
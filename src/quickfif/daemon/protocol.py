@@ -0,0 +1,98 @@
+"""
+Messages exchanged by the preview daemon and its clients.
+
+A client sends a single request and gets a single response over a fresh
+connection. Both are JSON objects followed by a newline.
+
+"""
+import json
+import os
+from dataclasses import asdict, dataclass
+from enum import StrEnum
+from pathlib import Path
+from typing import Final
+
+from quickfif.cache import get_cache_dir
+
+SOCKET_NAME: Final = "quickfif.sock"
+MAX_MESSAGE_BYTES: Final = 16 * 1024 * 1024  # noqa: WPS432
+
+# Daemon settings defaults; kept here for the CLI to show them without importing the server
+DEFAULT_WORKERS: Final = min(4, os.cpu_count() or 1)
+DEFAULT_REQUEST_TIMEOUT_SEC: Final = 10.0
+DEFAULT_IDLE_TIMEOUT_SEC: Final = 1800.0  # 30 minutes
+
+
+class Status(StrEnum):
+    """Response status."""
+
+    ok = "ok"
+    broken = "broken"  # reading the file failed
+    timeout = "timeout"
+    busy = "busy"  # all the workers are taken and the queue is full
+    version = "version"  # daemon runs different version of the package
+
+
+@dataclass(frozen=True)
+class Request(object):
+    """Preview request."""
+
+    fpath: str  # absolute path: the daemon may run in a different directory
+    ftype: str
+    version: str
+    fmt: str = "text"  # summary format, see `quickfif.config.SummaryFormat`
+
+
+@dataclass(frozen=True)
+class Response(object):
+    """Preview response; `summary` is set for `Status.ok`, `error` otherwise."""
+
+    status: Status
+    summary: str = ""
+    error: str = ""
+
+
+def get_socket_path() -> Path:
+    """Get daemon socket path in XDG runtime directory, falling back to the cache directory."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR", "")
+    if os.path.isabs(runtime_dir):
+        return Path(runtime_dir) / SOCKET_NAME
+    return get_cache_dir() / SOCKET_NAME
+
+
+def encode(message: Request | Response) -> bytes:
+    """Encode message to send over the socket."""
+    return "{0}\n".format(json.dumps(asdict(message))).encode()
+
+
+def decode_request(line: bytes) -> Request:
+    """
+    Decode request line.
+
+    Raises
+    ------
+    ValueError
+        If the line isn't a valid request
+
+    """
+    try:
+        return Request(**json.loads(line))
+    except TypeError as exc:
+        raise ValueError(f"Bad request: {exc}")
+
+
+def decode_response(line: bytes) -> Response:
+    """
+    Decode response line.
+
+    Raises
+    ------
+    ValueError
+        If the line isn't a valid response
+
+    """
+    fields = json.loads(line)
+    try:
+        return Response(**{**fields, "status": Status(fields["status"])})
+    except (TypeError, KeyError) as exc:
+        raise ValueError(f"Bad response: {exc}")
@@ -0,0 +1,202 @@
+"""
+Preview daemon keeping the heavy plugin dependencies imported.
+
+Connections are accepted by lightweight threads, while the files are read by a
+bounded pool of workers. A request waits for its worker no longer than the
+request timeout. Threads can't be interrupted, so a timed out worker keeps its
+slot in the pool until it finishes. When all the slots are taken, new requests
+are rejected right away and clients read the files themselves.
+
+"""
+import importlib
+import os
+import socket
+import socketserver
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import suppress
+from pathlib import Path
+from typing import Final, TypeAlias
+
+from quickfif.cache import get_version
+from quickfif.config import Ftype, qf_preview
+from quickfif.daemon.protocol import (
+    MAX_MESSAGE_BYTES,
+    Request,
+    Response,
+    Status,
+    decode_request,
+    encode,
+)
+from quickfif.summary import SummaryFormat, render_summary
+
+QUEUED_PER_WORKER: Final = 2
+SOCKET_MODE: Final = 0o600
+SOCKET_DIR_MODE: Final = 0o700
+
+# Connection as passed to `socketserver` methods
+_Connection: TypeAlias = socket.socket | tuple[bytes, socket.socket]
+
+# Imported by plugins on the first read; we import them once when the daemon starts
+PRELOAD_MODULES: Final = ("mne.io", "mne.epochs", "mne.preprocessing", "quickfif.describe")
+
+
+class DaemonRunningError(Exception):
+    """Another daemon is already listening on the socket."""
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "PreviewServer"
+
+    def handle(self) -> None:  # noqa: WPS110 (socketserver API)
+        try:
+            request = decode_request(self.rfile.readline(MAX_MESSAGE_BYTES))
+        except ValueError as exc:
+            response = Response(Status.broken, error=str(exc))
+        else:
+            response = self.server.respond(request)
+        with suppress(OSError):  # client gave up waiting
+            self.wfile.write(encode(response))
+
+
+class PreviewServer(  # noqa: WPS214 (socketserver hooks)
+    socketserver.ThreadingMixIn, socketserver.UnixStreamServer
+):
+    """Unix socket server answering preview requests with file summaries."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: Path,
+        workers: int,
+        request_timeout: float,
+        idle_timeout: float,
+    ) -> None:
+        self.socket_path = socket_path
+        self.request_timeout = request_timeout
+        self.idle_timeout = idle_timeout
+        self.timeout = idle_timeout  # how long `handle_request` waits for connections
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._slots = threading.BoundedSemaphore(workers * (1 + QUEUED_PER_WORKER))
+        self._activity_lock = threading.Lock()
+        self._in_flight = 0
+        self._last_activity = time.monotonic()
+        self._is_bound = False
+        super().__init__(str(socket_path), _RequestHandler)
+
+    def server_bind(self) -> None:
+        """Bind the socket and make it accessible only by the current user."""
+        super().server_bind()
+        self._is_bound = True
+        os.chmod(self.socket_path, SOCKET_MODE)
+
+    def server_close(self) -> None:
+        """Close and remove the socket; abandon queued requests."""
+        super().server_close()
+        if self._is_bound:  # don't remove socket of the daemon we failed to replace
+            self.socket_path.unlink(missing_ok=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def serve_until_idle(self) -> None:
+        """Serve requests until there were none for `idle_timeout` seconds."""
+        while not self._is_idle():
+            self.handle_request()
+
+    def verify_request(self, request: _Connection, client_address: str) -> bool:
+        """Count accepted connection as in flight; it's done in `shutdown_request`."""
+        self._track_activity(1)
+        return True
+
+    def shutdown_request(self, request: _Connection) -> None:
+        """Close the connection; called exactly once for each accepted connection."""
+        super().shutdown_request(request)
+        self._track_activity(-1)
+
+    def respond(self, request: Request) -> Response:
+        """Get response to the request; called from connection threads."""
+        if request.version != get_version():
+            return Response(Status.version, error=f"Daemon version is {get_version()}")
+        if not self._slots.acquire(blocking=False):
+            return Response(Status.busy, error="All workers are busy")
+        return self._wait_summary(self._submit(request))
+
+    def _submit(self, request: Request) -> "Future[str]":
+        try:
+            future = self._executor.submit(
+                _summarize, Path(request.fpath), request.ftype, request.fmt
+            )
+        except RuntimeError:  # executor is shut down
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _wait_summary(self, future: "Future[str]") -> Response:
+        try:
+            return Response(Status.ok, summary=future.result(timeout=self.request_timeout))
+        except FutureTimeoutError:
+            future.cancel()  # works only if the request is still queued
+            return Response(Status.timeout, error=f"No summary in {self.request_timeout} sec")
+        except Exception as exc:
+            return Response(Status.broken, error=str(exc))
+
+    def _track_activity(self, in_flight_change: int) -> None:
+        with self._activity_lock:
+            self._in_flight += in_flight_change
+            self._last_activity = time.monotonic()
+
+    def _is_idle(self) -> bool:
+        with self._activity_lock:
+            idle_sec = time.monotonic() - self._last_activity
+            return not self._in_flight and idle_sec >= self.idle_timeout
+
+
+def _summarize(fpath: Path, ftype: str, fmt: str) -> str:
+    return render_summary(qf_preview(fpath, Ftype(ftype)), SummaryFormat(fmt))
+
+
+def preload_plugins() -> None:
+    """Import heavy plugin dependencies so the first request doesn't pay for it."""
+    for module_name in PRELOAD_MODULES:
+        importlib.import_module(module_name)
+
+
+def remove_stale_socket(socket_path: Path) -> None:
+    """
+    Remove socket left by a daemon that didn't shut down cleanly.
+
+    Raises
+    ------
+    DaemonRunningError
+        If some daemon is listening on the socket
+
+    """
+    if not socket_path.exists():
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(socket_path))
+        except ConnectionRefusedError:
+            socket_path.unlink(missing_ok=True)
+            return
+    raise DaemonRunningError(f"Daemon is already listening on {socket_path}")
+
+
+def serve(socket_path: Path, workers: int, request_timeout: float, idle_timeout: float) -> None:
+    """
+    Run the daemon until it's idle for `idle_timeout` seconds.
+
+    Raises
+    ------
+    DaemonRunningError
+        If some daemon is listening on the socket
+
+    """
+    remove_stale_socket(socket_path)
+    socket_path.parent.mkdir(mode=SOCKET_DIR_MODE, parents=True, exist_ok=True)
+    preload_plugins()
+    with PreviewServer(socket_path, workers, request_timeout, idle_timeout) as server:
+        server.serve_until_idle()
@@ -0,0 +1,263 @@
+"""
+Grouped descriptive statistics with NumPy.
+
+Renders the same table as `DataFrame.groupby(labels).describe()` with the
+total row appended, without importing pandas. Labels are factorized by
+hashing their characters, sizes and sums come from `np.bincount` and quantiles
+are picked from the segments of samples sorted by group. Samples are sorted
+once: a stable sort of the group codes keeps them sorted within each group.
+
+The statistics are also available as plain dicts, ready for JSON, and the table
+is rendered from them.
+
+"""
+from typing import Final, Sequence, TypeAlias, TypedDict
+
+import numpy as np
+import numpy.typing as npt  # noqa: WPS301
+
+COUNT_NAME: Final = "count"
+STAT_NAMES: Final = ("mean", "std", "min", "25%", "50%", "75%", "max")
+# pandas leaves room for the sign in the names of numeric columns
+COLUMN_NAMES: Final = tuple(f" {name}" for name in (COUNT_NAME, *STAT_NAMES))
+# Quantile levels of min, 25%, 50%, 75% and max columns
+LEVELS: Final = (0, 0.25, 0.5, 0.75, 1)
+LERP_SWITCH: Final = 0.5
+TOTAL_LABEL: Final = "Total"
+NAN_REPR: Final = "NaN"
+FLOAT_FORMAT: Final = "{0:.2f}"
+
+HASH_SEED: Final = 0
+# Hashes are sums of code points with integer weights, exact in float64 in any order
+MANTISSA_BITS: Final = 53
+CODE_POINT_BITS: Final = 21
+# Stable sort of integers of 16 bits or less is a radix sort in numpy
+RADIX_SORT_DTYPE: Final = np.uint16
+
+Floats = npt.NDArray[np.float64]
+Ints = npt.NDArray[np.int64]
+Strings = npt.NDArray[np.str_]
+Stats: TypeAlias = "dict[str, float | None]"  # count and statistics by column; None for NaN
+
+
+class GroupedStats(TypedDict):
+    """Statistics of each label, sorted by label, and of all the samples."""
+
+    by_label: dict[str, Stats]
+    total: Stats
+
+
+def describe_table(labels: npt.ArrayLike, samples: npt.ArrayLike) -> str:
+    """
+    Get per-label and total statistics of samples as `pandas.DataFrame.to_string` table.
+
+    Examples
+    --------
+    >>> labels = np.array(["b", "a", "b"])
+    >>> print(describe_table(labels, np.array([1.0, 2.0, 4.0])))
+           count  mean  std  min  25%  50%  75%  max
+    a          1  2.00  NaN 2.00 2.00 2.00 2.00 2.00
+    b          2  2.50 2.12 1.00 1.75 2.50 3.25 4.00
+    Total      3  2.33 1.53 1.00 1.50 2.00 3.00 4.00
+
+    """
+    return format_stats(describe_stats(labels, samples))
+
+
+def describe_stats(labels: npt.ArrayLike, samples: npt.ArrayLike) -> GroupedStats:
+    """
+    Get per-label and total statistics of samples.
+
+    Examples
+    --------
+    >>> grouped = describe_stats(np.array(["b", "a", "b"]), np.array([1.0, 2.0, 4.0]))
+    >>> grouped["by_label"]["a"]["count"], grouped["by_label"]["a"]["std"]
+    (1, None)
+    >>> grouped["total"]["max"]
+    4.0
+
+    """
+    groups, codes = factorize(np.asarray(labels, dtype=str))
+    samples = np.asarray(samples, dtype=np.float64)
+    counts, stats = _describe_with_total(codes, samples, len(groups))
+    rows = _to_stats_rows(counts, stats)
+    by_label = dict(zip(groups.tolist(), rows))
+    return GroupedStats(by_label=by_label, total=rows[-1])
+
+
+def format_stats(grouped: GroupedStats) -> str:
+    """Format statistics as `pandas.DataFrame.to_string` table with the total row last."""
+    rows = [*grouped["by_label"].values(), grouped["total"]]
+    counts = np.array([row[COUNT_NAME] for row in rows], dtype=np.int64)
+    stats = np.array([_from_stats(row) for row in rows], dtype=np.float64)
+    return format_table([*grouped["by_label"], TOTAL_LABEL], counts, stats)
+
+
+def factorize(labels: Strings) -> tuple[Strings, Ints]:
+    """
+    Get sorted unique labels and the index of each label among them.
+
+    Same as `np.unique(labels, return_inverse=True)`, but sorts hashes of the
+    labels instead of strings, which is several times faster for long arrays.
+    Labels are compared with the label of their hash afterwards, so collisions
+    only make it slower.
+
+    Examples
+    --------
+    >>> groups, codes = factorize(np.array(["b", "a", "b"]))
+    >>> groups.tolist(), codes.tolist()
+    (['a', 'b'], [1, 0, 1])
+
+    """
+    hash_groups, hash_codes = _factorize_hashes(labels)
+    if not np.array_equal(hash_groups[hash_codes], labels):
+        groups, codes = np.unique(labels, return_inverse=True)  # hash collision
+        return groups, codes.astype(np.int64)
+    order = np.argsort(hash_groups)
+    ranks = np.empty_like(order)
+    ranks[order] = np.arange(len(order))
+    return hash_groups[order], ranks[hash_codes].astype(np.int64)
+
+
+def describe_groups(
+    codes: Ints, samples: Floats, sorted_samples: Floats, n_groups: int
+) -> tuple[Ints, Floats]:
+    """
+    Compute counts and statistics of samples in groups given by integer codes.
+
+    `sorted_samples` are the samples ordered by group code and then by value.
+
+    Returns
+    -------
+    counts : array of shape (n_groups,)
+        Number of samples in each group
+    stats : array of shape (n_groups, 7)
+        Mean, sample standard deviation, min, quartiles and max of each group;
+        NaN where undefined
+
+    """
+    counts = np.bincount(codes, minlength=n_groups).astype(np.int64)
+    means = _divide(_group_sums(codes, samples, n_groups), counts)
+    squares = _group_sums(codes, np.square(samples - means[codes]), n_groups)
+    stds = np.sqrt(_divide(squares, counts - 1))
+    quantiles = _segment_quantiles(sorted_samples, counts)
+    return counts, np.column_stack([means, stds, quantiles])
+
+
+def format_table(index: Sequence[str], counts: Ints, stats: Floats) -> str:
+    """Format statistics as pandas does with float format of two decimals."""
+    columns = _format_columns(counts, stats)
+    widths = [_get_width(column) for column in columns]
+    index_width = _get_width(index)
+    return "\n".join(
+        _join_row(label.ljust(index_width), row, widths)
+        for label, row in zip(["", *index], zip(*columns))
+    )
+
+
+def _describe_with_total(codes: Ints, samples: Floats, n_groups: int) -> tuple[Ints, Floats]:
+    """Describe groups and append the statistics of all samples."""
+    by_value, by_group = _sort_samples(codes, samples, n_groups)
+    group_counts, group_stats = describe_groups(codes, samples, by_group, n_groups)
+    total_count, total_stats = describe_groups(np.zeros_like(codes), samples, by_value, 1)
+    return np.concatenate([group_counts, total_count]), np.concatenate([group_stats, total_stats])
+
+
+def _to_stats_rows(counts: Ints, stats: Floats) -> list[Stats]:
+    rows = []
+    for count, row in zip(counts.tolist(), stats.tolist()):
+        named: Stats = {COUNT_NAME: count}
+        named.update(zip(STAT_NAMES, map(_nan_to_none, row)))
+        rows.append(named)
+    return rows
+
+
+def _from_stats(row: Stats) -> list[float]:
+    stats = [row[name] for name in STAT_NAMES]
+    return [np.nan if stat is None else stat for stat in stats]
+
+
+def _nan_to_none(stat: float) -> float | None:
+    return None if np.isnan(stat) else stat
+
+
+def _factorize_hashes(labels: Strings) -> tuple[Strings, Ints]:
+    """Get label of each unique hash and the index of hash of each label."""
+    hashes = _hash(labels)
+    unique_hashes = np.unique(hashes)
+    hash_codes = np.searchsorted(unique_hashes, hashes)
+    first_idx = np.empty(len(unique_hashes), dtype=np.int64)
+    label_idx = np.arange(len(labels))
+    first_idx[hash_codes[::-1]] = label_idx[::-1]  # the last write wins
+    return labels[first_idx], hash_codes
+
+
+def _hash(labels: Strings) -> Floats:
+    n_chars = labels.dtype.itemsize // np.dtype("U1").itemsize
+    code_points = np.ascontiguousarray(labels).view(np.uint32).reshape(len(labels), n_chars)
+    weight_bits = MANTISSA_BITS - CODE_POINT_BITS - n_chars.bit_length()
+    weights = np.random.default_rng(HASH_SEED).integers(1, 2**weight_bits, n_chars)
+    return np.einsum("ij,j->i", code_points, weights.astype(np.float64))
+
+
+def _sort_samples(codes: Ints, samples: Floats, n_groups: int) -> tuple[Floats, Floats]:
+    """Get samples sorted by value and sorted by group, then by value."""
+    code_dtype = RADIX_SORT_DTYPE if n_groups <= np.iinfo(RADIX_SORT_DTYPE).max else np.int64
+    by_value_order = np.argsort(samples)
+    sorted_codes = codes[by_value_order].astype(code_dtype)
+    by_value = samples[by_value_order]
+    return by_value, by_value[np.argsort(sorted_codes, kind="stable")]
+
+
+def _segment_quantiles(sorted_samples: Floats, counts: Ints) -> Floats:
+    """Quantiles with linear interpolation, as in `np.quantile`, of sorted segments."""
+    quantiles = np.full((len(counts), len(LEVELS)), np.nan)
+    nonempty = counts > 0
+    starts = (np.cumsum(counts) - counts)[nonempty, None]
+    positions = np.multiply.outer(counts[nonempty] - 1, LEVELS)
+    lower = np.floor(positions)
+    low_samples = sorted_samples[starts + lower.astype(np.int64)]
+    up_samples = sorted_samples[starts + np.ceil(positions).astype(np.int64)]
+    quantiles[nonempty] = _lerp(low_samples, up_samples, positions - lower)
+    return quantiles
+
+
+def _lerp(low: Floats, up: Floats, fraction: Floats) -> Floats:
+    """Interpolate exactly as `np.quantile` does, so that the values are the same."""
+    diff = up - low
+    from_low = low + diff * fraction
+    from_up = up - diff * (1 - fraction)
+    return np.where(fraction >= LERP_SWITCH, from_up, from_low)
+
+
+def _group_sums(codes: Ints, samples: Floats, n_groups: int) -> Floats:
+    return np.bincount(codes, weights=samples, minlength=n_groups).astype(np.float64)
+
+
+def _divide(numerator: Floats, denominator: Ints) -> Floats:
+    """Divide with NaN where denominator is not positive."""
+    quotient = np.full(len(numerator), np.nan)
+    np.divide(numerator, denominator, out=quotient, where=denominator > 0)
+    return quotient
+
+
+def _format_columns(counts: Ints, stats: Floats) -> list[list[str]]:
+    """Format columns with their names; pandas leaves room for the sign in integers too."""
+    count_name, *stat_names = COLUMN_NAMES
+    columns = [[count_name, *(f" {count}" for count in counts.tolist())]]
+    for name, column in zip(stat_names, stats.T.tolist()):
+        columns.append([name, *(_format_float(stat) for stat in column)])
+    return columns
+
+
+def _get_width(cells: Sequence[str]) -> int:
+    return max(len(cell) for cell in cells)
+
+
+def _format_float(stat: float) -> str:
+    return NAN_REPR if np.isnan(stat) else FLOAT_FORMAT.format(stat)
+
+
+def _join_row(label: str, cells: Sequence[str], widths: Sequence[int]) -> str:
+    justified = [cell.rjust(width) for cell, width in zip(cells, widths)]
+    return " ".join([label, *justified])
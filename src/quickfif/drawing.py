@@ -0,0 +1,257 @@
+"""
+Pictures of recordings drawn headless with the Agg backend.
+
+Figures are drawn without pyplot straight into PNG bytes, so drawing needs no
+display and never touches the interactive backend `inspect` sets. Raw traces
+are drawn from the min/max envelope of the data in each pixel column: the
+data are streamed in chunks, or taken from the pyramid sidecar (see
+`quickfif.pyramid`) when it's up to date, and matplotlib fills `width` points
+per channel instead of plotting millions of samples. Epochs are drawn as an
+image of their global field power, with peaks kept by decimation, and ICA as
+topographies of the components.
+
+"""
+import io
+import math
+from contextlib import suppress
+from enum import StrEnum
+from functools import singledispatch
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, TypeAlias
+
+import numpy as np
+import numpy.typing as npt  # noqa: WPS301
+from matplotlib import rc_context
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from quickfif.config import UnsupportedOperationError
+from quickfif.fiff.channels import channel_indices_by_type
+from quickfif.fiff.sampling import pick_evenly
+from quickfif.pyramid import (
+    MAX,
+    MIN,
+    get_chunk_size,
+    get_sidecar_path,
+    open_pyramid,
+    reduce_samples,
+)
+from quickfif.qf_types.base import QfType
+from quickfif.qf_types.epochs_type import QfEpochs
+from quickfif.qf_types.ica_type import QfIca
+from quickfif.qf_types.raw_type import QfRaw
+from quickfif.sparklines import NON_SIGNAL_TYPES
+
+if TYPE_CHECKING:  # pragma: no cover
+    from mne import Info
+    from mne.io import Raw
+
+DPI: Final = 100
+FONT_SIZE: Final = 7
+MAX_TYPES: Final = 3  # channel types drawn as butterfly plots, most numerous first
+MAX_STACKED: Final = 16  # channels drawn as stacked traces, evenly picked
+MAX_EPOCHS: Final = 256  # epochs in the image, evenly picked
+MAX_COMPONENTS: Final = 20
+FILL_ALPHA: Final = 0.3
+TIME_LABEL: Final = "Time, s"
+
+Floats: TypeAlias = npt.NDArray[np.float64]
+Envelope: TypeAlias = tuple[Floats, Floats]  # mins and maxs, (channel, pixel column)
+
+
+class TraceStyle(StrEnum):
+    """Styles of raw traces; values are the choices of `--style` option."""
+
+    butterfly = "butterfly"  # channels of a type overlaid, a plot per type
+    stacked = "stacked"  # a few channels one under another
+
+
+def render_png(qf_obj: QfType, width: int, height: int, style: TraceStyle) -> bytes:
+    """
+    Draw QfType object as PNG of `width` by `height` pixels.
+
+    Raises
+    ------
+    UnsupportedOperationError
+        If the file type can't be drawn
+    ValueError
+        If there is nothing to draw
+
+    """
+    fig = Figure(figsize=(width / DPI, height / DPI), dpi=DPI, layout="constrained")
+    FigureCanvasAgg(fig)
+    with rc_context({"font.size": FONT_SIZE}):
+        draw(qf_obj, fig, style)
+        png = io.BytesIO()
+        fig.savefig(png, format="png")
+    return png.getvalue()
+
+
+@singledispatch
+def draw(qf_obj: QfType, fig: Figure, style: TraceStyle) -> None:
+    """Draw file contents on the figure."""
+    raise UnsupportedOperationError(f"Drawing is not supported for {qf_obj.fpath}")
+
+
+@draw.register
+def _draw_raw(qf_obj: QfRaw, fig: Figure, style: TraceStyle) -> None:
+    """Draw envelopes of raw traces of the most numerous channel types."""
+    picks_by_type = get_signal_picks(qf_obj.raw.info)
+    if style == TraceStyle.stacked:
+        all_picks = sorted(idx for picks in picks_by_type.values() for idx in picks)
+        _draw_stacked_raw(qf_obj, fig, all_picks)
+    else:
+        _draw_butterfly_raw(qf_obj, fig, dict(list(picks_by_type.items())[:MAX_TYPES]))
+
+
+@draw.register
+def _draw_epochs(qf_obj: QfEpochs, fig: Figure, style: TraceStyle) -> None:
+    """Draw global field power of the most numerous channel type, epoch by time."""
+    epochs = qf_obj.epochs
+    if not len(epochs):
+        raise ValueError("No epochs to draw")
+    ch_type, picks = next(iter(get_signal_picks(epochs.info).items()))
+    selected = pick_evenly(len(epochs), MAX_EPOCHS)
+    gfp = epochs[selected].get_data(picks=picks, verbose=False).std(axis=1)  # (epoch, time)
+    ax = fig.add_subplot()
+    ax.imshow(
+        _decimate(gfp, _get_width(fig)),
+        aspect="auto",
+        origin="lower",
+        extent=(epochs.tmin, epochs.tmax, 0, len(selected)),
+        interpolation="nearest",
+    )
+    title = "GFP of {0} {1}".format(len(picks), ch_type)
+    ax.set(xlabel=TIME_LABEL, ylabel="Epoch", title=title)
+
+
+@draw.register
+def _draw_ica(qf_obj: QfIca, fig: Figure, style: TraceStyle) -> None:
+    """Draw topographies of the components or their weights if channels have no positions."""
+    from mne import pick_info  # noqa: WPS433 (heavy import, see `quickfif.config`)
+
+    ica = qf_obj.ica
+    ch_type, picks = next(iter(get_signal_picks(ica.info).items()))
+    components = ica.get_components()[picks, :MAX_COMPONENTS]
+    try:
+        _draw_topomaps(fig, components, pick_info(ica.info, picks), ch_type)
+    except (RuntimeError, ValueError):  # no channel positions
+        fig.clear()
+        ax = fig.add_subplot()
+        ax.imshow(components.T, aspect="auto", cmap="RdBu_r", interpolation="nearest")
+        ax.set(xlabel=f"{ch_type} channel", ylabel="Component", title="ICA weights")
+
+
+def get_signal_picks(ii: "Info") -> dict[str, list[int]]:
+    """
+    Get indices of channels by signal channel type, most numerous type first.
+
+    Raises
+    ------
+    ValueError
+        If there are no signal channels
+
+    """
+    picks_by_type = {
+        ch_type: picks
+        for ch_type, picks in channel_indices_by_type(ii["chs"]).items()
+        if picks and ch_type not in NON_SIGNAL_TYPES
+    }
+    if not picks_by_type:
+        raise ValueError("No signal channels to draw")
+    by_size = sorted(picks_by_type.items(), key=lambda type_item: len(type_item[1]))
+    return dict(reversed(by_size))
+
+
+def read_envelope(fpath: Path, raw: "Raw", picks: list[int], width: int) -> Envelope:
+    """Get min/max envelope of raw channels in `width` columns; see the module docstring."""
+    sidecar = get_sidecar_path(fpath)
+    with suppress(OSError, ValueError):
+        if sidecar.stat().st_mtime_ns >= _get_newest_mtime_ns(raw):
+            envelope = open_pyramid(sidecar).query(width, picks=picks)
+            return envelope.mins.astype(np.float64), envelope.maxs.astype(np.float64)
+    bin_size = _get_bin_size(raw.n_times, width)
+    chunk_size = get_chunk_size(len(picks), bin_size)
+    chunks = [
+        reduce_samples(raw.get_data(picks, start, start + chunk_size), bin_size)
+        for start in range(0, raw.n_times, chunk_size)
+    ]
+    stats = np.concatenate(chunks, axis=1).astype(np.float64)
+    return stats[MIN].T, stats[MAX].T
+
+
+def _get_newest_mtime_ns(raw: "Raw") -> int:
+    """Get modification time of the split changed last; the sidecar is fresh if it's newer."""
+    return max(Path(fname).stat().st_mtime_ns for fname in raw.filenames if fname is not None)
+
+
+def _get_bin_size(n_times: int, width: int) -> int:
+    return max(-(-n_times // width), 1)
+
+
+def _decimate(rows: Floats, width: int) -> Floats:
+    """Keep maximum of each of `width` bins of the rows, so peaks survive decimation."""
+    return reduce_samples(rows, _get_bin_size(rows.shape[1], width))[MAX].T
+
+
+def _get_width(fig: Figure) -> int:
+    return round(fig.get_figwidth() * DPI)
+
+
+def _draw_butterfly_raw(qf_obj: QfRaw, fig: Figure, picks_by_type: dict[str, list[int]]) -> None:
+    grid = fig.subplots(len(picks_by_type), 1, sharex=True, squeeze=False)
+    for ax, (ch_type, picks) in zip(grid[:, 0], picks_by_type.items()):
+        envelope = read_envelope(qf_obj.fpath, qf_obj.raw, picks, _get_width(fig))
+        _draw_butterfly(ax, qf_obj.raw.times[-1], envelope, ch_type)
+    grid[-1, 0].set_xlabel(TIME_LABEL)
+
+
+def _draw_stacked_raw(qf_obj: QfRaw, fig: Figure, all_picks: list[int]) -> None:
+    picks = [all_picks[idx] for idx in pick_evenly(len(all_picks), MAX_STACKED)]
+    envelope = read_envelope(qf_obj.fpath, qf_obj.raw, picks, _get_width(fig))
+    names = [qf_obj.raw.ch_names[idx] for idx in picks]
+    _draw_stacked(fig.add_subplot(), qf_obj.raw.times[-1], envelope, names)
+
+
+def _draw_topomaps(fig: Figure, components: Floats, pos: "Info", ch_type: str) -> None:
+    """Draw topographies of the components in a grid of the figure aspect."""
+    from mne.viz import plot_topomap  # noqa: WPS433 (heavy import, see `quickfif.config`)
+
+    n_components = components.shape[1]
+    aspect = fig.get_figwidth() / fig.get_figheight()
+    n_cols = math.ceil(math.sqrt(n_components * aspect))
+    n_rows = -(-n_components // n_cols)
+    for idx, weights in enumerate(components.T):
+        ax = fig.add_subplot(n_rows, n_cols, idx + 1)
+        plot_topomap(weights, pos, ch_type=ch_type, axes=ax, show=False)
+        ax.set_title(f"ICA{idx:03}")
+
+
+def _draw_butterfly(ax: Axes, duration: float, envelope: Envelope, ch_type: str) -> None:
+    mins, maxs = envelope
+    times = np.linspace(0, duration, mins.shape[1])
+    for ch_mins, ch_maxs in zip(mins, maxs):
+        ax.fill_between(times, ch_mins, ch_maxs, alpha=FILL_ALPHA, linewidth=0)
+    ax.set(ylabel=ch_type, yticks=[])
+    ax.margins(x=0)
+
+
+def _draw_stacked(ax: Axes, duration: float, envelope: Envelope, names: list[str]) -> None:
+    """Draw each channel in its own row, centered and scaled by its median span."""
+    offsets = np.arange(len(names))[::-1, np.newaxis]
+    lows, highs = _normalize_rows(envelope)
+    times = np.linspace(0, duration, lows.shape[1])
+    for ch_lows, ch_highs in zip(lows + offsets, highs + offsets):
+        ax.fill_between(times, ch_lows, ch_highs, linewidth=0)
+    ax.set(xlabel=TIME_LABEL, yticks=offsets[:, 0], yticklabels=names)
+    ax.margins(x=0)
+
+
+def _normalize_rows(envelope: Envelope) -> Envelope:
+    """Center each channel at zero and scale its typical span to half of the row; flat get 1."""
+    mins, maxs = envelope
+    centers = np.median((mins + maxs) / 2, axis=1, keepdims=True)
+    spans = np.median(maxs - mins, axis=1, keepdims=True) * 2
+    scales = np.where(spans > 0, spans, 1)
+    return (mins - centers) / scales, (maxs - centers) / scales
@@ -0,0 +1,147 @@
+"""
+Copying files which don't change on save without decoding them.
+
+A single FIFF file refers to no other files, so saving it under a new name
+produces the same content as copying. The copy is done by the kernel when the
+platform allows: reflink first (no data is copied at all on CoW file systems
+like btrfs or XFS), then `copy_file_range` and `sendfile`. Copying in user
+space is the last resort.
+
+"""
+import errno
+import os
+import shutil
+import sys
+from enum import StrEnum
+from pathlib import Path
+from typing import BinaryIO, Final
+
+FICLONE: Final = 0x40049409  # ioctl request for reflink on Linux, see ioctl_ficlone(2)
+# Errors meaning the copying method is not supported for these files; we try the next one
+UNSUPPORTED_ERRNOS: Final = frozenset((
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.EINVAL,
+    errno.ENOTTY,
+    errno.EBADF,
+))
+COMPRESSED_SUFFIX: Final = ".gz"
+# Files are split on save by mne only when they don't fit in 2GB, i.e. a single file never is
+DEFAULT_SPLIT_SIZE: Final = "2GB"
+
+
+class SaveMethod(StrEnum):
+    """How the file was saved; reported by `saveas`."""
+
+    reflink = "reflink"
+    copy_file_range = "copy_file_range"
+    sendfile = "sendfile"
+    userspace = "userspace copy"
+    rewrite = "mne rewrite"
+
+
+def copy_unchanged(src: Path, dst: Path, overwrite: bool) -> SaveMethod | None:
+    """
+    Copy file as is when saving it under a new name wouldn't change the content.
+
+    Returns
+    -------
+    SaveMethod | None
+        How the file was copied or None if it has to be rewritten by mne: the
+        file doesn't exist, is split, changes compression or is saved onto itself
+
+    Raises
+    ------
+    FileExistsError
+        If destination exists and `overwrite` is not set
+
+    """
+    if not src.is_file() or dst.exists() and dst.samefile(src):
+        return None
+    if src.name.endswith(COMPRESSED_SUFFIX) != dst.name.endswith(COMPRESSED_SUFFIX):
+        return None
+    from quickfif.fiff.raw import has_next_file  # noqa: WPS433 (imports numpy)
+
+    try:
+        is_split = has_next_file(src)
+    except ValueError:
+        return None  # mne read the file, so let mne write it
+    return None if is_split else copy_file(src, dst, overwrite)
+
+
+def copy_file(src: Path, dst: Path, overwrite: bool) -> SaveMethod:
+    """
+    Copy file with the fastest method available; `dst` appears atomically.
+
+    Raises
+    ------
+    FileExistsError
+        If destination exists and `overwrite` is not set
+
+    """
+    if dst.exists() and not overwrite:
+        raise FileExistsError(errno.EEXIST, "Destination exists", str(dst))
+    tmp_fpath = dst.with_name(f".{dst.name}.{os.getpid()}.tmp")
+    try:
+        with src.open("rb") as fsrc:
+            with tmp_fpath.open("wb") as fdst:
+                method = _copy_fileobj(fsrc, fdst)
+    except OSError:
+        tmp_fpath.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_fpath, dst)
+    return method
+
+
+def _copy_fileobj(fsrc: BinaryIO, fdst: BinaryIO) -> SaveMethod:
+    size = os.fstat(fsrc.fileno()).st_size
+    for method, copy_func in KERNEL_COPY_FUNCS:
+        try:
+            copy_func(fsrc.fileno(), fdst.fileno(), size)
+        except OSError as exc:
+            if exc.errno not in UNSUPPORTED_ERRNOS:
+                raise
+            os.ftruncate(fdst.fileno(), 0)  # drop whatever was copied before the failure
+            continue
+        return method
+    fdst.seek(0)
+    shutil.copyfileobj(fsrc, fdst)
+    return SaveMethod.userspace
+
+
+def _reflink(src_fd: int, dst_fd: int, size: int) -> None:
+    if sys.platform != "linux":
+        raise OSError(errno.ENOTSUP, "Reflink is only supported on Linux")
+    import fcntl  # noqa: WPS433 (not available on Windows)
+
+    fcntl.ioctl(dst_fd, FICLONE, src_fd)
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, size: int) -> None:
+    if sys.platform != "linux":
+        raise OSError(errno.ENOSYS, "copy_file_range is only supported on Linux")
+    copied = 0
+    while copied < size:
+        n_bytes = os.copy_file_range(src_fd, dst_fd, size - copied, copied, copied)
+        if not n_bytes:
+            break  # source was truncated while copying
+        copied += n_bytes
+
+
+def _sendfile(src_fd: int, dst_fd: int, size: int) -> None:
+    os.lseek(dst_fd, 0, os.SEEK_SET)
+    copied = 0
+    while copied < size:
+        n_bytes = os.sendfile(dst_fd, src_fd, copied, size - copied)
+        if not n_bytes:
+            break
+        copied += n_bytes
+
+
+KERNEL_COPY_FUNCS: Final = (
+    (SaveMethod.reflink, _reflink),
+    (SaveMethod.copy_file_range, _copy_file_range),
+    (SaveMethod.sendfile, _sendfile),
+)
@@ -0,0 +1,8 @@
+"""
+Lightweight FIFF reading.
+
+Pure Python/NumPy access to the FIFF tag directory and the few blocks needed
+for previews. mne is never imported; data buffers are decoded only to glance
+at a few evenly spaced samples of the signal.
+
+"""
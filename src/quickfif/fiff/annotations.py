@@ -0,0 +1,62 @@
+"""Annotations block reading."""
+from dataclasses import dataclass, field
+from typing import BinaryIO
+
+import numpy as np
+import numpy.typing as npt  # noqa: WPS301
+
+from quickfif.fiff import constants as const
+from quickfif.fiff.tag import DirEntry, read_array, read_string
+from quickfif.fiff.tree import Node
+
+
+def _empty_floats() -> npt.NDArray[np.float64]:
+    return np.empty(0, dtype=np.float64)
+
+
+@dataclass
+class FifAnnotations(object):
+    """Onsets, durations and descriptions of annotations; mirrors `mne.Annotations` fields."""
+
+    onset: npt.NDArray[np.float64] = field(default_factory=_empty_floats)
+    duration: npt.NDArray[np.float64] = field(default_factory=_empty_floats)
+    description: npt.NDArray[np.str_] = field(default_factory=lambda: np.empty(0, dtype=str))
+
+    def __len__(self) -> int:
+        """Get number of annotations."""
+        return len(self.onset)
+
+
+def read_annotations(fid: BinaryIO, tree: Node) -> FifAnnotations:
+    """Read annotations from FIFFB_MNE_ANNOTATIONS block. Empty if there's no such block."""
+    blocks = tree.find(const.FIFFB_MNE_ANNOTATIONS)
+    if not blocks:
+        return FifAnnotations()
+    block = blocks[0]
+
+    onset = _read_floats(fid, block.entries_of(const.FIFF_MNE_BASELINE_MIN))
+    offset = _read_floats(fid, block.entries_of(const.FIFF_MNE_BASELINE_MAX))
+    descriptions = block.entries_of(const.FIFF_COMMENT)
+    description = _read_name_list(fid, descriptions[0]) if descriptions else []
+    if len({len(onset), len(offset), len(description)}) != 1:
+        raise ValueError("Inconsistent annotations block")
+    # the file stores offsets; compute durations in file precision as mne does
+    return FifAnnotations(
+        onset=onset.astype(np.float64),
+        duration=(offset - onset).astype(np.float64),
+        description=np.array(description, dtype=str),
+    )
+
+
+def _read_floats(fid: BinaryIO, entries: list[DirEntry]) -> npt.NDArray[np.float32]:
+    if not entries or not entries[0].size:
+        return np.empty(0, dtype=np.float32)
+    return read_array(fid, entries[0], ">f4").astype(np.float32)
+
+
+def _read_name_list(fid: BinaryIO, ent: DirEntry) -> list[str]:
+    """Read colon-separated list with colons in names escaped as in mne."""
+    names = read_string(fid, ent)
+    if not names:
+        return []
+    return [name.replace("{COLON}", ":") for name in names.split(":")]
@@ -0,0 +1,86 @@
+"""Channel info structs and channel types."""
+import struct
+from types import MappingProxyType
+from typing import Final, TypedDict
+
+# Channel info struct fields: scan number, logical number, kind, range, calibration,
+# coil type, location (12 floats), unit, unit multiplier, name (16 chars)
+CH_INFO_STRUCT: Final = struct.Struct(">iiiffi12fii16s")
+
+# Channel types in the order `mne.channel_indices_by_type` lists them
+CH_TYPES_ORDER: Final = (
+    "eeg", "csd", "stim", "eog", "ecg", "emg", "misc", "resp", "chpi", "exci", "ias", "syst",
+    "seeg", "dipole", "gof", "bio", "ecog", "dbs", "temperature", "gsr", "ref_meg", "mag",
+    "grad", "hbo", "hbr", "fnirs_cw_amplitude", "fnirs_fd_ac_amplitude", "fnirs_fd_phase",
+    "fnirs_od", "eyegaze", "pupil",
+)
+
+# First rule: channel kind to type (see `mne._fiff.pick._first_rule`)
+_KIND_TO_TYPE: Final = MappingProxyType({
+    1: "meg", 2: "eeg", 3: "stim", 102: "bio", 202: "eog", 301: "ref_meg", 302: "emg",
+    402: "ecg", 502: "misc", 602: "resp", 802: "seeg", 803: "dbs", 900: "syst", 902: "ecog",
+    910: "ias", 920: "exci", 1000: "dipole", 1001: "gof", 1100: "fnirs", 1200: "temperature",
+    1300: "gsr", 1400: "eyetrack", 700: "chpi", 701: "chpi", 702: "chpi", 703: "chpi",
+    704: "chpi", 705: "chpi", 706: "chpi", 707: "chpi", 708: "chpi", 709: "chpi",
+})
+# Second rule: refine the type using either unit or coil type of the channel
+_SUBTYPES: Final = MappingProxyType({
+    "meg": ("unit", {201: "grad", 112: "mag"}),
+    "eeg": ("coil_type", {0: "eeg", 1: "eeg", 5: "eeg", 6: "csd"}),
+    "fnirs": (
+        "coil_type",
+        {
+            300: "hbo",
+            301: "hbr",
+            302: "fnirs_cw_amplitude",
+            303: "fnirs_od",
+            304: "fnirs_fd_ac_amplitude",
+            305: "fnirs_fd_phase",
+        },
+    ),
+    "eyetrack": ("coil_type", {400: "eyegaze", 401: "pupil"}),
+})
+
+
+class ChInfo(TypedDict):
+    """Subset of `mne.Info['chs']` entries fields."""
+
+    ch_name: str
+    kind: int
+    range: float  # noqa: WPS125 (same name as in mne)
+    cal: float
+    coil_type: int
+    unit: int
+
+
+def read_ch_info(ch_bytes: bytes) -> ChInfo:
+    """Decode channel info struct tag data."""
+    fields = CH_INFO_STRUCT.unpack(ch_bytes[: CH_INFO_STRUCT.size])
+    raw_name: bytes = fields[-1]
+    return ChInfo(
+        ch_name=raw_name.split(b"\0", 1)[0].decode(),
+        kind=fields[2],
+        range=fields[3],
+        cal=fields[4],
+        coil_type=fields[5],
+        unit=fields[-3],
+    )
+
+
+def channel_type(ch: ChInfo) -> str:
+    """Get channel type the same way `mne.channel_type` does."""
+    ch_type = _KIND_TO_TYPE.get(ch["kind"], "")
+    subtype_rule = _SUBTYPES.get(ch_type)
+    if subtype_rule is not None:
+        key, subtypes = subtype_rule
+        ch_type = subtypes.get(ch[key], "")  # type: ignore[literal-required]
+    return ch_type
+
+
+def channel_indices_by_type(chs: list[ChInfo]) -> dict[str, list[int]]:
+    """Get indices of channels by type; works with `mne.Info['chs']` too."""
+    ch_types = [channel_type(ch) for ch in chs]
+    return {
+        ch_type: [idx for idx, this_type in enumerate(ch_types) if this_type == ch_type]
+        for ch_type in CH_TYPES_ORDER
+    }
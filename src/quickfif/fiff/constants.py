@@ -0,0 +1,55 @@
+"""FIFF constants used by the lightweight reader (values match `mne.io.constants.FIFF`)."""
+from typing import Final
+
+# Tags
+FIFF_FILE_ID: Final = 100
+FIFF_DIR_POINTER: Final = 101
+FIFF_BLOCK_ID: Final = 103
+FIFF_BLOCK_START: Final = 104
+FIFF_BLOCK_END: Final = 105
+FIFF_PARENT_BLOCK_ID: Final = 110
+FIFF_REF_ROLE: Final = 115
+FIFF_REF_FILE_NUM: Final = 117
+FIFF_REF_FILE_NAME: Final = 118
+FIFF_NCHAN: Final = 200
+FIFF_SFREQ: Final = 201
+FIFF_CH_INFO: Final = 203
+FIFF_MEAS_DATE: Final = 204
+FIFF_COMMENT: Final = 206
+FIFF_FIRST_SAMPLE: Final = 208
+FIFF_EXPERIMENTER: Final = 212
+FIFF_LOWPASS: Final = 219
+FIFF_HIGHPASS: Final = 223
+FIFF_CH_DACQ_NAME: Final = 258
+FIFF_DATA_BUFFER: Final = 300
+FIFF_DATA_SKIP: Final = 301
+FIFF_MNE_BASELINE_MIN: Final = 3568
+FIFF_MNE_BASELINE_MAX: Final = 3569
+
+# Blocks
+FIFFB_MEAS: Final = 100
+FIFFB_MEAS_INFO: Final = 101
+FIFFB_RAW_DATA: Final = 102
+FIFFB_CONTINUOUS_DATA: Final = 112
+FIFFB_CH_INFO: Final = 113
+FIFFB_REF: Final = 118
+FIFFB_MNE_ANNOTATIONS: Final = 3810
+
+# Tag data types
+FIFFT_SHORT: Final = 2
+FIFFT_INT: Final = 3
+FIFFT_FLOAT: Final = 4
+FIFFT_DOUBLE: Final = 5
+FIFFT_STRING: Final = 10
+FIFFT_DAU_PACK16: Final = 16
+FIFFT_COMPLEX_FLOAT: Final = 20
+FIFFT_COMPLEX_DOUBLE: Final = 21
+FIFFT_ID_STRUCT: Final = 31
+FIFFT_DIR_ENTRY_STRUCT: Final = 32
+
+# Values
+FIFFV_NEXT_SEQ: Final = 0
+FIFFV_ROLE_PREV_FILE: Final = 1
+FIFFV_ROLE_NEXT_FILE: Final = 2
+DATE_NONE_USECS: Final = 2147483647  # max int32
+DATE_NONE: Final = (0, DATE_NONE_USECS)
@@ -0,0 +1,103 @@
+"""Measurement info block reading."""
+import math
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, TypedDict
+
+from quickfif.fiff import constants as const
+from quickfif.fiff.channels import ChInfo, read_ch_info
+from quickfif.fiff.tag import Stamp, read_array, read_bytes, read_float, read_int, read_string
+from quickfif.fiff.tree import Node
+
+
+class MeasInfo(TypedDict):
+    """Subset of `mne.Info` fields needed for previews."""
+
+    nchan: int
+    sfreq: float
+    highpass: float
+    lowpass: float
+    meas_date: datetime | None
+    experimenter: str | None
+    chs: list[ChInfo]
+    ch_names: list[str]
+
+
+def read_meas_info(fid: BinaryIO, tree: Node) -> MeasInfo:
+    """
+    Read measurement info from FIFFB_MEAS_INFO block.
+
+    Raises
+    ------
+    ValueError
+        If the file has no measurement info or sampling frequency
+
+    """
+    meas, meas_info = _find_meas_blocks(tree)
+    sfreq = _read_optional_float(fid, meas_info, const.FIFF_SFREQ)
+    if sfreq is None:
+        raise ValueError("Sampling frequency is missing")
+    highpass = _read_optional_float(fid, meas_info, const.FIFF_HIGHPASS)
+    lowpass = _read_optional_float(fid, meas_info, const.FIFF_LOWPASS)
+    experimenter = meas_info.entries_of(const.FIFF_EXPERIMENTER)
+    chs = _read_chs(fid, meas_info)
+    return MeasInfo(
+        nchan=read_int(fid, meas_info.entries_of(const.FIFF_NCHAN)[0]),
+        sfreq=sfreq,
+        highpass=0.0 if highpass is None else highpass,  # noqa: WPS358 (mne default)
+        lowpass=sfreq / 2 if lowpass is None else lowpass,
+        meas_date=_read_meas_date(fid, [tree, meas, meas_info]),
+        experimenter=read_string(fid, experimenter[0]) if experimenter else None,
+        chs=chs,
+        ch_names=[ch["ch_name"] for ch in chs],
+    )
+
+
+def _find_meas_blocks(tree: Node) -> tuple[Node, Node]:
+    meas_blocks = tree.find(const.FIFFB_MEAS)
+    info_blocks = meas_blocks[0].find(const.FIFFB_MEAS_INFO) if meas_blocks else []
+    if not info_blocks:
+        raise ValueError("Could not find measurement info")
+    return meas_blocks[0], info_blocks[0]
+
+
+def _read_chs(fid: BinaryIO, meas_info: Node) -> list[ChInfo]:
+    """Read channel infos replacing truncated names with long ones when they're stored."""
+    chs = [read_ch_info(read_bytes(fid, ent)) for ent in meas_info.entries_of(const.FIFF_CH_INFO)]
+    ext_blocks = [child for child in meas_info.children if child.block == const.FIFFB_CH_INFO]
+    for ext_block, ch in zip(ext_blocks, chs):
+        name_entries = ext_block.entries_of(const.FIFF_CH_DACQ_NAME)
+        if name_entries:
+            ch["ch_name"] = read_string(fid, name_entries[0])
+    return chs
+
+
+def _read_optional_float(fid: BinaryIO, node: Node, kind: int) -> float | None:
+    entries = node.entries_of(kind)
+    if not entries:
+        return None
+    tag_value = read_float(fid, entries[0])
+    return None if math.isnan(tag_value) else tag_value
+
+
+def _read_meas_date(fid: BinaryIO, nodes: list[Node]) -> datetime | None:
+    """
+    Read measurement date falling back to measurement id like mne does.
+
+    `nodes` are the root, measurement and measurement info blocks.
+
+    """
+    root, meas, meas_info = nodes
+    date_entries = meas_info.entries_of(const.FIFF_MEAS_DATE)
+    if date_entries:
+        stamp = read_array(fid, date_entries[0], ">i4").tolist() + [0]  # usecs may be missing
+        return _stamp_to_dt((stamp[0], stamp[1]))
+    candidates = (meas_info.parent_id, meas_info.block_id, meas.block_id, meas.parent_id)
+    meas_id = next((stamp for stamp in candidates if stamp is not None), root.block_id)
+    return None if meas_id is None else _stamp_to_dt(meas_id)
+
+
+def _stamp_to_dt(stamp: Stamp) -> datetime | None:
+    if stamp == const.DATE_NONE:
+        return None
+    secs, usecs = stamp
+    return datetime.fromtimestamp(0, tz=timezone.utc) + timedelta(seconds=secs, microseconds=usecs)
@@ -0,0 +1,461 @@
+"""
+Moving split sets without rewriting the data.
+
+Splits refer to each other by file names stored in FIFFB_REF blocks, so a plain
+`mv` breaks the set. Here only the reference tags are patched, which takes time
+proportional to the header size. A new name of the same length is written over
+the old one. A name of a different length is appended to the end of the file
+and the preceding tag is relinked to it, so readers following the tags (mne and
+`quickfif.fiff.tree` alike) skip the old name.
+
+"""
+import errno
+import os
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Callable, Final
+
+from quickfif.fiff import constants as const
+from quickfif.fiff.raw import MAX_SPLITS
+from quickfif.fiff.tag import TAG_HEADER, DirEntry, read_int, read_string
+from quickfif.fiff.tree import build_tree, read_dir_pointer, read_directory
+
+NEXT_FIELD: Final = struct.Struct(">i")
+NEXT_FIELD_OFFSET: Final = TAG_HEADER.size - NEXT_FIELD.size
+NO_DIRECTORY: Final = NEXT_FIELD.pack(-1)
+MAX_FILE_POS: Final = 2**31 - 1  # noqa: WPS432 (tag positions are int32)
+# Errors of `os.link` on file systems without hard links; we rename the file then
+LINK_UNSUPPORTED: Final = frozenset((errno.EPERM, errno.EOPNOTSUPP, errno.ENOTSUP))
+
+
+@dataclass(frozen=True)
+class Ref(object):
+    """Reference to another split file and the position of its file name tag."""
+
+    role: int
+    num: int | None
+    fname: str
+    name_tag: DirEntry
+    link_pos: int  # position of the 'next' field of the tag preceding the name
+    after_pos: int  # position of the tag following the name
+
+
+@dataclass(frozen=True)
+class NamePatch(object):
+    """New value for the file name tag of a reference."""
+
+    ref: Ref
+    fname: bytes
+
+    @property
+    def is_inplace(self) -> bool:
+        """Whether the new name fits in place of the old one."""
+        return len(self.fname) == self.ref.name_tag.size
+
+
+@dataclass(frozen=True)
+class Overwrite(object):
+    """Bytes to write over the file content at a position."""
+
+    pos: int
+    new_bytes: bytes
+
+    @property
+    def end(self) -> int:
+        """Get position after the overwritten bytes."""
+        return self.pos + len(self.new_bytes)
+
+
+@dataclass
+class Split(object):
+    """Split file with its references and the patches to apply on move."""
+
+    fpath: Path
+    size: int
+    refs: list[Ref]
+    dir_pointer: DirEntry
+    patches: list[NamePatch] = field(default_factory=list)
+
+    def find_ref(self, role: int) -> Ref | None:
+        """Find reference with a given role."""
+        return next((ref for ref in self.refs if ref.role == role), None)
+
+
+def split_fnames(fpath: Path, n_splits: int, bids: bool) -> list[Path]:
+    """
+    Get split file names the way mne names them on save.
+
+    Examples
+    --------
+    >>> [fpath.name for fpath in split_fnames(Path("rec_raw.fif"), 3, bids=False)]
+    ['rec_raw.fif', 'rec_raw-1.fif', 'rec_raw-2.fif']
+    >>> [fpath.name for fpath in split_fnames(Path("sub-01_meg.fif"), 2, bids=True)]
+    ['sub-01_split-01_meg.fif', 'sub-01_split-02_meg.fif']
+    >>> split_fnames(Path("sub-01_meg.fif"), 1, bids=True)
+    [PosixPath('sub-01_meg.fif')]
+
+    """
+    if n_splits == 1:
+        return [fpath]
+    stem, ext = fpath.stem, fpath.suffix
+    if not bids:
+        tail = [f"{stem}-{idx}{ext}" for idx in range(1, n_splits)]
+        return [fpath] + [fpath.with_name(fname) for fname in tail]
+    base, _, modality = stem.rpartition("_")
+    if not base:
+        raise ValueError(f"BIDS file name must end with modality, e.g. '_meg': {fpath.name}")
+    split_ids = [f"split-{idx:02}" for idx in range(1, n_splits + 1)]
+    fnames = [f"{base}_{split_id}_{modality}{ext}" for split_id in split_ids]
+    return [fpath.with_name(fname) for fname in fnames]
+
+
+def move_splits(src: Path, dst: Path, bids: bool, overwrite: bool = False) -> list[Path]:
+    """
+    Move split set to `dst` patching the references between the splits.
+
+    The whole chain is read and checked before anything changes on disk. Then
+    the files are hard-linked to the new names (renamed where hard links aren't
+    supported), patched, and only after that the old names are removed. If
+    linking or patching fails, the patched bytes are restored and the new
+    names removed, so the split set stays as it was.
+
+    Parameters
+    ----------
+    src
+        First file of the split set
+    dst
+        New name of the first file, the rest of the splits are named after it;
+        when `dst` is a directory, the files keep their names
+    bids
+        Name splits as `_split-01_meg.fif` instead of `_raw-1.fif`
+    overwrite
+        Replace existing destination files
+
+    Returns
+    -------
+    list[Path]
+        New file names
+
+    Raises
+    ------
+    ValueError
+        If the split chain is broken or can't be patched in place
+    OSError
+        If destination exists or the files can't be moved
+
+    """
+    chain = read_chain(src)
+    if dst.is_dir():
+        dsts = [dst / split.fpath.name for split in chain]
+    else:
+        dsts = split_fnames(dst, len(chain), bids)
+    if [split.fpath.resolve() for split in chain] == [fpath.resolve() for fpath in dsts]:
+        return dsts
+    plan_patches(chain, dsts)
+    check_destinations(chain, dsts, overwrite)
+
+    is_linked = _place_all(chain, dsts, overwrite)
+    _patch_all(chain, dsts, is_linked)
+    for old_fpath, linked in zip([src_split.fpath for src_split in chain], is_linked):
+        if linked:
+            old_fpath.unlink()
+    return dsts
+
+
+def read_chain(src: Path) -> list[Split]:
+    """
+    Read references of all the files in the split set starting with `src`.
+
+    Raises
+    ------
+    ValueError
+        If the chain is broken, compressed or doesn't start with `src`
+
+    """
+    if src.name.endswith(".gz"):
+        raise ValueError("Compressed files can't be patched in place")
+    return follow_chain(src, read_split)
+
+
+def follow_chain(src: Path, read: Callable[[Path], Split]) -> list[Split]:
+    """
+    Read splits starting with `src` one by one, following the next file references.
+
+    `read` gets the path of each split and may read a transformed copy of it,
+    e.g. decompressed, in which case the splits of the chain refer to the copies.
+
+    Raises
+    ------
+    ValueError
+        If the chain is broken or doesn't start with `src`
+
+    """
+    chain = [read(src)]
+    if chain[0].find_ref(const.FIFFV_ROLE_PREV_FILE) is not None:
+        raise ValueError(f"{src.name} is not the first file of the split set")
+    fpaths = [src]
+    next_ref = chain[0].find_ref(const.FIFFV_ROLE_NEXT_FILE)
+    while next_ref is not None:
+        fpaths.append(_check_next_ref(fpaths, next_ref))
+        chain.append(read(fpaths[-1]))
+        next_ref = chain[-1].find_ref(const.FIFFV_ROLE_NEXT_FILE)
+    return chain
+
+
+def _check_next_ref(fpaths: list[Path], next_ref: Ref) -> Path:
+    """Check reference to the next split; get the split path."""
+    fpath = fpaths[0].parent / next_ref.fname
+    if len(fpaths) >= MAX_SPLITS or fpath in fpaths:
+        raise ValueError(f"Split chain loops at {fpath.name}")
+    idx = len(fpaths)
+    if next_ref.num is not None and next_ref.num != idx:
+        raise ValueError(f"{fpath.name} is referred as split {next_ref.num}, not {idx}")
+    if not fpath.exists():
+        raise ValueError(f"Split {fpath.name} is missing")
+    return fpath
+
+
+def read_split(fpath: Path) -> Split:
+    """Read references of uncompressed split file."""
+    with fpath.open("rb") as fid:
+        directory = read_directory(fid)
+        tree = build_tree(fid, directory)
+        refs = [_read_ref(fid, directory, node.entries) for node in tree.find(const.FIFFB_REF)]
+        dir_pointer = read_dir_pointer(fid)
+    valid_refs = [ref for ref in refs if ref is not None]
+    return Split(fpath, fpath.stat().st_size, valid_refs, dir_pointer)
+
+
+def _read_ref(fid: BinaryIO, directory: list[DirEntry], entries: list[DirEntry]) -> Ref | None:
+    kinds = {ent.kind: ent for ent in reversed(entries)}  # first entry of each kind wins
+    name_tag = kinds.get(const.FIFF_REF_FILE_NAME)
+    if const.FIFF_REF_ROLE not in kinds or name_tag is None:
+        return None
+    prev_tag = directory[directory.index(name_tag) - 1]
+    if _next_pos(fid, prev_tag) != name_tag.pos:
+        raise ValueError(f"Can't relink file name tag at position {name_tag.pos}")
+    num_tag = kinds.get(const.FIFF_REF_FILE_NUM)
+    return Ref(
+        role=read_int(fid, kinds[const.FIFF_REF_ROLE]),
+        num=read_int(fid, num_tag) if num_tag else None,
+        fname=read_string(fid, name_tag),
+        name_tag=name_tag,
+        link_pos=prev_tag.pos + NEXT_FIELD_OFFSET,
+        after_pos=_next_pos(fid, name_tag),
+    )
+
+
+def _next_pos(fid: BinaryIO, ent: DirEntry) -> int:
+    """Get position of the tag following `ent` from its 'next' field."""
+    fid.seek(ent.pos + NEXT_FIELD_OFFSET)
+    next_pos = NEXT_FIELD.unpack(fid.read(NEXT_FIELD.size))[0]
+    return ent.data_pos + ent.size if next_pos == const.FIFFV_NEXT_SEQ else next_pos
+
+
+def plan_patches(chain: list[Split], dsts: list[Path]) -> None:
+    """
+    Add patches renaming the references to `dsts` to the splits.
+
+    Raises
+    ------
+    ValueError
+        If the new names can't be stored in the files
+
+    """
+    for idx, split in enumerate(chain):
+        for ref in split.refs:
+            fname = _get_new_fname(ref, idx, dsts)
+            if fname is not None:
+                split.patches.append(NamePatch(ref, _encode(fname)))
+        _check_room(split)
+
+
+def _get_new_fname(ref: Ref, idx: int, dsts: list[Path]) -> str | None:
+    if ref.role == const.FIFFV_ROLE_NEXT_FILE:
+        return dsts[idx + 1].name
+    if ref.role == const.FIFFV_ROLE_PREV_FILE:
+        # mne stores the previous file name with the directory it was saved to
+        prev = dsts[idx - 1]
+        return str(prev.absolute()) if os.sep in ref.fname else prev.name
+    return None
+
+
+def _check_room(split: Split) -> None:
+    """Check relinked names fit in int32 tag positions."""
+    appended = [TAG_HEADER.size + len(pt.fname) for pt in split.patches if not pt.is_inplace]
+    if split.size + sum(appended) > MAX_FILE_POS:
+        fname = split.fpath.name
+        raise ValueError(f"No room for new file names in {fname}")
+
+
+def _encode(fname: str) -> bytes:
+    try:
+        return fname.encode("latin1")  # FIFF strings are latin1-encoded
+    except UnicodeEncodeError:
+        raise ValueError(f"File name can't be stored in FIFF file: {fname}")
+
+
+def check_destinations(chain: list[Split], dsts: list[Path], overwrite: bool) -> None:
+    """
+    Check the splits can be written to `dsts`.
+
+    Raises
+    ------
+    ValueError
+        If one of destinations is a source split
+    FileExistsError
+        If destination exists and `overwrite` is not set
+
+    """
+    srcs = {split.fpath.resolve() for split in chain}
+    for fpath in dsts:
+        if fpath.resolve() in srcs:
+            raise ValueError(f"Destination {fpath} is one of the source splits")
+        if fpath.exists() and not overwrite:
+            raise FileExistsError(errno.EEXIST, "Destination exists", str(fpath))
+
+
+def _place_all(chain: list[Split], dsts: list[Path], overwrite: bool) -> list[bool]:
+    """Give the files their new names; on failure restore the old ones."""
+    is_linked: list[bool] = []
+    try:
+        for split, dst in zip(chain, dsts):
+            if overwrite:
+                dst.unlink(missing_ok=True)
+            is_linked.append(_place(split.fpath, dst))
+    except OSError:
+        _unplace_all(chain, dsts, is_linked)
+        raise
+    return is_linked
+
+
+def _unplace_all(chain: list[Split], dsts: list[Path], is_linked: list[bool]) -> None:
+    """Remove the new names given by `_place_all`, renaming back the moved files."""
+    for placed, new_fpath, linked in zip(chain, dsts, is_linked):
+        if linked:
+            new_fpath.unlink()
+        else:
+            new_fpath.rename(placed.fpath)
+
+
+def _place(src: Path, dst: Path) -> bool:
+    """Hard-link `src` to `dst` or rename it if hard links aren't supported."""
+    try:
+        os.link(src, dst)  # unlike rename, never replaces an existing file
+    except OSError as exc:
+        if exc.errno not in LINK_UNSUPPORTED:
+            raise
+        src.rename(dst)
+        return False
+    return True
+
+
+def get_patch_edits(split: Split) -> tuple[list[Overwrite], bytes]:
+    """
+    Express the patches of split as edits of its content, for writing it elsewhere.
+
+    Returns
+    -------
+    overwrites
+        Bytes to write over the content
+    appended
+        Bytes to append to the content
+
+    """
+    overwrites = []
+    appended = bytearray()
+    for patch in split.patches:
+        if patch.is_inplace:
+            overwrites.append(Overwrite(patch.ref.name_tag.data_pos, patch.fname))
+        else:
+            new_pos = split.size + len(appended)
+            overwrites.append(Overwrite(patch.ref.link_pos, NEXT_FIELD.pack(new_pos)))
+            appended += _pack_name_tag(patch)
+    if not all(pt.is_inplace for pt in split.patches):
+        overwrites.append(Overwrite(split.dir_pointer.data_pos, NO_DIRECTORY))
+    return overwrites, bytes(appended)
+
+
+def apply_patches(fpath: Path, split: Split) -> None:
+    """
+    Write new file names; each patch takes effect with a single small write.
+
+    The relinked names are appended and synced first. The file then switches
+    to them when the preceding tag is pointed at the new name. A stored tag
+    directory would still point at the old name, so it's dropped and readers
+    walk the tags instead.
+
+    """
+    with fpath.open("r+b") as fid:
+        for patch in split.patches:
+            if patch.is_inplace:
+                fid.seek(patch.ref.name_tag.data_pos)
+                fid.write(patch.fname)
+            else:
+                _relink(fid, patch)
+        if not all(pt.is_inplace for pt in split.patches):
+            fid.seek(split.dir_pointer.data_pos)
+            fid.write(NO_DIRECTORY)
+        fid.flush()
+        os.fsync(fid.fileno())
+
+
+def read_overwritten(fpath: Path, split: Split) -> list[Overwrite]:
+    """Read the bytes the patches of split write over, for restoring them."""
+    overwrites, _ = get_patch_edits(split)
+    with fpath.open("rb") as fid:
+        return [_read_overwritten(fid, edit) for edit in overwrites]
+
+
+def restore_content(fpath: Path, split: Split, originals: list[Overwrite]) -> None:
+    """Undo `apply_patches`: write back the original bytes and drop the appended names."""
+    with fpath.open("r+b") as fid:
+        for original in originals:
+            fid.seek(original.pos)
+            fid.write(original.new_bytes)
+        fid.truncate(split.size)
+        fid.flush()
+        os.fsync(fid.fileno())
+
+
+def _read_overwritten(fid: BinaryIO, edit: Overwrite) -> Overwrite:
+    fid.seek(edit.pos)
+    return Overwrite(edit.pos, fid.read(len(edit.new_bytes)))
+
+
+def _patch_all(chain: list[Split], dsts: list[Path], is_linked: list[bool]) -> None:
+    """
+    Patch the placed splits; on failure restore their content and old names.
+
+    Hard-linked splits share content with the old names, so a half-patched set
+    would break both the old and the new names.
+
+    """
+    saved: list[list[Overwrite]] = []
+    try:
+        for split, fpath in zip(chain, dsts):
+            saved.append(read_overwritten(fpath, split))
+            apply_patches(fpath, split)
+    except Exception:
+        for patched, new_fpath, originals in zip(chain, dsts, saved):
+            restore_content(new_fpath, patched, originals)
+        _unplace_all(chain, dsts, is_linked)
+        raise
+
+
+def _relink(fid: BinaryIO, patch: NamePatch) -> None:
+    new_pos = fid.seek(0, os.SEEK_END)
+    fid.write(_pack_name_tag(patch))
+    fid.flush()
+    os.fsync(fid.fileno())
+    fid.seek(patch.ref.link_pos)
+    fid.write(NEXT_FIELD.pack(new_pos))
+
+
+def _pack_name_tag(patch: NamePatch) -> bytes:
+    """Pack relinked file name tag, which links back to the tag after the old name."""
+    name_header = TAG_HEADER.pack(
+        const.FIFF_REF_FILE_NAME, const.FIFFT_STRING, len(patch.fname), patch.ref.after_pos
+    )
+    return name_header + patch.fname
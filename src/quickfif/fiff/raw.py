@@ -0,0 +1,175 @@
+"""Header-only reading of raw FIFF files and split sets."""
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import BinaryIO, Final, Iterator
+
+from quickfif.fiff import constants as const
+from quickfif.fiff.annotations import FifAnnotations, read_annotations
+from quickfif.fiff.info import MeasInfo, read_meas_info
+from quickfif.fiff.tag import DirEntry, open_fif, read_int, read_string
+from quickfif.fiff.tree import Node, read_tree
+
+# Bytes per sample for each data buffer type
+BUFFER_BYTES: Final = MappingProxyType({
+    const.FIFFT_DAU_PACK16: 2,
+    const.FIFFT_SHORT: 2,
+    const.FIFFT_FLOAT: 4,
+    const.FIFFT_DOUBLE: 8,
+    const.FIFFT_INT: 4,
+    const.FIFFT_COMPLEX_FLOAT: 8,
+    const.FIFFT_COMPLEX_DOUBLE: 16,
+})
+MAX_SPLITS: Final = 1000
+
+
+@dataclass
+class RawHeader(object):
+    """Everything the raw preview needs, read without touching data buffers."""
+
+    info: MeasInfo  # noqa: WPS110 (same name as in mne)
+    n_times: int
+    first_samp: int
+    annotations: FifAnnotations
+    fnames: list[Path] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        """Time of the last sample relative to the first one; same as `raw.times[-1]`."""
+        return (self.n_times - 1) / self.info["sfreq"]
+
+
+def read_raw_header(fpath: Path) -> RawHeader:
+    """
+    Read raw header following the split files chain.
+
+    Measurement info and annotations come from the first file; samples are
+    counted over all the splits.
+
+    Raises
+    ------
+    ValueError
+        If the file (or one of its splits) is not a valid raw FIFF file
+
+    """
+    with open_fif(fpath) as fid:
+        tree = read_tree(fid)
+        ii = read_meas_info(fid, tree)
+        first_samp, n_times = count_samples(fid, find_raw_node(tree), ii["nchan"])
+        header = RawHeader(ii, n_times, first_samp, read_annotations(fid, tree), [fpath])
+        next_fpath = read_next_fname(fid, tree, fpath)
+    _add_splits(header, next_fpath)
+
+    if ii["meas_date"] is None:
+        # without meas_date mne counts annotations onsets from the first sample
+        header.annotations.onset -= first_samp / ii["sfreq"]
+    return header
+
+
+def find_raw_node(tree: Node) -> Node:
+    """Find block with raw data buffers."""
+    for block in (const.FIFFB_RAW_DATA, const.FIFFB_CONTINUOUS_DATA):
+        raw_nodes = tree.find(block)
+        if raw_nodes:
+            return raw_nodes[0]
+    raise ValueError("No raw data in file")
+
+
+def count_samples(fid: BinaryIO, raw_node: Node, nchan: int) -> tuple[int, int]:
+    """
+    Count samples in raw data block from the data buffers sizes.
+
+    Follows `mne.io.Raw` logic for initial sample and skips.
+
+    Returns
+    -------
+    first_samp
+        Index of the first sample
+    n_times
+        Number of samples including skipped ones
+
+    """
+    first_samp, first_skip, entries = read_data_start(fid, raw_node)
+    n_times = 0
+    for _, start, n_samp in iter_buffers(fid, entries, nchan):
+        first_samp += n_samp * first_skip  # applied once we know the buffer size
+        first_skip = 0
+        n_times = start + n_samp
+    return first_samp, n_times
+
+
+def read_data_start(fid: BinaryIO, raw_node: Node) -> tuple[int, int, list[DirEntry]]:
+    """
+    Read initial sample and skip of raw data block.
+
+    Returns
+    -------
+    first_samp
+        Index of the first sample, without the initial skip
+    first_skip
+        Number of buffers skipped before the first sample
+    entries
+        The rest of the block entries
+
+    """
+    entries = raw_node.entries
+    first_samp, first_skip = 0, 0
+    if entries and entries[0].kind == const.FIFF_FIRST_SAMPLE:
+        first_samp = read_int(fid, entries[0])
+        entries = entries[1:]
+    if entries and entries[0].kind == const.FIFF_DATA_SKIP:
+        first_skip = read_int(fid, entries[0])
+        entries = entries[1:]
+    return first_samp, first_skip, entries
+
+
+def iter_buffers(
+    fid: BinaryIO, entries: list[DirEntry], nchan: int
+) -> Iterator[tuple[DirEntry, int, int]]:
+    """Generate data buffers with their first samples and sizes; skips leave gaps of samples."""
+    start, n_skip = 0, 0
+    for ent in entries:
+        if ent.kind == const.FIFF_DATA_SKIP:
+            n_skip = read_int(fid, ent)
+        elif ent.kind == const.FIFF_DATA_BUFFER:
+            n_samp = buffer_samples(ent, nchan)
+            start += n_samp * n_skip
+            yield ent, start, n_samp
+            start += n_samp
+            n_skip = 0
+
+
+def buffer_samples(ent: DirEntry, nchan: int) -> int:
+    """Get number of samples in data buffer."""
+    try:
+        return ent.size // (BUFFER_BYTES[ent.tag_type] * nchan)
+    except KeyError:
+        raise ValueError(f"Cannot handle data buffers of type {ent.tag_type}")
+
+
+def read_next_fname(fid: BinaryIO, tree: Node, fpath: Path) -> Path | None:
+    """Get next split file name from the FIFFB_REF block if there is one."""
+    for ref in tree.find(const.FIFFB_REF):
+        roles = ref.entries_of(const.FIFF_REF_ROLE)
+        if not roles or read_int(fid, roles[0]) != const.FIFFV_ROLE_NEXT_FILE:
+            continue
+        names = ref.entries_of(const.FIFF_REF_FILE_NAME)
+        if names:
+            return fpath.parent / read_string(fid, names[0])
+    return None
+
+
+def has_next_file(fpath: Path) -> bool:
+    """Check if FIFF file refers to the next split file."""
+    with open_fif(fpath) as fid:
+        return read_next_fname(fid, read_tree(fid), fpath) is not None
+
+
+def _add_splits(header: RawHeader, next_fpath: Path | None) -> None:
+    """Follow next file references adding split files and their samples to the header."""
+    while next_fpath is not None and next_fpath.exists() and len(header.fnames) < MAX_SPLITS:
+        header.fnames.append(next_fpath)
+        with open_fif(next_fpath) as fid:
+            tree = read_tree(fid)
+            header.n_times += count_samples(fid, find_raw_node(tree), header.info["nchan"])[1]
+            next_fpath = read_next_fname(fid, tree, next_fpath)
@@ -0,0 +1,160 @@
+"""Partial reads of a few evenly spaced raw data buffers."""
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import BinaryIO, Final, Iterator, TypeAlias
+
+import numpy as np
+import numpy.typing as npt  # noqa: WPS301
+
+from quickfif.fiff import constants as const
+from quickfif.fiff.info import MeasInfo, read_meas_info
+from quickfif.fiff.raw import (
+    MAX_SPLITS,
+    buffer_samples,
+    find_raw_node,
+    iter_buffers,
+    read_data_start,
+    read_next_fname,
+)
+from quickfif.fiff.tag import DirEntry, open_fif
+from quickfif.fiff.tree import read_tree
+
+# Big-endian sample types of the data buffers; complex buffers are not supported
+BUFFER_DTYPES: Final = MappingProxyType({
+    const.FIFFT_DAU_PACK16: ">i2",
+    const.FIFFT_SHORT: ">i2",
+    const.FIFFT_FLOAT: ">f4",
+    const.FIFFT_DOUBLE: ">f8",
+    const.FIFFT_INT: ">i4",
+})
+DEFAULT_N_BUFFERS: Final = 40
+DEFAULT_MAX_SAMPLES: Final = 200  # read from the start of each buffer
+
+# Data buffer entry, its first sample and number of samples
+_Buffer: TypeAlias = tuple[DirEntry, int, int]
+
+
+@dataclass(frozen=True)
+class BufferRef(object):
+    """Data buffer of a split file."""
+
+    fpath: Path
+    entry: DirEntry
+    start: int  # first sample of the buffer relative to the first sample of the recording
+    n_samples: int
+
+
+@dataclass(frozen=True)
+class SignalSample(object):
+    """Beginnings of evenly spaced data buffers of raw recording, in SI units."""
+
+    info: MeasInfo  # noqa: WPS110 (same name as in mne)
+    n_buffers: int  # in the whole recording
+    starts: list[int]  # first sample of each chunk relative to the first sample
+    chunks: list[npt.NDArray[np.float64]]  # (channel, sample)
+
+
+def read_sample(
+    fpath: Path, n_buffers: int = DEFAULT_N_BUFFERS, max_samples: int = DEFAULT_MAX_SAMPLES
+) -> SignalSample:
+    """
+    Read first `max_samples` of `n_buffers` data buffers spread over raw recording.
+
+    The buffers are found in the tag directories of the splits and only the
+    beginnings of the picked ones are read, so the amount of data read
+    doesn't grow with the recording length.
+
+    Raises
+    ------
+    ValueError
+        If the file (or one of its splits) is not a valid raw FIFF file
+
+    """
+    with open_fif(fpath) as fid:
+        ii = read_meas_info(fid, read_tree(fid))
+    buffers = list(_iter_buffers(fpath, ii["nchan"]))
+    picked = _pick_buffers(buffers, n_buffers, max_samples)
+    cals = [[ch["range"] * ch["cal"]] for ch in ii["chs"]]  # column to scale channels
+    heads = _read_heads(picked, ii["nchan"], max_samples)
+    chunks = [head * np.array(cals) for head in heads]
+    return SignalSample(ii, len(buffers), [ref.start for ref in picked], chunks)
+
+
+def read_buffer_head(
+    fid: BinaryIO, ent: DirEntry, nchan: int, max_samples: int
+) -> npt.NDArray[np.float64]:
+    """Read up to `max_samples` first samples of data buffer as (channel, sample) array."""
+    dtype = BUFFER_DTYPES.get(ent.tag_type)
+    if dtype is None:
+        raise ValueError(f"Cannot decode data buffers of type {ent.tag_type}")
+    n_samples = min(buffer_samples(ent, nchan), max_samples)
+    n_bytes = n_samples * nchan * np.dtype(dtype).itemsize
+    fid.seek(ent.data_pos)
+    buffer_head = fid.read(n_bytes)
+    if len(buffer_head) != n_bytes:
+        raise ValueError(f"Truncated data buffer at position {ent.pos}")
+    samples = np.frombuffer(buffer_head, dtype=dtype).reshape(n_samples, nchan)
+    return samples.T.astype(np.float64)
+
+
+def _read_heads(
+    buffers: list[BufferRef], nchan: int, max_samples: int
+) -> Iterator[npt.NDArray[np.float64]]:
+    """Read beginnings of the buffers opening each split once."""
+    for split_fpath in dict.fromkeys(ref.fpath for ref in buffers):
+        with open_fif(split_fpath) as fid:
+            yield from (
+                read_buffer_head(fid, ref.entry, nchan, max_samples)
+                for ref in buffers
+                if ref.fpath == split_fpath
+            )
+
+
+def _pick_buffers(buffers: list[BufferRef], n_buffers: int, max_samples: int) -> list[BufferRef]:
+    """Pick evenly spaced buffers skipping the ones shorter than half of the read size."""
+    n_read = min(max((ref.n_samples for ref in buffers), default=0), max_samples)
+    full = [ref for ref in buffers if ref.n_samples * 2 >= n_read]  # e.g. all but the last one
+    return [full[idx] for idx in pick_evenly(len(full), n_buffers)]
+
+
+def pick_evenly(n_total: int, n_picked: int) -> list[int]:
+    """
+    Get indices of `n_picked` items evenly spread from the first to the last one.
+
+    Examples
+    --------
+    >>> pick_evenly(10, 4)
+    [0, 3, 6, 9]
+    >>> pick_evenly(2, 4)
+    [0, 1]
+
+    """
+    if n_total <= n_picked:
+        return list(range(n_total))
+    return np.linspace(0, n_total - 1, n_picked).round().astype(int).tolist()
+
+
+def _iter_buffers(fpath: Path, nchan: int) -> Iterator[BufferRef]:
+    """Generate data buffers of all the splits."""
+    split_start = 0
+    next_fpath: Path | None = fpath
+    for _ in range(MAX_SPLITS):
+        if next_fpath is None or not next_fpath.exists():
+            return
+        split_fpath = next_fpath
+        buffers, next_fpath = _read_split_buffers(split_fpath, nchan)
+        yield from (
+            BufferRef(split_fpath, ent, split_start + start, n_samples)
+            for ent, start, n_samples in buffers
+        )
+        if buffers:
+            split_start += buffers[-1][1] + buffers[-1][2]
+
+
+def _read_split_buffers(fpath: Path, nchan: int) -> tuple[list[_Buffer], Path | None]:
+    """Get data buffers of split file and the name of the next split."""
+    with open_fif(fpath) as fid:
+        tree = read_tree(fid)
+        entries = read_data_start(fid, find_raw_node(tree))[-1]
+        return list(iter_buffers(fid, entries, nchan)), read_next_fname(fid, tree, fpath)
@@ -0,0 +1,84 @@
+"""FIFF tag headers and tag data decoding."""
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Final, TypeAlias
+
+import numpy as np
+import numpy.typing as npt  # noqa: WPS301
+
+from quickfif.fiff import constants as const
+from quickfif.gzindex import open_gzip
+
+TAG_HEADER: Final = struct.Struct(">iIii")  # kind, type, size, next
+ID_STRUCT: Final = struct.Struct(">i2iii")  # version, machid, secs, usecs
+
+Stamp: TypeAlias = tuple[int, int]
+
+
+@dataclass(frozen=True)
+class DirEntry(object):
+    """Directory entry: tag header with the tag position in the file."""
+
+    kind: int
+    tag_type: int
+    size: int
+    pos: int
+
+    @property
+    def data_pos(self) -> int:
+        """Position of the tag data (right after the header)."""
+        return self.pos + TAG_HEADER.size
+
+
+def open_fif(fpath: Path) -> BinaryIO:
+    """Open plain or gzip-compressed FIFF file for binary reading; gzip files are indexed."""
+    if fpath.name.endswith(".gz"):
+        return open_gzip(fpath)
+    return fpath.open("rb")
+
+
+def read_entry(fid: BinaryIO, pos: int) -> DirEntry:
+    """Read tag header at position `pos`."""
+    fid.seek(pos)
+    raw_header = fid.read(TAG_HEADER.size)
+    if len(raw_header) != TAG_HEADER.size:
+        raise ValueError(f"Truncated tag header at position {pos}")
+    kind, tag_type, size, _ = TAG_HEADER.unpack(raw_header)
+    return DirEntry(kind, tag_type, size, pos)
+
+
+def read_bytes(fid: BinaryIO, ent: DirEntry) -> bytes:
+    """Read raw tag data."""
+    fid.seek(ent.data_pos)
+    tag_data = fid.read(ent.size)
+    if len(tag_data) != ent.size:
+        raise ValueError(f"Truncated tag {ent.kind} at position {ent.pos}")
+    return tag_data
+
+
+def read_array(fid: BinaryIO, ent: DirEntry, dtype: str) -> npt.NDArray[np.generic]:
+    """Read tag data as a flat big-endian array."""
+    return np.frombuffer(read_bytes(fid, ent), dtype=dtype)
+
+
+def read_int(fid: BinaryIO, ent: DirEntry) -> int:
+    """Read scalar integer tag."""
+    return int(read_array(fid, ent, ">i4")[0])
+
+
+def read_float(fid: BinaryIO, ent: DirEntry) -> float:
+    """Read scalar float tag (single or double precision)."""
+    dtype = ">f8" if ent.tag_type == const.FIFFT_DOUBLE else ">f4"
+    return float(read_array(fid, ent, dtype)[0])  # type: ignore[arg-type]
+
+
+def read_string(fid: BinaryIO, ent: DirEntry) -> str:
+    """Read string tag. FIFF strings are latin1-encoded."""
+    return read_bytes(fid, ent).decode("latin1", "ignore")
+
+
+def read_stamp(fid: BinaryIO, ent: DirEntry) -> Stamp:
+    """Read (secs, usecs) time stamp from ID struct tag."""
+    id_fields = ID_STRUCT.unpack(read_bytes(fid, ent)[: ID_STRUCT.size])
+    return id_fields[-2], id_fields[-1]
@@ -0,0 +1,183 @@
+"""FIFF tag directory and block tree."""
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable
+
+from quickfif.fiff import constants as const
+from quickfif.fiff.tag import (
+    TAG_HEADER,
+    DirEntry,
+    Stamp,
+    read_array,
+    read_entry,
+    read_int,
+    read_stamp,
+)
+
+
+@dataclass
+class Node(object):
+    """Block of the FIFF tree with its direct entries and child blocks."""
+
+    block: int
+    entries: list[DirEntry] = field(default_factory=list)
+    children: list["Node"] = field(default_factory=list)
+    block_id: Stamp | None = None
+    parent_id: Stamp | None = None
+
+    def find(self, block: int) -> list["Node"]:
+        """Find all the blocks of a given kind in the subtree, including self."""
+        found = [self] if self.block == block else []
+        for child in self.children:
+            found.extend(child.find(block))
+        return found
+
+    def entries_of(self, kind: int) -> list[DirEntry]:
+        """Get direct entries of a given tag kind."""
+        return [ent for ent in self.entries if ent.kind == kind]
+
+
+@dataclass(frozen=True)
+class TagWalk(object):
+    """Tags found by following their links from the start of file."""
+
+    entries: list[DirEntry]
+    eof_pos: int | None  # where the links ran into the end of file; None if the last tag ends them
+
+
+def read_directory(fid: BinaryIO) -> list[DirEntry]:
+    """
+    Read tag directory of an open FIFF file.
+
+    Use the directory stored in the file when it's there; otherwise walk the
+    tag headers (see `walk_tags`).
+
+    Raises
+    ------
+    ValueError
+        If the file doesn't look like a FIFF file
+
+    """
+    dir_pos = read_int(fid, read_dir_pointer(fid))
+    if dir_pos > 0:
+        with suppress(ValueError):  # corrupted or missing directory: walk the tags instead
+            return read_stored_directory(fid, dir_pos)
+    return walk_tags(fid).entries
+
+
+def read_dir_pointer(fid: BinaryIO) -> DirEntry:
+    """
+    Read directory pointer tag which follows the file id.
+
+    Raises
+    ------
+    ValueError
+        If the file doesn't look like a FIFF file
+
+    """
+    file_id = read_entry(fid, 0)
+    if file_id.kind != const.FIFF_FILE_ID or file_id.tag_type != const.FIFFT_ID_STRUCT:
+        raise ValueError("File doesn't start with a file id tag")
+    dir_pointer = read_entry(fid, file_id.data_pos + file_id.size)
+    if dir_pointer.kind != const.FIFF_DIR_POINTER:
+        raise ValueError("File doesn't have a directory pointer")
+    return dir_pointer
+
+
+def read_tree(fid: BinaryIO) -> Node:
+    """Read directory of an open FIFF file and arrange it in a tree of blocks."""
+    return build_tree(fid, read_directory(fid))
+
+
+def build_tree(fid: BinaryIO, directory: list[DirEntry]) -> Node:
+    """Arrange directory entries in a tree of blocks."""
+    root = Node(block=0)
+    stack = [root]
+    for ent in directory:
+        if ent.kind == const.FIFF_BLOCK_START:
+            child = Node(block=read_int(fid, ent))
+            stack[-1].children.append(child)
+            stack.append(child)
+        elif ent.kind == const.FIFF_BLOCK_END:
+            if len(stack) > 1:
+                stack.pop()
+        else:
+            _add_entry(fid, stack[-1], ent)
+    return root
+
+
+def _add_entry(fid: BinaryIO, node: Node, ent: DirEntry) -> None:
+    node.entries.append(ent)
+    if ent.kind in {const.FIFF_FILE_ID, const.FIFF_BLOCK_ID}:
+        node.block_id = read_stamp(fid, ent)
+    elif ent.kind == const.FIFF_PARENT_BLOCK_ID:
+        node.parent_id = read_stamp(fid, ent)
+
+
+def read_stored_directory(fid: BinaryIO, dir_pos: int) -> list[DirEntry]:
+    """
+    Read tag directory stored at `dir_pos`.
+
+    Raises
+    ------
+    ValueError
+        If there's no directory tag at `dir_pos` or it's truncated
+
+    """
+    dir_tag = read_entry(fid, dir_pos)
+    if dir_tag.tag_type != const.FIFFT_DIR_ENTRY_STRUCT:
+        raise ValueError(f"No tag directory at position {dir_pos}")
+    # directory entries are tag headers with tag position stored in the 'next' field
+    rows = read_array(fid, dir_tag, ">i4").reshape(-1, 4).tolist()
+    return [DirEntry(*row) for row in rows]
+
+
+def walk_tags(fid: BinaryIO, on_problem: Callable[[str], None] | None = None) -> TagWalk:
+    """
+    Walk the tag headers following their links, seeking over the tag data.
+
+    The walk stops where the links loop back or run into a truncated tag
+    header; the problem is passed to `on_problem` if it's set.
+
+    Raises
+    ------
+    ValueError
+        If a tag has negative size
+
+    """
+    entries: list[DirEntry] = []
+    visited = set()
+    pos = 0
+    while pos >= 0:
+        if pos in visited:
+            _report(on_problem, f"Tags loop back to position {pos}")
+            break
+        visited.add(pos)
+        linked = _read_linked_entry(fid, pos, on_problem)
+        if linked is None:
+            return TagWalk(entries, pos)
+        ent, pos = linked
+        entries.append(ent)
+    return TagWalk(entries, None)
+
+
+def _read_linked_entry(
+    fid: BinaryIO, pos: int, on_problem: Callable[[str], None] | None
+) -> tuple[DirEntry, int] | None:
+    """Read tag header at `pos`; get its entry and position of the next tag, None past the end."""
+    fid.seek(pos)
+    raw_header = fid.read(TAG_HEADER.size)
+    if len(raw_header) < TAG_HEADER.size:
+        if raw_header:
+            _report(on_problem, f"Truncated tag header at position {pos}")
+        return None
+    kind, tag_type, size, next_pos = TAG_HEADER.unpack(raw_header)
+    if size < 0:
+        raise ValueError(f"Tag {kind} at position {pos} has negative size {size}")
+    ent = DirEntry(kind, tag_type, size, pos)
+    return ent, ent.data_pos + size if next_pos == const.FIFFV_NEXT_SEQ else next_pos
+
+
+def _report(on_problem: Callable[[str], None] | None, problem: str) -> None:
+    if on_problem is not None:
+        on_problem(problem)
@@ -0,0 +1,314 @@
+"""
+Random access to gzip-compressed FIFF files via a persistent seek-point index.
+
+Seeking in a gzip stream decompresses it from the start, so reading a tag
+near the end of a long `.fif.gz` recording costs as much as reading the whole
+file. The index keeps checkpoints every `span` bytes of uncompressed data: the
+position of a deflate block boundary in the compressed stream and the 32 KB of
+output preceding it, which is all the state deflate needs to resume there
+(see zran.c in zlib examples). A read decompresses at most `span` bytes from
+the nearest checkpoint instead of everything before the position.
+
+Checkpoints are recorded by the reader itself whenever it decompresses a part
+of the file not covered by the index yet, so the first pass over the file,
+e.g. the first preview, builds the index at no extra cost. The index is saved
+when the reader is closed if it has grown; reaching the end of the file
+completes it with the uncompressed size.
+
+Python's `zlib` doesn't report block boundaries and can't resume mid-byte, so
+the system zlib is used via `ctypes` (see `quickfif.inflate`). When it's not
+available, for small files and for files with several gzip members, files are
+read with `gzip` as before.
+
+Index files are stored in the package cache directory, named by the hash of
+the file identity as in `quickfif.cache`: a changed file gets a new index and
+old ones are pushed out by size-bounded LRU eviction.
+
+"""
+import bisect
+import ctypes
+import gzip
+import io
+import os
+import struct
+from contextlib import suppress
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Callable, Final
+
+from quickfif.cache import evict_entries, get_cache_dir, get_file_digest
+from quickfif.inflate import (
+    CHUNK_SIZE,
+    WINDOW_SIZE,
+    Z_STREAM_END,
+    Inflater,
+    SeekPoint,
+    get_address,
+    load_libz,
+)
+
+INDEX_DIR_NAME: Final = "gzindex"
+INDEX_SUFFIX: Final = ".gzidx"
+INDEX_FTYPE: Final = "gzip-index"
+DEFAULT_MAX_MB: Final = 256
+DEFAULT_MAX_BYTES: Final = DEFAULT_MAX_MB * 1024 * 1024
+DEFAULT_SPAN: Final = 4 * 1024 * 1024  # uncompressed bytes between checkpoints
+# Smaller files are decompressed faster than the index is read
+MIN_INDEXED_BYTES: Final = DEFAULT_SPAN
+READ_BUFFER_SIZE: Final = 65536
+
+MAGIC: Final = b"QFGZIDX1"
+INDEX_HEADER: Final = struct.Struct("<8sQQI")  # magic, uncompressed size, span, points
+UNKNOWN_SIZE: Final = 0xFFFFFFFFFFFFFFFF  # size in the header of index not reaching the end yet
+POINT_HEADER: Final = struct.Struct("<QQBI")  # uncompressed pos, compressed pos, bits, window
+
+
+@dataclass
+class GzipIndex(object):
+    """Seek points of a gzip file ordered by uncompressed position."""
+
+    span: int = DEFAULT_SPAN
+    points: list[SeekPoint] = field(default_factory=list)
+    size: int | None = None  # uncompressed size; known once the end was reached
+
+    @property
+    def indexed_pos(self) -> int:
+        """Get uncompressed position of the last point; new points go after it."""
+        return self.points[-1].uncompressed_pos if self.points else 0
+
+    def find(self, pos: int) -> SeekPoint | None:
+        """Get the last seek point at or before uncompressed position `pos`."""
+        starts = [point.uncompressed_pos for point in self.points]
+        idx = bisect.bisect_right(starts, pos)
+        return self.points[idx - 1] if idx else None
+
+
+class IndexedGzipReader(io.RawIOBase):  # noqa: WPS214 (file object protocol)
+    """
+    Seekable reader of gzip file resuming from the nearest seek point.
+
+    Decompressed data go through a circular buffer with the last 32 KB of
+    output, so that new seek points can be recorded on the way. When a second
+    gzip member follows the first one, the rest is read with `gzip`.
+
+    """
+
+    def __init__(
+        self,
+        libz: ctypes.CDLL,
+        fpath: Path,
+        index: GzipIndex,
+        on_update: Callable[[GzipIndex], None] | None = None,
+    ) -> None:
+        super().__init__()
+        self.index = index
+        self._libz = libz
+        self._fpath = fpath
+        self._fid = fpath.open("rb")
+        self._on_update = on_update
+        self._saved_state = self._get_index_state()
+        self._pos = 0
+        self._inflater: Inflater | None = None
+        self._stream_pos = 0  # uncompressed position of the inflater output
+        self._window = bytearray(WINDOW_SIZE)
+        self._window_addr = get_address(self._window)
+        self._window_end = 0
+        self._fallback: BinaryIO | None = None
+
+    def readable(self) -> bool:
+        """Reader is readable."""
+        return True
+
+    def seekable(self) -> bool:
+        """Reader is seekable."""
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """
+        Move to the uncompressed position; decompression is deferred until read.
+
+        Raises
+        ------
+        io.UnsupportedOperation
+            If seeking from the end before the size is known, as `gzip` does
+
+        """
+        if whence == io.SEEK_END and self.index.size is None:
+            raise io.UnsupportedOperation("Seek from end before the gzip file was read through")
+        size = self.index.size or 0
+        origins = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: size}
+        self._pos = max(origins[whence] + offset, 0)
+        return self._pos
+
+    def tell(self) -> int:
+        """Get uncompressed position."""
+        return self._pos
+
+    def readinto(self, buffer: "bytearray | memoryview") -> int:  # type: ignore[override]
+        """Read uncompressed data at the current position."""
+        if self._fallback is None:
+            self._skip_to(self._pos)
+        n_bytes = 0
+        # inflate returns no data at block boundaries; no inflater means end of file
+        while not n_bytes and self._inflater is not None and self._fallback is None:
+            n_bytes = self._inflate(get_address(buffer), len(buffer))
+        if not n_bytes and self._fallback is not None:
+            self._fallback.seek(self._pos)
+            n_bytes = self._fallback.readinto(buffer)  # type: ignore[attr-defined]
+        self._pos += n_bytes
+        return n_bytes
+
+    def close(self) -> None:
+        """Close the compressed file, passing the index to `on_update` if it has grown."""
+        if self._on_update is not None and self._get_index_state() != self._saved_state:
+            self._saved_state = self._get_index_state()
+            self._on_update(self.index)
+        self._inflater = None
+        self._fid.close()
+        if self._fallback is not None:
+            self._fallback.close()
+        super().close()
+
+    def _skip_to(self, pos: int) -> None:
+        """Get inflater output to `pos`, from the current state or the nearest seek point."""
+        point = self.index.find(pos)
+        if self._index_covers(pos) and not self._can_continue_to(pos, point):
+            self._inflater = Inflater(self._libz, self._fid, point)
+            self._stream_pos = self._inflater.start_out
+        while self._stream_pos < pos and self._inflater is not None:
+            self._inflate(0, min(pos - self._stream_pos, CHUNK_SIZE))
+
+    def _index_covers(self, pos: int) -> bool:
+        """Check if the position is before the end of file, if the end is known."""
+        return self.index.size is None or pos < self.index.size
+
+    def _can_continue_to(self, pos: int, point: SeekPoint | None) -> bool:
+        """Check if the current stream is before `pos` and no closer seek point is there."""
+        if self._inflater is None or self._stream_pos > pos:
+            return False
+        return point is None or self._stream_pos >= point.uncompressed_pos
+
+    def _inflate(self, out_addr: int, n_bytes: int) -> int:
+        """Inflate at most `n_bytes` and copy them to `out_addr` unless it's 0."""
+        if self._window_end == WINDOW_SIZE:
+            self._window_end = 0
+        n_bytes = min(n_bytes, WINDOW_SIZE - self._window_end)
+        window_addr = self._window_addr + self._window_end
+        inflater: Inflater = self._inflater  # type: ignore[assignment]
+        ret_code = inflater.inflate(window_addr, n_bytes)
+        n_inflated = n_bytes - inflater.stream.avail_out
+        if out_addr:
+            ctypes.memmove(out_addr, window_addr, n_inflated)
+        self._window_end += n_inflated
+        self._stream_pos += n_inflated
+        if ret_code == Z_STREAM_END:
+            self._finish(inflater)
+        elif self._stream_pos - self.index.indexed_pos > self.index.span:
+            self._add_seek_point(inflater)
+        return n_inflated
+
+    def _add_seek_point(self, inflater: Inflater) -> None:
+        split = self._window_end  # the oldest output is right after the newest
+        window = self._window[split:] + self._window[:split]
+        point = inflater.get_seek_point(bytes(window))
+        if point is not None:
+            self.index.points.append(point)
+
+    def _finish(self, inflater: Inflater) -> None:
+        """Complete the index at the end of the stream; use gzip if more members follow."""
+        self._inflater = None
+        if inflater.has_trailing_data():
+            self._fallback = gzip.open(self._fpath, "rb")  # type: ignore[assignment]
+            self._on_update = None  # seek points of the first member only are useless
+            return
+        self.index.size = self._stream_pos
+
+    def _get_index_state(self) -> tuple[int, int | None]:
+        return len(self.index.points), self.index.size
+
+
+def open_gzip(fpath: Path, min_indexed_bytes: int = MIN_INDEXED_BYTES) -> BinaryIO:
+    """
+    Open gzip file for random access with the index from cache.
+
+    The index is extended while the file is read and saved when the file is
+    closed. Small files are opened with `gzip`.
+
+    """
+    libz = load_libz()
+    if libz is None or fpath.stat().st_size < min_indexed_bytes:
+        return gzip.open(fpath, "rb")  # type: ignore[return-value]
+    index_path = _get_index_path(fpath)
+    try:
+        index = load_index(index_path)
+    except (OSError, ValueError, struct.error):
+        index = GzipIndex()
+    reader = IndexedGzipReader(libz, fpath, index, lambda idx: _store_index(idx, index_path))
+    return io.BufferedReader(reader, READ_BUFFER_SIZE)  # type: ignore[return-value]
+
+
+def save_index(index: GzipIndex, index_path: Path) -> None:
+    """Write index atomically."""
+    size = UNKNOWN_SIZE if index.size is None else index.size
+    chunks = [INDEX_HEADER.pack(MAGIC, size, index.span, len(index.points))]
+    for point in index.points:
+        chunks.append(
+            POINT_HEADER.pack(
+                point.uncompressed_pos, point.compressed_pos, point.bits, len(point.window)
+            )
+        )
+        chunks.append(point.window)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_name(f".{index_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(b"".join(chunks))
+    os.replace(tmp_path, index_path)
+
+
+def load_index(index_path: Path) -> GzipIndex:
+    """
+    Read index and mark it as recently used.
+
+    Raises
+    ------
+    ValueError
+        If the index file is not valid
+
+    """
+    index_bytes = index_path.read_bytes()
+    magic, size, span, n_points = INDEX_HEADER.unpack_from(index_bytes)
+    if magic != MAGIC:
+        raise ValueError("Not a gzip index")
+    points = _unpack_points(index_bytes, n_points)
+    os.utime(index_path)
+    return GzipIndex(span, points, None if size == UNKNOWN_SIZE else size)
+
+
+def _unpack_points(index_bytes: bytes, n_points: int) -> list[SeekPoint]:
+    offset = INDEX_HEADER.size
+    points = []
+    for _ in range(n_points):
+        point, offset = _unpack_point(index_bytes, offset)
+        points.append(point)
+    if offset != len(index_bytes):
+        raise ValueError("Truncated gzip index")
+    return points
+
+
+def _unpack_point(index_bytes: bytes, offset: int) -> tuple[SeekPoint, int]:
+    """Unpack seek point at `offset`; get the point and the offset of the next one."""
+    out_pos, in_pos, bits, window_len = POINT_HEADER.unpack_from(index_bytes, offset)
+    window_start = offset + POINT_HEADER.size
+    window_end = window_start + window_len
+    return SeekPoint(out_pos, in_pos, bits, index_bytes[window_start:window_end]), window_end
+
+
+def _store_index(index: GzipIndex, index_path: Path) -> None:
+    """Save index and evict old ones; the index is an optimization, so errors are ignored."""
+    with suppress(OSError):
+        save_index(index, index_path)
+        evict_entries(index_path.parent, INDEX_SUFFIX, DEFAULT_MAX_BYTES)
+
+
+def _get_index_path(fpath: Path) -> Path:
+    digest = get_file_digest(fpath, INDEX_FTYPE)
+    return get_cache_dir() / INDEX_DIR_NAME / f"{digest}{INDEX_SUFFIX}"
@@ -0,0 +1,167 @@
+"""
+Resumable inflate of gzip streams through `ctypes` bindings to the system zlib.
+
+Python's `zlib` doesn't report deflate block boundaries and can't resume in the
+middle of a byte, which random access to gzip files needs (see
+`quickfif.gzindex`). Here inflate stops at each block boundary, so the caller
+can record a seek point there, and a raw stream is resumed from a seek point
+with `inflatePrime` and the preceding window set as its dictionary.
+
+"""
+import ctypes
+import os
+import weakref
+import zlib
+from ctypes.util import find_library
+from dataclasses import dataclass
+from functools import cache
+from typing import BinaryIO, Final
+
+WINDOW_SIZE: Final = 32768  # deflate back-reference distance limit
+CHUNK_SIZE: Final = 65536
+
+# zlib constants, see zlib.h
+Z_OK: Final = 0
+Z_STREAM_END: Final = 1
+Z_BUF_ERROR: Final = -5
+GZIP_WBITS: Final = 31  # 16 + 15: gzip header and trailer, the largest window
+RAW_WBITS: Final = -15  # no header: resuming in the middle of the stream
+GZIP_TRAILER_SIZE: Final = 8  # CRC32 and size, left unread by raw inflate
+BLOCK_BOUNDARY_FLAG: Final = 128  # `data_type` flag: inflate stopped at a block boundary
+LAST_BLOCK_FLAG: Final = 64
+UNUSED_BITS_MASK: Final = 7
+BYTE_BITS: Final = 8
+
+
+@dataclass(frozen=True)
+class SeekPoint(object):
+    """Deflate block boundary where decompression can resume."""
+
+    uncompressed_pos: int
+    compressed_pos: int  # byte with the first bit of the block, or the next one if `bits`
+    bits: int  # bits of the block in the byte before `compressed_pos`
+    window: bytes  # compressed 32 KB of uncompressed data before the point
+
+
+class _ZStream(ctypes.Structure):
+    """`z_stream` from zlib.h."""
+
+    _fields_ = (  # noqa: WPS120 (ctypes API)
+        ("next_in", ctypes.c_void_p),
+        ("avail_in", ctypes.c_uint),
+        ("total_in", ctypes.c_ulong),
+        ("next_out", ctypes.c_void_p),
+        ("avail_out", ctypes.c_uint),
+        ("total_out", ctypes.c_ulong),
+        ("msg", ctypes.c_char_p),
+        ("state", ctypes.c_void_p),
+        ("zalloc", ctypes.c_void_p),
+        ("zfree", ctypes.c_void_p),
+        ("opaque", ctypes.c_void_p),
+        ("data_type", ctypes.c_int),
+        ("adler", ctypes.c_ulong),
+        ("reserved", ctypes.c_ulong),
+    )
+
+
+class Inflater(object):
+    """zlib inflate stream from the start of file or a seek point, reading input as needed."""
+
+    def __init__(self, libz: ctypes.CDLL, fid: BinaryIO, point: SeekPoint | None) -> None:
+        self.stream = _ZStream()
+        self.start_in = 0 if point is None else point.compressed_pos
+        self.start_out = 0 if point is None else point.uncompressed_pos
+        self._trailer_size = 0 if point is None else GZIP_TRAILER_SIZE
+        self._libz = libz
+        self._fid = fid
+        self._input = bytearray(CHUNK_SIZE)
+        self._input_addr = get_address(self._input)
+        init_code = libz.inflateInit2_(
+            ctypes.byref(self.stream),
+            GZIP_WBITS if point is None else RAW_WBITS,
+            libz.zlibVersion(),
+            ctypes.sizeof(_ZStream),
+        )
+        self._check(init_code)
+        weakref.finalize(self, libz.inflateEnd, ctypes.byref(self.stream))
+        if point is None:
+            fid.seek(0)
+        else:
+            self._resume(point)
+
+    def inflate(self, out_addr: int, n_bytes: int) -> int:
+        """
+        Inflate at most `n_bytes`, stopping at block boundaries; read input as needed.
+
+        Raises
+        ------
+        ValueError
+            If the stream is corrupted or truncated
+
+        """
+        stream = self.stream
+        if not stream.avail_in:
+            n_read = self._fid.readinto(self._input)  # type: ignore[attr-defined]
+            if not n_read:
+                raise ValueError("Truncated gzip stream")
+            stream.next_in = self._input_addr
+            stream.avail_in = n_read
+        stream.next_out = out_addr
+        stream.avail_out = n_bytes
+        return self._check(self._libz.inflate(ctypes.byref(stream), zlib.Z_BLOCK))
+
+    def has_trailing_data(self) -> bool:
+        """Check if there is data after the end of the stream, e.g. the next gzip member."""
+        stream_end = self.start_in + self.stream.total_in + self._trailer_size
+        return stream_end < os.fstat(self._fid.fileno()).st_size
+
+    def get_seek_point(self, window: bytes) -> SeekPoint | None:
+        """Get seek point at the current position if inflate stopped at a block boundary."""
+        data_type = self.stream.data_type
+        if not data_type & BLOCK_BOUNDARY_FLAG or data_type & LAST_BLOCK_FLAG:
+            return None
+        return SeekPoint(
+            self.start_out + self.stream.total_out,
+            self.start_in + self.stream.total_in,
+            data_type & UNUSED_BITS_MASK,
+            zlib.compress(window),
+        )
+
+    def _resume(self, point: SeekPoint) -> None:
+        """Prepare raw stream to continue from the seek point."""
+        if point.bits:  # the block starts in the high bits of the previous byte
+            self._fid.seek(point.compressed_pos - 1)
+            block_bits = self._fid.read(1)[0] >> (BYTE_BITS - point.bits)
+            self._check(self._libz.inflatePrime(ctypes.byref(self.stream), point.bits, block_bits))
+        else:
+            self._fid.seek(point.compressed_pos)
+        window = zlib.decompress(point.window)
+        self._check(
+            self._libz.inflateSetDictionary(ctypes.byref(self.stream), window, len(window))
+        )
+
+    def _check(self, ret_code: int) -> int:
+        if ret_code not in {Z_OK, Z_STREAM_END, Z_BUF_ERROR}:
+            msg = self.stream.msg.decode() if self.stream.msg else "code {0}".format(ret_code)
+            raise ValueError("Broken gzip stream: {0}".format(msg))
+        return ret_code
+
+
+def get_address(buffer: "bytearray | memoryview") -> int:
+    """Get address of writable buffer to pass to zlib; the buffer must outlive its use."""
+    return ctypes.addressof(ctypes.c_char.from_buffer(buffer))
+
+
+@cache
+def load_libz() -> ctypes.CDLL | None:
+    """Load system zlib; None if it's not found."""
+    libz_name = find_library("z")
+    if libz_name is None:
+        return None
+    try:
+        libz = ctypes.CDLL(libz_name)
+    except OSError:
+        return None
+    libz.zlibVersion.restype = ctypes.c_char_p
+    libz.inflateSetDictionary.argtypes = (ctypes.c_void_p, ctypes.c_char_p, ctypes.c_uint)
+    return libz
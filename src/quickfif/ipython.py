@@ -1,9 +1,14 @@
 """Utilities for inspecting objects in IPython console."""
-from typing import Any
+import os
+from contextlib import suppress
+from typing import Any, Final
 
-import IPython
-import matplotlib  # type: ignore
-from traitlets.config.loader import Config
+from quickfif.lazy import LazyProxy, lazy_module
+
+# Backend is picked by matplotlib when the first figure is created
+MPL_BACKEND_VAR: Final = "MPLBACKEND"
+MPL_BACKEND: Final = "TkAgg"
+LOADED_STATUS: Final = "{0}\n"
 
 
 def embed_ipython(ns: dict[str, Any]) -> None:  # type: ignore[misc]
@@ -11,7 +16,10 @@ def embed_ipython(ns: dict[str, Any]) -> None:  # type: ignore[misc]
     Embed IPython console with populated namespace.
 
     Before launching IPython, setup header showing the populated variables and
-    import essential libraries.
+    make essential libraries available. `np` and `plt` are imported on first
+    use, so the console doesn't wait for matplotlib. Namespace values may be
+    `LazyProxy` objects still loading in the background: before each cell the
+    proxies which finished loading are replaced with the loaded objects.
 
     Notes
     -----
@@ -19,14 +27,57 @@ def embed_ipython(ns: dict[str, Any]) -> None:  # type: ignore[misc]
     [link](https://ipython.readthedocs.io/en/stable/config/intro.html#running-ipython-from-python)
 
     """
-    matplotlib.use("TkAgg")
+    from IPython.terminal.interactiveshell import TerminalInteractiveShell  # noqa: WPS433
+    from IPython.terminal.ipapp import TerminalIPythonApp  # noqa: WPS433 (heavy import)
+    from traitlets.config.loader import Config  # noqa: WPS433
+
     cfg = Config()  # type: ignore[no-untyped-call]
     cfg.InteractiveShell.banner2 = _gen_ipython_header(ns)  # pyright: ignore
-    cfg.InteractiveShellApp.exec_lines = [  # pyright: ignore
-        "import numpy as np",
-        "import matplotlib.pyplot as plt",
-    ]
-    IPython.start_ipython(argv=[], user_ns=ns, config=cfg)  # type: ignore[no-untyped-call]
+    user_ns = {"np": lazy_module("numpy"), "plt": lazy_module("matplotlib.pyplot"), **ns}
+    # App and shell are singletons; start a fresh console with this namespace
+    TerminalInteractiveShell.clear_instance()
+    TerminalIPythonApp.clear_instance()
+    app = TerminalIPythonApp.instance(config=cfg, user_ns=user_ns)
+    app.initialize(argv=[])  # type: ignore[no-untyped-call]
+    shell = app.shell
+    shell.events.register(  # type: ignore[union-attr]
+        "pre_run_cell", _ProxyResolver(shell.user_ns, set(ns))  # type: ignore[union-attr]
+    )
+    _start_with_backend(app)
+
+
+class _ProxyResolver(object):
+    """Replace ready proxies in namespace, reporting status of the populated variables."""
+
+    def __init__(self, user_ns: dict[str, Any], reported: set[str]) -> None:  # type: ignore[misc]
+        self._user_ns = user_ns
+        self._reported = reported
+
+    def __call__(self, *args: object) -> None:
+        """Run as `pre_run_cell` callback."""
+        for name, proxy in list(self._user_ns.items()):
+            if isinstance(proxy, LazyProxy) and proxy.is_ready:
+                self._resolve(name, proxy)
+
+    def _resolve(self, name: str, proxy: LazyProxy) -> None:
+        with suppress(Exception):  # otherwise the proxy stays and raises the error on use
+            self._user_ns[name] = proxy.resolve()
+        self._report(name, proxy)
+
+    def _report(self, name: str, proxy: LazyProxy) -> None:
+        if name in self._reported:
+            self._reported.remove(name)
+            print(LOADED_STATUS.format(proxy.description))  # noqa: WPS421 (console output)
+
+
+def _start_with_backend(app: Any) -> None:  # type: ignore[misc]
+    """Start the app with matplotlib backend set unless the user chose one."""
+    if MPL_BACKEND_VAR in os.environ:
+        app.start()
+        return
+    os.environ[MPL_BACKEND_VAR] = MPL_BACKEND
+    app.start()
+    os.environ.pop(MPL_BACKEND_VAR, None)
 
 
 def _gen_ipython_header(namespace: dict[str, Any]) -> str:  # type: ignore[misc]
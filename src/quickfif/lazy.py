@@ -0,0 +1,184 @@
+"""
+Objects loaded in the background and modules imported on first use.
+
+`inspect` opens the console right away instead of waiting for the file: the
+file is read in a background thread and the namespace holds proxies, which
+wait for the reading to finish the first time they are used and then forward
+everything to the loaded object. The console replaces the proxies with the
+objects themselves once they are loaded, see `quickfif.ipython`.
+
+"""
+import importlib
+import sys
+import threading
+import time
+from typing import Callable, Final, Generic, Iterator, TypeVar
+
+T = TypeVar("T")
+
+LOADER_THREAD_NAME: Final = "quickfif-loader"
+
+
+class BackgroundLoader(Generic[T]):  # noqa: WPS214 (thread state accessors)
+    """Run loading function in a daemon thread and keep its result or error."""
+
+    def __init__(self, load: Callable[[], T]) -> None:
+        self._load = load
+        self._done = threading.Event()
+        self._loaded: T | None = None
+        self._error: Exception | None = None
+        self._start_time = time.monotonic()
+        self._elapsed_sec: float | None = None
+        self._thread = threading.Thread(target=self._run, name=LOADER_THREAD_NAME, daemon=True)
+
+    def start(self) -> "BackgroundLoader[T]":
+        """Start loading."""
+        self._start_time = time.monotonic()
+        self._thread.start()
+        return self
+
+    @property
+    def done(self) -> bool:
+        """Check if loading has finished, successfully or not."""
+        return self._done.is_set()
+
+    @property
+    def error(self) -> Exception | None:
+        """Get the error loading failed with, if it did."""
+        return self._error
+
+    @property
+    def status(self) -> str:
+        """Describe loading progress."""
+        if not self.done:
+            return "loading in background, {0:.1f} sec so far".format(self._get_elapsed_sec())
+        if self._error is not None:
+            return "loading failed: {0}".format(self._error)
+        return "loaded in {0:.1f} sec".format(self._get_elapsed_sec())
+
+    def wait(self) -> T:
+        """
+        Wait for loading to finish and get the result.
+
+        Raises
+        ------
+        Exception
+            The error loading failed with
+
+        """
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._loaded  # type: ignore[return-value]
+
+    def _run(self) -> None:
+        try:
+            self._loaded = self._load()
+        except Exception as exc:
+            self._error = exc
+        self._elapsed_sec = self._get_elapsed_sec()
+        self._done.set()
+
+    def _get_elapsed_sec(self) -> float:
+        if self._elapsed_sec is not None:
+            return self._elapsed_sec
+        return time.monotonic() - self._start_time
+
+
+class LazyProxy(object):  # noqa: WPS214 (forwards the protocols used in console)
+    """
+    Stand-in for an object which is not available yet.
+
+    The object is resolved on the first use of the proxy: attribute access,
+    indexing, calling, iteration or `dir`, which IPython calls for completion.
+    Until then `repr` describes the object without resolving it, so the proxy
+    can be shown in the console banner.
+
+    """
+
+    def __init__(
+        self,
+        resolve: Callable[[], object],
+        describe: Callable[[], str],
+        ready: Callable[[], bool],
+    ) -> None:
+        self._resolve = resolve
+        self._describe = describe
+        self._ready = ready
+        self._target: object = None
+        self._is_resolved = False
+
+    def __call__(self, *args: object, **kwargs: object) -> object:
+        """Call the object."""
+        return self.resolve()(*args, **kwargs)  # type: ignore[operator]
+
+    def __getattr__(self, name: str) -> object:
+        """Get attribute of the object; called only for names the proxy doesn't have."""
+        return getattr(self.resolve(), name)
+
+    def __dir__(self) -> Iterator[str]:  # type: ignore[override]  # noqa: WPS603 (completion)
+        """List attributes of the object."""
+        return iter(dir(self.resolve()))  # noqa: WPS421 (forwarded to the object)
+
+    def __repr__(self) -> str:
+        """Get object repr or describe the object if it's not resolved yet."""
+        return repr(self._target) if self._is_resolved else f"<{self._describe()}>"
+
+    def __str__(self) -> str:
+        """Get object string or describe the object if it's not resolved yet."""
+        return str(self._target) if self._is_resolved else f"<{self._describe()}>"
+
+    def __getitem__(self, key: object) -> object:
+        """Index the object."""
+        return self.resolve()[key]  # type: ignore[index]
+
+    def __len__(self) -> int:
+        """Get the object length."""
+        return len(self.resolve())  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[object]:
+        """Iterate over the object."""
+        return iter(self.resolve())  # type: ignore[call-overload]
+
+    @property
+    def description(self) -> str:
+        """Describe the object without resolving it."""
+        return self._describe()
+
+    @property
+    def is_ready(self) -> bool:
+        """Check if the object can be resolved without waiting."""
+        return self._is_resolved or self._ready()
+
+    def resolve(self) -> object:
+        """
+        Get the object, waiting for it if it's not available yet.
+
+        Raises
+        ------
+        Exception
+            The error resolving failed with; resolving is retried on the next use
+
+        """
+        if not self._is_resolved:
+            self._target = self._resolve()
+            self._is_resolved = True
+        return self._target
+
+
+def lazy_field(loader: BackgroundLoader[T], name: str) -> LazyProxy:
+    """Get proxy for the field of the object being loaded; ready once loading finished."""
+    return LazyProxy(
+        resolve=lambda: getattr(loader.wait(), name),
+        describe=lambda: "{name}: {status}".format(name=name, status=loader.status),
+        ready=lambda: loader.done,
+    )
+
+
+def lazy_module(module_name: str) -> LazyProxy:
+    """Get proxy for the module imported on first use; ready once imported by anyone."""
+    return LazyProxy(
+        resolve=lambda: importlib.import_module(module_name),
+        describe=lambda: "module '{name}', imported on first use".format(name=module_name),
+        ready=lambda: module_name in sys.modules,
+    )
@@ -0,0 +1,83 @@
+"""
+Parallel gzip compression and write-behind decompression of byte streams.
+
+Compression is spread over threads the way pigz does it. The input is cut into
+blocks, each block is deflated separately with the end of the previous block
+as the dictionary and flushed to a byte boundary, so the compressed blocks
+concatenate into one deflate stream of a standard single-member gzip file.
+zlib releases the GIL while deflating, so the blocks are compressed in
+parallel.
+
+Decompression can't be parallelized: each deflate block refers to the output
+of the previous ones. Writing the output overlaps with it instead.
+
+"""
+import gzip
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import BinaryIO, Final, Iterable
+
+BLOCK_SIZE: Final = 1024 * 1024
+BLOCKS_PER_JOB: Final = 2  # blocks in flight per thread; bounds memory use
+WINDOW_SIZE: Final = 32768  # deflate back-reference distance limit
+RAW_WBITS: Final = -15  # deflate stream without zlib header
+
+# Member header without optional fields: magic, method, flags, mtime, extra flags, OS
+GZIP_HEADER: Final = struct.Struct("<2sBBIBB")
+GZIP_MAGIC: Final = b"\x1f\x8b"
+GZIP_OS_UNKNOWN: Final = 255
+GZIP_TRAILER: Final = struct.Struct("<II")  # CRC32 and size modulo 2**32
+SIZE_MASK: Final = 0xFFFFFFFF
+FINAL_BLOCK: Final = b"\x03\x00"  # empty fixed Huffman block marked as the last one
+
+
+def write_gzip(
+    blocks: Iterable[bytes], fdst: BinaryIO, jobs: int, level: int, mtime: int = 0
+) -> None:
+    """Write blocks as a single gzip member, compressing them in `jobs` threads."""
+    fdst.write(GZIP_HEADER.pack(GZIP_MAGIC, zlib.DEFLATED, 0, mtime, 0, GZIP_OS_UNKNOWN))
+    crc, size, zdict = 0, 0, b""
+    pending: deque[Future[bytes]] = deque()
+    with ThreadPoolExecutor(jobs) as pool:
+        for block in blocks:
+            pending.append(pool.submit(_deflate, block, zdict, level))
+            zdict = block[-WINDOW_SIZE:]
+            crc = zlib.crc32(block, crc)
+            size += len(block)
+            if len(pending) > jobs * BLOCKS_PER_JOB:
+                fdst.write(pending.popleft().result())
+        for deflated in pending:
+            fdst.write(deflated.result())
+    fdst.write(FINAL_BLOCK + GZIP_TRAILER.pack(crc, size & SIZE_MASK))
+
+
+def decompress_file(src: Path, dst: Path) -> None:
+    """Decompress gzip file, writing the output while the next block is decompressed."""
+    with gzip.open(src, "rb") as fsrc:
+        with dst.open("wb") as fdst:
+            _write_behind(iter(partial(fsrc.read, BLOCK_SIZE), b""), fdst)
+
+
+def _deflate(block: bytes, zdict: bytes, level: int) -> bytes:
+    """Deflate block, continuing after `zdict`; the output ends on a byte boundary."""
+    if zdict:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, RAW_WBITS, zdict=zdict)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, RAW_WBITS)
+    return compressor.compress(block) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+def _write_behind(blocks: Iterable[bytes], fdst: BinaryIO) -> None:
+    """Write each block in a thread while the next one is produced."""
+    with ThreadPoolExecutor(1) as writer:
+        pending: list[Future[int]] = []
+        for block in blocks:
+            for written in pending:
+                written.result()
+            pending = [writer.submit(fdst.write, block)]
+        for last_written in pending:
+            last_written.result()
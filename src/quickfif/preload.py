@@ -0,0 +1,125 @@
+"""
+Raw data decoded once and shared as memory-mapped files by `inspect --preload`.
+
+Decoding the data of a large recording takes a while, so we keep the decoded
+array on disk: mne writes the preloaded data straight into a file when given
+a path for `preload`. Entries are named by the hash of the file identity, as
+in `quickfif.cache`, so a changed file gets a new entry and old ones are
+pushed out by size-bounded LRU eviction.
+
+Later sessions map the entry instead of decoding the file. The mapping is
+copy-on-write: the pages are shared by all the consoles on the same file via
+the page cache and in-place changes made in one console, e.g. filtering, stay
+private to it. Entries are written to a temporary file and atomically renamed,
+so concurrent sessions never map a partially written entry. Evicting an entry
+in use is safe: the mapping keeps the data until the console exits.
+
+"""
+import os
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+import numpy as np
+import numpy.typing as npt  # noqa: WPS301
+
+from quickfif.cache import clear_entries, evict_entries, get_cache_dir, get_file_digest
+
+if TYPE_CHECKING:
+    from mne.io import Raw  # pragma: no cover
+
+PRELOAD_DIR_NAME: Final = "preload"
+DEFAULT_MAX_GB: Final = 16  # a few long recordings
+DEFAULT_MAX_BYTES: Final = DEFAULT_MAX_GB * 1024**3
+ENTRY_SUFFIX: Final = ".dat"
+ENTRY_FTYPE: Final = "raw-data"
+MAP_MODE: Final = "c"  # copy-on-write
+
+
+@dataclass(frozen=True)
+class PreloadCache(object):
+    """
+    Store of decoded raw data, bounded by the total size of entries.
+
+    Filesystem errors make the data load in memory as with plain `preload`:
+    the cache is an optimization and must never break the console.
+
+    """
+
+    root: Path
+    max_bytes: int = DEFAULT_MAX_BYTES
+
+    def read_raw(self, fpath: Path) -> "Raw":
+        """Read raw with data mapped from the cache, decoding it into the cache on miss."""
+        from mne.io import read_raw_fif  # noqa: WPS433 (heavy import, see `quickfif.config`)
+
+        raw = read_raw_fif(fpath, verbose="ERROR")  # noqa: WPS601
+        with suppress(OSError):
+            entry = self._get_entry(fpath, raw)
+            if entry is not None:
+                _attach(raw, entry)
+                return raw
+        raw.load_data(verbose="ERROR")
+        return raw
+
+    def evict(self) -> None:
+        """Remove least recently used entries until they fit into `max_bytes`."""
+        evict_entries(self.root / PRELOAD_DIR_NAME, ENTRY_SUFFIX, self.max_bytes)
+
+    def clear(self) -> int:
+        """Remove all the entries. Return the number of removed entries."""
+        return clear_entries(self.root / PRELOAD_DIR_NAME, ENTRY_SUFFIX)
+
+    def _get_entry(self, fpath: Path, raw: "Raw") -> Path | None:
+        """Get entry with the data of raw, creating it if needed; None if it's too large."""
+        n_bytes = _get_data_nbytes(raw)
+        if n_bytes > self.max_bytes:
+            return None
+        digest = get_file_digest(fpath, ENTRY_FTYPE)
+        entry = self.root / PRELOAD_DIR_NAME / f"{digest}{ENTRY_SUFFIX}"
+        if not entry.is_file() or entry.stat().st_size != n_bytes:
+            _write_entry(fpath, entry)
+        os.utime(entry)  # mark as recently used
+        self.evict()
+        return entry
+
+
+def get_preload_cache() -> PreloadCache:
+    """Get preload cache in the default location."""
+    return PreloadCache(get_cache_dir())
+
+
+def _write_entry(fpath: Path, entry: Path) -> None:
+    """Decode the data into the entry; mne writes preloaded data into the file we pass."""
+    from mne.io import read_raw_fif  # noqa: WPS433
+
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = entry.with_name(f".{entry.name}.{os.getpid()}.tmp")
+    try:
+        raw = read_raw_fif(fpath, preload=str(tmp_path), verbose="ERROR")
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    raw._data = _detach(raw._data)  # noqa: WPS437
+    os.replace(tmp_path, entry)
+
+
+def _attach(raw: "Raw", entry: Path) -> None:
+    """Use mapped entry as raw data; same state as after `Raw.load_data`."""
+    shape = (raw.info["nchan"], raw.n_times)
+    mapped = np.memmap(entry, mode=MAP_MODE, dtype=raw._dtype, shape=shape)  # noqa: WPS437
+    raw._data = _detach(mapped)  # noqa: WPS437
+    raw.preload = True
+    raw._comp = None  # noqa: WPS437 (compensation is applied to the preloaded data)
+    raw.close()
+
+
+def _detach(mapped: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """Hide the file of the mapping from mne, which removes it when the raw is deleted."""
+    return mapped.view(np.ndarray)
+
+
+def _get_data_nbytes(raw: "Raw") -> int:
+    itemsize = np.dtype(raw._dtype).itemsize  # noqa: WPS437 (float or complex, as mne reads it)
+    return int(raw.info["nchan"] * raw.n_times * itemsize)
@@ -0,0 +1,196 @@
+"""
+Wall time, CPU time and peak memory of the phases of a command, for `qfif --profile`.
+
+Code marks its phases with `phase`, which does nothing unless a `Profiler` is
+active, so the marks stay in place at no cost. Phases nest: the phases marked
+by the functions called from a phase are recorded under its name, e.g.
+``recompress/compress test_raw-1.fif``. Only the thread which started the
+profiler records phases; other threads run in their own context.
+
+Memory is traced with `tracemalloc` from the start of profiling, so the peak
+of a phase includes what earlier phases still hold. Tracing makes allocations
+slower; compare timings of profiled runs with each other only.
+
+"""
+import cProfile
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Final, Iterator
+
+BYTES_IN_MB: Final = 1024 * 1024
+SEC_TO_MS: Final = 1000
+# Imports worth noticing: they take most of the time of a cold run
+HEAVY_MODULES: Final = ("mne", "numpy", "scipy", "pandas", "matplotlib", "IPython")
+PROC_STAT_START_FIELD: Final = 19  # starttime, counted after the command name, see proc(5)
+PHASE_SEP: Final = "/"
+HEADER: Final = "{0:<40} {1:>10} {2:>10} {3:>10}  {4}".format(
+    "phase", "wall, ms", "CPU, ms", "peak, MB", "imported"
+)
+ROW_FORMAT: Final = "{0:<40} {1:>10.1f} {2:>10.1f} {3:>10.1f}  {4}"
+STARTUP_FORMAT: Final = "{0:<40} {1:>10} {2:>10.1f} {3:>10}"
+
+_active_profiler: ContextVar["Profiler | None"] = ContextVar("profiler", default=None)
+
+
+@dataclass(frozen=True)
+class PhaseStats(object):
+    """Resources taken by a phase."""
+
+    name: str  # names of the enclosing phases and the phase joined with '/'
+    wall_sec: float
+    cpu_sec: float  # CPU time of the process, all threads included
+    peak_traced_mb: float
+    imported: tuple[str, ...]  # heavy modules imported during the phase
+
+
+@dataclass(frozen=True)
+class ProfileReport(object):
+    """Startup and phases of a profiled command."""
+
+    startup_wall_sec: float | None  # None where the process start time is unknown
+    startup_cpu_sec: float
+    phases: tuple[PhaseStats, ...]
+
+    def __str__(self) -> str:
+        """Format report as a table, phases in the order they started."""
+        startup_wall_ms = "-"
+        if self.startup_wall_sec is not None:
+            startup_wall_ms = "{0:.1f}".format(self.startup_wall_sec * SEC_TO_MS)
+        startup_row = STARTUP_FORMAT.format(
+            "startup (interpreter, imports, options)",
+            startup_wall_ms,
+            self.startup_cpu_sec * SEC_TO_MS,
+            "-",
+        )
+        rows = [
+            ROW_FORMAT.format(
+                stats.name,
+                stats.wall_sec * SEC_TO_MS,
+                stats.cpu_sec * SEC_TO_MS,
+                stats.peak_traced_mb,
+                ", ".join(stats.imported),
+            )
+            for stats in self.phases
+        ]
+        return "\n".join([HEADER, startup_row, *rows])
+
+    def to_json(self) -> str:
+        """Dump report as JSON."""
+        return json.dumps(asdict(self), indent=2)
+
+
+@dataclass
+class _RunningPhase(object):
+    name: str
+    imported_before: tuple[str, ...]
+    start_wall: float = field(default_factory=time.perf_counter)
+    start_cpu: float = field(default_factory=time.process_time)
+    peak_bytes: int = 0
+
+    def finish(self) -> PhaseStats:
+        imported = tuple(
+            module for module in _get_heavy_modules() if module not in self.imported_before
+        )
+        return PhaseStats(
+            self.name,
+            time.perf_counter() - self.start_wall,
+            time.process_time() - self.start_cpu,
+            self.peak_bytes / BYTES_IN_MB,
+            imported,
+        )
+
+
+class Profiler(object):
+    """Record phases of a command, optionally with cProfile running alongside."""
+
+    def __init__(self, with_cprofile: bool = False) -> None:
+        # create the profiler right before starting it: startup ends here
+        self._startup_wall_sec = get_process_age_sec()
+        self._startup_cpu_sec = time.process_time()
+        self._cprofile = cProfile.Profile() if with_cprofile else None
+        self._phases: list[PhaseStats | None] = []  # in the order they started
+        self._stack: list[_RunningPhase] = []
+        self._token: Token["Profiler | None"] | None = None
+
+    def start(self) -> None:
+        """Make the profiler active in the current context and start tracing memory."""
+        tracemalloc.start()
+        self._token = _active_profiler.set(self)
+        if self._cprofile:
+            self._cprofile.enable()
+
+    def stop(self) -> ProfileReport:
+        """Stop profiling and get the phases finished so far."""
+        if self._cprofile:
+            self._cprofile.disable()
+        if self._token:
+            _active_profiler.reset(self._token)
+        tracemalloc.stop()
+        finished = tuple(stats for stats in self._phases if stats)
+        return ProfileReport(self._startup_wall_sec, self._startup_cpu_sec, finished)
+
+    def dump_stats(self, fpath: Path) -> None:
+        """Save cProfile statistics for `pstats` or a viewer like snakeviz."""
+        if self._cprofile:
+            self._cprofile.dump_stats(fpath)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Record resources taken by the code in the block."""
+        self._update_peaks()
+        if self._stack:
+            name = PHASE_SEP.join((self._stack[-1].name, name))
+        running = _RunningPhase(name, _get_heavy_modules())
+        idx = len(self._phases)
+        self._phases.append(None)
+        self._stack.append(running)
+        try:
+            yield
+        finally:
+            self._update_peaks()
+            self._stack.pop()
+            self._phases[idx] = running.finish()
+
+    def _update_peaks(self) -> None:
+        """Account the traced peak to the running phases and start a new peak."""
+        if not tracemalloc.is_tracing():
+            return
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        for running in self._stack:
+            running.peak_bytes = max(running.peak_bytes, peak_bytes)
+        tracemalloc.reset_peak()
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Record phase with the active profiler; do nothing when profiling is off."""
+    profiler = _active_profiler.get()
+    if profiler is None:
+        yield
+        return
+    with profiler.phase(name):
+        yield
+
+
+def get_process_age_sec() -> float | None:
+    """Get seconds since the process started, or None if /proc is not available."""
+    try:
+        proc_stat = Path("/proc/self/stat").read_text()
+    except OSError:
+        return None
+    uptime = Path("/proc/uptime").read_text()
+    # the command name in parentheses may contain spaces
+    stat_fields = proc_stat.rsplit(")", 1)[1].split()
+    start_ticks = int(stat_fields[PROC_STAT_START_FIELD])
+    return float(uptime.split()[0]) - start_ticks / os.sysconf("SC_CLK_TCK")
+
+
+def _get_heavy_modules() -> tuple[str, ...]:
+    return tuple(module for module in HEAVY_MODULES if module in sys.modules)
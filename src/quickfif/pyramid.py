@@ -0,0 +1,399 @@
+"""
+Multi-resolution min/max/RMS envelope of raw data, stored in a sidecar file.
+
+An overview of a long recording doesn't need every sample: for each pixel it
+draws the range of the signal and its power. The pyramid keeps them for bins
+of `bin_size` samples at the finest level and for bins `factor` times larger
+at each next level, like mipmaps keep a texture. Any time window at any width
+is then summarized from the coarsest level whose bins still fit in a pixel,
+reading at most `factor` bins per pixel.
+
+The data are read once, in time segments decoded by several processes. The
+sidecar is a JSON header followed by float32 levels, each stored as
+(statistic, bin, channel), so a time window of a level is a contiguous slice
+of a memory map.
+
+"""
+import json
+import math
+import os
+import struct
+import time
+from dataclasses import dataclass
+from functools import partial
+from itertools import pairwise
+from pathlib import Path
+from typing import Final, Iterator, TypeAlias, TypedDict
+
+import numpy as np
+import numpy.typing as npt  # noqa: WPS301
+
+from quickfif.fiff.raw import read_raw_header
+
+SIDECAR_SUFFIX: Final = ".pyr"
+MAGIC: Final = b"QFPYR\x00\x00\x01"
+PREFIX: Final = struct.Struct("<8sQ")  # magic, header size
+ALIGNMENT: Final = 64  # levels start at cache line boundaries
+DTYPE: Final = np.dtype(np.float32)
+N_STATS: Final = 3  # min, max, mean square
+MIN, MAX, MEAN_SQUARE = range(N_STATS)  # noqa: WPS429 (indices of the statistics)
+DEFAULT_BIN_SIZE: Final = 256  # sidecar takes ~2% of float32 data
+DEFAULT_FACTOR: Final = 4
+DEFAULT_JOBS: Final = os.cpu_count() or 1
+SEGMENTS_PER_JOB: Final = 4  # smaller segments even out the load of the processes
+CHUNK_BYTES: Final = 67108864  # 64 MB of decoded float64 data read at once by a process
+BLOCK_BINS: Final = 65536  # bins of a level aggregated at once into the next one
+BYTES_IN_MB: Final = 1024 * 1024
+
+Stats: TypeAlias = npt.NDArray[np.float32]  # (statistic, bin, channel)
+Counts: TypeAlias = npt.NDArray[np.int64]
+
+
+class PyramidMeta(TypedDict):
+    """Header of pyramid file."""
+
+    sfreq: float
+    n_times: int
+    ch_names: list[str]
+    bin_sizes: list[int]  # of each level, finest first
+
+
+@dataclass(frozen=True)
+class Level(object):
+    """Statistics of bins of `bin_size` samples."""
+
+    bin_size: int
+    stats: Stats
+
+    @property
+    def n_bins(self) -> int:
+        """Get number of bins."""
+        return self.stats.shape[1]
+
+    def summarize(
+        self,
+        edges: npt.NDArray[np.int64],
+        stop: int,
+        n_times: int,
+        picks: list[int] | None,
+    ) -> Stats:
+        """Merge the bins from each of `edges` to the next one; the last ends at `stop`."""
+        bin_edges = edges // self.bin_size
+        first_bin = int(bin_edges[0])
+        stop_bin = _get_n_bins(stop, self.bin_size)
+        window = self.stats[:, first_bin:stop_bin]
+        if picks is not None:
+            window = window[:, :, picks]
+        counts = _get_bin_counts(self.bin_size, first_bin, stop_bin, n_times)
+        return reduce_bins(window, counts, bin_edges - first_bin)[0]
+
+
+@dataclass(frozen=True)
+class Envelope(object):
+    """Signal range and RMS per pixel; arrays are (channel, pixel)."""
+
+    times: npt.NDArray[np.float64]  # start of each pixel, sec from the first sample
+    mins: npt.NDArray[np.float32]
+    maxs: npt.NDArray[np.float32]
+    rms: npt.NDArray[np.float32]
+
+
+@dataclass(frozen=True)
+class Pyramid(object):
+    """Envelope levels of a raw recording, finest first."""
+
+    sfreq: float
+    n_times: int
+    ch_names: list[str]
+    levels: list[Level]
+
+    def query(
+        self,
+        width: int,
+        tmin: float = 0,
+        tmax: float | None = None,
+        picks: list[int] | None = None,
+    ) -> Envelope:
+        """
+        Summarize time window from `tmin` to `tmax` sec in `width` pixels.
+
+        Takes time proportional to the size of the output: the bins are read
+        from the coarsest level where a pixel spans at least one bin.
+
+        Raises
+        ------
+        ValueError
+            If the window is empty or `width` is not positive
+
+        """
+        start, stop = self._get_window(tmin, tmax)
+        if stop <= start or width < 1:
+            raise ValueError(f"Can't summarize {tmin}-{tmax} sec in {width} pixels")
+        edges = start + np.arange(width) * (stop - start) // width
+        level = self._get_level((stop - start) / width)
+        stats = level.summarize(edges, stop, self.n_times, picks)
+        times = edges / self.sfreq
+        rms = np.sqrt(stats[MEAN_SQUARE])
+        return Envelope(times, stats[MIN].T, stats[MAX].T, rms.T)
+
+    def _get_window(self, tmin: float, tmax: float | None) -> tuple[int, int]:
+        """Get first sample and the sample after the window; times are clipped to the data."""
+        start = max(round(tmin * self.sfreq), 0)
+        if tmax is None:
+            return start, self.n_times
+        return start, min(round(tmax * self.sfreq) + 1, self.n_times)
+
+    def _get_level(self, samples_per_pixel: float) -> Level:
+        fitting = [level for level in self.levels if level.bin_size <= samples_per_pixel]
+        return fitting[-1] if fitting else self.levels[0]
+
+
+@dataclass(frozen=True)
+class BuildStats(object):
+    """Written pyramid and the time it took."""
+
+    dst: Path
+    n_levels: int
+    n_channels: int
+    n_bytes: int
+    elapsed_sec: float
+
+    def __str__(self) -> str:
+        """Describe the pyramid for the user."""
+        size_mb = self.n_bytes / BYTES_IN_MB
+        return "Wrote {0}: {1} levels of {2} channels, {3:.1f} MB in {4:.2f} s".format(
+            self.dst, self.n_levels, self.n_channels, size_mb, self.elapsed_sec
+        )
+
+
+def get_sidecar_path(fpath: Path) -> Path:
+    """
+    Get default path of the pyramid of raw file, next to it.
+
+    Examples
+    --------
+    >>> get_sidecar_path(Path("rec_raw.fif")).name
+    'rec_raw.fif.pyr'
+
+    """
+    return fpath.with_name(f"{fpath.name}{SIDECAR_SUFFIX}")
+
+
+def build_pyramid(  # noqa: WPS211 (pyramid geometry)
+    fpath: Path,
+    dst: Path,
+    bin_size: int = DEFAULT_BIN_SIZE,
+    factor: int = DEFAULT_FACTOR,
+    jobs: int = DEFAULT_JOBS,
+) -> BuildStats:
+    """
+    Read raw data once and write the envelope pyramid to `dst`.
+
+    The file is written under a temporary name and renamed, so readers never
+    map a partially written pyramid.
+
+    Raises
+    ------
+    ValueError
+        If the raw file is broken or the geometry is wrong
+    OSError
+        If the pyramid can't be written
+
+    """
+    if bin_size < 1 or factor < 2:
+        raise ValueError(f"Bin size must be positive and factor at least 2: {bin_size}, {factor}")
+    start_time = time.monotonic()
+    raw_header = read_raw_header(fpath)
+    meta = PyramidMeta(
+        sfreq=float(raw_header.info["sfreq"]),
+        n_times=raw_header.n_times,
+        ch_names=list(raw_header.info["ch_names"]),
+        bin_sizes=_plan_levels(raw_header.n_times, bin_size, factor),
+    )
+    tmp_path = dst.with_name(f".{dst.name}.{os.getpid()}.tmp")
+    try:
+        _write_pyramid(fpath, tmp_path, meta, jobs)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, dst)
+    elapsed_sec = time.monotonic() - start_time
+    n_levels, n_channels = len(meta["bin_sizes"]), len(meta["ch_names"])
+    return BuildStats(dst, n_levels, n_channels, dst.stat().st_size, elapsed_sec)
+
+
+def open_pyramid(fpath: Path) -> Pyramid:
+    """
+    Map pyramid file read-only.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a pyramid
+    OSError
+        If the file can't be read
+
+    """
+    with fpath.open("rb") as fid:
+        magic, header_size = PREFIX.unpack(fid.read(PREFIX.size))
+        if magic != MAGIC:
+            raise ValueError(f"Not a pyramid file: {fpath}")
+        meta: PyramidMeta = json.loads(fid.read(header_size))
+    mapped = np.memmap(fpath, dtype=DTYPE, mode="r", offset=_get_data_offset(header_size))
+    levels = _split_levels(mapped.view(np.ndarray), meta)
+    return Pyramid(meta["sfreq"], meta["n_times"], meta["ch_names"], levels)
+
+
+def reduce_bins(
+    stats: Stats, counts: Counts, starts: npt.NDArray[np.int64]
+) -> tuple[Stats, Counts]:
+    """
+    Merge groups of bins starting at `starts`; a repeated start gives a copy of its bin.
+
+    `counts` are the numbers of samples in the bins; they weight mean squares.
+
+    """
+    mins = np.minimum.reduceat(stats[MIN], starts, axis=0)
+    maxs = np.maximum.reduceat(stats[MAX], starts, axis=0)
+    weighted = stats[MEAN_SQUARE] * counts[:, np.newaxis]
+    sums = np.add.reduceat(weighted, starts, axis=0)
+    merged_counts = np.add.reduceat(counts, starts)
+    mean_squares = sums / merged_counts[:, np.newaxis]
+    return np.stack((mins, maxs, mean_squares)).astype(DTYPE), merged_counts
+
+
+def reduce_samples(samples: npt.NDArray[np.float64], bin_size: int) -> Stats:
+    """Get statistics of bins of `bin_size` samples of (channel, time) data."""
+    n_samples = samples.shape[1]
+    starts = np.arange(0, n_samples, bin_size)
+    counts = np.diff(np.append(starts, n_samples))
+    mins = np.minimum.reduceat(samples, starts, axis=1)
+    maxs = np.maximum.reduceat(samples, starts, axis=1)
+    mean_squares = np.add.reduceat(np.square(samples), starts, axis=1) / counts
+    return np.stack((mins.T, maxs.T, mean_squares.T)).astype(DTYPE)
+
+
+def get_chunk_size(n_channels: int, bin_size: int) -> int:
+    """Get number of samples in `CHUNK_BYTES` of data; chunks end on bin edges."""
+    n_bins = CHUNK_BYTES // (np.float64().itemsize * n_channels * bin_size)
+    return max(n_bins, 1) * bin_size
+
+
+def _plan_levels(n_times: int, bin_size: int, factor: int) -> list[int]:
+    """
+    Get bin sizes of the levels, down to a single bin.
+
+    Examples
+    --------
+    >>> _plan_levels(1000, 10, 4)
+    [10, 40, 160, 640, 2560]
+
+    """
+    bin_sizes = [bin_size]
+    while bin_sizes[-1] < n_times:
+        bin_sizes.append(bin_sizes[-1] * factor)
+    return bin_sizes
+
+
+def _write_pyramid(fpath: Path, dst: Path, meta: PyramidMeta, jobs: int) -> None:
+    mapped = np.memmap(dst, dtype=DTYPE, mode="r+", offset=_create_file(dst, meta))
+    levels = _split_levels(mapped.view(np.ndarray), meta)
+    finest = levels[0]
+    for first_bin, stats in _read_finest(fpath, finest.bin_size, finest.n_bins, jobs):
+        finest.stats[:, first_bin : first_bin + stats.shape[1]] = stats  # noqa: E203
+    for lower, upper in pairwise(levels):
+        _fill_level(lower, upper, meta["n_times"])
+    mapped.flush()
+
+
+def _create_file(dst: Path, meta: PyramidMeta) -> int:
+    """Write header and allocate the levels; get offset of the levels."""
+    header = json.dumps(meta).encode()
+    data_offset = _get_data_offset(len(header))
+    with dst.open("wb") as fid:
+        fid.write(PREFIX.pack(MAGIC, len(header)) + header)
+        fid.truncate(data_offset + _get_levels_size(meta) * DTYPE.itemsize)
+    return data_offset
+
+
+def _read_finest(
+    fpath: Path, bin_size: int, n_bins: int, jobs: int
+) -> Iterator[tuple[int, Stats]]:
+    """Get statistics of the finest bins by time segments read in `jobs` processes."""
+    n_segments = min(jobs * SEGMENTS_PER_JOB, n_bins)
+    first_bins = [n_bins * idx // n_segments for idx in range(n_segments)]
+    starts = [first_bin * bin_size for first_bin in first_bins]
+    stops: list[int | None] = [*starts[1:], None]
+    reduce_segment = partial(_reduce_segment, fpath, bin_size)
+    if jobs == 1:
+        yield from zip(first_bins, map(reduce_segment, starts, stops))
+        return
+    from concurrent.futures import ProcessPoolExecutor  # noqa: WPS433 (imports multiprocessing)
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from zip(first_bins, pool.map(reduce_segment, starts, stops))
+
+
+def _reduce_segment(fpath: Path, bin_size: int, start: int, stop: int | None) -> Stats:
+    """Read raw data from `start` to `stop` sample in chunks and get their bin statistics."""
+    from mne.io import read_raw_fif  # noqa: WPS433 (heavy import, see `quickfif.config`)
+
+    raw = read_raw_fif(fpath, verbose="ERROR")
+    chunk_size = get_chunk_size(raw.info["nchan"], bin_size)
+    stop = raw.n_times if stop is None else stop
+    chunks = [
+        reduce_samples(raw.get_data(start=pos, stop=min(pos + chunk_size, stop)), bin_size)
+        for pos in range(start, stop, chunk_size)
+    ]
+    return np.concatenate(chunks, axis=1)
+
+
+def _fill_level(lower: Level, upper: Level, n_times: int) -> None:
+    """Aggregate bins of the lower level into the upper one, a block at a time."""
+    for first_bin in range(0, upper.n_bins, BLOCK_BINS):
+        stop_bin = min(first_bin + BLOCK_BINS, upper.n_bins)
+        edges = np.arange(first_bin, stop_bin, dtype=np.int64) * upper.bin_size
+        stop = min(stop_bin * upper.bin_size, n_times)
+        stats = lower.summarize(edges, stop, n_times, picks=None)
+        upper.stats[:, first_bin:stop_bin] = stats
+
+
+def _get_bin_counts(bin_size: int, first_bin: int, stop_bin: int, n_times: int) -> Counts:
+    """Get numbers of samples in the bins; only the last bin of a level may be shorter."""
+    bin_starts = np.arange(first_bin, stop_bin, dtype=np.int64) * bin_size
+    return np.minimum(n_times - bin_starts, bin_size)
+
+
+def _split_levels(flat: npt.NDArray[np.float32], meta: PyramidMeta) -> list[Level]:
+    """Get levels as views of the flat array following the header."""
+    levels = []
+    offset = 0
+    for bin_size in meta["bin_sizes"]:
+        shape = _get_level_shape(meta, bin_size)
+        size = math.prod(shape)
+        stats = flat[offset : offset + size].reshape(shape)  # noqa: E203
+        levels.append(Level(bin_size, stats))
+        offset += _align(size * DTYPE.itemsize) // DTYPE.itemsize
+    return levels
+
+
+def _get_levels_size(meta: PyramidMeta) -> int:
+    """Get number of values in all the levels, with the alignment padding."""
+    sizes = [math.prod(_get_level_shape(meta, bin_size)) for bin_size in meta["bin_sizes"]]
+    return sum(_align(size * DTYPE.itemsize) for size in sizes) // DTYPE.itemsize
+
+
+def _get_level_shape(meta: PyramidMeta, bin_size: int) -> tuple[int, int, int]:
+    return N_STATS, _get_n_bins(meta["n_times"], bin_size), len(meta["ch_names"])
+
+
+def _get_n_bins(n_times: int, bin_size: int) -> int:
+    return -(-n_times // bin_size)
+
+
+def _get_data_offset(header_size: int) -> int:
+    return _align(PREFIX.size + header_size)
+
+
+def _align(n_bytes: int) -> int:
+    return -(-n_bytes // ALIGNMENT) * ALIGNMENT
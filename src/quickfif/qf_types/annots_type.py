@@ -1,10 +1,15 @@
 """Plugin handling mne.Annotations."""
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Final
+from typing import TYPE_CHECKING, Final, Iterator, TypedDict
 
-import pandas as pd
-from mne import Annotations, read_annotations
+from quickfif.fastcopy import SaveMethod, copy_unchanged
+
+if TYPE_CHECKING:
+    from mne import Annotations  # pragma: no cover
+
+    from quickfif.describe import GroupedStats  # pragma: no cover
+    from quickfif.fiff.annotations import FifAnnotations  # pragma: no cover
 
 EXTENSIONS: Final[tuple[str, ...]] = ("_annot.fif", "-annot.fif")
 
@@ -12,44 +17,65 @@ EXTENSIONS: Final[tuple[str, ...]] = ("_annot.fif", "-annot.fif")
 SUMMARY_HEADER: Final = "Annotations duration statistics"
 
 
+class AnnotsSummaryFields(TypedDict):
+    """Values of the annotations summary."""
+
+    n_annotations: int
+    duration_stats: "GroupedStats"  # by description, sec
+
+
 @dataclass
 class QfAnnots(object):
     """QfType implementation for mne.Annotations."""
 
     fpath: Path
-    annots: Annotations
+    annots: "Annotations"
 
     @property
     def summary(self) -> str:
         """Annotations string representation."""
-        underline = "-" * len(SUMMARY_HEADER)
-        return "\n".join([SUMMARY_HEADER, underline, get_annots_summary(self.annots)])
+        return "\n".join(self.summary_sections())
 
-    def to_dict(self) -> dict[str, Path | Annotations]:
+    def summary_sections(self) -> Iterator[str]:
+        """Generate the header and the duration statistics."""
+        from quickfif.describe import format_stats  # noqa: WPS433 (imports numpy)
+
+        yield "\n".join([SUMMARY_HEADER, "-" * len(SUMMARY_HEADER)])
+        duration_stats = self.summary_fields()["duration_stats"]
+        yield format_stats(duration_stats)
+
+    def summary_fields(self) -> AnnotsSummaryFields:
+        """Get number of annotations and statistics of their duration."""
+        return AnnotsSummaryFields(
+            n_annotations=len(self.annots), duration_stats=get_annots_stats(self.annots)
+        )
+
+    def to_dict(self) -> dict[str, "Path | Annotations"]:
         """Convert to namespace dictionary."""
-        return asdict(self)
+        return {"fpath": self.fpath, "annots": self.annots}
 
 
-def get_annots_summary(annots: Annotations) -> str:
-    """Get annotations summary."""
-    df = annots.to_data_frame()
-    df_groups = df.groupby("description").duration.describe()
-    total_series = df.duration.describe()
-    total_series.name = "Total"
-    total_df = pd.DataFrame(total_series).T
-    joint_df = pd.concat([df_groups, total_df])
-    joint_df["count"] = joint_df["count"].astype(int)
-    return joint_df.to_string(float_format=lambda x: "{0:.2f}".format(x))
+def get_annots_stats(annots: "Annotations | FifAnnotations") -> "GroupedStats":
+    """Get per-description and total statistics of annotations duration."""
+    from quickfif.describe import describe_stats  # noqa: WPS433 (imports numpy)
+
+    return describe_stats(annots.description, annots.duration)
 
 
 def read(fpath: Path) -> QfAnnots:
     """Read the annotations."""
+    from mne import read_annotations  # noqa: WPS433 (heavy import, see `quickfif.config`)
+
     annots = read_annotations(str(fpath))  # noqa: WPS601 (shadowed class attr)
     return QfAnnots(fpath, annots)
 
 
-def save(qf_obj: QfAnnots, dst: Path, overwrite: bool) -> None:
-    """Save ICA solution."""
+def save(qf_obj: QfAnnots, dst: Path, overwrite: bool) -> SaveMethod:
+    """Save annotations; unchanged file is copied as is."""
     if dst.is_dir():
         dst = dst / qf_obj.fpath.name
+    copy_method = copy_unchanged(qf_obj.fpath, dst, overwrite)
+    if copy_method:
+        return copy_method
     qf_obj.annots.save(fname=dst, overwrite=overwrite)
+    return SaveMethod.rewrite
@@ -1,6 +1,6 @@
 """Custom project-level types."""
 from pathlib import Path
-from typing import Any, Protocol
+from typing import Any, Iterator, Mapping, Protocol
 
 
 class QfType(Protocol):
@@ -12,5 +12,29 @@ class QfType(Protocol):
     def summary(self) -> str:  # pyright: ignore
         """Convert object to string."""
 
+    def summary_sections(self) -> Iterator[str]:  # pyright: ignore
+        """
+        Generate sections of `summary`, cheap ones first; joined by newlines they make it.
+
+        The preview prints each section as soon as it's ready, so the first
+        lines don't wait for slow statistics at the end.
+
+        """
+
+    def summary_fields(self) -> Mapping[str, object]:  # pyright: ignore
+        """
+        Get the values `summary` is rendered from, ready for JSON.
+
+        Machine consumers get the values without text formatting and don't
+        have to parse `summary` back.
+
+        """
+
     def to_dict(self) -> dict[str, Any]:  # type: ignore[misc] # allow Any here
-        """Convert object to dictionary."""
+        """
+        Convert object to namespace dictionary.
+
+        Values are the object fields themselves, not copies: `inspect` hands
+        them to IPython, and copying loaded data would double memory use.
+
+        """
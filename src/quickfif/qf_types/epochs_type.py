@@ -1,13 +1,36 @@
 """Plugin handling `mne.Epochs`."""
-from dataclasses import asdict, dataclass
+from collections import Counter
+from dataclasses import dataclass
+from itertools import chain
 from pathlib import Path
-from typing import Final
+from typing import TYPE_CHECKING, Final, Iterator, Sequence, TypedDict
 
-from mne.epochs import EpochsFIF, read_epochs
+from quickfif.fastcopy import DEFAULT_SPLIT_SIZE, SaveMethod, copy_unchanged
+
+if TYPE_CHECKING:
+    from mne.epochs import EpochsFIF  # pragma: no cover
 
 BIDS_EXT: Final = ("_epo.fif",)
 NEUROMAG_EXT: Final = ("-epo.fif",)
 EXTENSIONS: Final[tuple[str, ...]] = BIDS_EXT + NEUROMAG_EXT
+# Drop log entry of the events not selected by event_id; not counted as dropped, as in mne
+IGNORED: Final = "IGNORED"
+PERCENT: Final = 100
+
+
+class EpochsSummaryFields(TypedDict):
+    """Values of the epochs summary."""
+
+    n_epochs: int
+    tmin: float
+    tmax: float
+    sfreq: float
+    n_channels: int
+    channel_counts: dict[str, int]  # by type
+    events: dict[str, int]  # number of epochs by event name, ids without epochs too
+    n_selected: int  # epochs selected by event_id, dropped ones included
+    n_dropped: int
+    drop_reasons: dict[str, int]  # most frequent first
 
 
 @dataclass
@@ -15,30 +38,119 @@ class QfEpochs(object):
     """QfType implementation for `mne.Epochs`."""
 
     fpath: Path
-    epochs: EpochsFIF
+    epochs: "EpochsFIF"
 
     @property
     def summary(self) -> str:
-        """Provide `mne.Epochs` object summary."""
-        return str(self.epochs.info)
+        """
+        Provide `mne.Epochs` object summary.
+
+        Uses only the epochs metadata: events, time limits and drop log, so the
+        data are not loaded for non-preloaded epochs.
 
-    def to_dict(self) -> dict[str, Path | EpochsFIF]:
+        """
+        return "\n".join(self.summary_sections())
+
+    def summary_sections(self) -> Iterator[str]:
+        """Generate sections of the epochs summary: counts first, then the info."""
+        fields = self.summary_fields()
+        res = _get_epochs_header(fields)
+        res.extend(_get_events_summary(fields))
+        res.extend(_get_drop_summary(fields))
+        yield "\n".join(res)
+        info_summary = str(self.epochs.info)
+        yield info_summary
+
+    def summary_fields(self) -> EpochsSummaryFields:
+        """Get values of the epochs summary; the data are not loaded either."""
+        epochs = self.epochs
+        selected = [reasons for reasons in epochs.drop_log if IGNORED not in reasons]
+        dropped = [reasons for reasons in selected if reasons]
+        ch_types = Counter(epochs.get_channel_types())
+        return EpochsSummaryFields(
+            n_epochs=len(epochs.events),
+            tmin=float(epochs.tmin),
+            tmax=float(epochs.tmax),
+            sfreq=float(epochs.info["sfreq"]),
+            n_channels=epochs.info["nchan"],
+            channel_counts=dict(ch_types),
+            events=_count_events(epochs.events[:, 2].tolist(), epochs.event_id),
+            n_selected=len(selected),
+            n_dropped=len(dropped),
+            drop_reasons=dict(Counter(chain.from_iterable(dropped)).most_common()),
+        )
+
+    def to_dict(self) -> dict[str, "Path | EpochsFIF"]:
         """Convert to namespace dictionary."""
-        return asdict(self)
+        return {"fpath": self.fpath, "epochs": self.epochs}
+
+
+def _get_epochs_header(fields: EpochsSummaryFields, sep: str = "|") -> list[str]:
+    hdr = "{section} {sep} {n_epochs} epochs, tmin: {tmin:.3f} sec, tmax: {tmax:.3f} sec"
+    hdr = hdr.format(section="Epochs", sep=sep, **fields)
+    return [hdr, "-" * len(hdr)]
+
+
+def _count_events(event_codes: Sequence[int], event_id: dict[str, int]) -> dict[str, int]:
+    """Get number of epochs for each event id; ids without epochs are counted too."""
+    counts = Counter(event_codes)
+    return {name: counts[code] for name, code in event_id.items()}
+
+
+def _get_events_summary(fields: EpochsSummaryFields, sep: str = "|") -> list[str]:
+    """Get number of epochs for each event id."""
+    hdr = "{section:11} {sep}".format(section="Events", sep=sep)
+    res = [hdr + " types: {n_types}".format(n_types=len(fields["events"]))]
+    for name, count in fields["events"].items():
+        res.append("  {n_epo:3} {name}".format(n_epo=count, name=name))
+    return res
+
+
+def _get_drop_summary(fields: EpochsSummaryFields, sep: str = "|") -> list[str]:
+    """Get number of dropped epochs and the drop reasons, most frequent first."""
+    n_selected, n_dropped = fields["n_selected"], fields["n_dropped"]
+    hdr = "{section:11} {sep} {n_drop} of {n_epo} epochs ({share:.1f}%)"
+    res = [hdr.format(
+        section="Dropped",
+        sep=sep,
+        n_drop=n_dropped,
+        n_epo=n_selected,
+        share=PERCENT * n_dropped / n_selected if n_selected else 0,
+    )]
+    for reason, count in fields["drop_reasons"].items():
+        res.append("  {count:3} {reason}".format(count=count, reason=reason))
+    return res
+
+
+def read(fpath: Path, preload: bool = False) -> QfEpochs:  # pyright: ignore
+    """
+    Read epochs.
+
+    By default the data are not loaded: preview and most of the subcommands
+    need only the metadata, and mne reads the data of non-preloaded epochs from
+    the file on access. `inspect --preload` passes `preload`, since the data
+    are used repeatedly in the console.
 
+    """
+    from mne.epochs import read_epochs  # noqa: WPS433 (heavy import, see `quickfif.config`)
 
-def read(fpath: Path) -> QfEpochs:  # pyright: ignore
-    """Read epochs."""
-    ep = read_epochs(str(fpath), verbose="ERROR")  # noqa: WPS601
+    ep = read_epochs(str(fpath), preload=preload, verbose="ERROR")  # noqa: WPS601
     return QfEpochs(fpath, ep)
 
 
-def save(qf_obj: QfEpochs, dst: Path, overwrite: bool, split_size: str = "2GB") -> None:
-    """Save epochs file in a split-safe manner."""
+def save(
+    qf_obj: QfEpochs, dst: Path, overwrite: bool, split_size: str = DEFAULT_SPLIT_SIZE
+) -> SaveMethod:
+    """Save epochs file in a split-safe manner; a single unsplit file is copied as is."""
     if dst.is_dir():
         dst = dst / qf_obj.fpath.name
+    if split_size == DEFAULT_SPLIT_SIZE:
+        copy_method = copy_unchanged(qf_obj.fpath, dst, overwrite)
+        if copy_method:
+            return copy_method
     split_naming = "bids" if str(dst).endswith(BIDS_EXT) else "neuromag"
 
     qf_obj.epochs.save(
         fname=dst, overwrite=overwrite, split_naming=split_naming, split_size=split_size
     )
+    return SaveMethod.rewrite
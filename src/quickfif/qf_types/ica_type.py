@@ -1,11 +1,36 @@
 """Plugin handling `mne.preprocessing.ICA`."""
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Final
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Final, Iterator, TypedDict
 
-from mne.preprocessing import ICA, read_ica
+from quickfif.fastcopy import SaveMethod, copy_unchanged
+
+if TYPE_CHECKING:
+    from mne.preprocessing import ICA  # pragma: no cover
 
 EXTENSIONS: Final[tuple[str, ...]] = ("_ica.fif", "-ica.fif")
+# Names of `ICA.current_fit` values in the summary
+FIT_ON: Final = MappingProxyType({"raw": "raw data", "epochs": "epochs"})
+FIT_FORMAT: Final = ", ".join((
+    " (fit in {n_iterations} iterations on {n_samples} samples)",
+    "{n_components} ICA components ({n_pca_components} PCA components available)",
+    "channel types: {types}",
+    "{n_excluded} sources marked for exclusion",
+))
+
+
+class IcaSummaryFields(TypedDict):
+    """Values of the ICA summary; fit results are None for unfitted ICA."""
+
+    fit_on: str | None  # 'raw data' or 'epochs'
+    method: str
+    n_iterations: int | None
+    n_samples: int | None
+    n_components: int | None
+    n_pca_components: int | None
+    ch_types: list[str]
+    excluded: list[int]  # indices of the components marked for exclusion
 
 
 @dataclass
@@ -13,26 +38,66 @@ class QfIca(object):
     """QfType implementation for `mne.preprocessing.ICA`."""
 
     fpath: Path
-    ica: ICA
+    ica: "ICA"
 
     @property
     def summary(self) -> str:
-        """ICA object summary."""
-        return str(self.ica)
+        """ICA object summary in the format of `ICA.__repr__`."""
+        fields = self.summary_fields()
+        summary = "{fit_on} decomposition, method: {method}".format(
+            fit_on=fields["fit_on"] or "no", method=fields["method"]
+        )
+        if fields["fit_on"] is not None:
+            summary += FIT_FORMAT.format(
+                types=", ".join(fields["ch_types"]),
+                n_excluded=len(fields["excluded"]) or "no",
+                **fields,
+            )
+        return f"<ICA | {summary}>"
+
+    def summary_sections(self) -> Iterator[str]:
+        """Generate the summary; it's a single line."""
+        yield self.summary
 
-    def to_dict(self) -> dict[str, Path | ICA]:
+    def summary_fields(self) -> IcaSummaryFields:
+        """Get values of the ICA summary."""
+        ica = self.ica
+        pca_components = getattr(ica, "pca_components_", None)
+        return IcaSummaryFields(
+            fit_on=FIT_ON.get(ica.current_fit),
+            method=ica.method,
+            n_iterations=_get_optional_int(ica, "n_iter_"),
+            n_samples=_get_optional_int(ica, "n_samples_"),
+            n_components=_get_optional_int(ica, "n_components_"),
+            n_pca_components=None if pca_components is None else len(pca_components),
+            ch_types=ica.get_channel_types(unique=True) if ica.info else [],
+            excluded=[int(idx) for idx in ica.exclude],
+        )
+
+    def to_dict(self) -> dict[str, "Path | ICA"]:
         """Convert to namespace dictionary."""
-        return asdict(self)
+        return {"fpath": self.fpath, "ica": self.ica}
+
+
+def _get_optional_int(ica: "ICA", attr: str) -> int | None:
+    fit_result = getattr(ica, attr, None)
+    return None if fit_result is None else int(fit_result)
 
 
 def read(fpath: Path) -> QfIca:
     """Read ICA solution."""
+    from mne.preprocessing import read_ica  # noqa: WPS433 (heavy import, see `quickfif.config`)
+
     ica = read_ica(str(fpath), verbose="ERROR")  # noqa: WPS601
     return QfIca(fpath, ica)
 
 
-def save(qf_obj: QfIca, dst: Path, overwrite: bool) -> None:
-    """Save ICA solution."""
+def save(qf_obj: QfIca, dst: Path, overwrite: bool) -> SaveMethod:
+    """Save ICA solution; unchanged file is copied as is."""
     if dst.is_dir():
         dst = dst / qf_obj.fpath.name
+    copy_method = copy_unchanged(qf_obj.fpath, dst, overwrite)
+    if copy_method:
+        return copy_method
     qf_obj.ica.save(fname=dst, overwrite=overwrite)
+    return SaveMethod.rewrite
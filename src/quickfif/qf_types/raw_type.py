@@ -1,15 +1,21 @@
 """Plugin handling `mne.io.QfRaw`."""
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Final
+from typing import TYPE_CHECKING, Final, Iterator, TypedDict
 
-from mne.channels.channels import channel_indices_by_type
-from mne.io import Raw, read_raw_fif
+from quickfif.fastcopy import DEFAULT_SPLIT_SIZE, SaveMethod, copy_unchanged
+from quickfif.fiff.channels import channel_indices_by_type
+from quickfif.qf_types.annots_type import get_annots_stats
 
-from quickfif.qf_types.annots_type import get_annots_summary
+if TYPE_CHECKING:  # pragma: no cover
+    from mne import Annotations, Info
+    from mne.io import Raw
 
-if TYPE_CHECKING:
-    from mne import Info  # pragma: no cover
+    from quickfif.describe import GroupedStats
+    from quickfif.fiff.annotations import FifAnnotations
+    from quickfif.fiff.info import MeasInfo
+    from quickfif.fiff.raw import RawHeader
 
 _NMG_SFX = ("raw", "raw_sss", "raw_tsss")
 _BIDS_SFX = ("_meg", "_eeg", "_ieeg")
@@ -22,82 +28,230 @@ EXTENSIONS: Final[tuple[str, ...]] = NEUROMAG_EXT + BIDS_EXT
 ANNOTS_HEADER: Final = "{section:10} {sep}{msg}"
 
 
+class RawSummaryFields(TypedDict):
+    """Values of the raw summary."""
+
+    duration_sec: float
+    sfreq: float
+    n_channels: int
+    channel_counts: dict[str, int]  # by type, most numerous first; empty types skipped
+    channel_names: dict[str, list[str]]  # by type, in the same order
+    highpass: float
+    lowpass: float
+    meas_date: str | None  # ISO 8601
+    experimenter: str | None
+    n_annotations: int
+    annotation_stats: "GroupedStats | None"  # duration stats by description, sec
+
+
 @dataclass
 class QfRaw(object):
     """QfType implementation for `mne.io.Raw` object."""
 
     fpath: Path
-    raw: Raw
+    raw: "Raw"
 
     @property
     def summary(self) -> str:
         """Raw object summary."""
-        res = _get_raw_header(self.raw.info, self.raw.times[-1])
-        res.extend(_get_ch_summary(self.raw.info))
-        res.extend(_get_misc_summary(self.raw.info))
+        return "\n".join(self.summary_sections())
+
+    def summary_sections(self) -> Iterator[str]:
+        """Generate sections of the raw object summary."""
+        return _iter_sections(self.raw.info, self.raw.times[-1], self.raw.annotations)
+
+    def summary_fields(self) -> RawSummaryFields:
+        """Get values of the raw object summary."""
+        return _get_summary_fields(self.raw.info, self.raw.times[-1], self.raw.annotations)
+
+    def to_dict(self) -> dict[str, "Path | Raw"]:
+        """Convert to namespace dictionary."""
+        return {"fpath": self.fpath, "raw": self.raw}
+
+
+@dataclass(frozen=True)
+class RawExport(object):
+    """Part of raw to save and the size of chunks it's streamed in."""
+
+    tmin: float = 0
+    tmax: float | None = None  # till the end
+    picks: tuple[str, ...] | None = None  # channel names or types; all channels if not set
+    buffer_sec: float | None = None  # peak memory use is proportional to it; mne default if None
 
-        annots_msg = " duration stats, sec" if self.raw.annotations else " no annotations"
-        res.append(ANNOTS_HEADER.format(section="Annotations", sep="|", msg=annots_msg))
-        if self.raw.annotations:
-            res.append(get_annots_summary(self.raw.annotations))
-        return "\n".join(res)
 
-    def to_dict(self) -> dict[str, str | Raw]:
+@dataclass
+class QfRawHeader(object):
+    """QfType implementation for raw file header; enough for preview, no data access."""
+
+    fpath: Path
+    header: "RawHeader"
+
+    @property
+    def summary(self) -> str:
+        """Raw file summary; same as `QfRaw.summary` for the same file."""
+        return "\n".join(self.summary_sections())
+
+    def summary_sections(self) -> Iterator[str]:
+        """Generate sections of the raw file summary."""
+        hdr = self.header
+        return _iter_sections(hdr.info, hdr.duration, hdr.annotations)
+
+    def summary_fields(self) -> RawSummaryFields:
+        """Get values of the raw file summary; same as `QfRaw.summary_fields`."""
+        hdr = self.header
+        return _get_summary_fields(hdr.info, hdr.duration, hdr.annotations)
+
+    def to_dict(self) -> dict[str, "Path | RawHeader"]:
         """Convert to namespace dictionary."""
-        return asdict(self)
+        return {"fpath": self.fpath, "header": self.header}
+
 
+def _get_summary_fields(
+    ii: "Info | MeasInfo", duration: float, annots: "Annotations | FifAnnotations"
+) -> RawSummaryFields:
+    fields = _get_info_fields(ii, duration, len(annots))
+    fields["annotation_stats"] = get_annots_stats(annots) if annots else None
+    return fields
 
-def _get_raw_header(ii: "Info", duration: float, sep: str = "|") -> list[str]:
+
+def _get_info_fields(ii: "Info | MeasInfo", duration: float, n_annots: int) -> RawSummaryFields:
+    """Get the summary values but annotation statistics, which take the most time."""
+    channel_names = _get_channel_names(ii)
+    meas_date = ii["meas_date"]
+    return RawSummaryFields(
+        duration_sec=float(duration),
+        sfreq=float(ii["sfreq"]),
+        n_channels=ii["nchan"],
+        channel_counts={ch_type: len(names) for ch_type, names in channel_names.items()},
+        channel_names=channel_names,
+        highpass=float(ii["highpass"]),
+        lowpass=float(ii["lowpass"]),
+        meas_date=meas_date.isoformat() if meas_date else None,
+        experimenter=ii["experimenter"],
+        n_annotations=n_annots,
+        annotation_stats=None,
+    )
+
+
+def _iter_sections(
+    ii: "Info | MeasInfo", duration: float, annots: "Annotations | FifAnnotations"
+) -> Iterator[str]:
+    """Generate summary sections; annotation statistics, the slowest one, comes last."""
+    fields = _get_info_fields(ii, duration, len(annots))
+    info_sections = (_get_raw_header, _get_ch_summary, _get_misc_summary)
+    yield from ("\n".join(get_section(fields)) for get_section in info_sections)
+    yield _get_annots_summary(get_annots_stats(annots) if annots else None)
+
+
+def _get_annots_summary(annots_stats: "GroupedStats | None", sep: str = "|") -> str:
+    """Get annotation duration statistics by description."""
+    from quickfif.describe import format_stats  # noqa: WPS433 (imports numpy)
+
+    annots_msg = " duration stats, sec" if annots_stats else " no annotations"
+    res = [ANNOTS_HEADER.format(section="Annotations", sep=sep, msg=annots_msg)]
+    if annots_stats:
+        res.append(format_stats(annots_stats))
+    return "\n".join(res)
+
+
+def _get_raw_header(fields: RawSummaryFields, sep: str = "|") -> list[str]:
     """Get summary header for raw file."""
-    hdr = "{section} {sep} duration: {dur:.1f} sec, sampling rate: {fs:.1f} Hz"
-    hdr = hdr.format(section="Raw", sep=sep, dur=duration, fs=ii["sfreq"])
+    hdr = "{section} {sep} duration: {dur:.1f} sec, sampling rate: {sfreq:.1f} Hz"
+    hdr = hdr.format(section="Raw", sep=sep, dur=fields["duration_sec"], **fields)
     return [hdr, "-" * len(hdr)]
 
 
-def _get_misc_summary(ii: "Info", sep: str = "|") -> list[str]:
+def _get_misc_summary(fields: RawSummaryFields, sep: str = "|") -> list[str]:
     """Get filtering, experimenter and meas_date summary."""
     hdr = "{section:11} {sep} highpass: {highpass:.1f}, lowpass: {lowpass:.1f}"
-    res = [hdr.format(section="Filter", sep=sep, **ii)]
+    res = [hdr.format(section="Filter", sep=sep, **fields)]
 
-    on = f"{ii['meas_date']:%d/%m/%Y, %H:%m}" if ii["meas_date"] else "N/A"  # noqa: WPS323
-    by = ii["experimenter"] or "N/A"
+    meas_date = fields["meas_date"]
+    on = "N/A"
+    if meas_date:
+        on = datetime.fromisoformat(meas_date).strftime("%d/%m/%Y, %H:%m")  # noqa: WPS323
+    by = fields["experimenter"] or "N/A"
     hdr = "{section:11} {sep}".format(section="Recorded", sep=sep)
     res.append(hdr + " by: {by}, on: {on}".format(by=by, on=on))
     return res
 
 
-def _get_ch_summary(ii: "Info", sep: str = "|") -> list[str]:
+def _get_ch_summary(fields: RawSummaryFields, sep: str = "|") -> list[str]:
     """Get channels number and composition summary."""
     hdr = "{section:11} {sep}".format(section="Channels", sep=sep)
-    res = [hdr + " total: {n_ch}".format(n_ch=ii["nchan"])]
-
-    type_idx = channel_indices_by_type(ii).items()
-    type_idx = [(t, idx) for t, idx in type_idx if idx]  # filter empty subtypes
+    res = [hdr + " total: {n_ch}".format(n_ch=fields["n_channels"])]
 
-    for t, idx in sorted(type_idx, key=lambda x: -len(x[1])):  # noqa: WPS426
-        ch_names = [ii["ch_names"][i] for i in idx]
+    for t, ch_names in fields["channel_names"].items():
         if len(ch_names) <= 4:
             ch_names_str = "".join([f"{name:10.10s}" for name in ch_names]).rstrip()
         else:
             ch_names_str = "{0:10.10s} {1:10.10s} {2:^10s} {3}".format(
                 ch_names[0], ch_names[1], "...", ch_names[-1]
             )
-        res.append("  {n_ch:3} {t:6}: {names}".format(n_ch=len(idx), t=t, names=ch_names_str))
+        res.append("  {n_ch:3} {t:6}: {names}".format(n_ch=len(ch_names), t=t, names=ch_names_str))
     return res
 
 
+def _get_channel_names(ii: "Info | MeasInfo") -> dict[str, list[str]]:
+    """Get channel names by type, most numerous type first."""
+    type_idx = list(channel_indices_by_type(ii["chs"]).items())
+    type_idx = [(t, idx) for t, idx in type_idx if idx]  # filter empty subtypes
+    type_idx.sort(key=lambda x: -len(x[1]))
+    return {t: [ii["ch_names"][i] for i in idx] for t, idx in type_idx}
+
+
 def read(fpath: Path) -> QfRaw:
     """Read raw object."""
+    from mne.io import read_raw_fif  # noqa: WPS433 (heavy import, see `quickfif.config`)
+
     raw = read_raw_fif(fpath, verbose="ERROR")  # noqa: WPS601
     return QfRaw(fpath, raw)
 
 
-def save(qf_obj: QfRaw, dst: Path, overwrite: bool, split_size: str = "2GB") -> None:
-    """Save raw file in a split-safe manner."""
+def read_header(fpath: Path) -> QfRawHeader:
+    """Read raw file header for preview without reading the data."""
+    from quickfif.fiff.raw import read_raw_header  # noqa: WPS433 (imports numpy)
+
+    return QfRawHeader(fpath, read_raw_header(fpath))
+
+
+def save(
+    qf_obj: QfRaw,
+    dst: Path,
+    overwrite: bool,
+    split_size: str = DEFAULT_SPLIT_SIZE,
+    export: RawExport | None = None,
+) -> SaveMethod:
+    """
+    Save raw file in a split-safe manner; a single unsplit file is copied as is.
+
+    With `export`, only a time window and a subset of channels are saved. The
+    data are read from the source and written in chunks of `export.buffer_sec`,
+    so the raw is never loaded in memory as a whole. Besides the chunks, mne
+    allocates only the time axis: 8 bytes per sample, whatever the number of
+    channels.
+
+    """
     if dst.is_dir():
         dst = dst / qf_obj.fpath.name
+    # RawArray or raw read from another file don't match the file contents
+    fnames = [fname for fname in qf_obj.raw.filenames if fname is not None]
+    is_file_backed = [Path(fname).resolve() for fname in fnames] == [qf_obj.fpath.resolve()]
+    if export is None and split_size == DEFAULT_SPLIT_SIZE and is_file_backed:
+        copy_method = copy_unchanged(qf_obj.fpath, dst, overwrite)
+        if copy_method:
+            return copy_method
+    export = export or RawExport()
     split_naming = "bids" if str(dst).endswith(BIDS_EXT) else "neuromag"
 
     qf_obj.raw.save(
-        fname=dst, overwrite=overwrite, split_naming=split_naming, split_size=split_size
+        fname=dst,
+        tmin=export.tmin,
+        tmax=export.tmax,
+        picks=list(export.picks) if export.picks else None,
+        buffer_size_sec=export.buffer_sec,
+        overwrite=overwrite,
+        split_naming=split_naming,
+        split_size=split_size,
     )
+    return SaveMethod.rewrite
@@ -0,0 +1,231 @@
+"""
+Converting FIFF files between plain and gzip-compressed by streaming the bytes.
+
+`saveas` converts by reading the recording with mne and writing it again, and
+plain `gzip` compresses on a single core. Here the file content is copied as
+is, only the file name references between the splits are patched on the way
+(see `quickfif.fiff.move`), since split names change with the extension.
+
+Compression is spread over threads (see `quickfif.pgzip`). Compressed splits
+get the patches applied on the way to the compressor, while decompressed
+splits are patched in place before they take their names.
+
+"""
+import os
+import time
+from dataclasses import dataclass, field
+from enum import StrEnum
+from functools import partial
+from pathlib import Path
+from typing import BinaryIO, Final, Iterator
+
+from quickfif.fiff import move
+from quickfif.pgzip import BLOCK_SIZE, decompress_file, write_gzip
+from quickfif.profiling import phase
+
+COMPRESSED_SUFFIX: Final = ".gz"
+DEFAULT_LEVEL: Final = 6  # zlib default: most of the ratio of level 9 at a fraction of time
+DEFAULT_JOBS: Final = os.cpu_count() or 1
+BYTES_IN_MB: Final = 1024 * 1024
+
+
+class Direction(StrEnum):
+    """Which way the files were converted."""
+
+    compress = "compressed"
+    decompress = "decompressed"
+
+
+@dataclass(frozen=True)
+class RecompressStats(object):
+    """Converted files and the amount of data read and written."""
+
+    direction: Direction
+    dsts: list[Path]
+    n_read: int
+    n_written: int
+    elapsed_sec: float
+
+    @property
+    def throughput(self) -> float:
+        """Get MB of uncompressed data processed per second."""
+        n_plain = self.n_read if self.direction == Direction.compress else self.n_written
+        return n_plain / BYTES_IN_MB / max(self.elapsed_sec, 1e-6)  # noqa: WPS432
+
+    def __str__(self) -> str:
+        """Describe conversion for the user."""
+        return "{0} {1}: {2:.1f} MB to {3:.1f} MB in {4:.2f} s, {5:.1f} MB/s".format(
+            self.direction.capitalize(),
+            ", ".join(str(dst) for dst in self.dsts),
+            self.n_read / BYTES_IN_MB,
+            self.n_written / BYTES_IN_MB,
+            self.elapsed_sec,
+            self.throughput,
+        )
+
+
+@dataclass
+class _ChainDecompressor(object):
+    """Decompress splits to temporary files next to `dst` while the chain is followed."""
+
+    dst: Path
+    src_fpaths: list[Path] = field(default_factory=list)
+    tmp_fpaths: list[Path] = field(default_factory=list)
+
+    def __call__(self, fpath: Path) -> move.Split:
+        """Decompress split and read its references."""
+        self.src_fpaths.append(fpath)
+        self.tmp_fpaths.append(_get_tmp_path(self.dst, len(self.tmp_fpaths)))
+        with phase(f"decompress {fpath.name}"):
+            decompress_file(fpath, self.tmp_fpaths[-1])
+        return move.read_split(self.tmp_fpaths[-1])
+
+
+def recompress(  # noqa: WPS211 (conversion settings)
+    src: Path,
+    dst: Path,
+    bids: bool,
+    overwrite: bool = False,
+    jobs: int = DEFAULT_JOBS,
+    level: int = DEFAULT_LEVEL,
+) -> RecompressStats:
+    """
+    Compress split set to gzip files or decompress it, as the `dst` extension says.
+
+    Destination files appear only when all of them are written.
+
+    Parameters
+    ----------
+    src
+        First file of the split set
+    dst
+        Name of the first converted file, the rest of the splits are named after it
+    bids
+        Name splits as `_split-01_meg.fif` instead of `_raw-1.fif`
+    overwrite
+        Replace existing destination files
+    jobs
+        Number of threads compressing the data
+    level
+        Compression level from 1 (fastest) to 9 (smallest)
+
+    Raises
+    ------
+    ValueError
+        If source and destination are compressed alike or the split chain is broken
+    OSError
+        If destination exists or the files can't be written
+
+    """
+    start_time = time.monotonic()
+    if src.name.endswith(COMPRESSED_SUFFIX) == dst.name.endswith(COMPRESSED_SUFFIX):
+        raise ValueError("Source and destination are compressed alike; use saveas or move")
+    if dst.exists() and not overwrite:
+        raise FileExistsError(f"Destination exists: {dst}")
+    if src.name.endswith(COMPRESSED_SUFFIX):
+        direction = Direction.decompress
+        dsts, n_read, n_written = _decompress_chain(src, dst, bids, overwrite)
+    else:
+        direction = Direction.compress
+        dsts, n_read, n_written = _compress_chain(src, dst, bids, overwrite, jobs, level)
+    return RecompressStats(direction, dsts, n_read, n_written, time.monotonic() - start_time)
+
+
+def _compress_chain(  # noqa: WPS211 (conversion settings)
+    src: Path, dst: Path, bids: bool, overwrite: bool, jobs: int, level: int
+) -> tuple[list[Path], int, int]:
+    chain = move.read_chain(src)
+    dsts = move.split_fnames(dst, len(chain), bids)
+    move.plan_patches(chain, dsts)
+    move.check_destinations(chain, dsts, overwrite)
+    tmp_fpaths = [_get_tmp_path(dst, idx) for idx in range(len(chain))]
+    try:
+        for split, tmp_fpath in zip(chain, tmp_fpaths):
+            _compress_split(split, tmp_fpath, jobs, level)
+    except Exception:
+        _remove_all(tmp_fpaths)
+        raise
+    _replace_all(tmp_fpaths, dsts)
+    return dsts, sum(src_split.size for src_split in chain), _get_total_size(dsts)
+
+
+def _decompress_chain(
+    src: Path, dst: Path, bids: bool, overwrite: bool
+) -> tuple[list[Path], int, int]:
+    decompressor = _ChainDecompressor(dst)
+    try:
+        dsts = _decompress_and_patch(src, dst, bids, overwrite, decompressor)
+    except Exception:
+        _remove_all(decompressor.tmp_fpaths)
+        raise
+    _replace_all(decompressor.tmp_fpaths, dsts)
+    return dsts, _get_total_size(decompressor.src_fpaths), _get_total_size(dsts)
+
+
+def _decompress_and_patch(  # noqa: WPS211 (conversion settings)
+    src: Path, dst: Path, bids: bool, overwrite: bool, decompressor: _ChainDecompressor
+) -> list[Path]:
+    """Decompress split set to temporary files and patch them for the new names."""
+    chain = move.follow_chain(src, decompressor)
+    dsts = move.split_fnames(dst, len(chain), bids)
+    move.plan_patches(chain, dsts)
+    move.check_destinations(chain, dsts, overwrite)
+    for split in chain:
+        move.apply_patches(split.fpath, split)
+    return dsts
+
+
+def _compress_split(split: move.Split, dst: Path, jobs: int, level: int) -> None:
+    """Compress split file with the patches of its references applied."""
+    overwrites, appended = move.get_patch_edits(split)
+    with phase("compress {0}".format(split.fpath.name)):
+        with split.fpath.open("rb") as fsrc:
+            mtime = int(os.fstat(fsrc.fileno()).st_mtime)
+            with dst.open("wb") as fdst:
+                write_gzip(_read_patched(fsrc, overwrites, appended), fdst, jobs, level, mtime)
+
+
+def _read_patched(
+    fid: BinaryIO, overwrites: list[move.Overwrite], appended: bytes
+) -> Iterator[bytes]:
+    """Read file in blocks with `overwrites` applied and `appended` added at the end."""
+    pos = 0
+    for block in iter(partial(fid.read, BLOCK_SIZE), b""):
+        yield _overwrite(block, pos, overwrites)
+        pos += len(block)
+    if appended:
+        yield appended
+
+
+def _overwrite(block: bytes, pos: int, overwrites: list[move.Overwrite]) -> bytes:
+    """Apply overwrites to the block starting at file position `pos`."""
+    end = pos + len(block)
+    hits = [ow for ow in overwrites if ow.pos < end and ow.end > pos]
+    if not hits:
+        return block
+    patched = bytearray(block)
+    for ow in hits:
+        start, stop = max(ow.pos, pos), min(ow.end, end)
+        new_part = ow.new_bytes[start - ow.pos : stop - ow.pos]  # noqa: E203
+        patched[start - pos : stop - pos] = new_part  # noqa: E203, WPS362 (in-place patch)
+    return bytes(patched)
+
+
+def _get_tmp_path(dst: Path, idx: int) -> Path:
+    """Get name of temporary file for split `idx`, hidden next to the destination."""
+    tmp_name = ".{name}.{pid}-{idx}.tmp".format(name=dst.name, pid=os.getpid(), idx=idx)
+    return dst.with_name(tmp_name)
+
+
+def _replace_all(tmp_fpaths: list[Path], dsts: list[Path]) -> None:
+    for tmp_fpath, dst in zip(tmp_fpaths, dsts):
+        os.replace(tmp_fpath, dst)
+
+
+def _get_total_size(fpaths: list[Path]) -> int:
+    return sum(fpath.stat().st_size for fpath in fpaths)
+
+
+def _remove_all(fpaths: list[Path]) -> None:
+    for fpath in fpaths:
+        fpath.unlink(missing_ok=True)
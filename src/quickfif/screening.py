@@ -0,0 +1,384 @@
+"""
+Per-channel statistics of raw data for screening bad channels.
+
+The data are streamed in chunks of at most `CHUNK_BYTES` (see
+`quickfif.pyramid`), so memory use doesn't depend on the recording length.
+Signal channels are split into groups, each read by its own process. Mean and
+central moments of each chunk are merged into the running ones with the
+pairwise update formulas of Chan and Pébay, which is a single pass over the
+data and, unlike sums of powers, stays accurate for long recordings with a
+large offset.
+
+A channel is suggested as bad if it's constant in a large share of 1 s
+windows (flat), sits at its extreme value in many samples (clipped), or its
+standard deviation or kurtosis stands out among channels of the same type
+(noisy).
+
+"""
+import os
+from dataclasses import dataclass
+from functools import partial
+from itertools import pairwise
+from pathlib import Path
+from typing import Final, TypeAlias, TypedDict
+
+import numpy as np
+import numpy.typing as npt  # noqa: WPS301
+
+from quickfif.fiff.channels import channel_indices_by_type
+from quickfif.fiff.info import MeasInfo
+from quickfif.fiff.raw import read_raw_header
+from quickfif.pyramid import get_chunk_size
+from quickfif.sparklines import CLIP_MIN_SAMPLES, CLIP_SHARE, NON_SIGNAL_TYPES
+
+DEFAULT_JOBS: Final = os.cpu_count() or 1
+FLAT_WINDOW_SEC: Final = 1.0
+FLAT_MAX_SHARE: Final = 0.1  # of the recording in flat windows
+NOISY_Z: Final = 5  # robust z-score of log std or kurtosis among channels of a type
+MIN_COMPARED: Final = 4  # channels of a type needed to tell noisy ones
+MAD_TO_STD: Final = 1.4826  # scale of median absolute deviation of normal data
+FLAT: Final = "flat"
+CLIPPED: Final = "clipped"
+NOISY: Final = "noisy"
+ROW: Final = (
+    "{name:12} {ch_type:5} {mean:>10} {std:>10} {rms:>10} {ptp:>10} {kurtosis:>8} {flat:>6}"
+    + " {n_clipped:>8} {bad}"
+)
+
+Floats: TypeAlias = npt.NDArray[np.float64]
+Counts: TypeAlias = npt.NDArray[np.int64]
+
+
+class ChannelStats(TypedDict):
+    """Statistics of the whole recording of a channel."""
+
+    name: str
+    ch_type: str
+    mean: float
+    std: float
+    rms: float
+    ptp: float
+    kurtosis: float  # excess, 0 for normal noise and for constant channels
+    flat_share: float  # of samples in windows of FLAT_WINDOW_SEC where the channel is constant
+    n_clipped: int  # samples at the channel maximum or at its minimum, whichever is more
+    bad: list[str]  # reasons to suspect the channel; empty for good ones
+
+
+class RawStats(TypedDict):
+    """Statistics of signal channels of raw recording."""
+
+    n_times: int
+    sfreq: float
+    channels: list[ChannelStats]
+    bads: list[str]  # names of suggested bad channels
+
+
+@dataclass(frozen=True)
+class Moments(object):
+    """Number of samples, mean and sums of powers 2 to 4 of deviations from it by channel."""
+
+    n_samples: int
+    mean: Floats
+    m2: Floats
+    m3: Floats
+    m4: Floats
+
+    @classmethod
+    def empty(cls, n_channels: int) -> "Moments":
+        """Get moments of no samples."""
+        return cls(0, *np.zeros((4, n_channels)))  # noqa: WPS432 (mean and 3 sums)
+
+    @classmethod
+    def from_samples(cls, samples: Floats) -> "Moments":
+        """Get moments of (channel, time) data."""
+        mean = samples.mean(axis=1)
+        deviations = samples - mean[:, np.newaxis]
+        squares = np.square(deviations)
+        m3 = np.sum(squares * deviations, axis=1)
+        m4 = np.sum(np.square(squares), axis=1)
+        return cls(samples.shape[1], mean, squares.sum(axis=1), m3, m4)
+
+    def merge(self, other: "Moments") -> "Moments":
+        """Get moments of the samples of both; Pébay (2008), eqs. 2.1 and 3.1."""
+        n_total = self.n_samples + other.n_samples
+        delta = other.mean - self.mean
+        step = delta / n_total
+        cross = step * delta * float(self.n_samples * other.n_samples)
+        return Moments(
+            n_total,
+            self.mean + step * other.n_samples,
+            self.m2 + other.m2 + cross,
+            _merge_m3(self, other, step, cross),
+            _merge_m4(self, other, step, cross),
+        )
+
+
+@dataclass(frozen=True)
+class Extremes(object):
+    """Extreme value of each channel and number of samples at it."""
+
+    reduce: np.ufunc  # np.minimum or np.maximum
+    peaks: Floats
+    counts: Counts
+
+    def update(self, samples: Floats) -> "Extremes":
+        """Get extremes of the samples seen so far and of (channel, time) chunk."""
+        chunk_peaks = self.reduce.reduce(samples, axis=1)
+        chunk_counts = np.count_nonzero(samples == chunk_peaks[:, np.newaxis], axis=1)
+        peaks = self.reduce(self.peaks, chunk_peaks)
+        kept = np.where(self.peaks == peaks, self.counts, 0)
+        added = np.where(chunk_peaks == peaks, chunk_counts, 0)
+        return Extremes(self.reduce, peaks, kept + added)
+
+
+@dataclass
+class Accumulator(object):
+    """Running statistics of a group of channels, updated chunk by chunk."""
+
+    moments: Moments
+    lows: Extremes
+    highs: Extremes
+    n_flat: Counts  # samples in flat windows
+
+    @classmethod
+    def empty(cls, n_channels: int) -> "Accumulator":
+        """Get statistics of no samples."""
+        zeros = np.zeros(n_channels, dtype=np.int64)
+        infs = np.full(n_channels, np.inf)
+        lows = Extremes(np.minimum, infs, zeros)
+        highs = Extremes(np.maximum, -infs, zeros)
+        return cls(Moments.empty(n_channels), lows, highs, zeros)
+
+    def update(self, samples: Floats, window: int) -> None:
+        """Add (channel, time) chunk starting on a boundary of flat windows of `window` samples."""
+        self.moments = self.moments.merge(Moments.from_samples(samples))
+        self.lows = self.lows.update(samples)
+        self.highs = self.highs.update(samples)
+        self.n_flat = self.n_flat + _count_flat(samples, window)
+
+
+def read_stats(fpath: Path, jobs: int = DEFAULT_JOBS) -> RawStats:
+    """
+    Stream raw data of signal channels and get their statistics.
+
+    A file without signal channels gets no channel statistics.
+
+    Raises
+    ------
+    ValueError
+        If the file (or one of its splits) is not a valid raw FIFF file
+
+    """
+    raw_header = read_raw_header(fpath)
+    ii = raw_header.info
+    types = _get_signal_types(ii)
+    groups = _split_groups(sorted(types), jobs)
+    window = max(round(ii["sfreq"] * FLAT_WINDOW_SEC), 1)
+    accs = _accumulate(fpath, groups, window, jobs)
+    channels = _summarize_groups(accs, groups, ii["ch_names"], types)
+    _mark_noisy(channels)
+    return RawStats(
+        n_times=raw_header.n_times,
+        sfreq=ii["sfreq"],
+        channels=channels,
+        bads=[ch_stats["name"] for ch_stats in channels if ch_stats["bad"]],
+    )
+
+
+def summarize(acc: Accumulator, names: list[str], ch_types: list[str]) -> list[ChannelStats]:
+    """Get statistics of the channels from their accumulator; flat and clipped ones are marked."""
+    moments = acc.moments
+    variances = moments.m2 / moments.n_samples
+    kurtoses = np.divide(
+        moments.n_samples * moments.m4,
+        np.square(moments.m2),
+        out=np.full_like(variances, 3),  # noqa: WPS432 (kurtosis of normal distribution)
+        where=moments.m2 > 0,
+    )
+    rms = np.sqrt(variances + np.square(moments.mean))
+    n_clipped = np.maximum(acc.lows.counts, acc.highs.counts)
+    flat_shares = acc.n_flat / moments.n_samples
+    min_clipped = max(CLIP_MIN_SAMPLES, CLIP_SHARE * moments.n_samples)
+    return [
+        ChannelStats(
+            name=names[idx],
+            ch_type=ch_types[idx],
+            mean=float(moments.mean[idx]),
+            std=float(np.sqrt(variances[idx])),
+            rms=float(rms[idx]),
+            ptp=float(acc.highs.peaks[idx] - acc.lows.peaks[idx]),
+            kurtosis=float(kurtoses[idx] - 3),  # noqa: WPS432 (excess kurtosis)
+            flat_share=float(flat_shares[idx]),
+            n_clipped=int(n_clipped[idx]),
+            bad=_get_flat_or_clipped(flat_shares[idx], n_clipped[idx], min_clipped),
+        )
+        for idx in range(len(names))
+    ]
+
+
+def render_stats(stats: RawStats) -> str:
+    """Render table of channel statistics and suggested bad channels."""
+    header = ROW.format(
+        name="Channel",
+        ch_type="Type",
+        mean="Mean",
+        std="Std",
+        rms="RMS",
+        ptp="Peak2peak",
+        kurtosis="Kurtosis",
+        flat="Flat",
+        n_clipped="Clipped",
+        bad="Bad",
+    )
+    lines = [header, *map(_render_channel, stats["channels"])]
+    suspects = [
+        "{0} ({1})".format(ch_stats["name"], ", ".join(ch_stats["bad"]))
+        for ch_stats in stats["channels"]
+        if ch_stats["bad"]
+    ]
+    lines.append("Suggested bad channels: {0}".format(", ".join(suspects) or "none"))
+    return "\n".join(lines)
+
+
+def robust_z(samples: Floats) -> Floats:
+    """
+    Get deviations from the median in units of scaled median absolute deviation.
+
+    Examples
+    --------
+    >>> robust_z(np.array([1.0, 2, 3, 4, 100])).round(1).tolist()
+    [-1.3, -0.7, 0.0, 0.7, 65.4]
+    >>> robust_z(np.array([1.0, 1, 1, 5])).tolist()
+    [0.0, 0.0, 0.0, 0.0]
+
+    """
+    deviations = samples - np.median(samples)
+    scale = np.median(np.abs(deviations)) * MAD_TO_STD
+    return deviations / scale if scale > 0 else np.zeros_like(samples)
+
+
+def _split_groups(picks: list[int], jobs: int) -> list[list[int]]:
+    """Split channels into `jobs` groups of nearly equal size, keeping their order."""
+    if not picks:
+        return []
+    n_groups = min(jobs, len(picks))
+    bounds = [len(picks) * idx // n_groups for idx in range(n_groups + 1)]
+    return [picks[start:stop] for start, stop in pairwise(bounds)]
+
+
+def _summarize_groups(
+    accs: list[Accumulator],
+    groups: list[list[int]],
+    ch_names: list[str],
+    types: dict[int, str],
+) -> list[ChannelStats]:
+    channels = []
+    for group, acc in zip(groups, accs):
+        names = [ch_names[idx] for idx in group]
+        channels.extend(summarize(acc, names, [types[idx] for idx in group]))
+    return channels
+
+
+def _get_signal_types(ii: MeasInfo) -> dict[int, str]:
+    """Get types of signal channels by their indices."""
+    return {
+        idx: ch_type
+        for ch_type, picks in channel_indices_by_type(ii["chs"]).items()
+        for idx in picks
+        if ch_type not in NON_SIGNAL_TYPES
+    }
+
+
+def _accumulate(
+    fpath: Path, groups: list[list[int]], window: int, jobs: int
+) -> list[Accumulator]:
+    """Get statistics of channel groups read in `jobs` processes, in order of the groups."""
+    accumulate_group = partial(_accumulate_group, fpath, window)
+    if jobs == 1 or len(groups) < 2:
+        return list(map(accumulate_group, groups))
+    from concurrent.futures import ProcessPoolExecutor  # noqa: WPS433 (imports multiprocessing)
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(accumulate_group, groups))
+
+
+def _accumulate_group(fpath: Path, window: int, picks: list[int]) -> Accumulator:
+    """Read raw data of the channels in chunks and accumulate their statistics."""
+    from mne.io import read_raw_fif  # noqa: WPS433 (heavy import, see `quickfif.config`)
+
+    raw = read_raw_fif(fpath, verbose="ERROR")
+    acc = Accumulator.empty(len(picks))
+    chunk_size = get_chunk_size(len(picks), window)
+    for start in range(0, raw.n_times, chunk_size):
+        acc.update(raw.get_data(picks, start, start + chunk_size), window)
+    return acc
+
+
+def _merge_m3(first: Moments, second: Moments, step: Floats, cross: Floats) -> Floats:
+    n_a, n_b = first.n_samples, second.n_samples
+    shift = 3 * step * (n_a * second.m2 - n_b * first.m2)
+    return first.m3 + second.m3 + cross * step * (n_a - n_b) + shift
+
+
+def _merge_m4(first: Moments, second: Moments, step: Floats, cross: Floats) -> Floats:
+    n_a, n_b = first.n_samples, second.n_samples
+    squared_step = np.square(step)
+    weight = float(n_a**2 - n_a * n_b + n_b**2)
+    spread = cross * squared_step * weight
+    shift2 = 6 * squared_step * (n_a**2 * second.m2 + n_b**2 * first.m2)  # noqa: WPS221 (eq. 3.1)
+    shift3 = 4 * step * (n_a * second.m3 - n_b * first.m3)  # noqa: WPS221, WPS432 (eq. 3.1)
+    return first.m4 + second.m4 + spread + shift2 + shift3
+
+
+def _count_flat(samples: Floats, window: int) -> Counts:
+    """Count samples of each channel in windows where it's constant."""
+    n_samples = samples.shape[1]
+    starts = np.arange(0, n_samples, window)
+    lengths = np.diff(np.append(starts, n_samples))
+    highs = np.maximum.reduceat(samples, starts, axis=1)
+    is_flat = highs == np.minimum.reduceat(samples, starts, axis=1)
+    return is_flat @ lengths
+
+
+def _get_flat_or_clipped(flat_share: float, n_clipped: int, min_clipped: float) -> list[str]:
+    if flat_share > FLAT_MAX_SHARE:
+        return [FLAT]
+    return [CLIPPED] if n_clipped >= min_clipped else []
+
+
+def _mark_noisy(channels: list[ChannelStats]) -> None:
+    """Mark channels with std or kurtosis standing out among channels of the same type."""
+    by_type: dict[str, list[ChannelStats]] = {}
+    for ch_stats in channels:
+        by_type.setdefault(ch_stats["ch_type"], []).append(ch_stats)
+    for same_type in by_type.values():
+        if len(same_type) >= MIN_COMPARED:
+            _mark_noisy_type(same_type)
+
+
+def _mark_noisy_type(channels: list[ChannelStats]) -> None:
+    for ch_stats, noisy in zip(channels, _find_noisy(channels)):
+        if noisy and FLAT not in ch_stats["bad"]:
+            ch_stats["bad"].append(NOISY)
+
+
+def _find_noisy(channels: list[ChannelStats]) -> npt.NDArray[np.bool_]:
+    stds = np.array([ch_stats["std"] for ch_stats in channels])
+    kurtoses = np.array([ch_stats["kurtosis"] for ch_stats in channels])
+    log_stds = np.log(np.maximum(stds, np.finfo(stds.dtype).tiny))
+    return np.logical_or(robust_z(log_stds) > NOISY_Z, robust_z(kurtoses) > NOISY_Z)
+
+
+def _render_channel(ch_stats: ChannelStats) -> str:
+    return ROW.format(
+        name=ch_stats["name"],
+        ch_type=ch_stats["ch_type"],
+        mean=f"{ch_stats['mean']:.2e}",
+        std=f"{ch_stats['std']:.2e}",
+        rms=f"{ch_stats['rms']:.2e}",
+        ptp=f"{ch_stats['ptp']:.2e}",
+        kurtosis=f"{ch_stats['kurtosis']:.1f}",
+        flat=f"{ch_stats['flat_share']:.0%}",
+        n_clipped=ch_stats["n_clipped"],
+        bad=",".join(ch_stats["bad"]),
+    )
@@ -0,0 +1,158 @@
+"""
+Glance at raw signal: sparklines of channel types over the recording.
+
+The signal is summarized from the beginnings of a few evenly spaced data
+buffers (see `quickfif.fiff.sampling`), so it takes about the same time for a
+recording of any length. The sparkline of a channel type shows the median
+over its channels of the signal standard deviation in each buffer, so
+artifacts stand out as peaks. Flat channels don't change in any of the read
+samples; clipped ones sit at their extreme value in many of them.
+
+"""
+from pathlib import Path
+from typing import Final, TypedDict
+
+import numpy as np
+import numpy.typing as npt  # noqa: WPS301
+
+from quickfif.fiff.channels import channel_indices_by_type
+from quickfif.fiff.sampling import SignalSample, read_sample
+
+SPARK_CHARS: Final = "▁▂▃▄▅▆▇█"
+# Channels carrying codes or system values rather than signal
+NON_SIGNAL_TYPES: Final = frozenset(("stim", "syst", "chpi", "exci", "ias", "dipole", "gof"))
+CLIP_SHARE: Final = 0.01  # of the read samples at the channel maximum or minimum
+CLIP_MIN_SAMPLES: Final = 3
+MAX_LISTED: Final = 3  # flat and clipped channel names
+SIGNAL_HEADER: Final = "{section:11} {sep} {msg}"
+
+Floats = npt.NDArray[np.float64]
+
+
+class TypeSignal(TypedDict):
+    """Signal summary of channels of one type."""
+
+    n_channels: int
+    stds: list[float]  # median over the channels of std in each read buffer
+    flat: list[str]
+    clipped: list[str]
+
+
+class SignalFields(TypedDict):
+    """Signal summary of raw recording."""
+
+    n_buffers: int  # in the whole recording
+    times: list[float]  # start of each read buffer, sec from the first sample
+    by_type: dict[str, TypeSignal]  # signal channel types with channels only
+
+
+def read_signal(fpath: Path) -> SignalFields:
+    """
+    Summarize signal of raw file from a few data buffers.
+
+    Raises
+    ------
+    ValueError
+        If the file (or one of its splits) is not a valid raw FIFF file
+
+    """
+    return summarize_signal(read_sample(fpath))
+
+
+def summarize_signal(sample: SignalSample) -> SignalFields:
+    """Get sparkline values and suspicious channels by channel type."""
+    by_type = {}
+    for ch_type, picks in channel_indices_by_type(sample.info["chs"]).items():
+        if picks and ch_type not in NON_SIGNAL_TYPES:
+            chunks = [chunk[picks] for chunk in sample.chunks]
+            names = [sample.info["ch_names"][idx] for idx in picks]
+            by_type[ch_type] = _summarize_type(chunks, names)
+    sfreq = sample.info["sfreq"]
+    return SignalFields(
+        n_buffers=sample.n_buffers,
+        times=[start / sfreq for start in sample.starts],
+        by_type=by_type,
+    )
+
+
+def render_signal(fields: SignalFields, sep: str = "|") -> str:
+    """Render signal summary section of the preview."""
+    n_read = len(fields["times"])
+    msg = f"std over {n_read} of {fields['n_buffers']} data buffers" if n_read else "no data"
+    res = [SIGNAL_HEADER.format(section="Signal", sep=sep, msg=msg)]
+    if n_read:
+        res.extend(_render_type(*type_item) for type_item in fields["by_type"].items())
+    return "\n".join(res)
+
+
+def sparkline(heights: list[float]) -> str:
+    """
+    Draw heights as bars from zero to the maximum.
+
+    Examples
+    --------
+    >>> sparkline([0, 1, 2, 4])
+    '▁▃▅█'
+    >>> sparkline([0, 0])
+    '▁▁'
+
+    """
+    top = max(heights, default=0)
+    scale = (len(SPARK_CHARS) - 1) / top if top > 0 else 0
+    return "".join(SPARK_CHARS[round(height * scale)] for height in heights)
+
+
+def _summarize_type(chunks: list[Floats], names: list[str]) -> TypeSignal:
+    samples = np.concatenate(chunks, axis=1)
+    is_flat = np.ptp(samples, axis=1) == 0
+    is_clipped = np.logical_and(_count_at_edges(samples) >= _get_min_clipped(samples), ~is_flat)
+    return TypeSignal(
+        n_channels=len(names),
+        stds=[float(np.median(chunk.std(axis=1))) for chunk in chunks],
+        flat=[name for name, flat in zip(names, is_flat) if flat],
+        clipped=[name for name, clipped in zip(names, is_clipped) if clipped],
+    )
+
+
+def _count_at_edges(samples: Floats) -> npt.NDArray[np.int64]:
+    """Count samples of each channel at its maximum or at its minimum, whichever is more."""
+    at_min = samples == samples.min(axis=1, keepdims=True)
+    at_max = samples == samples.max(axis=1, keepdims=True)
+    return np.maximum(np.count_nonzero(at_min, axis=1), np.count_nonzero(at_max, axis=1))
+
+
+def _get_min_clipped(samples: Floats) -> float:
+    return max(CLIP_MIN_SAMPLES, CLIP_SHARE * samples.shape[1])
+
+
+def _render_type(ch_type: str, type_signal: TypeSignal) -> str:
+    stds = type_signal["stds"]
+    line = "  {n_ch:3} {t:6}: {spark} {lo:.1e}..{hi:.1e}".format(
+        n_ch=type_signal["n_channels"],
+        t=ch_type,
+        spark=sparkline(stds),
+        lo=min(stds),
+        hi=max(stds),
+    )
+    suspicious = {"flat": type_signal["flat"], "clipped": type_signal["clipped"]}
+    problems = [
+        "{0}: {1}".format(problem, _list_names(names))
+        for problem, names in suspicious.items()
+        if names
+    ]
+    return ", ".join([line, *problems])
+
+
+def _list_names(names: list[str]) -> str:
+    """
+    List first few names.
+
+    Examples
+    --------
+    >>> _list_names(["a", "b", "c", "d", "e"])
+    'a b c +2'
+
+    """
+    listed = " ".join(names[:MAX_LISTED])
+    n_more = len(names) - MAX_LISTED
+    return f"{listed} +{n_more}" if n_more > 0 else listed
@@ -0,0 +1,47 @@
+"""
+Summary of a file as text for people or as JSON for scripts.
+
+Plugins compute the values of the summary with `summary_fields` and render the
+text from them, so both formats always report the same values. JSON summaries
+are printed as records of a single line, so the output of many files is NDJSON.
+
+"""
+import json
+from enum import StrEnum
+from pathlib import Path
+from typing import Iterator
+
+from quickfif.qf_types.base import QfType
+
+
+class SummaryFormat(StrEnum):
+    """Formats of the file summary; values are the choices of `--format` option."""
+
+    text = "text"
+    json = "json"  # JSON object of `summary_fields`
+
+
+def render_summary(qf_obj: QfType, fmt: SummaryFormat) -> str:
+    """Render summary of QfType object in the given format."""
+    return "\n".join(render_sections(qf_obj, fmt))
+
+
+def render_sections(qf_obj: QfType, fmt: SummaryFormat) -> Iterator[str]:
+    """Render summary of QfType object section by section; JSON is a single section."""
+    if fmt == SummaryFormat.json:
+        yield json.dumps(qf_obj.summary_fields())
+    else:
+        yield from qf_obj.summary_sections()
+
+
+def format_record(fpath: Path, **fields: object) -> str:
+    """
+    Format JSON record of a file as a single line.
+
+    Examples
+    --------
+    >>> format_record(Path("test_raw.fif"), ftype="raw", summary={"sfreq": 1000.0})
+    '{"fpath": "test_raw.fif", "ftype": "raw", "summary": {"sfreq": 1000.0}}'
+
+    """
+    return json.dumps({"fpath": str(fpath), **fields})
@@ -0,0 +1,147 @@
+"""
+PNG thumbnails of recordings for image previews of file managers and archives.
+
+Thumbnails are drawn by `quickfif.drawing` and cached by the identity of the
+file and its later splits like previews (see `quickfif.cache`), so rendering a
+file again is free until one of the files changes. Many files are rendered by
+a pool of processes.
+
+"""
+import os
+import shutil
+from contextlib import suppress
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Final, Iterator
+
+from quickfif.cache import clear_entries, evict_entries, get_cache_dir, get_split_set_digest
+from quickfif.config import Ftype, qf_read
+from quickfif.drawing import TraceStyle, render_png
+from quickfif.parsers import parse_ftype
+
+THUMBNAILS_DIR_NAME: Final = "thumbnails"
+ENTRY_SUFFIX: Final = ".png"
+DEFAULT_MAX_MB: Final = 256  # thousands of thumbnails
+DEFAULT_MAX_BYTES: Final = DEFAULT_MAX_MB * 1024 * 1024
+DEFAULT_JOBS: Final = os.cpu_count() or 1
+DEFAULT_WIDTH: Final = 640
+DEFAULT_HEIGHT: Final = 360
+
+
+@dataclass(frozen=True)
+class ThumbnailOptions(object):
+    """Thumbnail settings shared by all the files; passed to worker processes."""
+
+    width: int = DEFAULT_WIDTH  # pixels
+    height: int = DEFAULT_HEIGHT
+    style: TraceStyle = TraceStyle.butterfly
+
+    @property
+    def key(self) -> tuple[str, str, str]:
+        """Get the settings making thumbnails different, for the cache key."""
+        return str(self.style), str(self.width), str(self.height)
+
+
+@dataclass(frozen=True)
+class ThumbnailResult(object):
+    """Thumbnail of a file or error message when rendering failed."""
+
+    fpath: Path
+    png: Path | None = None
+    error: str = ""
+
+
+@dataclass(frozen=True)
+class ThumbnailCache(object):
+    """
+    Store of rendered thumbnails, bounded by the total size of entries.
+
+    Entries are written to a temporary file and atomically renamed, so
+    parallel renderers of the same file never see a partial PNG.
+
+    """
+
+    root: Path
+    max_bytes: int = DEFAULT_MAX_BYTES
+
+    def get(self, fpath: Path, ftype: Ftype, options: ThumbnailOptions) -> Path:
+        """
+        Get thumbnail of the current state of the file, rendering it on miss.
+
+        Raises
+        ------
+        Exception
+            Whatever reading or drawing the file raises
+
+        """
+        entry = self._entry_path(fpath, ftype, options)
+        with suppress(FileNotFoundError):
+            os.utime(entry)  # mark as recently used
+            return entry
+        png = render_png(qf_read(fpath, ftype), options.width, options.height, options.style)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry.with_name(f".{entry.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(png)
+        os.replace(tmp_path, entry)
+        self.evict()
+        return entry
+
+    def evict(self) -> None:
+        """Remove least recently used entries until they fit into `max_bytes`."""
+        evict_entries(self.root / THUMBNAILS_DIR_NAME, ENTRY_SUFFIX, self.max_bytes)
+
+    def clear(self) -> int:
+        """Remove all the entries. Return the number of removed entries."""
+        return clear_entries(self.root / THUMBNAILS_DIR_NAME, ENTRY_SUFFIX)
+
+    def _entry_path(self, fpath: Path, ftype: Ftype, options: ThumbnailOptions) -> Path:
+        digest = get_split_set_digest(fpath, ftype, *options.key)
+        return self.root / THUMBNAILS_DIR_NAME / f"{digest}{ENTRY_SUFFIX}"
+
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    """Get thumbnail cache in the default location."""
+    return ThumbnailCache(get_cache_dir())
+
+
+def make_thumbnails(
+    fpaths: list[Path], dsts: list[Path | None], options: ThumbnailOptions, jobs: int
+) -> Iterator[ThumbnailResult]:
+    """
+    Get thumbnails of files in `jobs` processes, in input order; errors are returned.
+
+    With a single job, files are rendered in this process one by one.
+
+    """
+    make_one = partial(make_thumbnail, options=options)
+    if jobs == 1:
+        yield from map(make_one, fpaths, dsts)
+        return
+    from concurrent.futures import ProcessPoolExecutor  # noqa: WPS433 (imports multiprocessing)
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(make_one, fpaths, dsts)
+
+
+def make_thumbnail(fpath: Path, dst: Path | None, options: ThumbnailOptions) -> ThumbnailResult:
+    """Get thumbnail of a file in a batch, copied to `dst` if it's set; errors are returned."""
+    if not fpath.is_file():
+        return ThumbnailResult(fpath, error=f"Path '{fpath}' does not exist or is not a file.")
+    try:
+        ftype = parse_ftype(fpath)
+    except ValueError:
+        return ThumbnailResult(fpath, error=f"Can't determine file type of '{fpath}'")
+    try:
+        png = _get_png(fpath, ftype, dst, options)
+    except Exception as exc:
+        return ThumbnailResult(fpath, error=f"Failed to render '{fpath}': {exc}")
+    return ThumbnailResult(fpath, png)
+
+
+def _get_png(fpath: Path, ftype: Ftype, dst: Path | None, options: ThumbnailOptions) -> Path:
+    entry = get_thumbnail_cache().get(fpath, ftype, options)
+    if dst is None:
+        return entry
+    shutil.copyfile(entry, dst)
+    return dst
@@ -0,0 +1,301 @@
+"""
+Checking integrity of split sets without reading the data.
+
+A truncated or corrupt split otherwise shows up only when mne fails to read
+it. Here the tag headers of each split are walked, seeking over the tag data:
+the file must start with the file id, the tags must fit in the file, link to
+each other without loops and balance their blocks, and a stored tag directory
+must list the same tags. The references between the splits are followed to
+find missing parts and the files named as the next split are checked for
+parts left out of the set.
+
+Checksums need every byte of the files, so the splits are hashed in threads
+while the chain is followed; hashlib releases the GIL, and the splits are
+read in parallel.
+
+"""
+import hashlib
+import os
+import re
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import BinaryIO, Callable, Final
+
+from quickfif.fiff import constants as const
+from quickfif.fiff.move import split_fnames
+from quickfif.fiff.raw import MAX_SPLITS
+from quickfif.fiff.tag import DirEntry, open_fif, read_int, read_string
+from quickfif.fiff.tree import (
+    Node,
+    build_tree,
+    read_dir_pointer,
+    read_stored_directory,
+    walk_tags,
+)
+
+DEFAULT_JOBS: Final = os.cpu_count() or 1
+BLOCK_SIZE: Final = 1024 * 1024
+BYTES_IN_MB: Final = 1024 * 1024
+CHECKSUM_ALGORITHM: Final = "sha256"
+BIDS_SPLIT: Final = re.compile(r"_split-(\d+)_")
+# Errors of reading a truncated or corrupt .fif.gz file
+READ_ERRORS: Final = (ValueError, OSError, EOFError, zlib.error)
+
+
+@dataclass(frozen=True)
+class SplitRef(object):
+    """Reference to another split file."""
+
+    role: int
+    num: int | None
+    fname: str
+
+
+@dataclass
+class SplitReport(object):
+    """Problems found in a split file, its size and checksum."""
+
+    fpath: Path
+    n_tags: int = 0
+    size: int = 0  # uncompressed
+    problems: list[str] = field(default_factory=list)
+    refs: list[SplitRef] = field(default_factory=list)
+    checksum: str | None = None
+
+    def find_ref(self, role: int) -> SplitRef | None:
+        """Find reference with a given role."""
+        return next((ref for ref in self.refs if ref.role == role), None)
+
+    def __str__(self) -> str:
+        """Describe the split: one line per problem or the size if it's intact."""
+        fname = self.fpath.name
+        if self.problems:
+            return "\n".join(f"{fname}: {problem}" for problem in self.problems)
+        size_mb = self.size / BYTES_IN_MB
+        return f"{fname}: OK, {self.n_tags} tags, {size_mb:.1f} MB"
+
+
+@dataclass(frozen=True)
+class VerifyReport(object):
+    """Reports of the split files and problems of the split set as a whole."""
+
+    splits: list[SplitReport]
+    problems: list[str]
+    elapsed_sec: float
+
+    @property
+    def n_problems(self) -> int:
+        """Get number of problems in the set and its splits."""
+        return len(self.problems) + sum(len(split.problems) for split in self.splits)
+
+    @property
+    def throughput(self) -> float:
+        """Get MB of uncompressed data verified per second."""
+        n_bytes = sum(split.size for split in self.splits)
+        return n_bytes / BYTES_IN_MB / max(self.elapsed_sec, 1e-6)  # noqa: WPS432
+
+    def __str__(self) -> str:
+        """Describe the splits, the problems of the set and the total."""
+        lines = [str(split) for split in self.splits]
+        lines.extend(f"Split set: {problem}" for problem in self.problems)
+        verdict = f"{self.n_problems} problems" if self.n_problems else "OK"
+        lines.append(
+            "Verified {0} splits in {1:.2f} s, {2:.1f} MB/s: {3}".format(
+                len(self.splits), self.elapsed_sec, self.throughput, verdict
+            )
+        )
+        return "\n".join(lines)
+
+
+def verify_splits(src: Path, checksum: bool = False, jobs: int = DEFAULT_JOBS) -> VerifyReport:
+    """
+    Check structure of file `src` and its splits, following the references between them.
+
+    Parameters
+    ----------
+    src
+        First file of the split set
+    checksum
+        Compute SHA-256 of each split file as stored on disk
+    jobs
+        Number of threads hashing the splits
+
+    Returns
+    -------
+    VerifyReport
+        Problems found in each split and in the set
+
+    """
+    start_time = time.monotonic()
+    with ThreadPoolExecutor(jobs) as pool:
+        digests: list[Future[str]] = []
+
+        def check(fpath: Path) -> SplitReport:  # noqa: WPS430 (submits hashing on the way)
+            if checksum:
+                digests.append(pool.submit(hash_file, fpath))
+            return check_split(fpath)
+
+        splits, problems = _follow_chain(src, check)
+        for split, digest in zip(splits, digests):
+            split.checksum = digest.result()
+    return VerifyReport(splits, problems, time.monotonic() - start_time)
+
+
+def check_split(fpath: Path) -> SplitReport:
+    """Walk the tags of a plain or compressed split file and check its structure."""
+    report = SplitReport(fpath)
+    try:
+        with open_fif(fpath) as fid:
+            _check_structure(fid, report)
+    except READ_ERRORS as exc:
+        report.problems.append(str(exc))
+    return report
+
+
+def hash_file(fpath: Path) -> str:
+    """Get hex checksum of the file content as stored on disk."""
+    with fpath.open("rb") as fid:
+        return hashlib.file_digest(fid, CHECKSUM_ALGORITHM).hexdigest()
+
+
+def _check_structure(fid: BinaryIO, report: SplitReport) -> None:
+    dir_pointer = read_dir_pointer(fid)
+    walk = walk_tags(fid, report.problems.append)
+    entries = walk.entries
+    report.n_tags = len(entries)
+    report.size = _get_size(fid, max(ent.data_pos for ent in entries))
+    _check_extent(entries, walk.eof_pos, report)
+    _check_blocks(entries, report.problems)
+    _check_directory(fid, read_int(fid, dir_pointer), entries, report.problems)
+    report.refs = _read_refs(fid, build_tree(fid, entries))
+
+
+def _get_size(fid: BinaryIO, pos: int) -> int:
+    """Get file size reading from `pos`, which is within the file; works for gzip too."""
+    fid.seek(pos)
+    blocks = iter(partial(fid.read, BLOCK_SIZE), b"")
+    return pos + sum(len(block) for block in blocks)
+
+
+def _check_extent(entries: list[DirEntry], eof_pos: int | None, report: SplitReport) -> None:
+    """Check tag data and links stay within the file."""
+    for ent in entries:
+        if ent.data_pos + ent.size > report.size:
+            msg = "Tag {0} at position {1} ends past the end of file ({2} bytes); truncated?"
+            report.problems.append(msg.format(ent.kind, ent.pos, report.size))
+            return
+    if eof_pos is not None and eof_pos > report.size:
+        report.problems.append(f"Tag links to position {eof_pos} past the end of file")
+
+
+def _check_blocks(entries: list[DirEntry], problems: list[str]) -> None:
+    depth = 0
+    for ent in entries:
+        if ent.kind == const.FIFF_BLOCK_START:
+            depth += 1
+        elif ent.kind == const.FIFF_BLOCK_END:
+            if not depth:
+                problems.append(f"Block end without start at position {ent.pos}")
+            depth = max(depth - 1, 0)
+    if depth:
+        problems.append(f"{depth} blocks are not closed")
+
+
+def _check_directory(
+    fid: BinaryIO, dir_pos: int, entries: list[DirEntry], problems: list[str]
+) -> None:
+    """Compare the stored tag directory, if any, with the tags found by the walk."""
+    if dir_pos <= 0:
+        return
+    try:
+        stored = set(read_stored_directory(fid, dir_pos))
+    except ValueError as exc:
+        problems.append(f"Broken tag directory: {exc}")
+        return
+    listed = {ent for ent in entries if ent.pos < dir_pos}
+    n_unknown = len(stored - set(entries))
+    n_unlisted = len(listed - stored)
+    if n_unknown or n_unlisted:
+        problems.append(
+            f"Tag directory lists {n_unknown} tags not in the file and misses {n_unlisted} tags"
+        )
+
+
+def _read_refs(fid: BinaryIO, tree: Node) -> list[SplitRef]:
+    refs = []
+    for node in tree.find(const.FIFFB_REF):
+        roles = node.entries_of(const.FIFF_REF_ROLE)
+        names = node.entries_of(const.FIFF_REF_FILE_NAME)
+        nums = node.entries_of(const.FIFF_REF_FILE_NUM)
+        if roles and names:
+            num = read_int(fid, nums[0]) if nums else None
+            fname = read_string(fid, names[0])
+            refs.append(SplitRef(read_int(fid, roles[0]), num, fname))
+    return refs
+
+
+def _follow_chain(
+    src: Path, check: Callable[[Path], SplitReport]
+) -> tuple[list[SplitReport], list[str]]:
+    """Check splits one by one following the next file references; get set problems."""
+    splits = [check(src)]
+    problems = []
+    if splits[0].find_ref(const.FIFFV_ROLE_PREV_FILE) is not None:
+        problems.append(f"{src.name} is not the first file of the split set")
+    fpaths = [src]
+    next_ref = splits[0].find_ref(const.FIFFV_ROLE_NEXT_FILE)
+    while next_ref is not None:
+        fpath = _check_next_ref(fpaths, next_ref, problems)
+        if fpath is None:
+            return splits, problems
+        fpaths.append(fpath)
+        splits.append(check(fpath))
+        next_ref = splits[-1].find_ref(const.FIFFV_ROLE_NEXT_FILE)
+    _check_extra_split(fpaths, splits[-1], problems)
+    return splits, problems
+
+
+def _check_next_ref(fpaths: list[Path], next_ref: SplitRef, problems: list[str]) -> Path | None:
+    """Get path of the next split; None if the chain can't go on."""
+    fpath = fpaths[0].parent / next_ref.fname
+    idx = len(fpaths)
+    if next_ref.num is not None and next_ref.num != idx:
+        problems.append(f"{fpath.name} is referred as split {next_ref.num}, not {idx}")
+    if idx >= MAX_SPLITS or fpath in fpaths:
+        problems.append(f"Split chain loops at {fpath.name}")
+    elif fpath.exists():
+        return fpath
+    else:
+        problems.append(f"Split {fpath.name} is missing")
+    return None
+
+
+def _check_extra_split(fpaths: list[Path], last: SplitReport, problems: list[str]) -> None:
+    """Check there's no file named as the split following an intact last split."""
+    extra_fpath = _guess_next_fpath(fpaths)
+    if not last.problems and extra_fpath.exists():
+        problems.append(f"{extra_fpath.name} is named as a split but the set ends before it")
+
+
+def _guess_next_fpath(fpaths: list[Path]) -> Path:
+    """
+    Get the name a split following the last one would have.
+
+    Examples
+    --------
+    >>> _guess_next_fpath([Path("rec_raw.fif")]).name
+    'rec_raw-1.fif'
+    >>> _guess_next_fpath([Path("sub-01_split-01_meg.fif"), Path("sub-01_split-02_meg.fif")]).name
+    'sub-01_split-03_meg.fif'
+
+    """
+    n_splits = len(fpaths)
+    last = fpaths[-1]
+    if BIDS_SPLIT.search(last.name):
+        split_id = "_split-{0:02}_".format(n_splits + 1)
+        return last.with_name(BIDS_SPLIT.sub(split_id, last.name))
+    return split_fnames(fpaths[0], n_splits + 1, bids=False)[-1]
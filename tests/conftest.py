@@ -15,9 +15,19 @@ pytest_plugins = (
     "tests.plugins.annots_fixtures",
     "tests.plugins.ica_fixtures",
     "tests.plugins.epochs_fixtures",
+    "tests.plugins.daemon_fixtures",
 )
 
 
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Isolate persistent caches and daemon socket of each test from the user's ones."""
+    cache_home_path = tmp_path_factory.mktemp("cache_home", numbered=True)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home_path))
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(cache_home_path))
+    return cache_home_path
+
+
 @pytest.fixture(scope="session")
 def empty_file_factory(tmp_path_factory: pytest.TempPathFactory) -> Callable[[str], Path]:
     """Empty file factory. Parametrization by base name and extension."""
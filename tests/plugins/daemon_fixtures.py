@@ -0,0 +1,56 @@
+"""Preview daemon fixtures."""
+import threading
+from typing import Iterator, Protocol
+
+import pytest
+
+from quickfif.daemon import server as daemon_server
+from quickfif.daemon.protocol import get_socket_path
+from quickfif.daemon.server import PreviewServer
+
+
+class ServerFactory(Protocol):
+    """Protocol for running server factory."""
+
+    def __call__(self, workers: int = ..., request_timeout: float = ...) -> PreviewServer:
+        """Create server."""
+
+
+@pytest.fixture
+def server_factory() -> Iterator[ServerFactory]:
+    """Start server on the default socket in a background thread; stop it on teardown."""
+    servers = []
+
+    def factory(workers: int = 1, request_timeout: float = 5) -> PreviewServer:
+        server = PreviewServer(get_socket_path(), workers, request_timeout, idle_timeout=60)
+        threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield factory
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def hanging_workers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[tuple[threading.Event, threading.Event]]:
+    """
+    Make daemon workers hang.
+
+    Yields events: the first is set when a worker starts, setting the second
+    releases the workers. Workers are released when the test ends.
+
+    """
+    started, release = threading.Event(), threading.Event()
+
+    def hanging_summarize(*args: object) -> str:  # noqa: WPS430
+        started.set()
+        release.wait()
+        return "summary"
+
+    monkeypatch.setattr(daemon_server, "_summarize", hanging_summarize)
+    yield started, release
+    release.set()
@@ -1,8 +1,7 @@
 """Fake QfType implementation for testing."""
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from pathlib import Path
-
-from quickfif.config import Ftype
+from typing import Iterator, Mapping
 
 
 @dataclass
@@ -17,6 +16,14 @@ class FakeQfType(object):
         """Fake object summary string."""
         return str(self)
 
-    def to_dict(self) -> dict[str, Path | Ftype]:
-        """Convert do dictionary."""
-        return asdict(self)
+    def summary_sections(self) -> Iterator[str]:
+        """Fake summary sections."""
+        yield self.summary
+
+    def summary_fields(self) -> Mapping[str, object]:
+        """Fake summary fields."""
+        return {"mne_obj": self.mne_obj}
+
+    def to_dict(self) -> dict[str, Path | str]:
+        """Convert to dictionary."""
+        return {"fpath": self.fpath, "mne_obj": self.mne_obj}
@@ -41,6 +41,22 @@ def small_raw_obj(request: pytest.FixtureRequest, raw_obj_factory: RawFactory) -
     return raw_obj_factory(n_ch, 100, 1.1)  # noqa: WPS432
 
 
+@pytest.fixture
+def small_raw_fpath(tmp_path: "Path", small_raw_obj: Raw) -> "Path":
+    """Small raw saved to a file."""
+    fpath = tmp_path / "test_raw.fif"
+    small_raw_obj.save(fpath)
+    return fpath
+
+
+@pytest.fixture
+def split_raw_fpath(tmp_path: "Path", raw_obj_factory: RawFactory) -> "Path":
+    """Raw saved in 3 splits with neuromag naming; the first split path."""
+    fpath = tmp_path / "test_raw.fif"
+    raw_obj_factory(4, sfreq=1000, dur_sec=150).save(fpath, split_size="2MB")  # noqa: WPS432
+    return fpath
+
+
 @pytest.fixture
 def large_qf_raw(
     tmp_path: "Path", raw_obj_factory: Callable[[int, float, float], Raw]
@@ -0,0 +1,148 @@
+"""Test persistent summary cache."""
+import os
+from importlib.metadata import PackageNotFoundError
+from typing import TYPE_CHECKING
+
+import pytest
+
+from quickfif.cache import (
+    UNKNOWN_VERSION,
+    SummaryCache,
+    get_cache_dir,
+    get_summary_cache,
+    get_version,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Iterator
+
+SUMMARY = "Raw | some summary"
+
+
+@pytest.fixture
+def fpath(tmp_path: "Path") -> "Path":
+    """File to cache summary for."""
+    fpath = tmp_path / "test_raw.fif"
+    fpath.write_bytes(b"data")
+    return fpath
+
+
+@pytest.fixture
+def summary_cache(tmp_path: "Path") -> SummaryCache:
+    """Empty summary cache."""
+    return SummaryCache(tmp_path / "cache")
+
+
+def test_cache_dir_respects_xdg(cache_home: "Path") -> None:
+    """Test cache is stored under XDG_CACHE_HOME."""
+    assert get_summary_cache().root == get_cache_dir() == cache_home / "quickfif"
+
+
+@pytest.fixture
+def uncached_version() -> "Iterator[None]":
+    """Forget the package version before and after the test."""
+    get_version.cache_clear()
+    yield
+    get_version.cache_clear()
+
+
+@pytest.mark.usefixtures("uncached_version")
+def test_version_of_source_checkout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the cache works when the package isn't installed and has no metadata."""
+    monkeypatch.setattr("importlib.metadata.version", _raise_not_found)
+
+    assert get_version() == UNKNOWN_VERSION
+
+
+def _raise_not_found(distribution_name: str) -> str:
+    raise PackageNotFoundError(distribution_name)
+
+
+def test_cache_dir_ignores_relative_xdg(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test relative XDG_CACHE_HOME is ignored as the spec requires."""
+    monkeypatch.setenv("XDG_CACHE_HOME", "relative")
+
+    assert get_cache_dir().is_absolute()
+
+
+def test_hit_after_put(summary_cache: SummaryCache, fpath: "Path") -> None:
+    """Test stored summary is returned for the unchanged file."""
+    assert summary_cache.get(fpath, "raw") is None
+
+    summary_cache.put(fpath, "raw", SUMMARY)
+
+    assert summary_cache.get(fpath, "raw") == SUMMARY
+    assert summary_cache.get(fpath, "epochs") is None
+
+
+def test_miss_after_file_change(summary_cache: SummaryCache, fpath: "Path") -> None:
+    """Test changing size or modification time of the file invalidates the entry."""
+    summary_cache.put(fpath, "raw", SUMMARY)
+    st = fpath.stat()
+    os.utime(fpath, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+
+    assert summary_cache.get(fpath, "raw") is None
+
+
+@pytest.mark.parametrize(
+    ("fname", "split_fname"),
+    [("test_raw.fif", "test_raw-1.fif"), ("sub-01_split-01_meg.fif", "sub-01_split-02_meg.fif")],
+)
+def test_miss_after_later_split_change(
+    summary_cache: SummaryCache, tmp_path: "Path", fname: str, split_fname: str
+) -> None:
+    """Test a growing continuation split invalidates the entry of the first file."""
+    first_fpath, split_fpath = tmp_path / fname, tmp_path / split_fname
+    first_fpath.write_bytes(b"data")
+    split_fpath.write_bytes(b"data")
+    summary_cache.put(first_fpath, "raw", SUMMARY)
+
+    with split_fpath.open("ab") as fid:
+        fid.write(b"more data")
+
+    assert summary_cache.get(first_fpath, "raw") is None
+
+
+def test_missing_file_is_a_miss(summary_cache: SummaryCache, tmp_path: "Path") -> None:
+    """Test cache doesn't raise for files it can't stat."""
+    missing_fpath = tmp_path / "missing_raw.fif"
+    summary_cache.put(missing_fpath, "raw", SUMMARY)
+
+    assert summary_cache.get(missing_fpath, "raw") is None
+
+
+def _put_used_at(summary_cache: SummaryCache, fpath: "Path", used_ns: int) -> None:
+    """Put summary to cache and pretend it was last used at `used_ns`."""
+    entries_before = set(summary_cache.root.rglob("*.txt"))
+    summary_cache.put(fpath, "raw", SUMMARY)
+    new_entries = set(summary_cache.root.rglob("*.txt")) - entries_before
+    os.utime(new_entries.pop(), ns=(used_ns, used_ns))
+
+
+def test_evicts_least_recently_used(tmp_path: "Path") -> None:
+    """Test eviction keeps the entries used last within the size limit."""
+    summary_cache = SummaryCache(tmp_path / "cache", max_bytes=2 * len(SUMMARY))
+    fpaths = [tmp_path / f"{idx}_raw.fif" for idx in range(3)]
+    for fp in fpaths:
+        fp.touch()
+    first, second, third = fpaths
+    _put_used_at(summary_cache, first, used_ns=1)
+    _put_used_at(summary_cache, second, used_ns=2)
+    summary_cache.get(first, "raw")  # first becomes most recently used
+
+    summary_cache.put(third, "raw", SUMMARY)
+
+    assert summary_cache.get(first, "raw") == SUMMARY
+    assert summary_cache.get(second, "raw") is None
+    assert summary_cache.get(third, "raw") == SUMMARY
+
+
+def test_clear_removes_all(summary_cache: SummaryCache, fpath: "Path") -> None:
+    """Test clearing the cache."""
+    summary_cache.put(fpath, "raw", SUMMARY)
+    summary_cache.put(fpath, "epochs", SUMMARY)
+
+    assert summary_cache.clear() == 2
+    assert summary_cache.get(fpath, "raw") is None
+    assert not summary_cache.clear()
@@ -0,0 +1,131 @@
+"""Test the catalog of recordings."""
+import os
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from quickfif.catalog import (
+    SCHEMA_VERSION,
+    CatalogError,
+    IndexStats,
+    index_files,
+    open_catalog,
+    query,
+    read_record,
+)
+from quickfif.cli.paths import expand_paths
+from tests.plugins.raw_fixtures import RawFactory
+
+
+@pytest.fixture
+def archive(tmp_path: Path, raw_obj_factory: RawFactory) -> Path:
+    """Directory with a raw file of EEG, a BIDS split set and a broken file."""
+    root = tmp_path / "archive"
+    (root / "sub-01").mkdir(parents=True)
+    raw_obj_factory(3, sfreq=1000, dur_sec=1, ch_types="eeg").save(root / "eeg_raw.fif")
+    bids_raw = raw_obj_factory(4, sfreq=500, dur_sec=150)  # noqa: WPS432
+    bids_raw.save(root / "sub-01" / "sub-01_meg.fif", split_size="2MB", split_naming="bids")
+    (root / "broken_raw.fif").write_bytes(b"broken")
+    return root
+
+
+def index_archive(catalog_fpath: Path, root: Path, jobs: int = 2) -> IndexStats:
+    """Index the supported files under root."""
+    with open_catalog(catalog_fpath) as conn:
+        return index_files(conn, root, expand_paths([str(root)], recursive=True), jobs=jobs)
+
+
+@pytest.fixture
+def indexed_catalog(archive: Path, tmp_path: Path) -> Path:
+    """Catalog with the archive indexed."""
+    catalog_fpath = tmp_path / "catalog.sqlite"
+    index_archive(catalog_fpath, archive)
+    return catalog_fpath
+
+
+def test_query_by_metadata(archive: Path, tmp_path: Path) -> None:
+    """Test files are found by info fields and channel counts; splits are one record."""
+    catalog_fpath = tmp_path / "catalog.sqlite"
+
+    stats = index_archive(catalog_fpath, archive)
+
+    rows = {str(row["fpath"]): row for row in query(catalog_fpath, "error IS NULL")}
+    eeg_fpath, split_fpath = archive / "eeg_raw.fif", archive / "sub-01" / "sub-01_meg.fif"
+    assert (stats.n_read, stats.n_failed) == (4, 1)
+    assert list(rows) == [str(eeg_fpath), str(split_fpath.with_name("sub-01_split-01_meg.fif"))]
+    assert rows[str(eeg_fpath)]["sfreq"] == 1000
+    assert [row["fpath"] for row in query(catalog_fpath, "n_eeg = 3")] == [str(eeg_fpath)]
+    assert [row["n_splits"] for row in query(catalog_fpath, "n_misc = 4")] == [2]
+
+
+def test_reindex_reads_changed_files_only(archive: Path, tmp_path: Path) -> None:
+    """Test re-indexing skips unchanged files and split sets and drops removed files."""
+    catalog_fpath = tmp_path / "catalog.sqlite"
+    index_archive(catalog_fpath, archive)
+    os.utime(archive / "sub-01" / "sub-01_split-02_meg.fif", ns=(0, 0))
+    (archive / "eeg_raw.fif").unlink()
+
+    stats = index_archive(catalog_fpath, archive)
+
+    assert (stats.n_read, stats.n_unchanged, stats.n_removed) == (1, 1, 1)
+    assert len(list(query(catalog_fpath, "1"))) == 2
+
+
+def test_changed_continuation_rereads_split_set(
+    archive: Path, indexed_catalog: Path, mocker: MockerFixture
+) -> None:
+    """Test a changed continuation split makes the set read again from its first file."""
+    os.utime(archive / "sub-01" / "sub-01_split-02_meg.fif", ns=(0, 0))
+    read = mocker.patch("quickfif.catalog.read_record", wraps=read_record)
+
+    stats = index_archive(indexed_catalog, archive, jobs=1)
+
+    assert stats.n_read == 1
+    read.assert_called_once_with(archive / "sub-01" / "sub-01_split-01_meg.fif", "raw")
+    assert index_archive(indexed_catalog, archive).n_read == 0  # new times are recorded
+
+
+def test_split_set_failing_stat_is_read_again(archive: Path, indexed_catalog: Path) -> None:
+    """Test a split set whose continuation can't be stated is read again."""
+    (archive / "sub-01" / "sub-01_split-02_meg.fif").unlink()
+
+    stats = index_archive(indexed_catalog, archive)
+
+    assert (stats.n_read, stats.n_unchanged, stats.n_removed) == (1, 2, 0)
+    assert [row["n_splits"] for row in query(indexed_catalog, "n_misc = 4")] == [1]
+
+
+def test_gone_files_are_removed(archive: Path, indexed_catalog: Path) -> None:
+    """Test records of the files which are gone are removed with their splits and channels."""
+    (archive / "eeg_raw.fif").unlink()
+    (archive / "broken_raw.fif").unlink()
+
+    stats = index_archive(indexed_catalog, archive)
+
+    assert (stats.n_read, stats.n_removed) == (0, 2)
+    assert [row["n_eeg"] for row in query(indexed_catalog, "1")] == [0]
+
+
+def test_new_schema_reads_everything_again(
+    archive: Path, indexed_catalog: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test catalog of another schema version is recreated and all the files are read."""
+    monkeypatch.setattr("quickfif.catalog.SCHEMA_VERSION", SCHEMA_VERSION + 1)
+
+    stats = index_archive(indexed_catalog, archive)
+
+    assert (stats.n_read, stats.n_unchanged) == (4, 0)
+    assert len(list(query(indexed_catalog, "1"))) == 3
+
+
+def test_query_errors(archive: Path, tmp_path: Path) -> None:
+    """Test missing catalog and bad conditions are reported; the catalog isn't changed."""
+    catalog_fpath = tmp_path / "catalog.sqlite"
+    with pytest.raises(CatalogError, match="No catalog"):
+        list(query(catalog_fpath, "1"))
+    index_archive(catalog_fpath, archive)
+
+    with pytest.raises(CatalogError):
+        list(query(catalog_fpath, "1; DELETE FROM files"))
+    assert len(list(query(catalog_fpath, "1"))) == 3
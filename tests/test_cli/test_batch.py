@@ -0,0 +1,93 @@
+"""Test previewing many files at once."""
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from quickfif.cli import main
+from quickfif.cli.errors import ExitCode
+from quickfif.cli.paths import expand_paths
+
+
+@pytest.fixture
+def session_dir(tmp_path: Path, small_raw_fpath: Path) -> Path:
+    """Directory with good and broken raw files, a nested run and an unsupported file."""
+    session = tmp_path / "session"
+    (session / "nested").mkdir(parents=True)
+    shutil.copy(small_raw_fpath, session / "run1_raw.fif")
+    shutil.copy(small_raw_fpath, session / "nested" / "run2_raw.fif")
+    (session / "broken_raw.fif").write_bytes(b"broken")
+    (session / "notes.txt").touch()
+    return session
+
+
+def test_expand_directory(session_dir: Path) -> None:
+    """Test directories are expanded to sorted supported files, recursively if asked."""
+    broken, run1 = session_dir / "broken_raw.fif", session_dir / "run1_raw.fif"
+    run2 = session_dir / "nested" / "run2_raw.fif"
+
+    assert expand_paths([str(session_dir)], recursive=False) == [broken, run1]
+    assert expand_paths([str(session_dir)], recursive=True) == [broken, run2, run1]
+
+
+def test_expand_globs(session_dir: Path) -> None:
+    """Test patterns are expanded, duplicates are dropped, unmatched patterns kept."""
+    run1, run2 = session_dir / "run1_raw.fif", session_dir / "nested" / "run2_raw.fif"
+    patterns = [f"{session_dir}/**/run*", str(run1), "missing*_raw.fif"]
+
+    expanded = expand_paths(patterns, recursive=True)
+
+    assert expanded == [run2, run1, Path("missing*_raw.fif")]
+
+
+def test_batch_continues_after_errors(cli: CliRunner, session_dir: Path) -> None:
+    """Test broken file doesn't stop the batch and defines the exit code."""
+    cli_result = cli.invoke(main.main, [str(session_dir), "--recursive"])
+
+    assert cli_result.exit_code == ExitCode.broken_file
+    assert cli_result.stdout.count("==>") == 2
+    assert "broken_raw.fif" in cli_result.stderr
+    assert "1 of 3 files failed" in cli_result.stderr
+
+
+def test_batch_mixed_failures(cli: CliRunner, session_dir: Path) -> None:
+    """Test failures of different kinds give aggregate exit code."""
+    args = [str(session_dir / "broken_raw.fif"), str(session_dir / "notes.txt")]
+
+    cli_result = cli.invoke(main.main, args)
+
+    assert cli_result.exit_code == ExitCode.mixed_failures
+
+
+@pytest.mark.parametrize("order", ["input", "completion"])
+def test_batch_in_parallel(cli: CliRunner, session_dir: Path, order: str) -> None:
+    """Test previews from worker processes match the sequential ones."""
+    args = [f"{session_dir}/**/run*", "-r", "--no-cache"]
+    sequential = cli.invoke(main.main, args)
+
+    parallel = cli.invoke(main.main, args + ["--jobs", "2", "--order", order])
+
+    assert parallel.exit_code == ExitCode.ok, parallel.output
+    assert sorted(parallel.stdout.split("==>")) == sorted(sequential.stdout.split("==>"))
+
+
+def test_batch_json_is_ndjson(cli: CliRunner, session_dir: Path) -> None:
+    """Test JSON batch prints a record per line, failed files included."""
+    cli_result = cli.invoke(main.main, [str(session_dir), "-r", "--format", "json"])
+
+    records = [json.loads(line) for line in cli_result.stdout.splitlines()]
+    assert [Path(record["fpath"]).name for record in records] == [
+        "broken_raw.fif", "run2_raw.fif", "run1_raw.fif"
+    ]
+    assert records[0]["exit_code"] == ExitCode.broken_file
+    assert records[1]["summary"] == records[2]["summary"]
+    assert "1 of 3 files failed" in cli_result.stderr
+
+
+def test_subcommand_needs_single_file(cli: CliRunner, session_dir: Path) -> None:
+    """Test subcommands refuse to work on many files."""
+    cli_result = cli.invoke(main.main, [str(session_dir), "inspect"])
+
+    assert cli_result.exit_code == ExitCode.bad_click_path
@@ -1,13 +1,16 @@
 """Test CLI main command without subcommands (a.k.a. preview)."""
+import json
 from difflib import SequenceMatcher
+from time import sleep
 from typing import TYPE_CHECKING, Callable
 
 import pytest
 from click.testing import CliRunner
 
+from quickfif.cache import get_summary_cache
 from quickfif.cli import main
 from quickfif.cli.errors import ExitCode
-from quickfif.config import EXT_TO_FTYPE
+from quickfif.config import EXT_TO_FTYPE, Ftype, qf_preview
 from quickfif.qf_types.base import QfType
 
 if TYPE_CHECKING:
@@ -82,3 +85,96 @@ def test_preview_outputs_qf_obj_str(
     # for some qf types we print info which may differ a bit for read vs created objects
     # so we check for similarity, not equality
     assert_similar(saved_qf_obj.summary, cli_result.output)
+
+
+def test_preview_is_cached(cli: CliRunner, small_raw_fpath: "Path") -> None:
+    """Test the second preview comes from the cache, unless caching is switched off."""
+    first_result = cli.invoke(main.main, [str(small_raw_fpath)])
+    cached_summary = get_summary_cache().get(small_raw_fpath, Ftype.raw)
+    get_summary_cache().put(small_raw_fpath, Ftype.raw, "cached")
+    cached_result = cli.invoke(main.main, [str(small_raw_fpath)])
+    no_cache_result = cli.invoke(main.main, ["--no-cache", str(small_raw_fpath)])
+
+    assert cached_summary is not None
+    assert first_result.output == f"{cached_summary}\n"
+    assert cached_result.output == "cached\n"
+    assert no_cache_result.output == first_result.output
+
+
+@pytest.mark.parametrize("use_cache", [True, False], ids=["cached", "not cached"])
+def test_preview_json(cli: CliRunner, small_raw_fpath: "Path", use_cache: bool) -> None:
+    """Test JSON preview has the values of the text one, from the cache as well."""
+    fpath = str(small_raw_fpath)
+    args = ["--format", "json", fpath]
+    cli.invoke(main.main, [fpath])  # text in the cache must not be taken
+    cli.invoke(main.main, args)
+
+    cli_result = cli.invoke(main.main, args if use_cache else ["--no-cache", *args])
+
+    record = json.loads(cli_result.stdout)
+    assert record["fpath"] == fpath
+    assert record["ftype"] == Ftype.raw
+    assert record["summary"] == main.qf_read(small_raw_fpath, Ftype.raw).summary_fields()
+
+
+def test_profile_reports_preview_phases(cli: CliRunner, small_raw_fpath: "Path") -> None:
+    """Test --profile prints phases to stderr and --profile-json writes the same phases."""
+    profile_fpath = small_raw_fpath.with_name("profile.json")
+    args = ["--no-cache", "--no-daemon", "--profile", "--profile-json", str(profile_fpath)]
+
+    cli_result = cli.invoke(main.main, [*args, str(small_raw_fpath)])
+
+    phases = [stats["name"] for stats in json.loads(profile_fpath.read_text())["phases"]]
+    assert phases == ["parse_ftype", "cache", "daemon", "qf_preview", "summary"]
+    assert "qf_preview" in cli_result.stderr
+    assert "qf_preview" not in cli_result.stdout
+
+
+def test_cache_clear(cli: CliRunner, small_raw_fpath: "Path") -> None:
+    """Test clearing the cache with `qfif cache clear` without passing a file."""
+    cli.invoke(main.main, [str(small_raw_fpath)])
+
+    cli_result = cli.invoke(main.main, ["cache", "clear"])
+
+    assert cli_result.exit_code == ExitCode.ok, cli_result.output
+    assert "Removed 1" in cli_result.output
+    assert get_summary_cache().get(small_raw_fpath, Ftype.raw) is None
+
+
+def test_budget_cuts_slow_sections(
+    cli: CliRunner, small_raw_fpath: "Path", monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test preview prints the sections ready within the budget and exits fine."""
+    expected_summary = qf_preview(small_raw_fpath, Ftype.raw).summary
+    monkeypatch.setattr(
+        "quickfif.qf_types.raw_type._get_annots_summary", lambda *args: sleep(3)
+    )
+    budget_args = ["--no-cache", "--no-daemon", "--budget-ms", "500"]
+
+    cli_result = cli.invoke(main.main, [*budget_args, str(small_raw_fpath)])
+
+    assert cli_result.exit_code == ExitCode.ok, cli_result.output
+    printed, omitted_mark = cli_result.stdout.rstrip().rsplit("\n", 1)
+    assert expected_summary.startswith(printed)
+    assert "time budget of 500 ms" in omitted_mark
+
+
+def test_budget_needs_single_text_preview(cli: CliRunner, small_raw_fpath: "Path") -> None:
+    """Test time budget is refused where the output can't be cut."""
+    json_args = ["--format", "json", "--budget-ms", "9"]
+    cli_result = cli.invoke(main.main, [small_raw_fpath.as_posix(), *json_args])
+
+    assert cli_result.exit_code == ExitCode.bad_click_path
+
+
+def test_signal_follows_cached_preview(cli: CliRunner, small_raw_fpath: "Path") -> None:
+    """Test --signal appends sparklines to the preview from the cache and to JSON records."""
+    fpath = small_raw_fpath.as_posix()
+    cli.invoke(main.main, [fpath])
+
+    cli_result = cli.invoke(main.main, ["--signal", fpath])
+    json_result = cli.invoke(main.main, ["--signal", "--format", "json", fpath])
+
+    summary = qf_preview(small_raw_fpath, Ftype.raw).summary
+    assert cli_result.stdout.startswith(f"{summary}\nSignal "), cli_result.output
+    assert json.loads(json_result.stdout)["signal"]["by_type"]["misc"]["n_channels"] == 3
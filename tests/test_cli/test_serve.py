@@ -0,0 +1,42 @@
+"""Test CLI preview forwarding to the daemon and daemon startup."""
+from typing import TYPE_CHECKING
+
+import pytest
+from click.testing import CliRunner
+
+from quickfif.cli import main, preview
+from quickfif.cli.errors import ExitCode
+from quickfif.config import Ftype, qf_preview
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from tests.plugins.daemon_fixtures import ServerFactory
+
+
+def test_preview_is_forwarded_to_daemon(
+    cli: CliRunner,
+    server_factory: "ServerFactory",
+    small_raw_fpath: "Path",
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test preview comes from the daemon and doesn't read the file in process."""
+    server_factory()
+    expected_summary = qf_preview(small_raw_fpath, Ftype.raw).summary
+    monkeypatch.setattr(preview, "qf_preview", None)  # fail if called
+
+    cli_result = cli.invoke(main.main, ["--no-cache", str(small_raw_fpath)])
+    no_daemon_result = cli.invoke(main.main, ["--no-cache", "--no-daemon", str(small_raw_fpath)])
+
+    assert cli_result.exit_code == ExitCode.ok, cli_result.output
+    assert cli_result.output == f"{expected_summary}\n"
+    assert no_daemon_result.exit_code == ExitCode.broken_file
+
+
+def test_serve_refuses_second_daemon(cli: CliRunner, server_factory: "ServerFactory") -> None:
+    """Test starting daemon fails gracefully when one is already running."""
+    server_factory()
+
+    cli_result = cli.invoke(main.main, ["serve"])
+
+    assert cli_result.exit_code == ExitCode.daemon_failed
@@ -0,0 +1,95 @@
+"""
+Test startup path of the CLI stays light.
+
+Running `qfif --help` or previewing a raw file must not import mne and friends:
+importing them takes seconds while the header-only preview needs milliseconds.
+
+"""
+import json
+import subprocess  # noqa: S404
+import sys
+import time
+from typing import TYPE_CHECKING, Final
+
+import mne
+import numpy as np
+import pytest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from tests.plugins.raw_fixtures import RawFactory  # pragma: no cover
+
+# Wall time budgets include interpreter startup. Heavy imports alone (mne, pandas,
+# matplotlib) add ~2-3 sec, so going over the budget means one of them sneaked in.
+HELP_BUDGET_SEC: Final = 1.0
+PREVIEW_BUDGET_SEC: Final = 1.5
+
+HEAVY_MODULES: Final = ("mne", "pandas", "matplotlib", "IPython", "scipy", "sklearn")
+
+# Run CLI and dump imported modules names to stderr
+_RUN_CLI_SCRIPT: Final = """
+import json, sys
+from quickfif.cli.main import main
+try:
+    main(sys.argv[1:])
+except SystemExit:
+    pass
+json.dump(sorted(sys.modules), sys.stderr)
+"""
+
+
+def _run_cli(args: list[str]) -> tuple[float, set[str]]:
+    start = time.perf_counter()
+    proc = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", _RUN_CLI_SCRIPT, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed = time.perf_counter() - start
+    return elapsed, set(json.loads(proc.stderr.splitlines()[-1]))
+
+
+@pytest.fixture
+def raw_fpath(tmp_path: "Path", raw_obj_factory: "RawFactory") -> "Path":
+    """Raw file without annotations, previewed from header only."""
+    fpath = tmp_path / "test_raw.fif"
+    raw_obj_factory(10, sfreq=1000, dur_sec=10).save(fpath)  # noqa: WPS432
+    return fpath
+
+
+@pytest.fixture
+def epochs_fpath(tmp_path: "Path") -> "Path":
+    """Epochs file; previewing it needs mne unless the preview is cached."""
+    mne_info = mne.create_info(3, sfreq=100)  # noqa: WPS432
+    epochs = mne.EpochsArray(np.zeros((2, 3, 10)), mne_info, verbose="ERROR")
+    fpath = tmp_path / "test-epo.fif"
+    epochs.save(fpath)
+    return fpath
+
+
+def test_help_does_not_import_heavy_modules() -> None:
+    """Test `qfif --help` stays within the time budget without heavy imports."""
+    elapsed, modules = _run_cli(["--help"])
+
+    assert not modules.intersection(HEAVY_MODULES)
+    assert elapsed < HELP_BUDGET_SEC
+
+
+def test_raw_preview_does_not_import_heavy_modules(raw_fpath: "Path") -> None:
+    """Test raw file preview stays within the time budget without heavy imports."""
+    elapsed, modules = _run_cli([str(raw_fpath)])
+
+    assert not modules.intersection(HEAVY_MODULES)
+    assert elapsed < PREVIEW_BUDGET_SEC
+
+
+def test_cached_preview_does_not_import_heavy_modules(epochs_fpath: "Path") -> None:
+    """Test cache hit returns without importing mne."""
+    _, modules_on_miss = _run_cli([str(epochs_fpath)])
+    elapsed, modules_on_hit = _run_cli([str(epochs_fpath)])
+
+    assert "mne" in modules_on_miss
+    assert not modules_on_hit.intersection(HEAVY_MODULES)
+    assert elapsed < PREVIEW_BUDGET_SEC
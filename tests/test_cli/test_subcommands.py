@@ -1,12 +1,17 @@
 """Test green path for CLI."""
 from typing import TYPE_CHECKING
 
+import click
 import pytest
 from click.testing import CliRunner
 
 from quickfif.cli import main
 from quickfif.cli.errors import ExitCode
+from quickfif.config import Ftype, qf_read
+from quickfif.lazy import LazyProxy
+from quickfif.preload import get_preload_cache
 from quickfif.qf_types.base import QfType
+from quickfif.qf_types.raw_type import QfRaw
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -42,6 +47,48 @@ def test_inspect_fails_gracefully_on_embed_exception(
     assert cli_res.exit_code == ExitCode.embed_failed
 
 
+def test_inspect_namespace_is_loaded_in_background(
+    cli: CliRunner,
+    monkeypatch: pytest.MonkeyPatch,
+    main_args: list[str],
+    saved_qf_obj: QfType,
+    ftype: Ftype,
+) -> None:
+    """Test console gets the path right away and the other variables resolve to the file."""
+    namespaces: list[dict[str, LazyProxy]] = []
+    monkeypatch.setattr(main, "embed_ipython", namespaces.append)
+
+    cli_result = cli.invoke(main.main, main_args + ["inspect"])
+
+    assert cli_result.exit_code == ExitCode.ok, cli_result.output
+    ns = namespaces[0]
+    expected_ns = qf_read(saved_qf_obj.fpath, ftype).to_dict()
+    assert ns.keys() == expected_ns.keys()
+    assert ns["fpath"] == saved_qf_obj.fpath
+    for name in ns.keys() - {"fpath"}:
+        assert repr(ns[name].resolve()) == repr(expected_ns[name])
+
+
+def test_inspect_preloads_raw_and_epochs(
+    cli: CliRunner,
+    monkeypatch: pytest.MonkeyPatch,
+    main_args: list[str],
+    ftype: Ftype,
+) -> None:
+    """Test raw data are preloaded into the cache, epochs into memory and other types refused."""
+    namespaces: list[dict[str, LazyProxy]] = []
+    monkeypatch.setattr(main, "embed_ipython", namespaces.append)
+
+    cli_result = cli.invoke(main.main, main_args + ["inspect", "--preload"])
+
+    if ftype not in {Ftype.raw, Ftype.epochs}:
+        assert cli_result.exit_code == click.UsageError.exit_code
+        return
+    assert cli_result.exit_code == ExitCode.ok, cli_result.output
+    assert namespaces[0][str(ftype)].resolve().preload  # type: ignore[attr-defined]
+    assert get_preload_cache().clear() == int(ftype == Ftype.raw)
+
+
 @pytest.fixture(params=[True, False], ids=["file", "dir"])
 def save_dst(
     request: pytest.FixtureRequest,
@@ -91,3 +138,105 @@ def test_saveas_fails_gracefully_on_save_exception(
     cli_result = cli.invoke(main.main, saveas_args)
 
     assert cli_result.exit_code == ExitCode.save_failed
+
+
+def test_move_doesnt_read_data(
+    cli: CliRunner, split_raw_fpath: "Path", monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test move works on split files without reading them with mne."""
+    monkeypatch.setattr(main, "qf_read", None)  # fail if called
+    dst = split_raw_fpath.with_name("moved_meg.fif")
+
+    cli_result = cli.invoke(main.main, [str(split_raw_fpath), "move", str(dst)])
+
+    assert cli_result.exit_code == ExitCode.ok, cli_result.output
+    assert dst.with_name("moved_split-03_meg.fif").exists()
+    assert not split_raw_fpath.exists()
+
+
+def test_move_fails_gracefully(cli: CliRunner, split_raw_fpath: "Path") -> None:
+    """Test move of a split which is not the first one fails with save error."""
+    middle_split = split_raw_fpath.with_name("test_raw-1.fif")
+
+    cli_result = cli.invoke(main.main, [str(middle_split), "move", "moved_raw.fif"])
+
+    assert cli_result.exit_code == ExitCode.save_failed
+
+
+def test_recompress_reports_throughput(cli: CliRunner, split_raw_fpath: "Path") -> None:
+    """Test recompress converts split set and reports its speed."""
+    dst = split_raw_fpath.with_name("test_raw.fif.gz")
+
+    cli_result = cli.invoke(main.main, [str(split_raw_fpath), "recompress", str(dst)])
+
+    assert "MB/s" in cli_result.stderr, cli_result.output
+    assert dst.with_name("test_raw.fif-2.gz").exists()
+
+
+def test_saveas_reports_save_method(cli: CliRunner, small_raw_fpath: "Path") -> None:
+    """Test saveas tells if the file was copied or rewritten."""
+    dst = small_raw_fpath.with_name("copy_raw.fif")
+
+    cli_result = cli.invoke(main.main, [str(small_raw_fpath), "saveas", str(dst)])
+
+    assert cli_result.exit_code == ExitCode.ok, cli_result.output
+    assert dst.read_bytes() == small_raw_fpath.read_bytes()
+    assert "mne rewrite" not in cli_result.stderr
+
+
+@pytest.mark.parametrize("ftype_args", [False], indirect=True)
+def test_saveas_crops_raw_only(
+    cli: CliRunner, saved_qf_obj: QfType, main_args: list[str], tmp_path: "Path"
+) -> None:
+    """Test saveas with crop options works for raw and fails gracefully for other types."""
+    dst = tmp_path / "export" / saved_qf_obj.fpath.name
+    dst.parent.mkdir()
+
+    cli_result = cli.invoke(main.main, main_args + ["saveas", str(dst), "--tmax", "0.5"])
+
+    if isinstance(saved_qf_obj, QfRaw):
+        assert cli_result.exit_code == ExitCode.ok, cli_result.output
+        assert "mne rewrite" in cli_result.stderr
+    else:
+        assert cli_result.exit_code == ExitCode.save_failed
+
+
+def test_verify_exits_with_broken_file(cli: CliRunner, split_raw_fpath: "Path") -> None:
+    """Test verify prints checksums of the splits and fails when a split is missing."""
+    cli_result = cli.invoke(main.main, [str(split_raw_fpath), "verify", "--checksum"])
+    split_raw_fpath.with_name("test_raw-2.fif").unlink()
+    broken_result = cli.invoke(main.main, [str(split_raw_fpath), "verify"])
+
+    assert cli_result.stderr.endswith(": OK\n"), cli_result.output
+    assert len(cli_result.stdout.splitlines()) == 3
+    assert broken_result.exit_code == ExitCode.broken_file
+    assert "missing" in broken_result.stderr
+
+
+def test_pyramid_is_written_next_to_raw(cli: CliRunner, split_raw_fpath: "Path") -> None:
+    """Test pyramid of split raw is written next to it and other file types are rejected."""
+    cli_result = cli.invoke(main.main, [str(split_raw_fpath), "pyramid", "-j", "2"])
+    ica_result = cli.invoke(main.main, [str(split_raw_fpath), "-t", "ica", "pyramid"])
+
+    assert cli_result.stderr.startswith("Wrote "), cli_result.output
+    assert split_raw_fpath.with_name("test_raw.fif.pyr").exists()
+    assert ica_result.exit_code == ExitCode.bad_click_path
+
+
+def test_thumbnails_are_written_to_output_dir(cli: CliRunner, small_raw_fpath: "Path") -> None:
+    """Test thumbnails of a directory of files are written as <name>.png and printed."""
+    out_dir = small_raw_fpath.parent / "thumbnails"
+    args = ["thumbnail", str(small_raw_fpath.parent), "-o", str(out_dir), "-j", "1"]
+
+    cli_result = cli.invoke(main.main, args)
+
+    assert cli_result.stdout.strip() == str(out_dir / "test_raw.fif.png"), cli_result.output
+    assert (out_dir / "test_raw.fif.png").read_bytes().startswith(b"\x89PNG")
+
+
+def test_stats_prints_json_record(cli: CliRunner, small_raw_fpath: "Path") -> None:
+    """Test statistics of raw channels are printed as a JSON record of the file."""
+    cli_result = cli.invoke(main.main, [str(small_raw_fpath), "stats", "--format", "json"])
+
+    assert cli_result.stdout.count('"ch_type": "misc"') == 3, cli_result.output
+    assert cli_result.stdout.rstrip().endswith('"bads": []}}')
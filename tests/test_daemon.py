@@ -0,0 +1,116 @@
+"""Test preview daemon and its client."""
+import socket
+import threading
+from typing import TYPE_CHECKING, Final
+
+import pytest
+
+from quickfif.cache import get_version
+from quickfif.config import Ftype, qf_preview
+from quickfif.daemon import server as daemon_server
+from quickfif.daemon.client import request_summary
+from quickfif.daemon.protocol import Request, Status, get_socket_path
+from quickfif.daemon.server import DaemonRunningError, PreviewServer, remove_stale_socket
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from tests.plugins.daemon_fixtures import ServerFactory
+
+SHORT_TIMEOUT_SEC: Final = 0.01
+
+
+def test_daemon_summary_is_same_as_in_process(
+    server_factory: "ServerFactory", small_raw_fpath: "Path"
+) -> None:
+    """Test daemon answers with the same summary as we'd compute ourselves."""
+    server_factory()
+    expected_summary = qf_preview(small_raw_fpath, Ftype.raw).summary
+
+    assert request_summary(small_raw_fpath, Ftype.raw) == expected_summary
+
+
+def test_daemon_read_error_is_raised(server_factory: "ServerFactory", tmp_path: "Path") -> None:
+    """Test client raises when daemon failed to read the file."""
+    server_factory()
+    broken_fpath = tmp_path / "broken_raw.fif"
+    broken_fpath.write_bytes(b"not a fif file")
+
+    with pytest.raises(ValueError, match="Truncated"):
+        request_summary(broken_fpath, Ftype.raw)
+
+
+def test_no_daemon_gives_none(small_raw_fpath: "Path") -> None:
+    """Test client returns None without running daemon, with or without a stale socket."""
+    assert request_summary(small_raw_fpath, Ftype.raw) is None
+
+    get_socket_path().touch()
+
+    assert request_summary(small_raw_fpath, Ftype.raw) is None
+
+
+@pytest.mark.usefixtures("hanging_workers")
+def test_timeout(server_factory: "ServerFactory", small_raw_fpath: "Path") -> None:
+    """Test request times out when worker hangs and client falls back."""
+    server = server_factory(request_timeout=SHORT_TIMEOUT_SEC)
+
+    response = server.respond(Request(str(small_raw_fpath), Ftype.raw, get_version()))
+
+    assert response.status == Status.timeout
+    assert request_summary(small_raw_fpath, Ftype.raw) is None
+
+
+def test_busy_when_queue_is_full(
+    server_factory: "ServerFactory",
+    small_raw_fpath: "Path",
+    hanging_workers: tuple[threading.Event, threading.Event],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test requests over the queue limit are rejected right away, the rest are served."""
+    monkeypatch.setattr(daemon_server, "QUEUED_PER_WORKER", 0)
+    server = server_factory(workers=1)
+    request = Request(str(small_raw_fpath), Ftype.raw, get_version())
+    started, release = hanging_workers
+    responses = []
+    thread = threading.Thread(target=lambda: responses.append(server.respond(request)))
+    thread.start()
+    started.wait()
+
+    busy_response = server.respond(request)
+    release.set()
+    thread.join()
+
+    assert busy_response.status == Status.busy
+    assert responses[0].status == Status.ok
+
+
+def test_version_mismatch(server_factory: "ServerFactory", small_raw_fpath: "Path") -> None:
+    """Test daemon refuses to serve clients of different package version."""
+    server = server_factory()
+
+    response = server.respond(Request(str(small_raw_fpath), Ftype.raw, "0.0.0"))
+
+    assert response.status == Status.version
+
+
+def test_idle_shutdown_removes_socket() -> None:
+    """Test daemon stops when idle and cleans up after itself."""
+    socket_path = get_socket_path()
+    with PreviewServer(socket_path, 1, 1, idle_timeout=SHORT_TIMEOUT_SEC) as server:
+        server.serve_until_idle()
+
+    assert not socket_path.exists()
+
+
+def test_remove_stale_socket(server_factory: "ServerFactory") -> None:
+    """Test socket of a dead daemon is removed, while the running one is left alone."""
+    socket_path = get_socket_path()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(str(socket_path))  # no one listens on the socket after it's closed
+
+    remove_stale_socket(socket_path)
+
+    assert not socket_path.exists()
+    server_factory()
+    with pytest.raises(DaemonRunningError):
+        remove_stale_socket(socket_path)
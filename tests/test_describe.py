@@ -0,0 +1,42 @@
+"""Test grouped statistics match pandas `describe`."""
+import numpy as np
+import numpy.typing as npt  # noqa: WPS301
+import pytest
+
+from quickfif.describe import describe_table
+
+DESCRIPTIONS = ("BAD_ACQ_SKIP", "EDGE boundary", "sleep N2", "Ω")
+
+
+def pandas_describe_table(labels: npt.NDArray[np.str_], durations: npt.NDArray[np.float64]) -> str:
+    """Build the table as quickfif did with pandas."""
+    pd = pytest.importorskip("pandas")
+
+    df = pd.DataFrame({"description": labels, "duration": durations})
+    df_groups = df.groupby("description").duration.describe()
+    total_series = df.duration.describe()
+    total_series.name = "Total"
+    joint_df = pd.concat([df_groups, total_series.to_frame().T])
+    joint_df["count"] = joint_df["count"].astype(int)
+    return str(joint_df.to_string(float_format=lambda x: "{0:.2f}".format(x)))
+
+
+@pytest.mark.parametrize("n_annots", [0, 1, 2, 7, 100000])
+@pytest.mark.parametrize("scale", [1e-3, 30, 1e7])
+def test_same_table_as_pandas(n_annots: int, scale: float) -> None:
+    """Test table is the same for durations of different magnitudes and group sizes."""
+    rng = np.random.default_rng(n_annots)
+    onsets = (rng.random(n_annots) * scale * 100).astype(np.float32)
+    offsets = onsets + rng.random(n_annots).astype(np.float32) * scale
+    durations = (offsets - onsets).astype(np.float64)
+    labels = rng.choice(DESCRIPTIONS, n_annots).astype(str)
+
+    assert describe_table(labels, durations) == pandas_describe_table(labels, durations)
+
+
+def test_single_value_groups() -> None:
+    """Test standard deviation of one value is NaN and negative values are aligned."""
+    labels = np.array(["b", "a"])
+    durations = np.array([-1.5, 12345.25])
+
+    assert describe_table(labels, durations) == pandas_describe_table(labels, durations)
@@ -0,0 +1,97 @@
+"""Test copying of files which don't change on save."""
+import errno
+from pathlib import Path
+
+import pytest
+
+from quickfif import fastcopy
+from quickfif.config import Ftype, qf_read, qf_save
+
+SaveMethod = fastcopy.SaveMethod
+
+KERNEL_METHODS = (SaveMethod.reflink, SaveMethod.copy_file_range, SaveMethod.sendfile)
+
+
+def unsupported(src_fd: int, dst_fd: int, size: int) -> None:
+    """Copy function failing as on a file system which doesn't support it."""
+    raise OSError(errno.EOPNOTSUPP, "Not supported")
+
+
+@pytest.fixture
+def src_fpath(tmp_path: Path) -> Path:
+    """File with a few MB of data."""
+    fpath = tmp_path / "src.bin"
+    fpath.write_bytes(bytes(range(256)) * 10000)  # noqa: WPS432
+    return fpath
+
+
+def test_copy_is_identical(src_fpath: Path) -> None:
+    """Test copy has the same content and no temporary files are left."""
+    dst = src_fpath.with_name("dst.bin")
+
+    save_method = fastcopy.copy_file(src_fpath, dst, overwrite=False)
+
+    assert save_method in KERNEL_METHODS
+    assert dst.read_bytes() == src_fpath.read_bytes()
+    assert sorted(src_fpath.parent.iterdir()) == [dst, src_fpath]
+
+
+@pytest.mark.parametrize("n_unsupported", [1, 2, 3])
+def test_copy_falls_back(
+    src_fpath: Path, n_unsupported: int, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test next copy method is used when the previous ones are not supported."""
+    copy_funcs = list(fastcopy.KERNEL_COPY_FUNCS)
+    for idx in range(n_unsupported):
+        copy_funcs[idx] = (copy_funcs[idx][0], unsupported)
+    monkeypatch.setattr(fastcopy, "KERNEL_COPY_FUNCS", copy_funcs)
+    dst = src_fpath.with_name("dst.bin")
+
+    save_method = fastcopy.copy_file(src_fpath, dst, overwrite=False)
+
+    expected = [*KERNEL_METHODS, SaveMethod.userspace][n_unsupported]
+    assert save_method == expected
+    assert dst.read_bytes() == src_fpath.read_bytes()
+
+
+def test_failed_copy_leaves_no_files(src_fpath: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test copy errors other than 'not supported' are raised and clean up after themselves."""
+
+    def failing(src_fd: int, dst_fd: int, size: int) -> None:  # noqa: WPS430
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(fastcopy, "KERNEL_COPY_FUNCS", [(SaveMethod.reflink, failing)])
+
+    with pytest.raises(OSError, match="No space"):
+        fastcopy.copy_file(src_fpath, src_fpath.with_name("dst.bin"), overwrite=True)
+    assert list(src_fpath.parent.iterdir()) == [src_fpath]
+
+
+@pytest.mark.parametrize(
+    ("dst_name", "expected_method"),
+    [("copy_raw.fif", KERNEL_METHODS), ("copy_raw.fif.gz", (SaveMethod.rewrite,))],
+)
+def test_unchanged_raw_is_copied(
+    small_raw_fpath: Path, dst_name: str, expected_method: tuple[SaveMethod, ...]
+) -> None:
+    """Test single raw file is copied as is unless compression changes."""
+    dst = small_raw_fpath.with_name(dst_name)
+
+    save_method = qf_save(qf_read(small_raw_fpath, Ftype.raw), dst, overwrite=False)
+
+    assert save_method in expected_method
+    is_copied = save_method != SaveMethod.rewrite
+    assert is_copied == (dst.read_bytes() == small_raw_fpath.read_bytes())
+
+
+def test_split_raw_is_rewritten(
+    split_raw_fpath: Path, tmp_path_factory: pytest.TempPathFactory
+) -> None:
+    """Test split raw goes through mne, since the split files refer to each other by name."""
+    dst = tmp_path_factory.mktemp("dst") / "copy_raw.fif"
+    qf_raw = qf_read(split_raw_fpath, Ftype.raw)
+
+    save_method = qf_save(qf_raw, dst, overwrite=False)
+
+    assert save_method == SaveMethod.rewrite
+    assert qf_read(dst, Ftype.raw).summary == qf_raw.summary
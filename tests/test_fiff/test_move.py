@@ -0,0 +1,96 @@
+"""Test moving split sets by patching file references."""
+from itertools import chain, repeat
+from pathlib import Path
+
+import mne
+import pytest
+from numpy.testing import assert_array_equal
+from pytest_mock import MockerFixture
+
+from quickfif.fiff.move import move_splits
+from quickfif.fiff.raw import read_raw_header
+
+
+def read_data(fpath: Path) -> mne.io.Raw:
+    """Read raw with all its splits."""
+    return mne.io.read_raw_fif(fpath, verbose="ERROR").get_data()
+
+
+@pytest.mark.parametrize(
+    ("dst_name", "bids"), [("longer_test_name_meg.fif", True), ("tset_raw.fif", False)]
+)
+def test_moved_splits_read_as_before(
+    split_raw_fpath: Path, dst_name: str, bids: bool
+) -> None:
+    """Test moved split set has the same data and the old files are gone."""
+    src_fnames = read_raw_header(split_raw_fpath).fnames
+    src_sizes = [fpath.stat().st_size for fpath in src_fnames]
+    expected_data = read_data(split_raw_fpath)
+
+    dsts = move_splits(split_raw_fpath, split_raw_fpath.with_name(dst_name), bids)
+
+    assert len(src_fnames) == 3
+    assert len(dsts) == len(src_fnames)
+    assert read_raw_header(dsts[0]).fnames == dsts
+    assert_array_equal(read_data(dsts[0]), expected_data)
+    assert not any(fpath.exists() for fpath in src_fnames)
+    dst_sizes = [fpath.stat().st_size for fpath in dsts]
+    # names of the same length are written in place
+    assert (dst_sizes == src_sizes) is (len(dst_name) == len(split_raw_fpath.name))
+
+
+def test_move_to_directory_keeps_names(split_raw_fpath: Path) -> None:
+    """Test splits keep their names when moved to directory."""
+    dst_dir = split_raw_fpath.parent / "moved"
+    dst_dir.mkdir()
+
+    dsts = move_splits(split_raw_fpath, dst_dir, bids=False)
+
+    assert [fpath.name for fpath in dsts] == ["test_raw.fif", "test_raw-1.fif", "test_raw-2.fif"]
+    assert read_raw_header(dsts[0]).fnames == dsts
+
+
+def test_broken_chain_is_left_untouched(split_raw_fpath: Path) -> None:
+    """Test nothing is moved when one of the splits is missing."""
+    split_raw_fpath.with_name("test_raw-2.fif").unlink()
+    dst = split_raw_fpath.with_name("new_raw.fif")
+
+    with pytest.raises(ValueError, match="missing"):
+        move_splits(split_raw_fpath, dst, bids=False)
+
+    assert sorted(fpath.name for fpath in split_raw_fpath.parent.iterdir()) == [
+        "test_raw-1.fif",
+        "test_raw.fif",
+    ]
+
+
+def test_existing_destination(split_raw_fpath: Path) -> None:
+    """Test existing destination file is replaced only when asked."""
+    dst = split_raw_fpath.with_name("new_raw.fif")
+    dst.with_name("new_raw-2.fif").touch()
+
+    with pytest.raises(FileExistsError):
+        move_splits(split_raw_fpath, dst, bids=False)
+    assert split_raw_fpath.exists()
+    assert not dst.exists()
+
+    move_splits(split_raw_fpath, dst, bids=False, overwrite=True)
+
+    assert read_raw_header(dst).fnames[-1] == dst.with_name("new_raw-2.fif")
+
+
+def test_failed_patch_restores_split_set(split_raw_fpath: Path, mocker: MockerFixture) -> None:
+    """Test split set is left as it was when patching fails in the middle of the chain."""
+    src_fnames = read_raw_header(split_raw_fpath).fnames
+    src_contents = [fpath.read_bytes() for fpath in src_fnames]
+    dst = split_raw_fpath.with_name("longer_new_raw.fif")
+    # first split is patched; the second fails after its first name is relinked
+    fsync_results = [None, None, None, OSError("No space left on device")]
+    fsync = mocker.patch("os.fsync", side_effect=chain(fsync_results, repeat(None)))
+
+    with pytest.raises(OSError, match="No space"):
+        move_splits(split_raw_fpath, dst, bids=False)
+
+    assert fsync.call_count > len(fsync_results)
+    assert src_contents == [fpath.read_bytes() for fpath in src_fnames]
+    assert set(split_raw_fpath.parent.iterdir()) == set(src_fnames)
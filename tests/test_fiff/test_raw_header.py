@@ -0,0 +1,97 @@
+"""Test header-only raw FIFF reading against mne."""
+from typing import TYPE_CHECKING
+
+import mne
+import pytest
+from mne.channels.channels import channel_indices_by_type as mne_channel_indices_by_type
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+from quickfif.fiff.channels import channel_indices_by_type
+from quickfif.fiff.raw import read_raw_header
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from tests.plugins.raw_fixtures import RawFactory  # pragma: no cover
+
+
+@pytest.fixture(params=["test_raw.fif", "test_raw.fif.gz", "test_meg.fif"])
+def saved_raw_fpath(
+    request: pytest.FixtureRequest,
+    tmp_path: "Path",
+    raw_obj_factory: "RawFactory",
+) -> "Path":
+    """Annotated raw with long channel names and mixed channel types saved in splits."""
+    raw = raw_obj_factory(4, sfreq=1000, dur_sec=200, ch_types="eeg")  # noqa: WPS432
+    raw.set_channel_types({"0": "misc", "1": "stim"})
+    raw.rename_channels({"3": "very_long_channel_name"})
+    raw.set_meas_date(1500000000)  # noqa: WPS432
+    raw.info["experimenter"] = "test"
+    onsets, descriptions = [1, 2, 3], ["a", "b:colon", "a"]
+    raw.set_annotations(mne.Annotations(onsets, [0.5, 0.1, 0], descriptions))
+    fpath = tmp_path / request.param
+    split_naming = "bids" if "meg" in fpath.name else "neuromag"
+    raw.save(fpath, split_size="2MB", split_naming=split_naming)
+    return next(tmp_path.iterdir()) if "meg" in fpath.name else fpath
+
+
+def test_header_samples_match_mne_raw(saved_raw_fpath: "Path") -> None:
+    """Test samples count over all splits is the same as read by mne."""
+    raw = mne.io.read_raw_fif(saved_raw_fpath, verbose="ERROR")
+
+    header = read_raw_header(saved_raw_fpath)
+
+    assert len(header.fnames) > 1, "We expect splits."
+    assert header.n_times == raw.n_times
+    assert header.first_samp == raw.first_samp
+    assert header.duration == pytest.approx(raw.times[-1])
+
+
+@pytest.mark.parametrize(
+    "key", ["nchan", "sfreq", "highpass", "lowpass", "meas_date", "experimenter", "ch_names"]
+)
+def test_header_info_matches_mne_info(saved_raw_fpath: "Path", key: str) -> None:
+    """Test measurement info fields are the same as read by mne."""
+    raw = mne.io.read_raw_fif(saved_raw_fpath, verbose="ERROR")
+
+    header = read_raw_header(saved_raw_fpath)
+
+    assert header.info[key] == raw.info[key]  # type: ignore[literal-required]
+
+
+def test_header_annotations_and_ch_types_match_mne(saved_raw_fpath: "Path") -> None:
+    """Test annotations and channel types are the same as read by mne."""
+    raw = mne.io.read_raw_fif(saved_raw_fpath, verbose="ERROR")
+
+    header = read_raw_header(saved_raw_fpath)
+
+    assert channel_indices_by_type(header.info["chs"]) == mne_channel_indices_by_type(raw.info)
+    assert_array_almost_equal(header.annotations.onset, raw.annotations.onset)
+    assert_array_almost_equal(header.annotations.duration, raw.annotations.duration)
+    assert_array_equal(header.annotations.description, raw.annotations.description)
+
+
+def test_header_without_meas_date_and_annotations(
+    tmp_path: "Path", raw_obj_factory: "RawFactory"
+) -> None:
+    """Test defaults when optional fields are missing."""
+    raw = raw_obj_factory(2, sfreq=100, dur_sec=1)
+    raw.set_meas_date(None)
+    fpath = tmp_path / "test_raw.fif"
+    raw.save(fpath)
+
+    header = read_raw_header(fpath)
+
+    assert header.info["meas_date"] is None
+    assert header.info["experimenter"] is None
+    assert not header.annotations
+
+
+@pytest.mark.parametrize("file_bytes", [b"", b"not a fif file at all", bytes(64)])  # noqa: WPS432
+def test_broken_file_raises_value_error(tmp_path: "Path", file_bytes: bytes) -> None:
+    """Test garbage input fails with ValueError."""
+    fpath = tmp_path / "test_raw.fif"
+    fpath.write_bytes(file_bytes)
+
+    with pytest.raises(ValueError):
+        read_raw_header(fpath)
@@ -0,0 +1,31 @@
+"""Test partial reads of raw data buffers against mne."""
+from typing import TYPE_CHECKING
+
+import mne
+import pytest
+from numpy.testing import assert_allclose
+
+from quickfif.fiff.sampling import read_sample
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from tests.plugins.raw_fixtures import RawFactory  # pragma: no cover
+
+
+@pytest.mark.parametrize("fname", ["test_raw.fif", "test_raw.fif.gz"])
+def test_sample_matches_mne_data(
+    tmp_path: "Path", raw_obj_factory: "RawFactory", fname: str
+) -> None:
+    """Test beginnings of buffers spread over all the splits are calibrated like mne data."""
+    fpath = tmp_path / fname
+    raw = raw_obj_factory(4, sfreq=1000, dur_sec=150, ch_types="eeg")  # noqa: WPS432
+    raw.save(fpath, split_size="2MB", fmt="short")
+    mne_data = mne.io.read_raw_fif(fpath, verbose="ERROR").get_data()
+
+    sample = read_sample(fpath, n_buffers=10, max_samples=50)  # noqa: WPS432
+
+    assert sample.n_buffers == 151  # noqa: WPS432 (1 s buffers and the last sample)
+    assert sample.starts[-1] > mne_data.shape[1] * 0.9  # noqa: WPS432 (reached the last split)
+    for start, chunk in zip(sample.starts, sample.chunks):
+        assert_allclose(chunk, mne_data[:, start : start + chunk.shape[1]])  # noqa: E203
@@ -0,0 +1,58 @@
+"""Test reading tag directory of corrupt FIFF files."""
+from pathlib import Path
+
+import pytest
+
+from quickfif.fiff import constants as const
+from quickfif.fiff.tag import ID_STRUCT, TAG_HEADER, open_fif
+from quickfif.fiff.tree import read_directory, walk_tags
+
+NO_DIRECTORY = -1
+LOOP_POS = 2 * TAG_HEADER.size + ID_STRUCT.size + 4  # after file id and directory pointer
+
+
+def write_tags(fpath: Path, last_size: int, last_next: int) -> None:
+    """Write file id and directory pointer without directory followed by a tag."""
+    file_id = TAG_HEADER.pack(const.FIFF_FILE_ID, const.FIFFT_ID_STRUCT, ID_STRUCT.size, 0)
+    dir_pointer = TAG_HEADER.pack(const.FIFF_DIR_POINTER, const.FIFFT_INT, 4, 0)
+    last_tag = TAG_HEADER.pack(const.FIFF_BLOCK_START, const.FIFFT_INT, last_size, last_next)
+    fpath.write_bytes(
+        file_id
+        + bytes(ID_STRUCT.size)
+        + dir_pointer
+        + NO_DIRECTORY.to_bytes(4, "big", signed=True)
+        + last_tag
+        + bytes(4)
+    )
+
+
+def test_walk_stops_at_tag_linking_to_itself(tmp_path: Path) -> None:
+    """Test the walk over tags ends when the last tag links back to itself."""
+    write_tags(tmp_path / "loop_raw.fif", 4, LOOP_POS)
+
+    with open_fif(tmp_path / "loop_raw.fif") as fid:
+        directory = read_directory(fid)
+
+    assert [ent.pos for ent in directory][-1] == LOOP_POS
+    assert len(directory) == 3
+
+
+def test_negative_tag_size_raises_value_error(tmp_path: Path) -> None:
+    """Test a tag with negative size makes the file broken instead of moving the walk back."""
+    write_tags(tmp_path / "negative_raw.fif", -LOOP_POS, const.FIFFV_NEXT_SEQ)
+
+    with open_fif(tmp_path / "negative_raw.fif") as fid:
+        with pytest.raises(ValueError, match="negative size"):
+            read_directory(fid)
+
+
+def test_walk_reports_loop_to_callback(tmp_path: Path) -> None:
+    """Test the loop ending the walk is reported and there is no end of file position."""
+    write_tags(tmp_path / "loop_raw.fif", 4, LOOP_POS)
+    problems: list[str] = []
+
+    with open_fif(tmp_path / "loop_raw.fif") as fid:
+        walk = walk_tags(fid, problems.append)
+
+    assert problems == [f"Tags loop back to position {LOOP_POS}"]
+    assert walk.eof_pos is None
@@ -0,0 +1,128 @@
+"""Test random access to gzip files with seek-point index."""
+import gzip
+import io
+from pathlib import Path
+from typing import BinaryIO, Final
+
+import numpy as np
+import pytest
+
+from quickfif.fiff.info import read_meas_info
+from quickfif.fiff.tree import read_tree
+from quickfif.gzindex import DEFAULT_SPAN, INDEX_SUFFIX, GzipIndex, IndexedGzipReader, open_gzip
+from quickfif.inflate import load_libz
+from tests.plugins.raw_fixtures import RawFactory
+
+SPAN: Final = 65536
+N_SAMPLES: Final = 500000
+N_READS: Final = 50
+READ_SIZES: Final = (1, 100, SPAN * 3)
+
+libz = load_libz()
+pytestmark = pytest.mark.skipif(libz is None, reason="system zlib is not available")
+
+
+@pytest.fixture(scope="module")
+def payload() -> bytes:
+    """Poorly compressible data, so the gzip stream has many deflate blocks."""
+    noise = np.random.default_rng(0).normal(size=N_SAMPLES) * 100
+    return noise.astype(">i4").tobytes()
+
+
+@pytest.fixture
+def gz_fpath(tmp_path: Path, payload: bytes) -> Path:
+    """Single-member gzip file."""
+    fpath = tmp_path / "payload.gz"
+    fpath.write_bytes(gzip.compress(payload))
+    return fpath
+
+
+def open_reader(fpath: Path, index: GzipIndex) -> BinaryIO:
+    """Open reader with explicit index."""
+    reader = IndexedGzipReader(libz, fpath, index)  # type: ignore[arg-type]
+    return io.BufferedReader(reader)  # type: ignore[return-value]
+
+
+def read_at(fid: BinaryIO, pos: int, n_bytes: int = -1) -> bytes:
+    """Read from position."""
+    fid.seek(pos)
+    return fid.read(n_bytes)
+
+
+def index_files(cache_home: Path) -> list[Path]:
+    """Index files stored in the cache."""
+    return sorted(cache_home.rglob(f"*{INDEX_SUFFIX}"))
+
+
+def test_random_reads_match_data(gz_fpath: Path, payload: bytes) -> None:
+    """Test reads at random positions match data while the index is built and after."""
+    index = GzipIndex(span=SPAN)
+    rng = np.random.default_rng(0)
+    for _ in range(2):
+        positions = rng.integers(len(payload) + SPAN, size=N_READS)
+        with open_reader(gz_fpath, index) as fid:
+            for pos, n_bytes in zip(positions, rng.choice(READ_SIZES, size=N_READS)):
+                assert read_at(fid, pos, n_bytes) == payload[pos : pos + n_bytes]  # noqa: E203
+    assert index.size == len(payload)
+    assert len(index.points) > len(payload) // SPAN // 2
+
+
+def test_index_is_saved_and_extended(tmp_path: Path, payload: bytes, cache_home: Path) -> None:
+    """Test index is saved on close and extended by later reads."""
+    payload *= DEFAULT_SPAN * 2 // len(payload) + 1
+    gz_fpath = tmp_path / "long_payload.gz"
+    gz_fpath.write_bytes(gzip.compress(payload))
+    with open_gzip(gz_fpath, min_indexed_bytes=0) as partial_fid:
+        read_at(partial_fid, len(payload) // 2, 1)
+    assert len(index_files(cache_home)) == 1
+
+    with open_gzip(gz_fpath, min_indexed_bytes=0) as full_fid:
+        partial_index = full_fid.raw.index  # type: ignore[attr-defined]
+        assert partial_index.points
+        assert partial_index.size is None
+        assert full_fid.read() == payload
+
+    with open_gzip(gz_fpath, min_indexed_bytes=0) as indexed_fid:
+        assert indexed_fid.seek(-1, io.SEEK_END) == len(payload) - 1
+
+
+def test_changed_file_gets_new_index(gz_fpath: Path, payload: bytes, cache_home: Path) -> None:
+    """Test index of a rewritten file is not used."""
+    with open_gzip(gz_fpath, min_indexed_bytes=0) as fid:
+        fid.read()
+    gz_fpath.write_bytes(gzip.compress(payload[::-1]))
+
+    with open_gzip(gz_fpath, min_indexed_bytes=0) as changed_fid:
+        assert changed_fid.read() == payload[::-1]
+    assert len(index_files(cache_home)) == 2
+
+
+def test_multimember_file_falls_back_to_gzip(tmp_path: Path, payload: bytes) -> None:
+    """Test the rest of the file is read with gzip after the first member."""
+    fpath = tmp_path / "multi.gz"
+    half = len(payload) // 2
+    first, second = payload[:half], payload[half:]
+    fpath.write_bytes(gzip.compress(first) + gzip.compress(second))
+    index = GzipIndex(span=SPAN)
+
+    with open_reader(fpath, index) as fid:
+        assert fid.read() == payload
+        across_members = first[-1:] + second[:1]
+        assert read_at(fid, half - 1, 2) == across_members
+    assert index.size is None
+
+
+def test_fiff_tree_is_read_through_index(tmp_path: Path, raw_obj_factory: RawFactory) -> None:
+    """Test FIFF tree and info read through the index match the ones read with gzip."""
+    fpath = tmp_path / "test_raw.fif.gz"
+    raw_obj_factory(4, sfreq=1000, dur_sec=100).save(fpath)  # noqa: WPS432
+    with gzip.open(fpath) as gz_fid:
+        gz_binary: BinaryIO = gz_fid  # type: ignore[assignment]
+        expected_tree = read_tree(gz_binary)
+        expected_info = read_meas_info(gz_binary, expected_tree)
+
+    for _ in range(2):  # build the index, then use it
+        with open_gzip(fpath, min_indexed_bytes=0) as fid:
+            tree = read_tree(fid)
+            assert tree == expected_tree
+            assert read_meas_info(fid, tree) == expected_info
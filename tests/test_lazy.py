@@ -0,0 +1,68 @@
+"""Test background loading and lazy proxies."""
+import sys
+import threading
+
+import pytest
+
+from quickfif.lazy import BackgroundLoader, LazyProxy, lazy_field, lazy_module
+
+
+class Loaded(object):
+    """Object with a field, as returned by the read functions."""
+
+    def __init__(self) -> None:
+        self.events = [1, 2, 3]
+
+
+def test_proxy_waits_for_loading() -> None:
+    """Test proxy describes progress while loading and forwards to the loaded field after."""
+    release = threading.Event()
+
+    def load() -> Loaded:  # noqa: WPS430 (blocks until released)
+        release.wait()
+        return Loaded()
+
+    loader = BackgroundLoader(load).start()
+    proxy = lazy_field(loader, "events")
+
+    assert "loading in background" in str(proxy)
+    release.set()
+    assert list(proxy) == [1, 2, 3]
+    assert (len(proxy), proxy[0]) == (3, 1)
+    assert "loaded in" in proxy.description
+    assert proxy.resolve() is loader.wait().events
+
+
+def test_failed_loading_raises_on_use() -> None:
+    """Test error of the background thread is raised on every use of the proxy."""
+
+    def load() -> Loaded:  # noqa: WPS430
+        raise ValueError("broken file")
+
+    loader = BackgroundLoader(load).start()
+    proxy = lazy_field(loader, "events")
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="broken file"):
+            proxy.resolve()
+    assert proxy.is_ready
+    assert "loading failed: broken file" in repr(proxy)
+
+
+def test_lazy_module_imports_on_first_use(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test module is not imported until the proxy is used."""
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+    proxy = lazy_module("colorsys")
+
+    assert not proxy.is_ready
+    assert "colorsys" not in sys.modules
+    assert proxy.__name__ == "colorsys"
+    assert proxy.is_ready
+    assert "rgb_to_hsv" in dir(proxy)  # noqa: WPS421 (completion in console)
+
+
+def test_proxy_is_callable() -> None:
+    """Test calls are forwarded."""
+    proxy = LazyProxy(resolve=lambda: len, describe=lambda: "len", ready=lambda: True)
+
+    assert proxy("abc") == 3
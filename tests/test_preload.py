@@ -0,0 +1,89 @@
+"""Test memory-mapped preload cache."""
+import gc
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+from mne.io import read_raw_fif
+
+from quickfif.preload import ENTRY_SUFFIX, PreloadCache, get_preload_cache
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def preload_cache(tmp_path: "Path") -> PreloadCache:
+    """Empty preload cache."""
+    return PreloadCache(tmp_path / "cache")
+
+
+def entries(preload_cache: PreloadCache) -> list["Path"]:
+    """Entries stored in cache."""
+    return sorted(preload_cache.root.rglob(f"*{ENTRY_SUFFIX}"))
+
+
+def test_data_is_mapped_from_single_entry(
+    preload_cache: PreloadCache, split_raw_fpath: "Path"
+) -> None:
+    """Test data of cached raw match mne preload and sessions share one entry."""
+    expected = read_raw_fif(split_raw_fpath, preload=True).get_data()
+
+    first_raw = preload_cache.read_raw(split_raw_fpath)
+    second_raw = preload_cache.read_raw(split_raw_fpath)
+
+    assert first_raw.preload and second_raw.preload
+    assert np.array_equal(first_raw.get_data(), expected)
+    assert np.array_equal(second_raw.get_data(), expected)
+    assert len(entries(preload_cache)) == 1
+    assert isinstance(second_raw._data.base, np.memmap)  # noqa: WPS437 (no copy)
+
+
+def test_changes_stay_private(preload_cache: PreloadCache, small_raw_fpath: "Path") -> None:
+    """Test in-place changes don't reach the entry, which outlives the raw."""
+    raw = preload_cache.read_raw(small_raw_fpath)
+    expected = raw.get_data()
+
+    raw.apply_function(lambda signal: signal + 1, picks="all")
+    del raw  # noqa: WPS420 (mne removes files of memmapped data on delete)
+    gc.collect()
+
+    assert np.array_equal(preload_cache.read_raw(small_raw_fpath).get_data(), expected)
+
+
+def test_evicts_least_recently_used(tmp_path: "Path", small_raw_fpath: "Path") -> None:
+    """Test eviction keeps the data used last within the size limit."""
+    n_bytes = read_raw_fif(small_raw_fpath).get_data().nbytes
+    preload_cache = PreloadCache(tmp_path / "cache", max_bytes=n_bytes)
+    other_fpath = small_raw_fpath.with_name("other_raw.fif")
+    read_raw_fif(small_raw_fpath).save(other_fpath)
+
+    preload_cache.read_raw(small_raw_fpath)
+    old_entries = entries(preload_cache)
+    preload_cache.read_raw(other_fpath)
+
+    assert len(entries(preload_cache)) == 1
+    assert not set(old_entries) & set(entries(preload_cache))
+
+
+def test_too_large_data_is_loaded_in_memory(tmp_path: "Path", small_raw_fpath: "Path") -> None:
+    """Test data larger than the cache are loaded as usual."""
+    preload_cache = PreloadCache(tmp_path / "cache", max_bytes=1)
+
+    raw = preload_cache.read_raw(small_raw_fpath)
+
+    assert raw.preload
+    assert not entries(preload_cache)
+
+
+def test_clear_removes_all(preload_cache: PreloadCache, small_raw_fpath: "Path") -> None:
+    """Test clearing the cache."""
+    preload_cache.read_raw(small_raw_fpath)
+
+    assert preload_cache.clear() == 1
+    assert not entries(preload_cache)
+
+
+def test_default_location(cache_home: "Path") -> None:
+    """Test preloaded data are stored in the package cache directory."""
+    assert get_preload_cache().root == cache_home / "quickfif"
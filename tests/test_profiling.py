@@ -0,0 +1,35 @@
+"""Test recording time and memory of command phases."""
+import json
+
+from quickfif.profiling import Profiler, phase
+
+N_ALLOCATED = 10**6
+
+
+def test_nested_phases_are_named_after_enclosing_ones() -> None:
+    """Test phases are reported in the order they started with their parents' names."""
+    profiler = Profiler()
+    profiler.start()
+    with phase("outer"):
+        with phase("inner"):
+            allocated = bytearray(N_ALLOCATED)
+        del allocated  # noqa: WPS420 (peak must outlive the allocation)
+    report = profiler.stop()
+
+    names = [stats.name for stats in report.phases]
+    assert names == ["outer", "outer/inner"]
+    outer, inner = report.phases
+    assert inner.peak_traced_mb * 1024 * 1024 >= N_ALLOCATED
+    assert outer.peak_traced_mb >= inner.peak_traced_mb
+    assert outer.wall_sec >= inner.wall_sec
+
+
+def test_phase_does_nothing_without_profiler() -> None:
+    """Test phases marked when profiling is off are not recorded by a later profiler."""
+    with phase("unprofiled"):
+        profiler = Profiler()
+    profiler.start()
+    report = profiler.stop()
+
+    assert not report.phases
+    assert not json.loads(report.to_json())["phases"]
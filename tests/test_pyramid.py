@@ -0,0 +1,57 @@
+"""Test envelope pyramids of raw data."""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from quickfif.pyramid import Pyramid, build_pyramid, open_pyramid
+from tests.plugins.raw_fixtures import RawFactory
+
+BIN_SIZE = 16
+
+
+@pytest.fixture
+def raw_fpath(tmp_path: Path, raw_obj_factory: RawFactory) -> Path:
+    """Raw file with a number of samples not divisible by the bin sizes."""
+    fpath = tmp_path / "rec_raw.fif"
+    raw_obj_factory(3, sfreq=1000, dur_sec=10).save(fpath)  # noqa: WPS432
+    return fpath
+
+
+@pytest.fixture
+def pyramid(raw_fpath: Path, tmp_path: Path) -> Pyramid:
+    """Pyramid of the raw file."""
+    build_pyramid(raw_fpath, tmp_path / "rec.pyr", bin_size=BIN_SIZE, jobs=1)
+    return open_pyramid(tmp_path / "rec.pyr")
+
+
+def test_single_pixel_summarizes_all_data(raw_fpath: Path, pyramid: Pyramid) -> None:
+    """Test one pixel gets the range and RMS of the whole recording."""
+    from mne.io import read_raw_fif  # noqa: WPS433 (heavy import)
+
+    samples = read_raw_fif(raw_fpath).get_data()
+
+    envelope = pyramid.query(1)
+    rms = np.sqrt(np.mean(np.square(samples), axis=1))
+    assert np.allclose(envelope.mins[:, 0], samples.min(axis=1))
+    assert np.allclose(envelope.maxs[:, 0], samples.max(axis=1))
+    assert np.allclose(envelope.rms[:, 0], rms, rtol=1e-5)  # noqa: WPS432
+
+
+def test_query_reads_finest_bins(raw_fpath: Path, pyramid: Pyramid) -> None:
+    """Test pixels narrower than a bin repeat the bins of the finest level."""
+    from mne.io import read_raw_fif  # noqa: WPS433 (heavy import)
+
+    first_bin = read_raw_fif(raw_fpath).get_data(picks=[1], stop=BIN_SIZE)
+
+    envelope = pyramid.query(BIN_SIZE * 2, tmax=0.031, picks=[1])  # noqa: WPS432 (32 samples)
+    assert envelope.maxs.shape == (1, BIN_SIZE * 2)
+    assert np.allclose(envelope.maxs[0, :BIN_SIZE], first_bin.max())
+
+
+def test_jobs_write_same_pyramid(raw_fpath: Path, tmp_path: Path) -> None:
+    """Test segments read by several processes are stitched into the same file."""
+    build_pyramid(raw_fpath, tmp_path / "serial.pyr", bin_size=BIN_SIZE, jobs=1)
+    build_pyramid(raw_fpath, tmp_path / "parallel.pyr", bin_size=BIN_SIZE, jobs=2)
+
+    assert (tmp_path / "serial.pyr").read_bytes() == (tmp_path / "parallel.pyr").read_bytes()
@@ -22,8 +22,8 @@ def test_to_dict_wraps_fpath_and_annots(qf_annots: QfAnnots) -> None:
     """Test to_dict wraps fpath and raw."""
     res = qf_annots.to_dict()
 
-    assert qf_annots.fpath in res.values()
-    assert qf_annots.annots in res.values()
+    assert res["fpath"] is qf_annots.fpath
+    assert res["annots"] is qf_annots.annots
 
 
 def test_read_loads_same_data(saved_qf_annots: QfAnnots) -> None:
@@ -1,11 +1,38 @@
 """Test qf epochs."""
+import tracemalloc
+from pathlib import Path
 
+import mne
+import numpy as np
+import pytest
 from numpy.testing import assert_array_almost_equal
 
 from quickfif.qf_types.epochs_type import QfEpochs
 from quickfif.qf_types.epochs_type import read as read_qf_epochs
 
 
+@pytest.fixture
+def event_epochs_fpath(tmp_path: Path) -> Path:  # noqa: WPS210 (too many local variables)
+    """Epochs of two event types, some of them dropped, saved to file."""
+    n_epo, n_ch, sfreq, tmin = 40, 32, 1000, -0.2
+    events = np.zeros((n_epo, 3), dtype=int)
+    events[:, 0] = np.arange(n_epo) * sfreq
+    events[:, 2] = np.arange(n_epo) % 2
+    epochs = mne.EpochsArray(
+        data=np.random.randn(n_epo, n_ch, sfreq),
+        info=mne.create_info(n_ch, sfreq, "eeg"),
+        events=events,
+        event_id={"left": 0, "right": 1},
+        tmin=tmin,
+        verbose="ERROR",
+    )
+    epochs.drop([0, 1, 3], reason="EOG", verbose="ERROR")
+    epochs.drop([0], reason="MUSCLE", verbose="ERROR")
+    fpath = tmp_path / "events-epo.fif"
+    epochs.save(fpath)
+    return fpath
+
+
 def test_summary_string_contains_info(qf_epochs: QfEpochs) -> None:
     """
     Test summary for `QfRaw`.
@@ -19,12 +46,52 @@ def test_summary_string_contains_info(qf_epochs: QfEpochs) -> None:
     assert "Info" in summary, summary
 
 
+def test_summary_from_metadata(event_epochs_fpath: Path) -> None:
+    """Test summary reports epochs, events and drops without loading the data."""
+    qf_epochs = read_qf_epochs(event_epochs_fpath)
+
+    summary = qf_epochs.summary.splitlines()
+
+    assert not qf_epochs.epochs.preload
+    assert summary[0] == "Epochs | 36 epochs, tmin: -0.200 sec, tmax: 0.799 sec"
+    assert summary[2:6] == [
+        "Events      | types: 2",
+        "   18 left",
+        "   18 right",
+        "Dropped     | 4 of 40 epochs (10.0%)",
+    ]
+    assert summary[6:8] == ["    3 EOG", "    1 MUSCLE"]
+
+
+def test_summary_fields(event_epochs_fpath: Path) -> None:
+    """Test structured summary has the values of the text one."""
+    fields = read_qf_epochs(event_epochs_fpath).summary_fields()
+
+    assert (fields["n_epochs"], fields["n_channels"]) == (36, 32)
+    assert fields["channel_counts"] == {"eeg": 32}
+    assert fields["events"] == {"left": 18, "right": 18}
+    assert (fields["n_dropped"], fields["n_selected"]) == (4, 40)
+    assert list(fields["drop_reasons"].items()) == [("EOG", 3), ("MUSCLE", 1)]
+
+
+def test_preview_memory_doesnt_grow_with_data(event_epochs_fpath: Path) -> None:
+    """Test reading for preview doesn't load the data."""
+    data_bytes = event_epochs_fpath.stat().st_size
+
+    tracemalloc.start()
+    read_qf_epochs(event_epochs_fpath).summary  # noqa: WPS428 (computing is the point)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert peak_bytes < data_bytes / 4
+
+
 def test_to_dict_wraps_fpath_and_epochs(qf_epochs: QfEpochs) -> None:
     """Test to_dict wraps fpath and raw."""
     ns = qf_epochs.to_dict()
 
-    assert qf_epochs.fpath == ns["fpath"]
-    assert qf_epochs.epochs == ns["epochs"]
+    assert qf_epochs.fpath is ns["fpath"]
+    assert qf_epochs.epochs is ns["epochs"]
 
 
 def test_read_loads_same_data(saved_qf_epochs: QfEpochs) -> None:
@@ -18,12 +18,20 @@ def test_summary_string(qf_ica: QfIca) -> None:
     assert "ICA" in summary, summary
 
 
+def test_summary_is_rendered_as_mne_repr(saved_qf_ica: QfIca) -> None:
+    """Test summary rendered from the structured one is the same as mne shows."""
+    qf_ica = read_qf_ica(saved_qf_ica.fpath)
+
+    assert qf_ica.summary == str(qf_ica.ica)
+    assert qf_ica.summary_fields()["n_components"] == qf_ica.ica.n_components_
+
+
 def test_to_dict_wraps_fpath_and_ica(qf_ica: QfIca) -> None:
     """Test to_dict wraps fpath and raw."""
     ns = qf_ica.to_dict()
 
-    assert qf_ica.fpath == ns["fpath"]
-    assert repr(qf_ica.ica) == repr(ns["ica"])  # use repr: direct ica comparison doesn't work
+    assert qf_ica.fpath is ns["fpath"]
+    assert qf_ica.ica is ns["ica"]
 
 
 def test_read_loads_same_data(saved_qf_ica: QfIca) -> None:
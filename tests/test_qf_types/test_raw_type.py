@@ -1,4 +1,5 @@
 """Test raw_type handling."""
+import tracemalloc
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable
 
@@ -6,8 +7,10 @@ import mne
 import pytest
 from numpy.testing import assert_array_almost_equal
 
-from quickfif.qf_types.raw_type import QfRaw
+from quickfif.qf_types.raw_type import QfRaw, RawExport
 from quickfif.qf_types.raw_type import read as read_qf_raw
+from quickfif.qf_types.raw_type import read_header as read_qf_raw_header
+from quickfif.qf_types.raw_type import save as save_qf_raw
 
 if TYPE_CHECKING:
     from tests.plugins.raw_fixtures import RawFactory  # pragma: no cover
@@ -85,8 +88,8 @@ def test_to_dict_wraps_fpath_and_raw(qf_raw: QfRaw) -> None:
     """Test to_dict wraps fpath and raw."""
     res = qf_raw.to_dict()
 
-    assert qf_raw.fpath in res.values()
-    assert qf_raw.raw in res.values()
+    assert res["fpath"] is qf_raw.fpath
+    assert res["raw"] is qf_raw.raw
 
 
 def test_read_loads_same_data(saved_qf_raw: QfRaw) -> None:
@@ -94,3 +97,55 @@ def test_read_loads_same_data(saved_qf_raw: QfRaw) -> None:
     loaded_raw = read_qf_raw(saved_qf_raw.fpath)
 
     assert_array_almost_equal(saved_qf_raw.raw.get_data(), loaded_raw.raw.get_data())
+
+
+def test_header_summary_is_same_as_raw_summary(saved_qf_raw: QfRaw) -> None:
+    """Test header-only preview renders exactly the same summary as the full read."""
+    header_summary = read_qf_raw_header(saved_qf_raw.fpath).summary
+
+    assert header_summary == read_qf_raw(saved_qf_raw.fpath).summary
+
+
+def test_header_summary_fields_are_same_as_raw_ones(saved_qf_raw: QfRaw) -> None:
+    """Test header-only preview gets the same structured summary as the full read."""
+    header_fields = read_qf_raw_header(saved_qf_raw.fpath).summary_fields()
+
+    assert header_fields == read_qf_raw(saved_qf_raw.fpath).summary_fields()
+    assert header_fields["n_channels"] == sum(header_fields["channel_counts"].values())
+
+
+def test_export_saves_crop_and_picks_in_splits(split_raw_fpath: Path, tmp_path: Path) -> None:
+    """Test exported raw has the selected samples and channels, split as requested."""
+    dst = tmp_path / "export" / "export_raw.fif"
+    dst.parent.mkdir()
+    picks = ("0", "1", "3")
+    export = RawExport(tmin=10, tmax=130, picks=picks, buffer_sec=1)  # noqa: WPS432
+
+    save_qf_raw(
+        read_qf_raw(split_raw_fpath), dst, overwrite=False, split_size="2MB", export=export
+    )
+
+    src_raw = mne.io.read_raw_fif(split_raw_fpath, verbose="ERROR")
+    expected_raw = src_raw.crop(export.tmin, export.tmax).pick(list(picks))
+    exported_raw = mne.io.read_raw_fif(dst, verbose="ERROR")
+    assert len(exported_raw.filenames) > 1, "We expect splits."
+    assert exported_raw.ch_names == list(picks)
+    assert_array_almost_equal(exported_raw.get_data(), expected_raw.get_data())
+
+
+def test_export_memory_is_bounded_by_buffer(
+    tmp_path: Path, raw_obj_factory: "RawFactory"
+) -> None:
+    """Test export streams the data instead of loading the whole raw."""
+    fpath = tmp_path / "test_raw.fif"
+    raw_obj_factory(32, sfreq=1000, dur_sec=50).save(fpath)  # noqa: WPS432
+    qf_raw = read_qf_raw(fpath)
+    data_bytes = qf_raw.raw.info["nchan"] * qf_raw.raw.n_times * 8  # float64 when loaded
+    export = RawExport(buffer_sec=1)
+
+    tracemalloc.start()
+    save_qf_raw(qf_raw, tmp_path / "export_raw.fif", overwrite=False, export=export)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert peak_bytes < data_bytes / 8
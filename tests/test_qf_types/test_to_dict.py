@@ -0,0 +1,29 @@
+"""Test namespace dictionaries refer to the loaded objects."""
+import tracemalloc
+from dataclasses import fields
+from typing import Final
+
+import pytest
+
+from quickfif.qf_types.base import QfType
+
+# Building the dictionary allocates next to nothing compared to ~10MB objects
+MAX_TO_DICT_BYTES: Final = 65536
+
+
+@pytest.fixture(params=["large_qf_raw", "large_qf_epochs"])
+def large_qf_obj(request: pytest.FixtureRequest) -> QfType:
+    """Objects with ~10MB of data loaded."""
+    return request.getfixturevalue(request.param)  # type: ignore[no-any-return]
+
+
+def test_to_dict_doesnt_copy(large_qf_obj: QfType) -> None:
+    """Test namespace holds the same instances and building it doesn't copy the data."""
+    tracemalloc.start()
+    ns = large_qf_obj.to_dict()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    for field in fields(large_qf_obj):  # type: ignore[arg-type]
+        assert ns[field.name] is getattr(large_qf_obj, field.name)
+    assert peak_bytes < MAX_TO_DICT_BYTES
@@ -0,0 +1,67 @@
+"""Test streaming conversion between plain and gzip-compressed FIFF files."""
+import gzip
+from pathlib import Path
+
+import mne
+import pytest
+from numpy.testing import assert_array_equal
+
+from quickfif.fiff.raw import read_raw_header
+from quickfif.recompress import Direction, recompress
+
+
+def read_data(fpath: Path) -> mne.io.Raw:
+    """Read raw with all its splits."""
+    return mne.io.read_raw_fif(fpath, verbose="ERROR").get_data()
+
+
+@pytest.mark.parametrize(
+    ("gz_name", "plain_name", "bids"),
+    [("test_raw.fif.gz", "back_raw.fif", False), ("sub-01_meg.fif.gz", "sub-01_meg.fif", True)],
+)
+def test_split_set_round_trip(
+    split_raw_fpath: Path, gz_name: str, plain_name: str, bids: bool
+) -> None:
+    """Test compressed and decompressed back split sets keep the data and the chain."""
+    expected_data = read_data(split_raw_fpath)
+
+    compressed = recompress(split_raw_fpath, split_raw_fpath.with_name(gz_name), bids, jobs=3)
+    gz_dsts = compressed.dsts
+    decompressed = recompress(gz_dsts[0], split_raw_fpath.with_name(plain_name), bids)
+
+    assert compressed.direction == Direction.compress
+    assert len(gz_dsts) == 3
+    assert read_raw_header(gz_dsts[0]).fnames == gz_dsts
+    assert_array_equal(read_data(gz_dsts[0]), expected_data)
+    assert read_raw_header(decompressed.dsts[0]).fnames == decompressed.dsts
+    assert_array_equal(read_data(decompressed.dsts[0]), expected_data)
+
+
+def test_single_file_content_is_kept(small_raw_fpath: Path) -> None:
+    """Test file without splits is compressed byte to byte into a single gzip member."""
+    dst = small_raw_fpath.with_name("test_raw.fif.gz")
+
+    stats = recompress(small_raw_fpath, dst, bids=False)
+
+    assert gzip.decompress(stats.dsts[0].read_bytes()) == small_raw_fpath.read_bytes()
+    assert stats.n_read == small_raw_fpath.stat().st_size
+    assert stats.throughput > 0
+
+
+def test_same_compression_is_rejected(small_raw_fpath: Path) -> None:
+    """Test conversion to the same compression points to saveas."""
+    with pytest.raises(ValueError, match="saveas"):
+        recompress(small_raw_fpath, small_raw_fpath.with_name("copy_raw.fif"), bids=False)
+
+
+def test_existing_destination_is_kept(split_raw_fpath: Path) -> None:
+    """Test existing split destination stops conversion and leaves no files behind."""
+    taken = split_raw_fpath.with_name("test_raw.fif-2.gz")
+    taken.write_bytes(b"taken")
+    files_before = sorted(split_raw_fpath.parent.iterdir())
+
+    with pytest.raises(FileExistsError):
+        recompress(split_raw_fpath, split_raw_fpath.with_name("test_raw.fif.gz"), bids=False)
+
+    assert sorted(split_raw_fpath.parent.iterdir()) == files_before
+    assert taken.read_bytes() == b"taken"
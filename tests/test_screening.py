@@ -0,0 +1,62 @@
+"""Test streaming channel statistics and bad channel screening."""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from quickfif.screening import Accumulator, read_stats
+from tests.plugins.raw_fixtures import RawFactory
+
+N_CHANNELS = 8
+SFREQ = 100
+
+
+@pytest.fixture
+def bad_raw_fpath(tmp_path: Path, raw_obj_factory: RawFactory) -> Path:
+    """Raw with a flat, a noisy and a clipped EEG channel."""
+    raw = raw_obj_factory(N_CHANNELS, sfreq=SFREQ, dur_sec=60, ch_types="eeg")  # noqa: WPS432
+    raw.apply_function(lambda samples: np.zeros_like(samples), picks=[1])
+    raw.apply_function(lambda samples: samples * 100, picks=[3])  # noqa: WPS432
+    raw.apply_function(lambda samples: np.clip(samples, -1, 1), picks=[5])
+    fpath = tmp_path / "bad_raw.fif"
+    raw.save(fpath)
+    return fpath
+
+
+def test_chunks_add_up_to_whole_data() -> None:
+    """Test moments merged chunk by chunk match the ones of the whole data with large offset."""
+    samples = np.random.default_rng(0).standard_t(5, size=(2, 10001)) + 1e4  # noqa: WPS432
+    acc = Accumulator.empty(2)
+    for start in range(0, samples.shape[1], SFREQ * 7):
+        acc.update(samples[:, start : start + SFREQ * 7], SFREQ)  # noqa: E203
+
+    deviations = samples - samples.mean(axis=1, keepdims=True)
+    assert acc.moments.mean == pytest.approx(samples.mean(axis=1))
+    assert acc.moments.m2 == pytest.approx(np.sum(deviations**2, axis=1))
+    assert acc.moments.m4 == pytest.approx(np.sum(deviations**4, axis=1))
+    assert acc.highs.peaks == pytest.approx(samples.max(axis=1))
+
+
+def test_bad_channels_are_suggested(bad_raw_fpath: Path) -> None:
+    """Test channels read in groups by several processes keep their order and get flagged."""
+    raw_stats = read_stats(bad_raw_fpath, jobs=3)
+
+    assert [ch_stats["name"] for ch_stats in raw_stats["channels"]] == [
+        str(idx) for idx in range(N_CHANNELS)
+    ]
+    assert raw_stats["bads"] == ["1", "3", "5"]
+    assert [raw_stats["channels"][idx]["bad"] for idx in (1, 3, 5)] == [
+        ["flat"],
+        ["noisy"],
+        ["clipped"],
+    ]
+
+
+def test_file_without_signal_channels(tmp_path: Path, raw_obj_factory: RawFactory) -> None:
+    """Test a stim-only raw file gets no channel statistics instead of failing."""
+    fpath = tmp_path / "stim_raw.fif"
+    raw_obj_factory(1, sfreq=SFREQ, dur_sec=1, ch_types="stim").save(fpath)
+
+    raw_stats = read_stats(fpath, jobs=2)
+
+    assert (raw_stats["channels"], raw_stats["bads"]) == ([], [])
@@ -0,0 +1,26 @@
+"""Test signal glance of raw files."""
+from pathlib import Path
+
+import numpy as np
+from mne import create_info
+from mne.io import RawArray
+
+from quickfif.sparklines import read_signal, render_signal
+
+
+def test_suspicious_channels_are_listed(tmp_path: Path) -> None:
+    """Test flat and clipped channels are found and an artifact is the sparkline peak."""
+    fpath = tmp_path / "test_raw.fif"
+    samples = np.random.randn(4, 60000)  # noqa: WPS432
+    samples[0] = 0
+    samples[1] = np.clip(samples[1], -1, 1)
+    samples[2:, 30000:31000] *= 100  # noqa: WPS432
+    mne_info = create_info(["flat", "clipped", "eeg1", "eeg2"], sfreq=1000, ch_types="eeg")
+    RawArray(samples, mne_info).save(fpath, buffer_size_sec=1)
+
+    signal = read_signal(fpath)
+
+    eeg = signal["by_type"]["eeg"]
+    assert (eeg["flat"], eeg["clipped"]) == (["flat"], ["clipped"])
+    assert np.argmax(eeg["stds"]) == signal["times"].index(30)  # noqa: WPS432
+    assert "flat: flat, clipped: clipped" in render_signal(signal)
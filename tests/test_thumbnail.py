@@ -0,0 +1,85 @@
+"""Test headless thumbnails and their cache."""
+from pathlib import Path
+
+import pytest
+from mne import Epochs
+from mne.preprocessing import ICA
+from pytest_mock import MockerFixture
+
+from quickfif.config import Ftype
+from quickfif.drawing import TraceStyle, read_envelope, render_png
+from quickfif.pyramid import build_pyramid, get_sidecar_path, reduce_samples
+from quickfif.qf_types.epochs_type import QfEpochs
+from quickfif.qf_types.ica_type import QfIca
+from quickfif.thumbnail import ThumbnailOptions, get_thumbnail_cache, make_thumbnails
+
+PNG_SIGNATURE = b"\x89PNG"
+WIDTH, HEIGHT = 320, 180
+BIN_SIZE = 64
+
+
+def get_png_size(png: bytes) -> tuple[int, int]:
+    """Get width and height from the header chunk of PNG."""
+    header = png[16:24]  # noqa: WPS432 (after signature, chunk length and type)
+    width, height = header[:4], header[4:]
+    return int.from_bytes(width, "big"), int.from_bytes(height, "big")
+
+
+@pytest.mark.parametrize("style", list(TraceStyle))
+def test_raw_is_rendered_once(small_raw_fpath: Path, style: TraceStyle, mocker: MockerFixture):
+    """Test raw thumbnail has the requested size and is taken from the cache afterwards."""
+    options = ThumbnailOptions(WIDTH, HEIGHT, style)
+    entry = get_thumbnail_cache().get(small_raw_fpath, Ftype.raw, options)
+    render = mocker.patch("quickfif.thumbnail.render_png")
+
+    assert get_thumbnail_cache().get(small_raw_fpath, Ftype.raw, options) == entry
+    assert get_png_size(entry.read_bytes()) == (WIDTH, HEIGHT)
+    render.assert_not_called()
+
+
+def test_envelope_is_read_from_pyramid(split_raw_fpath: Path, mocker: MockerFixture) -> None:
+    """Test envelope from an up-to-date pyramid sidecar matches the one of the data."""
+    from mne.io import read_raw_fif  # noqa: WPS433 (heavy import)
+
+    raw = read_raw_fif(split_raw_fpath)
+    _, streamed_maxs = read_envelope(split_raw_fpath, raw, [0, 2], WIDTH)
+    build_pyramid(split_raw_fpath, get_sidecar_path(split_raw_fpath), BIN_SIZE, jobs=1)
+    get_data = mocker.patch.object(raw, "get_data")
+
+    _, maxs = read_envelope(split_raw_fpath, raw, [0, 2], WIDTH)
+    assert maxs.max(axis=1) == pytest.approx(streamed_maxs.max(axis=1))
+    get_data.assert_not_called()
+
+
+def test_changed_split_is_drawn_again(split_raw_fpath: Path, mocker: MockerFixture) -> None:
+    """Test a later split newer than the pyramid and the thumbnail makes them stale."""
+    options = ThumbnailOptions(WIDTH, HEIGHT)
+    build_pyramid(split_raw_fpath, get_sidecar_path(split_raw_fpath), BIN_SIZE, jobs=1)
+    entry = get_thumbnail_cache().get(split_raw_fpath, Ftype.raw, options)
+    split_raw_fpath.with_name("test_raw-2.fif").touch()  # after the sidecar and the rendering
+    streamed = mocker.patch("quickfif.drawing.reduce_samples", wraps=reduce_samples)
+
+    assert get_thumbnail_cache().get(split_raw_fpath, Ftype.raw, options) != entry
+    streamed.assert_called()
+
+
+def test_epochs_and_ica_are_rendered(small_epochs_obj: Epochs, ica_obj: ICA) -> None:
+    """Test epochs image and ICA weights of channels without positions are drawn."""
+    style = TraceStyle.butterfly
+    epochs_png = render_png(QfEpochs(Path(), small_epochs_obj), WIDTH, HEIGHT, style)
+    ica_png = render_png(QfIca(Path(), ica_obj), WIDTH, HEIGHT, style)
+
+    assert epochs_png.startswith(PNG_SIGNATURE)
+    assert ica_png.startswith(PNG_SIGNATURE)
+
+
+def test_batch_reports_failed_files(small_raw_fpath: Path, tmp_path: Path) -> None:
+    """Test files rendered by a pool are copied in input order and failures are returned."""
+    fpaths = [small_raw_fpath, tmp_path / "notes.txt", tmp_path / "missing_raw.fif"]
+    (tmp_path / "notes.txt").write_text("not a recording")
+    dsts: list[Path | None] = [tmp_path / "rec.png", None, None]
+
+    thumbnails = list(make_thumbnails(fpaths, dsts, ThumbnailOptions(WIDTH, HEIGHT), jobs=2))
+    assert [thumb.png for thumb in thumbnails] == [tmp_path / "rec.png", None, None]
+    assert "file type" in thumbnails[1].error
+    assert "does not exist" in thumbnails[2].error
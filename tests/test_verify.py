@@ -0,0 +1,63 @@
+"""Test integrity checks of split sets."""
+import gzip
+import hashlib
+import shutil
+from pathlib import Path
+
+import pytest
+
+from quickfif.recompress import recompress
+from quickfif.verify import verify_splits
+
+
+def test_intact_split_set_with_checksums(split_raw_fpath: Path) -> None:
+    """Test intact plain and compressed sets pass; checksums and sizes match the files."""
+    gz_dsts = recompress(
+        split_raw_fpath, split_raw_fpath.with_name("test_raw.fif.gz"), bids=False
+    ).dsts
+
+    report = verify_splits(split_raw_fpath, checksum=True, jobs=2)
+    gz_report = verify_splits(gz_dsts[0])
+
+    assert not report.n_problems and not gz_report.n_problems, str(report)
+    gz_sizes = [split.size for split in gz_report.splits]
+    assert gz_sizes == [len(gzip.decompress(fpath.read_bytes())) for fpath in gz_dsts]
+    assert [split.checksum for split in report.splits] == [
+        hashlib.sha256(split.fpath.read_bytes()).hexdigest() for split in report.splits
+    ]
+
+
+def test_truncated_split(split_raw_fpath: Path) -> None:
+    """Test truncated split is found without reading the data."""
+    split_fpath = split_raw_fpath.with_name("test_raw-1.fif")
+    split_bytes = split_fpath.read_bytes()
+    split_fpath.write_bytes(split_bytes[: len(split_bytes) // 2])
+
+    report = verify_splits(split_raw_fpath)
+
+    assert report.n_problems
+    assert "truncated" in report.splits[1].problems[0]
+
+
+@pytest.mark.parametrize(
+    ("broken_name", "problem"),
+    [("test_raw-2.fif", "Split test_raw-2.fif is missing"), ("test_raw.fif", "not the first")],
+)
+def test_broken_chain(split_raw_fpath: Path, broken_name: str, problem: str) -> None:
+    """Test missing splits and sets checked from a middle split are reported."""
+    split_raw_fpath.with_name(broken_name).unlink()
+    middle_split = split_raw_fpath.with_name("test_raw-1.fif")
+    src = split_raw_fpath if split_raw_fpath.exists() else middle_split
+
+    report = verify_splits(src)
+
+    assert any(problem in set_problem for set_problem in report.problems), str(report)
+
+
+def test_extra_split(split_raw_fpath: Path) -> None:
+    """Test file named as the next split of a complete set is reported."""
+    shutil.copy(split_raw_fpath, split_raw_fpath.with_name("test_raw-3.fif"))
+
+    report = verify_splits(split_raw_fpath)
+
+    assert report.problems == ["test_raw-3.fif is named as a split but the set ends before it"]